@@ -5,10 +5,8 @@ from datetime import datetime, timedelta
 import json
 import os
 import sys
-import io
 import html
 import hashlib
-from contextlib import redirect_stdout
 from pathlib import Path
 from typing import Optional
 import plotly.graph_objects as go
@@ -26,24 +24,18 @@ if str(CURRENT_DIR) not in sys.path:
 
 # 기존 SOXLQuantTrader 클래스 import
 from soxl_quant_system import SOXLQuantTrader
-
-APP_COMPOUNDING_ENABLED = True
-APP_PROFIT_COMPOUNDING_RATE = 0.70
-APP_LOSS_COMPOUNDING_RATE = 0.20
-APP_COMPOUNDING_SETTLEMENT_DAYS = 7
-APP_COMPOUNDING_RENEWAL_DAYS = 10
-
-
-def configure_app_trader(trader: SOXLQuantTrader) -> SOXLQuantTrader:
-    if hasattr(trader, "set_profit_loss_compounding"):
-        trader.set_profit_loss_compounding(
-            enabled=APP_COMPOUNDING_ENABLED,
-            profit_rate=APP_PROFIT_COMPOUNDING_RATE,
-            loss_rate=APP_LOSS_COMPOUNDING_RATE,
-            settlement_delay_days=APP_COMPOUNDING_SETTLEMENT_DAYS,
-            renewal_days=APP_COMPOUNDING_RENEWAL_DAYS,
-        )
-    return trader
+from preset_snapshots import (
+    build_portfolio_mdd_records,
+    build_snapshot_from_positions,
+    configure_app_trader,
+    merge_snapshot_max_mdd,
+    record_snapshot_max_mdd,
+    simulate_presets,
+    snapshot_has_positions,
+    snapshot_max_mdd,
+    snapshot_max_mdd_percent,
+    snapshot_position_items,
+)
 
 # 페이지 설정
 st.set_page_config(
@@ -289,8 +281,8 @@ _GH_REPO = "mwk1134/mos_quant"
 _GH_SNAPSHOT_PATH = "data/positions_snapshots.json"
 _PRESET_CONFIGS_KEY = "_preset_configs"
 _PRESET_NAMES = ("KMW", "JEH", "KMW2", "JEH2", "JSD", "KHW")
-_MAX_MDD_KEY = "maxMdd"
-_MDD_CALCULATION_VERSION = "full_history_v1"
+# 프리셋 동시 시뮬레이션 스레드 수 (프리셋마다 한 스레드)
+_PRESET_SIMULATION_WORKERS = len(_PRESET_NAMES)
 
 def _gh_token() -> str:
     """Streamlit secrets 또는 환경변수에서 GitHub 토큰 가져오기"""
@@ -430,197 +422,20 @@ def _snapshot_max_date(snapshot: dict) -> str:
         dates.append(date_str)
     return max(dates) if dates else ""
 
-def _is_snapshot_position(key: str, value: object) -> bool:
-    if not isinstance(key, str) or "_" not in key or not isinstance(value, dict):
-        return False
-    _, date_str = key.split("_", 1)
-    try:
-        datetime.strptime(date_str, "%Y-%m-%d")
-        return int(value.get("shares", 0) or 0) > 0
-    except Exception:
-        return False
-
-def _snapshot_has_positions(snapshot: dict) -> bool:
-    return any(
-        _is_snapshot_position(key, value)
-        for key, value in (snapshot or {}).items()
-    )
-
-def _snapshot_position_items(snapshot: dict) -> list:
-    return [
-        (key, value)
-        for key, value in (snapshot or {}).items()
-        if _is_snapshot_position(key, value)
-    ]
-
-def _snapshot_max_mdd(snapshot: dict) -> dict:
-    if not isinstance(snapshot, dict):
-        return {}
-    raw = snapshot.get(_MAX_MDD_KEY)
-    if not isinstance(raw, dict):
-        return {}
-    try:
-        percent = float(raw.get("percent", 0.0) or 0.0)
-    except Exception:
-        percent = 0.0
-    if percent <= 0:
-        return {}
-    result = dict(raw)
-    result["percent"] = percent
-    return result
-
-def _snapshot_max_mdd_percent(snapshot: dict) -> float:
-    return float(_snapshot_max_mdd(snapshot).get("percent", 0.0) or 0.0)
-
-def _merge_snapshot_max_mdd(snapshot: dict, previous_snapshot: dict) -> dict:
-    if not isinstance(snapshot, dict):
-        return snapshot
-    current_info = _snapshot_max_mdd(snapshot)
-    previous_info = _snapshot_max_mdd(previous_snapshot)
-    current_version = current_info.get("calculationVersion")
-    previous_version = previous_info.get("calculationVersion")
-    if previous_info and not current_info:
-        snapshot[_MAX_MDD_KEY] = previous_info
-    elif (
-        previous_info
-        and current_version == previous_version
-        and previous_info.get("percent", 0.0) > current_info.get("percent", 0.0)
-    ):
-        snapshot[_MAX_MDD_KEY] = previous_info
-    return snapshot
-
-def _make_max_mdd_record(
-    preset_name: str,
-    mdd_info: dict,
-    current_price: Optional[float] = None,
-) -> dict:
-    try:
-        percent = float((mdd_info or {}).get("mdd_percent", 0.0) or 0.0)
-    except Exception:
-        percent = 0.0
-    if percent <= 0:
-        return {}
-
-    record = {
-        "percent": round(percent, 4),
-        "date": str((mdd_info or {}).get("mdd_date") or datetime.now().strftime("%Y-%m-%d")),
-        "updatedAt": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "preset": str(preset_name or ""),
+def _preset_run_settings() -> dict:
+    """프리셋 시뮬레이션에 쓰는 세션 설정. 워커 스레드는 st.session_state를 읽지 않으므로 호출 스레드에서 미리 읽어 넘긴다."""
+    return {
+        "sf_config": st.session_state.get('sf_config'),
+        "ag_config": st.session_state.get('ag_config'),
+        "test_today_override": st.session_state.get('test_today_override'),
     }
-    calculation_version = str((mdd_info or {}).get("calculation_version") or "").strip()
-    if calculation_version:
-        record["calculationVersion"] = calculation_version
-    if (mdd_info or {}).get("mdd_value") is not None:
-        record["value"] = float((mdd_info or {}).get("mdd_value") or 0.0)
-    if (mdd_info or {}).get("mdd_peak_date"):
-        record["peakDate"] = str((mdd_info or {}).get("mdd_peak_date"))
-    if (mdd_info or {}).get("overall_peak_value") is not None:
-        record["peakValue"] = float((mdd_info or {}).get("overall_peak_value") or 0.0)
-    if current_price is not None:
-        try:
-            record["soxlPrice"] = round(float(current_price), 4)
-        except Exception:
-            pass
-    return record
-
-def _apply_max_mdd_record(snapshot: dict, record: dict) -> bool:
-    if not isinstance(snapshot, dict) or not isinstance(record, dict):
-        return False
-    try:
-        new_percent = float(record.get("percent", 0.0) or 0.0)
-    except Exception:
-        new_percent = 0.0
-    current = _snapshot_max_mdd(snapshot)
-    new_version = record.get("calculationVersion")
-    current_version = current.get("calculationVersion")
-    if new_version and new_version != current_version:
-        snapshot[_MAX_MDD_KEY] = record
-        return True
-    if new_percent <= _snapshot_max_mdd_percent(snapshot):
-        return False
-    snapshot[_MAX_MDD_KEY] = record
-    return True
-
-def _record_snapshot_max_mdd(
-    preset_name: str,
-    snapshot: dict,
-    mdd_info: dict,
-    current_price: Optional[float] = None,
-) -> tuple:
-    if not preset_name or not isinstance(snapshot, dict):
-        return snapshot, _snapshot_max_mdd(snapshot), False
-    record = _make_max_mdd_record(preset_name, mdd_info, current_price)
-    changed = _apply_max_mdd_record(snapshot, record)
-    return snapshot, _snapshot_max_mdd(snapshot), changed
-
-def _calculate_trader_live_mdd_info(
-    trader: SOXLQuantTrader,
-    sim_result: dict,
-    snapshot: dict,
-) -> tuple:
-    try:
-        soxl_data = trader.get_stock_data("SOXL", "1mo")
-        if soxl_data is None or len(soxl_data) == 0:
-            return {}, None
-        current_price = float(soxl_data.iloc[-1]["Close"])
-        current_date = soxl_data.index[-1].strftime("%Y-%m-%d")
-        total_position_value = sum(
-            float(pos.get("shares", 0) or 0) * current_price
-            for pos in trader.positions
-        )
-        total_invested = sum(float(pos.get("amount", 0.0) or 0.0) for pos in trader.positions)
-        portfolio = {
-            "total_invested": total_invested,
-            "total_position_value": total_position_value,
-            "unrealized_pnl": total_position_value - total_invested,
-            "available_cash": float(getattr(trader, "available_cash", 0.0) or 0.0),
-            "total_portfolio_value": float(getattr(trader, "available_cash", 0.0) or 0.0) + total_position_value,
-        }
-        mdd_records = _build_portfolio_mdd_records(
-            sim_result,
-            portfolio,
-            snapshot,
-            current_date,
-            trader.positions,
-        )
-        return trader.calculate_mdd(mdd_records), current_price
-    except Exception:
-        return {}, None
-
-def _calculate_preset_full_history_mdd(preset: dict) -> dict:
-    """Calculate MDD from the preset's complete daily equity curve."""
-    try:
-        trader = SOXLQuantTrader(
-            initial_capital=preset['initial_capital'],
-            sf_config=st.session_state.get('sf_config'),
-            ag_config=st.session_state.get('ag_config'),
-        )
-        configure_app_trader(trader)
-        trader.session_start_date = preset.get('session_start_date')
-        trader.set_seed_increases(preset.get('seed_increases') or [])
-        if st.session_state.get('test_today_override'):
-            trader.set_test_today(st.session_state.test_today_override)
-        trader.clear_cache()
-        result = trader.simulate_from_start_to_today(
-            preset.get('session_start_date'), quiet=True
-        )
-        if not isinstance(result, dict) or result.get('error'):
-            return {}
-        records = result.get('daily_records') or []
-        if not records:
-            return {}
-        result = trader.calculate_mdd(records)
-        result["calculation_version"] = _MDD_CALCULATION_VERSION
-        return result
-    except Exception:
-        return {}
 
 def _is_manual_cash_locked_snapshot(snapshot: dict) -> bool:
     return (
         isinstance(snapshot, dict)
         and bool(snapshot.get("manual_cash_lock"))
         and snapshot.get("available_cash") is not None
-        and not _snapshot_has_positions(snapshot)
+        and not snapshot_has_positions(snapshot)
     )
 
 def _should_auto_save_snapshot(previous_snapshot: dict, current_snapshot: dict) -> bool:
@@ -629,12 +444,12 @@ def _should_auto_save_snapshot(previous_snapshot: dict, current_snapshot: dict)
         return False
     if current_snapshot == (previous_snapshot or {}):
         return False
-    if _snapshot_max_mdd_percent(current_snapshot) > _snapshot_max_mdd_percent(previous_snapshot or {}):
+    if snapshot_max_mdd_percent(current_snapshot) > snapshot_max_mdd_percent(previous_snapshot or {}):
         return True
     if current_snapshot.get("pending_buy") != (previous_snapshot or {}).get("pending_buy"):
         return True
-    prev_has_positions = _snapshot_has_positions(previous_snapshot)
-    curr_has_positions = _snapshot_has_positions(current_snapshot)
+    prev_has_positions = snapshot_has_positions(previous_snapshot)
+    curr_has_positions = snapshot_has_positions(current_snapshot)
     if _is_manual_cash_locked_snapshot(previous_snapshot) and not curr_has_positions:
         return False
     if prev_has_positions and not curr_has_positions:
@@ -656,81 +471,6 @@ def get_preset_configs() -> dict:
         "KHW": st.session_state.khw_preset,
     }
 
-def _build_snapshot_from_positions(
-    trader: SOXLQuantTrader,
-    previous_snapshot: dict,
-    include_runtime_state: bool = True,
-    preserve_saved_positions: bool = True,
-) -> dict:
-    """트레이더 보유 포지션을 저장용 스냅샷으로 변환. 기존 저장 수량은 우선 보존."""
-    current_snapshot = {}
-    for pos in trader.positions:
-        buy_date = pos['buy_date']
-        buy_date_str = buy_date.strftime('%Y-%m-%d') if isinstance(buy_date, (datetime, pd.Timestamp)) else str(buy_date)
-        snap_key = f"{pos['round']}_{buy_date_str}"
-        saved = previous_snapshot.get(snap_key) if previous_snapshot and preserve_saved_positions else None
-        if not saved and previous_snapshot and preserve_saved_positions:
-            for sk, sv in previous_snapshot.items():
-                if sk.endswith(f"_{buy_date_str}"):
-                    saved = sv
-                    break
-        if saved:
-            current_snapshot[snap_key] = {
-                'shares': int(saved['shares']),
-                'buy_price': float(pos['buy_price']),
-                'amount': float(saved['shares']) * float(pos['buy_price']),
-                'round': int(pos['round']),
-                'mode': str(pos.get('mode') or saved.get('mode') or 'SF'),
-            }
-        else:
-            current_snapshot[snap_key] = {
-                'shares': int(pos['shares']),
-                'buy_price': float(pos['buy_price']),
-                'amount': float(pos['amount']),
-                'round': int(pos['round']),
-                'mode': str(pos.get('mode') or 'SF'),
-            }
-
-    # 아직 체결되지 않은 전날 표시 주문은 자동 프리셋 순회 중에도 보존한다.
-    # 같은 회차·주문일 포지션이 생겼다면 체결된 것이므로 pending 메타데이터를 제거한다.
-    pending_buy = (previous_snapshot or {}).get("pending_buy")
-    if isinstance(pending_buy, dict):
-        try:
-            pending_key = f"{int(pending_buy['round'])}_{pending_buy['order_date']}"
-        except Exception:
-            pending_key = ""
-        if pending_key and pending_key not in current_snapshot:
-            current_snapshot["pending_buy"] = dict(pending_buy)
-    if include_runtime_state:
-        current_snapshot['available_cash'] = float(getattr(trader, 'available_cash', 0.0) or 0.0)
-        current_snapshot['processed_seed_dates'] = sorted(list(getattr(trader, 'processed_seed_dates', set()) or []))
-        try:
-            current_snapshot['as_of_date'] = trader.get_latest_trading_day().strftime("%Y-%m-%d")
-        except Exception:
-            # Keep a prior exact checkpoint if market-calendar data is temporarily
-            # unavailable. Falling back to a wall-clock date could skip trades.
-            previous_as_of = str((previous_snapshot or {}).get('as_of_date') or '').strip()
-            if previous_as_of:
-                current_snapshot['as_of_date'] = previous_as_of
-        if not _snapshot_has_positions(current_snapshot):
-            try:
-                latest_day = trader.get_latest_trading_day().date()
-                resume_day = latest_day
-                for _ in range(14):
-                    resume_day -= timedelta(days=1)
-                    if not trader.is_market_closed(datetime(resume_day.year, resume_day.month, resume_day.day)):
-                        break
-                current_snapshot['cash_snapshot_date'] = resume_day.strftime("%Y-%m-%d")
-            except Exception:
-                current_snapshot['cash_snapshot_date'] = datetime.now().strftime("%Y-%m-%d")
-    if getattr(trader, 'profit_loss_compounding_enabled', False):
-        current_snapshot['compound_seed'] = float(getattr(trader, 'compound_seed', 0.0) or 0.0)
-        current_snapshot['compound_reference_seed'] = float(getattr(trader, 'compound_reference_seed', 0.0) or 0.0)
-        current_snapshot['compound_profit_rate'] = float(getattr(trader, 'profit_compounding_rate', 0.0) or 0.0)
-        current_snapshot['compound_loss_rate'] = float(getattr(trader, 'loss_compounding_rate', 0.0) or 0.0)
-    _merge_snapshot_max_mdd(current_snapshot, previous_snapshot or {})
-    return current_snapshot
-
 def _pending_buy_from_recommendation(
     trader: SOXLQuantTrader,
     recommendation: dict,
@@ -761,45 +501,42 @@ def _pending_buy_from_recommendation(
         "basis_date": basis_date,
     }
 
-def _simulate_preset_snapshot(preset_name: str, preset: dict, previous_snapshot: dict) -> tuple:
-    """프리셋 하나를 임시 트레이더로 시뮬레이션하고 저장용 스냅샷을 반환."""
-    temp_trader = SOXLQuantTrader(
-        initial_capital=preset['initial_capital'],
-        sf_config=st.session_state.get('sf_config'),
-        ag_config=st.session_state.get('ag_config')
-    )
-    configure_app_trader(temp_trader)
-    temp_trader.session_start_date = preset.get('session_start_date')
-    temp_trader.set_seed_increases(preset.get('seed_increases') or [])
-    if st.session_state.get('test_today_override'):
-        temp_trader.set_test_today(st.session_state.test_today_override)
-    temp_trader.clear_cache()
-
-    start_date = preset.get('session_start_date')
-    if previous_snapshot:
-        sim_result = temp_trader.simulate_from_snapshot_to_today(previous_snapshot, start_date, quiet=True)
-    else:
-        sim_result = temp_trader.simulate_from_start_to_today(start_date, quiet=True)
-    if sim_result and "error" in sim_result:
-        return None, sim_result["error"]
-
-    current_snapshot = _build_snapshot_from_positions(temp_trader, previous_snapshot or {})
-    _, current_price = _calculate_trader_live_mdd_info(
-        temp_trader,
-        sim_result,
-        current_snapshot,
-    )
-    mdd_info = _calculate_preset_full_history_mdd(preset)
-    _record_snapshot_max_mdd(preset_name, current_snapshot, mdd_info, current_price)
-    return current_snapshot, None
+def _simulate_presets_concurrently(
+    previous_snapshots: dict,
+    max_workers: int = _PRESET_SIMULATION_WORKERS,
+) -> dict:
+    """
+    전체 프리셋을 스레드 풀에서 동시에 시뮬레이션 (preset_snapshots.simulate_presets).
+    세션 설정은 호출 스레드에서 읽어 넘기고, 결과 저장과 세션 상태 갱신은 호출 측(메인 스레드)에서 한다.
+    Returns:
+        dict: 프리셋 이름 → (스냅샷 또는 None, 오류 메시지 또는 None), get_preset_configs 순서
+    """
+    return simulate_presets(get_preset_configs(), previous_snapshots, _preset_run_settings(), max_workers)
+
+def _load_all_preset_snapshots() -> dict:
+    """전체 프리셋 스냅샷을 GitHub에서 한 번에 로드 (GitHub에 없는 프리셋만 raw URL/로컬 fallback)."""
+    all_data, sha = _gh_load_all_snapshots()
+    all_data = all_data or {}
+    st.session_state._gh_snapshot_sha = sha
+    fallback = None
+    for preset_name in _PRESET_NAMES:
+        if all_data.get(preset_name):
+            continue
+        if fallback is None:
+            fallback = _load_all_snapshots_fallback()
+        if fallback.get(preset_name):
+            all_data[preset_name] = fallback[preset_name]
+    st.session_state._gh_snapshot_all = all_data
+    return {preset_name: all_data.get(preset_name, {}) for preset_name in _PRESET_NAMES}
 
 def auto_save_all_preset_snapshots() -> list:
-    """모든 프리셋을 순회해 새 확정 거래일 스냅샷이 있으면 저장."""
+    """모든 프리셋을 동시에 시뮬레이션해 새 확정 거래일 스냅샷이 있으면 저장."""
     results = []
-    for preset_name, preset in get_preset_configs().items():
+    previous_snapshots = _load_all_preset_snapshots()
+    outcomes = _simulate_presets_concurrently(previous_snapshots)
+    for preset_name, (current_snapshot, err) in outcomes.items():
         try:
-            previous_snapshot = load_preset_snapshot(preset_name)
-            current_snapshot, err = _simulate_preset_snapshot(preset_name, preset, previous_snapshot)
+            previous_snapshot = previous_snapshots.get(preset_name, {})
             if err:
                 results.append({"preset": preset_name, "status": "error", "message": err})
                 continue
@@ -845,19 +582,19 @@ def save_preset_snapshot(preset_name: str, snapshot: dict) -> tuple:
         all_data = getattr(st.session_state, '_gh_snapshot_all', None) or {}
         sha = getattr(st.session_state, '_gh_snapshot_sha', None)
     previous_snapshot = (all_data or {}).get(preset_name, {})
-    if _is_manual_cash_locked_snapshot(previous_snapshot) and not _snapshot_has_positions(snapshot):
+    if _is_manual_cash_locked_snapshot(previous_snapshot) and not snapshot_has_positions(snapshot):
         return True, ""
     if snapshot:
-        snapshot = _merge_snapshot_max_mdd(dict(snapshot), previous_snapshot)
+        snapshot = merge_snapshot_max_mdd(dict(snapshot), previous_snapshot)
     all_data[preset_name] = snapshot
     ok, err = _gh_save_all_snapshots(all_data, sha)
     if not ok and "GitHub API" in str(err) and "(409)" in str(err):
         latest_data, latest_sha = _gh_load_all_snapshots()
         latest_previous = (latest_data or {}).get(preset_name, {})
-        if _is_manual_cash_locked_snapshot(latest_previous) and not _snapshot_has_positions(snapshot):
+        if _is_manual_cash_locked_snapshot(latest_previous) and not snapshot_has_positions(snapshot):
             return True, ""
         if snapshot:
-            snapshot = _merge_snapshot_max_mdd(dict(snapshot), latest_previous)
+            snapshot = merge_snapshot_max_mdd(dict(snapshot), latest_previous)
         latest_data[preset_name] = snapshot
         all_data = latest_data
         ok, err = _gh_save_all_snapshots(all_data, latest_sha)
@@ -893,17 +630,17 @@ def _refresh_preset_max_mdds_for_display(all_data: dict, ttl_seconds: int = 300)
 
     refreshed = dict(all_data or {})
     results = []
-    for preset_name, preset in get_preset_configs().items():
+    outcomes = _simulate_presets_concurrently(refreshed)
+    for preset_name, (current_snapshot, err) in outcomes.items():
         try:
             previous_snapshot = refreshed.get(preset_name, {})
-            previous_mdd = _snapshot_max_mdd(previous_snapshot)
-            current_snapshot, err = _simulate_preset_snapshot(preset_name, preset, previous_snapshot)
+            previous_mdd = snapshot_max_mdd(previous_snapshot)
             if err or current_snapshot is None:
                 results.append({"preset": preset_name, "status": "error", "message": err or "snapshot unavailable"})
                 continue
 
             refreshed[preset_name] = current_snapshot
-            current_mdd = _snapshot_max_mdd(current_snapshot)
+            current_mdd = snapshot_max_mdd(current_snapshot)
             if current_mdd != previous_mdd:
                 ok, save_err = save_preset_snapshot(preset_name, current_snapshot)
                 results.append({
@@ -924,7 +661,7 @@ def _refresh_preset_max_mdds_for_display(all_data: dict, ttl_seconds: int = 300)
 def show_preset_max_mdd_summary() -> None:
     all_data = _load_all_snapshots_for_display()
     needs_refresh = any(
-        not _snapshot_max_mdd((all_data or {}).get(preset_name, {}))
+        not snapshot_max_mdd((all_data or {}).get(preset_name, {}))
         for preset_name in _PRESET_NAMES
     )
     if needs_refresh:
@@ -938,10 +675,10 @@ def show_preset_max_mdd_summary() -> None:
         snapshot = (all_data or {}).get(preset_name, {})
         if st.session_state.get("active_preset") == preset_name and st.session_state.get("positions_snapshot"):
             active_snapshot = dict(st.session_state.positions_snapshot)
-            _merge_snapshot_max_mdd(active_snapshot, snapshot)
+            merge_snapshot_max_mdd(active_snapshot, snapshot)
             st.session_state.positions_snapshot = active_snapshot
             snapshot = active_snapshot
-        info = _snapshot_max_mdd(snapshot)
+        info = snapshot_max_mdd(snapshot)
         percent = info.get("percent") if info else None
         price = info.get("soxlPrice") if info else None
         rows.append({
@@ -1311,38 +1048,13 @@ def _deduplicate_positions_by_date(trader, snapshot: dict) -> None:
     for idx in sorted(to_remove, reverse=True):
         trader.positions.pop(idx)
 
-def _build_portfolio_mdd_records(
-    sim_result: dict,
-    portfolio: dict,
-    snapshot: dict,
-    current_date: str,
-    positions: list = None,
-) -> list:
-    """Build MDD records without inventing a historical peak from current cost basis."""
-    records = []
-
-    if isinstance(sim_result, dict):
-        for record in sim_result.get("daily_records", []) or []:
-            if isinstance(record, dict) and "total_assets" in record:
-                records.append(record)
-
-    current_assets = float(portfolio.get("total_portfolio_value", 0.0) or 0.0)
-    if current_assets > 0:
-        records.append({
-            "date": current_date or datetime.now().strftime("%Y-%m-%d"),
-            "total_assets": current_assets,
-            "source": "current_portfolio",
-        })
-
-    return records
-
 def _restore_snapshot_cash_when_positions_unchanged(trader, snapshot: dict) -> bool:
     """Keep a persisted cash balance immutable during read-only recommendation work."""
     if not isinstance(snapshot, dict) or snapshot.get('available_cash') is None:
         return False
 
     snapshot_positions = {}
-    for key, item in _snapshot_position_items(snapshot):
+    for key, item in snapshot_position_items(snapshot):
         snapshot_positions[key] = (
             int(item.get('shares', 0) or 0),
             round(float(item.get('buy_price', 0.0) or 0.0), 8),
@@ -1509,7 +1221,10 @@ def initialize_trader():
                 
                 # RSI 참조 데이터 자동 업데이트 체크 (웹앱 실행 시마다)
                 try:
-                    if not st.session_state.trader.check_and_update_rsi_data():
+                    if SOXLQuantTrader.rsi_refresh_in_progress():
+                        # 트레이더 생성 시 시작된 백그라운드 갱신이 진행 중이면 중복 갱신하지 않음
+                        st.info("ℹ️ RSI 참조 데이터를 백그라운드에서 업데이트하고 있습니다.")
+                    elif not st.session_state.trader.check_and_update_rsi_data():
                         # 최신 데이터가 아니면 자동으로 업데이트
                         with st.spinner('RSI 참조 데이터 업데이트 중...'):
                             if st.session_state.trader.update_rsi_reference_file():
@@ -2083,7 +1798,7 @@ def show_daily_recommendation():
         
         # 시뮬레이션 결과를 스냅샷으로 저장 (표시와 동기화 - 매도된 포지션 제거)
         # preset일 때: 원본 스냅샷의 수량 유지 (시뮬레이션 결과로 덮어쓰지 않음)
-        current_snapshot = _build_snapshot_from_positions(st.session_state.trader, snapshot or {})
+        current_snapshot = build_snapshot_from_positions(st.session_state.trader, snapshot or {})
         for pos in st.session_state.trader.positions:
             buy_date_str = pos['buy_date'].strftime('%Y-%m-%d') if isinstance(pos['buy_date'], (datetime, pd.Timestamp)) else str(pos['buy_date'])
             snap_key = f"{pos['round']}_{buy_date_str}"
@@ -2379,7 +2094,7 @@ def show_daily_recommendation():
                     st.session_state.trader.available_cash -= float(confirm_amount)
 
                     # Explicit fills are the only place where a buy changes cash.
-                    new_snapshot = _build_snapshot_from_positions(
+                    new_snapshot = build_snapshot_from_positions(
                         st.session_state.trader,
                         snapshot_for_btn or {},
                         include_runtime_state=True,
@@ -2513,7 +2228,7 @@ def show_daily_recommendation():
     st.subheader("💼 포트폴리오 현황")
     
     portfolio = recommendation['portfolio']
-    mdd_records = _build_portfolio_mdd_records(
+    mdd_records = build_portfolio_mdd_records(
         sim_result,
         portfolio,
         st.session_state.get('positions_snapshot', {}),
@@ -2522,9 +2237,9 @@ def show_daily_recommendation():
     )
     mdd_info = st.session_state.trader.calculate_mdd(mdd_records)
     mdd_percent = float(mdd_info.get('mdd_percent', 0.0) or 0.0)
-    max_mdd_info = _snapshot_max_mdd(st.session_state.get('positions_snapshot', {}))
+    max_mdd_info = snapshot_max_mdd(st.session_state.get('positions_snapshot', {}))
     if st.session_state.get('active_preset'):
-        updated_snapshot, max_mdd_info, max_mdd_changed = _record_snapshot_max_mdd(
+        updated_snapshot, max_mdd_info, max_mdd_changed = record_snapshot_max_mdd(
             st.session_state.active_preset,
             st.session_state.get('positions_snapshot', {}),
             mdd_info,
@@ -2568,14 +2283,15 @@ def show_daily_recommendation():
         st.subheader("📊 보유 포지션 상세")
         
         positions_data = []
-        for pos in st.session_state.trader.positions:
-            # 테스트 날짜 오버라이드 고려
-            today_for_hold_days = st.session_state.trader.get_today_date()
-            if st.session_state.trader and st.session_state.trader.test_today_override:
-                today_for_hold_days = datetime.strptime(st.session_state.trader.test_today_override, '%Y-%m-%d')
-            hold_days = st.session_state.trader.count_trading_days(
-                pos['buy_date'], today_for_hold_days
-            )
+        # 테스트 날짜 오버라이드 고려
+        today_for_hold_days = st.session_state.trader.get_today_date()
+        if st.session_state.trader and st.session_state.trader.test_today_override:
+            today_for_hold_days = datetime.strptime(st.session_state.trader.test_today_override, '%Y-%m-%d')
+        # 전체 포지션의 보유 거래일을 한 번에 계산
+        hold_days_list = st.session_state.trader.count_trading_days_many(
+            [pos['buy_date'] for pos in st.session_state.trader.positions], today_for_hold_days
+        )
+        for pos, hold_days in zip(st.session_state.trader.positions, hold_days_list.tolist()):
             current_value = pos['shares'] * recommendation['soxl_current_price']
             pnl = current_value - pos['amount']
             pnl_rate = (pnl / pos['amount']) * 100
@@ -2697,7 +2413,7 @@ def show_daily_recommendation():
                         }
                         
                         # 스냅샷을 trader.positions 기준으로 재구성 후 GitHub에 영구 저장 (실제 체결 수량 반영)
-                        current_snapshot = _build_snapshot_from_positions(
+                        current_snapshot = build_snapshot_from_positions(
                             st.session_state.trader,
                             st.session_state.get('positions_snapshot', {}) or {},
                             include_runtime_state=True,
@@ -2823,14 +2539,15 @@ def show_portfolio():
         st.subheader("📦 보유 포지션")
         
         positions_data = []
-        for pos in st.session_state.trader.positions:
-            # 테스트 날짜 오버라이드 고려
-            today_for_hold_days = st.session_state.trader.get_today_date()
-            if st.session_state.trader and st.session_state.trader.test_today_override:
-                today_for_hold_days = datetime.strptime(st.session_state.trader.test_today_override, '%Y-%m-%d')
-            hold_days = st.session_state.trader.count_trading_days(
-                pos['buy_date'], today_for_hold_days
-            )
+        # 테스트 날짜 오버라이드 고려
+        today_for_hold_days = st.session_state.trader.get_today_date()
+        if st.session_state.trader and st.session_state.trader.test_today_override:
+            today_for_hold_days = datetime.strptime(st.session_state.trader.test_today_override, '%Y-%m-%d')
+        # 전체 포지션의 보유 거래일을 한 번에 계산
+        hold_days_list = st.session_state.trader.count_trading_days_many(
+            [pos['buy_date'] for pos in st.session_state.trader.positions], today_for_hold_days
+        )
+        for pos, hold_days in zip(st.session_state.trader.positions, hold_days_list.tolist()):
             current_value = pos['shares'] * current_price if 'current_price' in locals() else pos['amount']
             pnl = current_value - pos['amount']
             pnl_rate = (pnl / pos['amount']) * 100
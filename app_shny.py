@@ -5,9 +5,7 @@ from datetime import datetime, timedelta
 import json
 import os
 import sys
-import io
 import base64
-from contextlib import redirect_stdout
 from pathlib import Path
 import plotly.graph_objects as go
 import requests as _requests
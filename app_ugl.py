@@ -5,8 +5,6 @@ from datetime import datetime, timedelta
 import json
 import os
 import sys
-import io
-from contextlib import redirect_stdout
 from pathlib import Path
 import plotly.graph_objects as go
 
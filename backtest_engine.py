@@ -0,0 +1,582 @@
+"""
+배열 기반 백테스트 엔진 (SOXLQuantTrader.run_backtest의 engine="array")
+
+- PositionBook: 보유 회차의 매도목표가/손절예정일을 열(column) 배열로 보관하는 포지션 장부
+- ArrayBacktestEngine: 종가·날짜를 NumPy 배열로 한 번만 펼친 뒤 기존 iterrows 루프와
+  같은 규칙(SF/AG LOC 매수·매도, 손절예정일, 시드증액, 10거래일 투자원금 갱신, 손익 복리)을
+  실행해 동일한 daily_records를 만든다.
+
+기존 루프에서 매 봉마다 반복되던 작업(pd.Series 행 생성, 시드증액 strptime, 금요일 계산,
+전체 이력 슬라이싱, 포지션별 거래일 계산, 매도 시 daily_records 전체 탐색)은 모두
+시작 시 한 번의 배열 계산이나 회차별 색인으로 대체된다.
+"""
+
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from mode_timeline import FORCED_SF_WEEK
+from rsi_reference import get_weekly_rsi_index
+from us_market_calendar import trading_day_mask
+
+WEEKDAYS_KOREAN = ("월", "화", "수", "목", "금", "토", "일")
+
+# PositionBook.exits의 빈 결과와 보유 포지션이 없을 때의 손절예정일(ordinal) 하한
+_NO_EXITS = np.zeros(0, dtype=np.int64)
+_NO_STOP = np.iinfo(np.int64).max
+
+
+def format_month_day(day: date) -> str:
+    """날짜를 MM.DD.(요일) 형식으로 변환 (매도일/손절예정일 표시용)"""
+    return f"{day.month:02d}.{day.day:02d}.({WEEKDAYS_KOREAN[day.weekday()]})"
+
+
+class PositionBook:
+    """
+    보유 포지션 장부 (struct-of-arrays)
+
+    포지션 딕셔너리 목록(trader.positions)은 그대로 유지하고, 매도 판정에 필요한
+    매도목표가와 손절예정일(ordinal)을 같은 순서의 NumPy 배열로 함께 보관한다.
+    매일의 매도 판정은 배열 비교 한 번으로 끝나고, 최저 목표가·가장 이른 손절예정일에
+    못 미치는 날(대부분의 봉)은 배열 연산 없이 바로 넘어간다.
+    """
+
+    __slots__ = ("positions", "targets", "stops", "size", "min_target", "min_stop")
+
+    def __init__(self, positions: List[dict], capacity: int = 16):
+        self.positions = positions
+        self.size = 0
+        capacity = max(capacity, len(positions))
+        self.targets = np.empty(capacity, dtype=np.float64)
+        self.stops = np.empty(capacity, dtype=np.int64)
+        self.min_target = float("inf")
+        self.min_stop = _NO_STOP
+
+    def track(self, target: float, stop_ordinal: int) -> None:
+        """positions 마지막 항목의 매도목표가/손절예정일 등록"""
+        if self.size == len(self.targets):
+            self.targets = np.concatenate([self.targets, np.empty(len(self.targets), dtype=np.float64)])
+            self.stops = np.concatenate([self.stops, np.empty(len(self.stops), dtype=np.int64)])
+        self.targets[self.size] = target
+        self.stops[self.size] = stop_ordinal
+        self.size += 1
+        self.min_target = min(self.min_target, target)
+        self.min_stop = min(self.min_stop, stop_ordinal)
+
+    def exits(self, close: float, ordinal: int) -> np.ndarray:
+        """당일 종가에 매도되는 포지션 위치 (목표가 도달 또는 손절예정일 경과, 보유 순서)"""
+        size = self.size
+        if not size or (close < self.min_target and ordinal < self.min_stop):
+            return _NO_EXITS
+        hit = (close >= self.targets[:size]) | (ordinal >= self.stops[:size])
+        return np.flatnonzero(hit)
+
+    def remove(self, indices: np.ndarray) -> None:
+        keep = np.ones(self.size, dtype=bool)
+        keep[indices] = False
+        kept = int(keep.sum())
+        self.targets[:kept] = self.targets[: self.size][keep]
+        self.stops[:kept] = self.stops[: self.size][keep]
+        self.positions[:] = [position for position, kept_flag in zip(self.positions, keep) if kept_flag]
+        self.size = kept
+        self.min_target = float(self.targets[:kept].min()) if kept else float("inf")
+        self.min_stop = int(self.stops[:kept].min()) if kept else _NO_STOP
+
+    def total_shares(self):
+        return sum([position["shares"] for position in self.positions])
+
+
+class ArrayBacktestEngine:
+    """
+    run_backtest의 일별 루프를 배열 위에서 실행하는 엔진
+
+    run_backtest가 데이터 조회·시작 상태 확인·기간 필터링을 마친 뒤 호출하며,
+    포트폴리오 상태(positions, available_cash, current_round, 투자원금, 시드증액/복리 상태)는
+    기존 루프와 마찬가지로 trader 인스턴스에 직접 반영한다.
+    trader.record_backtest_events가 True이면 기존 루프와 같은 일별 이벤트(주차/매수/매도)를 기록한다.
+    """
+
+    def __init__(self, trader, bars: pd.DataFrame, rsi_ref_data: dict):
+        self.trader = trader
+        self.rsi_ref_data = rsi_ref_data
+        self.dates = list(bars.index)
+        self.closes = bars["Close"].to_numpy()
+        days = [pd.Timestamp(current_date).date() for current_date in self.dates]
+        self.days = days
+        self.ordinals = np.fromiter((day.toordinal() for day in days), dtype=np.int64, count=len(days))
+        # date.fromordinal(1)이 월요일이므로 (ordinal - 1) % 7 이 요일
+        weekdays = (self.ordinals - 1) % 7
+        self.friday_ordinals = self.ordinals + (4 - weekdays) % 7
+        if len(days):
+            mask = trading_day_mask(days[0], days[-1], trader.us_holidays).to_numpy()
+            self.is_trading = mask[self.ordinals - self.ordinals[0]]
+        else:
+            self.is_trading = np.zeros(0, dtype=bool)
+        # 봉 날짜의 자정 datetime (복리 정산일 비교용, 봉마다 Timestamp 변환하지 않음)
+        self.midnights = [datetime(day.year, day.month, day.day) for day in days]
+        # 참조 데이터 인덱스는 한 번만 확보 (조회마다 지문 계산·캐시 잠금을 거치지 않음)
+        try:
+            self._rsi_index = get_weekly_rsi_index(rsi_ref_data) if rsi_ref_data else None
+        except Exception:
+            self._rsi_index = None
+        self._rsi_cache: Dict[int, Optional[float]] = {}
+        self._stop_ordinals: Dict[int, np.ndarray] = {}
+        self._stop_loss_labels: Dict[int, List[str]] = {}
+        self.loop_state: Optional[Dict] = None
+
+    # ---- 조회 헬퍼 ----------------------------------------------------------
+
+    def _rsi(self, friday: datetime) -> Optional[float]:
+        key = friday.toordinal()
+        if key not in self._rsi_cache:
+            rsi = self._rsi_index.lookup(friday.strftime('%Y-%m-%d')) if self._rsi_index is not None else None
+            # 인덱스에 없는 주차는 get_rsi_from_reference에 맡긴다 (백그라운드 갱신 대기·재조회 포함)
+            if rsi is None:
+                rsi = self.trader.get_rsi_from_reference(friday, self.rsi_ref_data)
+            self._rsi_cache[key] = rsi
+        return self._rsi_cache[key]
+
+    def _determine_mode(self, current_rsi: float, prev_rsi: float, prev_mode: str) -> str:
+        # determine_mode와 같은 판정 (호출마다 출력하지 않음)
+        is_matched, matched_mode = self.trader._is_mode_case_matched(current_rsi, prev_rsi)
+        return matched_mode if is_matched else prev_mode
+
+    def _stop_loss_label(self, i: int, max_hold_days) -> str:
+        """calculate_stop_loss_date(당일, max_hold_days)와 같은 값 (보유일수별로 전체 봉을 한 번에 계산)"""
+        try:
+            hold = int(max_hold_days)
+        except Exception:
+            hold = -1
+        if hold < 0:
+            return self.trader.calculate_stop_loss_date(self.dates[i], max_hold_days)
+        labels = self._stop_loss_labels.get(hold)
+        if labels is None:
+            stops = self._stop_ordinals_for(hold).tolist()
+            labels = [format_month_day(date.fromordinal(stop)) for stop in stops]
+            self._stop_loss_labels[hold] = labels
+        return labels[i]
+
+    def _stop_ordinals_for(self, hold: int) -> np.ndarray:
+        """봉마다 get_trading_date_after(당일, hold)의 ordinal (보유일수별로 전체 봉을 한 번에 계산)"""
+        stops = self._stop_ordinals.get(hold)
+        if stops is None:
+            index = self.trader._session_index()
+            stops = np.fromiter(
+                (day.toordinal() for day in index.session_after_many(self.days, hold).astype(object)),
+                dtype=np.int64,
+                count=len(self.days),
+            )
+            self._stop_ordinals[hold] = stops
+        return stops
+
+    def _track_position(self, book: PositionBook, position: dict, i: Optional[int] = None) -> None:
+        """포지션 장부에 매도목표가/손절예정일 등록 (i: 당일 봉에서 매수한 포지션이면 그 봉 위치)"""
+        trader = self.trader
+        position_config = trader.get_position_config(position)
+        target = position["buy_price"] * (1 + position_config["sell_threshold"] / 100)
+        hold = int(position_config["max_hold_days"])
+        if i is not None and hold >= 0:
+            stop_ordinal = int(self._stop_ordinals_for(hold)[i])
+        else:
+            stop_ordinal = trader.get_trading_date_after(position["buy_date"], hold).toordinal()
+        book.track(target, stop_ordinal)
+
+    # ---- 주차 모드 ----------------------------------------------------------
+
+    def _enter_week(self, current_date, friday_ordinal: int, state: dict) -> Optional[dict]:
+        """새 주차 시작: 주차 RSI와 모드 갱신 (기존 루프의 주차 모드 결정과 동일한 순서)"""
+        trader = self.trader
+        week_modes = state["week_modes"]
+        current_mode = state["current_mode"]
+
+        # Timestamp 연산 대신 자정 datetime으로 주차 금요일 계산
+        this_week_friday = datetime.fromordinal(friday_ordinal)
+        trader.current_week_friday = this_week_friday
+
+        # 주입된 모드 타임라인에 이번 주차가 있으면 RSI 조회·모드 판정 생략
+        timeline = trader._mode_timeline
+        if timeline is not None:
+            week = timeline.get(this_week_friday.date())
+            if week is not None and week[0] is not None:
+                self._set_week_mode(current_date, this_week_friday, week[1], week[0], state)
+                return None
+
+        prev_week_friday = this_week_friday - timedelta(days=7)
+        two_weeks_ago_friday = this_week_friday - timedelta(days=14)
+
+        current_week_rsi = self._rsi(this_week_friday)
+        prev_week_rsi = self._rsi(prev_week_friday)
+        two_weeks_ago_rsi = self._rsi(two_weeks_ago_friday)
+
+        # RSI 데이터가 없는 경우 실시간 계산 폴백
+        missing_fridays = [
+            friday
+            for friday, rsi in (
+                (this_week_friday, current_week_rsi),
+                (prev_week_friday, prev_week_rsi),
+                (two_weeks_ago_friday, two_weeks_ago_rsi),
+            )
+            if rsi is None
+        ]
+        if missing_fridays:
+            try:
+                fallback_rsi = trader.calculate_weekly_rsi_for_dates(missing_fridays)
+                if current_week_rsi is None:
+                    current_week_rsi = fallback_rsi.get(this_week_friday.strftime('%Y-%m-%d'))
+                if prev_week_rsi is None:
+                    prev_week_rsi = fallback_rsi.get(prev_week_friday.strftime('%Y-%m-%d'))
+                if two_weeks_ago_rsi is None:
+                    two_weeks_ago_rsi = fallback_rsi.get(two_weeks_ago_friday.strftime('%Y-%m-%d'))
+            except Exception as e:
+                trader.logger.warning("⚠️ RSI 실시간 계산 폴백 실패: %s", e)
+
+        if current_week_rsi is None:
+            return {"error": f"RSI 데이터가 없습니다. 주차: {this_week_friday.strftime('%Y-%m-%d')}"}
+        if prev_week_rsi is None or two_weeks_ago_rsi is None:
+            return {"error": f"RSI 데이터가 없습니다. 1주전 RSI: {prev_week_rsi}, 2주전 RSI: {two_weeks_ago_rsi}"}
+
+        # 이전 주차 모드: 저장된 값 → 전전주/전전전주 모드로 재계산 → current_mode 순
+        prev_week_prev_rsi = self._rsi(prev_week_friday - timedelta(days=7))
+        prev_week_two_weeks_rsi = self._rsi(prev_week_friday - timedelta(days=14))
+        prev_week_friday_str = prev_week_friday.strftime('%Y-%m-%d')
+        if prev_week_friday_str in week_modes:
+            actual_prev_week_mode = week_modes[prev_week_friday_str]
+            current_mode = actual_prev_week_mode
+        elif prev_week_prev_rsi is not None and prev_week_two_weeks_rsi is not None:
+            prev_prev_week_friday_str = (prev_week_friday - timedelta(days=7)).strftime('%Y-%m-%d')
+            prev_prev_week_mode = current_mode
+            if prev_prev_week_friday_str in week_modes:
+                prev_prev_week_mode = week_modes[prev_prev_week_friday_str]
+            else:
+                prev_prev_prev_week_friday = prev_week_friday - timedelta(days=14)
+                prev_prev_prev_week_mode = week_modes.get(prev_prev_prev_week_friday.strftime('%Y-%m-%d'), current_mode)
+                prev_prev_prev_rsi = self._rsi(prev_prev_prev_week_friday)
+                prev_prev_prev_two_weeks_rsi = self._rsi(prev_prev_prev_week_friday - timedelta(days=7))
+                if prev_prev_prev_rsi is not None and prev_prev_prev_two_weeks_rsi is not None:
+                    prev_prev_week_mode = self._determine_mode(
+                        prev_prev_prev_rsi, prev_prev_prev_two_weeks_rsi, prev_prev_prev_week_mode
+                    )
+                    week_modes[prev_prev_week_friday_str] = prev_prev_week_mode
+            actual_prev_week_mode = self._determine_mode(prev_week_prev_rsi, prev_week_two_weeks_rsi, prev_prev_week_mode)
+            week_modes[prev_week_friday_str] = actual_prev_week_mode
+            current_mode = actual_prev_week_mode
+        else:
+            actual_prev_week_mode = current_mode
+
+        new_mode = self._determine_mode(prev_week_rsi, two_weeks_ago_rsi, actual_prev_week_mode)
+        friday_day = this_week_friday.date()
+        if FORCED_SF_WEEK[0] <= friday_day <= FORCED_SF_WEEK[1] and actual_prev_week_mode == "SF":
+            new_mode = "SF"
+
+        self._set_week_mode(current_date, this_week_friday, new_mode, current_week_rsi, state)
+        return None
+
+    def _set_week_mode(self, current_date, this_week_friday, new_mode: str, current_week_rsi: float, state: dict) -> None:
+        trader = self.trader
+        state["week_modes"][this_week_friday.strftime('%Y-%m-%d')] = new_mode
+        trader.current_mode = new_mode
+        state["current_mode"] = new_mode
+        state["current_week_rsi"] = current_week_rsi
+        state["current_week"] += 1
+        if trader.record_backtest_events:
+            trader._record_backtest_event(
+                current_date, "week", week=state["current_week"], mode=new_mode, rsi=current_week_rsi
+            )
+
+    # ---- 일별 루프 ----------------------------------------------------------
+
+    def run(
+        self,
+        prev_close: Optional[float],
+        start_mode: str,
+        start_week_rsi: Optional[float],
+        week_modes: Dict[str, str],
+        from_snapshot: bool,
+        resume: Optional[Dict] = None,
+    ):
+        """
+        일별 루프 실행
+        Args:
+            resume: 체크포인트에서 이어서 실행할 때의 루프 상태
+                    (current_week, current_week_friday, total_realized_pnl, bar_offset, open_buy_rows)
+        Returns:
+            List[Dict]: daily_records (RSI 데이터가 없으면 {"error": ...})
+                        실행 후 루프 상태는 self.loop_state에 남는다 (다음 체크포인트용)
+        """
+        trader = self.trader
+        compounding = bool(getattr(trader, "profit_loss_compounding_enabled", False))
+        record_events = trader.record_backtest_events
+        resume = resume or {}
+        state = {
+            "current_mode": start_mode,
+            "current_week_rsi": start_week_rsi,
+            "current_week": resume.get("current_week", 0),
+            "week_modes": week_modes,
+        }
+
+        book = PositionBook(trader.positions)
+        for position in trader.positions:
+            self._track_position(book, position)
+
+        # 시드증액은 한 번만 파싱 (원래 순서 유지, 이미 반영된 날짜는 제외)
+        pending_seeds = [
+            (datetime.strptime(seed["date"], "%Y-%m-%d").date(), seed)
+            for seed in trader.seed_increases
+        ]
+        pending_seeds = [item for item in pending_seeds if item[1]["date"] not in trader.processed_seed_dates]
+
+        daily_records: List[Dict] = []
+        # 회차별 미매도 매수 행 (기록 순서) — 매도 시 daily_records 전체를 다시 훑지 않기 위함
+        open_buy_rows: Dict[int, deque] = {}
+        for record in resume.get("open_buy_rows", ()):
+            open_buy_rows.setdefault(record["buy_round"], deque()).append(record)
+        total_realized_pnl = resume.get("total_realized_pnl", 0)
+        current_week_friday = resume.get("current_week_friday")
+        bar_offset = resume.get("bar_offset", 0)
+
+        # 봉 단위 값은 파이썬 리스트로 (NumPy 스칼라 연산·변환 비용 제거)
+        dates, days, midnights = self.dates, self.days, self.midnights
+        closes = self.closes.tolist()
+        ordinals = self.ordinals.tolist()
+        friday_ordinals = self.friday_ordinals.tolist()
+        is_trading = self.is_trading.tolist()
+
+        for i in range(len(dates)):
+            current_date = dates[i]
+            current_price = closes[i]
+            ordinal = ordinals[i]
+            trading_day = is_trading[i]
+            seed_capital_injection_today = 0.0
+
+            if trading_day:
+                trader.trading_days_count += 1
+
+                if pending_seeds:
+                    current_day = days[i]
+                    unprocessed_seeds = [
+                        seed for seed_day, seed in pending_seeds
+                        if seed_day <= current_day and seed["date"] not in trader.processed_seed_dates
+                    ]
+                    if unprocessed_seeds:
+                        total_shares = book.total_shares()
+                        current_total_assets = trader.available_cash + (total_shares * current_price)
+                        total_seed_increase = sum([si["amount"] for si in unprocessed_seeds])
+                        trader.available_cash += total_seed_increase
+                        seed_capital_injection_today = total_seed_increase
+                        trader.current_investment_capital = current_total_assets + total_seed_increase
+                        trader._add_compounding_seed(total_seed_increase)
+                        for seed in unprocessed_seeds:
+                            trader.processed_seed_dates.add(seed["date"])
+                        pending_seeds = [
+                            item for item in pending_seeds if item[1]["date"] not in trader.processed_seed_dates
+                        ]
+
+            friday_ordinal = friday_ordinals[i]
+            if current_week_friday != friday_ordinal:
+                current_week_friday = friday_ordinal
+                error = self._enter_week(current_date, friday_ordinal, state)
+                if error:
+                    return error
+
+            if prev_close is not None:
+                current_mode = state["current_mode"]
+                config = trader.sf_config if current_mode == "SF" else trader.ag_config
+                buy_price = prev_close * (1 + config["buy_threshold"] / 100)
+                sell_price = prev_close * (1 + config["sell_threshold"] / 100)
+
+                # 매수 회차는 매도 처리 전 보유 포지션 수 기준 (LOC 동시 체결)
+                buy_round_for_today = len(trader.positions) + 1
+                if compounding:
+                    trader._process_compounding_for_date(midnights[i])
+
+                daily_realized = 0
+                sold_positions = []
+                exits = book.exits(current_price, ordinal)
+                if len(exits):
+                    sell_label = format_month_day(days[i])
+                    for index in exits:
+                        position = trader.positions[index]
+                        proceeds = position["shares"] * current_price
+                        realized_pnl = proceeds - position["amount"]
+                        trader.available_cash += proceeds
+                        if compounding:
+                            sell_dt = midnights[i]
+                            trader.compound_settlements.append({
+                                "trade_date": sell_dt,
+                                "settlement_date": sell_dt + timedelta(days=trader.compounding_settlement_delay_days),
+                                "pnl": realized_pnl,
+                            })
+                        daily_realized += realized_pnl
+                        total_realized_pnl += realized_pnl
+                        sold_positions.append({
+                            "round": position["round"],
+                            "sell_date": sell_label,
+                            "sell_price": current_price,
+                            "realized_pnl": realized_pnl,
+                        })
+                        if record_events:
+                            trader._record_backtest_event(
+                                current_date, "sell",
+                                round=position["round"], shares=position["shares"],
+                                price=current_price, realized_pnl=realized_pnl,
+                            )
+                    book.remove(exits)
+                    trader.current_round = buy_round_for_today
+
+                if from_snapshot:
+                    total_assets_for_buy_base = trader.available_cash + (book.total_shares() * current_price)
+                    if total_assets_for_buy_base > 0:
+                        trader.current_investment_capital = total_assets_for_buy_base
+
+                current_round_before_buy = trader.current_round
+                buy_executed = False
+                buy_price_executed = 0
+                buy_quantity = 0
+                buy_amount = 0
+                if (
+                    trader.current_round <= config["split_count"]
+                    and trader.available_cash > 0
+                    and buy_price > current_price
+                ):
+                    position = self._buy(config, buy_price, current_price, current_date, current_mode)
+                    if position is not None:
+                        self._track_position(book, position, i)
+                        buy_executed = True
+                        buy_price_executed = position["buy_price"]
+                        buy_quantity = position["shares"]
+                        buy_amount = position["amount"]
+                        sell_price = current_price * (1 + config["sell_threshold"] / 100)
+                        if record_events:
+                            trader._record_backtest_event(
+                                current_date, "buy",
+                                round=current_round_before_buy, shares=buy_quantity,
+                                price=buy_price_executed, amount=buy_amount, mode=current_mode,
+                            )
+
+                trader.current_round = len(trader.positions) + 1 if trader.positions else 1
+
+                total_shares = book.total_shares()
+                # 10거래일마다 투자원금 업데이트 (매매 처리 완료 후, 다음 거래일부터 적용)
+                if trading_day and trader.trading_days_count % 10 == 0 and trader.trading_days_count > 0:
+                    trader.current_investment_capital = trader.available_cash + (total_shares * current_price)
+
+                position_value = total_shares * current_price
+                split_ratios = config["split_ratios"]
+                daily_records.append({
+                    "date": days[i].isoformat(),
+                    "week": state["current_week"],
+                    "rsi": state["current_week_rsi"] if state["current_week_rsi"] is not None else 50.0,
+                    "mode": current_mode,
+                    "strategy_name": config.get("strategy_name", "기본"),
+                    "current_round": min(current_round_before_buy, 7 if current_mode == "SF" else 8),
+                    "seed_amount": (
+                        (
+                            trader.compound_reference_seed
+                            if compounding
+                            else trader.current_investment_capital
+                        ) * split_ratios[current_round_before_buy - 1]
+                        if buy_executed and 1 <= current_round_before_buy <= len(config.get("split_ratios", []))
+                        else 0
+                    ),
+                    "buy_order_price": buy_price,
+                    "close_price": current_price,
+                    "sell_target_price": sell_price,
+                    "stop_loss_date": self._stop_loss_label(i, config["max_hold_days"]),
+                    "d": 0,
+                    "trading_days": bar_offset + i + 1,
+                    "buy_executed_price": buy_price_executed,
+                    "buy_quantity": buy_quantity,
+                    "buy_amount": buy_amount,
+                    "buy_round": current_round_before_buy if buy_executed else 0,
+                    "commission": 0.0,
+                    "sell_date": "",
+                    "sell_executed_price": 0,
+                    "holding_days": 0,
+                    "holdings": total_shares,
+                    "realized_pnl": 0,
+                    "cumulative_realized": total_realized_pnl,
+                    "daily_realized": daily_realized,
+                    "update": False,
+                    "investment_update": trader.current_investment_capital,
+                    "withdrawal": False,
+                    "withdrawal_amount": 0,
+                    "seed_increase": seed_capital_injection_today,
+                    "position_value": position_value,
+                    "cash_balance": trader.available_cash,
+                    "total_assets": trader.available_cash + position_value,
+                })
+                if buy_executed and buy_price_executed > 0 and buy_quantity > 0:
+                    open_buy_rows.setdefault(current_round_before_buy, deque()).append(daily_records[-1])
+
+                # 오늘 매도된 회차를 가장 먼저 기록된 미매도 매수 행에 반영
+                # (보유기간 holding_days는 기존 경로와 같이 0으로 둔다)
+                for sold_pos in sold_positions:
+                    rows = open_buy_rows.get(sold_pos["round"])
+                    if rows:
+                        record = rows.popleft()
+                        record["sell_date"] = sold_pos["sell_date"]
+                        record["sell_executed_price"] = sold_pos["sell_price"]
+                        record["realized_pnl"] = sold_pos["realized_pnl"]
+
+            prev_close = current_price
+
+        self.loop_state = {
+            "current_mode": state["current_mode"],
+            "current_week_rsi": state["current_week_rsi"],
+            "current_week": state["current_week"],
+            "current_week_friday": current_week_friday,
+            "total_realized_pnl": total_realized_pnl,
+            "current_investment_capital": trader.current_investment_capital,
+            "bars": bar_offset + len(dates),
+        }
+        return daily_records
+
+    def _buy(self, config: dict, target_price: float, actual_price: float, current_date, mode: str) -> Optional[dict]:
+        """execute_buy와 같은 수량/금액 규칙으로 LOC 매수 체결 (체결 실패 시 None)"""
+        trader = self.trader
+        round_num = trader.current_round
+        split_ratios = config["split_ratios"]
+        if round_num <= len(split_ratios):
+            base_amount = (
+                trader.compound_reference_seed
+                if getattr(trader, "profit_loss_compounding_enabled", False)
+                else trader.current_investment_capital
+            )
+            target_amount = base_amount * split_ratios[round_num - 1]
+        else:
+            target_amount = 0.0
+
+        pending_quantity = trader._pending_buy_quantity(round_num, current_date)
+        target_shares = pending_quantity if pending_quantity is not None else int(target_amount / target_price)
+        if target_shares <= 0:
+            return None
+
+        actual_amount = target_shares * actual_price
+        if actual_amount > trader.available_cash:
+            actual_shares = int(trader.available_cash / actual_price)
+            if actual_shares <= 0:
+                return None
+            actual_amount = actual_shares * actual_price
+        else:
+            actual_shares = target_shares
+
+        position = {
+            "round": round_num,
+            "buy_date": current_date,
+            "buy_price": actual_price,
+            "shares": actual_shares,
+            "target_price": target_price,
+            "amount": actual_amount,
+            "mode": mode,
+            "sell_threshold": float(config.get("sell_threshold", 0)),
+            "max_hold_days": int(config.get("max_hold_days", 0)),
+        }
+        if config.get("strategy_name"):
+            position["strategy_name"] = config["strategy_name"]
+        trader.positions.append(position)
+        trader.available_cash -= actual_amount
+        trader.current_round += 1
+        return position
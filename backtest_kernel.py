@@ -0,0 +1,465 @@
+"""
+SF/AG 분할매수 상태기계 커널 (파라미터 탐색·대량 시뮬레이션용)
+
+ArrayBacktestEngine과 같은 매매 규칙(LOC 매수, 목표가/손절예정일 매도, 10거래일 투자원금 갱신,
+시드증액, 손익 복리)을 float/int 배열만으로 실행한다. numba가 설치되어 있으면 JIT 컴파일해
+사용하고, 없으면 같은 코드를 순수 Python으로 실행한다.
+
+입력은 봉 단위 배열(종가, 모드 코드, 누적 거래일 수, 거래일 여부)과 모드별 파라미터이며,
+출력은 봉별 총자산(equity) 배열과 매도 체결 배열(trades)이다. run_kernel_batch는 여러 가격 경로를
+(경로 수, 봉 수) 배열로 받아 한 번에 실행한다.
+스냅샷 재개, 저장된 매수 추천수량, 날짜별 전략 변형은 다루지 않는다 (run_backtest 사용).
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from us_market_calendar import get_trading_session_index
+
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    numba = None
+    NUMBA_AVAILABLE = False
+
+MODE_SF = 0
+MODE_AG = 1
+MODE_CODES = {"SF": MODE_SF, "AG": MODE_AG}
+
+# trades 배열 열 순서
+TRADE_COLUMNS = ("buy_index", "sell_index", "round", "shares", "buy_price", "sell_price", "amount", "realized_pnl")
+
+# 10거래일마다 투자원금을 총자산으로 갱신
+INVESTMENT_RENEWAL_DAYS = 10
+
+
+class ModeParams(NamedTuple):
+    """모드 코드(MODE_SF/MODE_AG) 순서로 쌓은 모드별 매매 파라미터"""
+
+    buy_threshold: np.ndarray
+    sell_threshold: np.ndarray
+    max_hold_days: np.ndarray
+    split_count: np.ndarray
+    split_ratios: np.ndarray  # (2, 최대 분할 수), 비는 칸은 0
+    ratio_count: np.ndarray
+
+
+class CompoundingParams(NamedTuple):
+    """set_profit_loss_compounding()과 같은 손익 복리 설정"""
+
+    profit_rate: float = 0.70
+    loss_rate: float = 0.20
+    settlement_delay_days: int = 7
+    renewal_days: int = 10
+
+
+def mode_params(sf_config: Dict, ag_config: Dict) -> ModeParams:
+    """sf_config/ag_config 딕셔너리를 커널 입력 배열로 변환"""
+    configs = (sf_config, ag_config)
+    width = max(len(config["split_ratios"]) for config in configs)
+    ratios = np.zeros((2, max(width, 1)), dtype=np.float64)
+    for code, config in enumerate(configs):
+        ratios[code, : len(config["split_ratios"])] = config["split_ratios"]
+    return ModeParams(
+        buy_threshold=np.array([float(config["buy_threshold"]) for config in configs]),
+        sell_threshold=np.array([float(config["sell_threshold"]) for config in configs]),
+        max_hold_days=np.array([int(config["max_hold_days"]) for config in configs], dtype=np.int64),
+        split_count=np.array([int(config["split_count"]) for config in configs], dtype=np.int64),
+        split_ratios=ratios,
+        ratio_count=np.array([len(config["split_ratios"]) for config in configs], dtype=np.int64),
+    )
+
+
+def mode_codes(modes: Sequence[str]) -> np.ndarray:
+    """"SF"/"AG" 문자열 목록을 모드 코드 배열로 변환"""
+    return np.fromiter((MODE_CODES[mode] for mode in modes), dtype=np.int8, count=len(modes))
+
+
+def session_counts(days: Sequence[date], extra_holidays: Iterable = ()) -> np.ndarray:
+    """봉 날짜별 누적 거래일 수 (첫 봉 전날 기준, 손절예정일 판정용)"""
+    if not len(days):
+        return np.zeros(0, dtype=np.int64)
+    base = days[0] - timedelta(days=1)
+    return get_trading_session_index(extra_holidays).sessions_between_many([base], list(days))
+
+
+def _simulate(
+    closes,
+    modes,
+    session_counts,
+    trading,
+    ordinals,
+    injections,
+    buy_threshold,
+    sell_threshold,
+    max_hold_days,
+    split_count,
+    split_ratios,
+    ratio_count,
+    initial_cash,
+    prev_close,
+    compounding,
+    profit_rate,
+    loss_rate,
+    settlement_delay_days,
+    renewal_days,
+):
+    n = closes.shape[0]
+    equity = np.full(n, np.nan)
+    capacity = int(split_count.max()) + 1
+
+    # 보유 포지션 (보유 순서 유지)
+    pos_round = np.zeros(capacity, dtype=np.int64)
+    pos_buy_index = np.zeros(capacity, dtype=np.int64)
+    pos_shares = np.zeros(capacity, dtype=np.int64)
+    pos_buy_price = np.zeros(capacity)
+    pos_amount = np.zeros(capacity)
+    pos_target = np.zeros(capacity)
+    pos_stop = np.zeros(capacity, dtype=np.int64)
+    npos = 0
+
+    trades = np.zeros((n, 8))
+    ntrades = 0
+
+    # 손익 복리 정산 대기열 (정산일 ordinal, 손익)
+    settle_ordinal = np.zeros(n, dtype=np.int64)
+    settle_pnl = np.zeros(n)
+    nsettle = 0
+
+    cash = initial_cash
+    capital = initial_cash
+    compound_seed = initial_cash
+    compound_reference = initial_cash
+    current_round = 1
+    trading_days = 0
+
+    for i in range(n):
+        close = closes[i]
+        mode = modes[i]
+        total_shares = 0
+        for p in range(npos):
+            total_shares += pos_shares[p]
+
+        if trading[i]:
+            trading_days += 1
+            injection = injections[i]
+            if injection != 0.0:
+                assets = cash + total_shares * close
+                cash += injection
+                capital = assets + injection
+                if compounding:
+                    compound_seed += injection
+                    compound_reference += injection
+
+        if prev_close == prev_close:  # NaN이면 전일 종가 없음 → 매매 없음
+            buy_price = prev_close * (1 + buy_threshold[mode] / 100)
+            buy_round_for_today = npos + 1
+
+            if compounding:
+                kept = 0
+                for s in range(nsettle):
+                    if settle_ordinal[s] <= ordinals[i]:
+                        pnl = settle_pnl[s]
+                        compound_seed += pnl * (profit_rate if pnl >= 0 else loss_rate)
+                    else:
+                        settle_ordinal[kept] = settle_ordinal[s]
+                        settle_pnl[kept] = settle_pnl[s]
+                        kept += 1
+                nsettle = kept
+                if trading_days == 1 or trading_days % renewal_days == 0:
+                    compound_reference = compound_seed
+
+            kept = 0
+            sold = False
+            for p in range(npos):
+                if close >= pos_target[p] or session_counts[i] >= pos_stop[p]:
+                    proceeds = pos_shares[p] * close
+                    pnl = proceeds - pos_amount[p]
+                    cash += proceeds
+                    trades[ntrades, 0] = pos_buy_index[p]
+                    trades[ntrades, 1] = i
+                    trades[ntrades, 2] = pos_round[p]
+                    trades[ntrades, 3] = pos_shares[p]
+                    trades[ntrades, 4] = pos_buy_price[p]
+                    trades[ntrades, 5] = close
+                    trades[ntrades, 6] = pos_amount[p]
+                    trades[ntrades, 7] = pnl
+                    ntrades += 1
+                    if compounding:
+                        settle_ordinal[nsettle] = ordinals[i] + settlement_delay_days
+                        settle_pnl[nsettle] = pnl
+                        nsettle += 1
+                    sold = True
+                else:
+                    pos_round[kept] = pos_round[p]
+                    pos_buy_index[kept] = pos_buy_index[p]
+                    pos_shares[kept] = pos_shares[p]
+                    pos_buy_price[kept] = pos_buy_price[p]
+                    pos_amount[kept] = pos_amount[p]
+                    pos_target[kept] = pos_target[p]
+                    pos_stop[kept] = pos_stop[p]
+                    kept += 1
+            npos = kept
+            if sold:
+                current_round = buy_round_for_today
+
+            if current_round <= split_count[mode] and cash > 0 and buy_price > close:
+                target_amount = 0.0
+                if current_round <= ratio_count[mode]:
+                    base = compound_reference if compounding else capital
+                    target_amount = base * split_ratios[mode, current_round - 1]
+                shares = int(target_amount / buy_price)
+                if shares > 0:
+                    amount = shares * close
+                    if amount > cash:
+                        shares = int(cash / close)
+                        amount = shares * close
+                    if shares > 0:
+                        pos_round[npos] = current_round
+                        pos_buy_index[npos] = i
+                        pos_shares[npos] = shares
+                        pos_buy_price[npos] = close
+                        pos_amount[npos] = amount
+                        pos_target[npos] = close * (1 + sell_threshold[mode] / 100)
+                        pos_stop[npos] = session_counts[i] + max_hold_days[mode]
+                        npos += 1
+                        cash -= amount
+
+            current_round = npos + 1
+
+            total_shares = 0
+            for p in range(npos):
+                total_shares += pos_shares[p]
+            if trading[i] and trading_days % INVESTMENT_RENEWAL_DAYS == 0:
+                capital = cash + total_shares * close
+
+        equity[i] = cash + total_shares * close
+        prev_close = close
+
+    return equity, trades[:ntrades]
+
+
+_simulate_compiled = numba.njit(cache=True)(_simulate) if NUMBA_AVAILABLE else None
+
+
+def run_kernel(
+    closes: np.ndarray,
+    modes: np.ndarray,
+    session_counts: np.ndarray,
+    params: ModeParams,
+    initial_cash: float,
+    prev_close: Optional[float] = None,
+    trading: Optional[np.ndarray] = None,
+    ordinals: Optional[np.ndarray] = None,
+    injections: Optional[np.ndarray] = None,
+    compounding: Optional[CompoundingParams] = None,
+    use_numba: Optional[bool] = None,
+):
+    """
+    SF/AG 분할매수 규칙을 배열 위에서 실행
+    Args:
+        closes: 봉별 종가
+        modes: 봉별 모드 코드 (해당 봉이 속한 주차의 모드, MODE_SF/MODE_AG)
+        session_counts: 봉 날짜까지의 누적 거래일 수 (손절예정일 판정용, 같은 달력 기준이면 기준점은 무관)
+        params: mode_params()로 만든 모드별 파라미터
+        initial_cash: 초기 자본
+        prev_close: 첫 봉의 전일 종가 (None이면 첫 봉은 매매 없이 종가만 기록)
+        trading: 거래일 여부 (None이면 모든 봉을 거래일로 간주)
+        ordinals: 봉 날짜의 date.toordinal() (손익 복리 정산일 계산용)
+        injections: 봉별 시드증액 금액 (거래일 봉에만 반영)
+        compounding: 손익 복리 설정 (None이면 사용 안 함)
+        use_numba: True/False로 강제 (None이면 numba가 있을 때만 사용)
+    Returns:
+        tuple: (equity 배열, trades 배열[TRADE_COLUMNS 순서])
+    """
+    closes = np.ascontiguousarray(closes, dtype=np.float64)
+    n = len(closes)
+    if trading is None:
+        trading = np.ones(n, dtype=np.bool_)
+    if ordinals is None:
+        if compounding is not None:
+            raise ValueError("손익 복리 계산에는 ordinals(봉 날짜)가 필요합니다.")
+        ordinals = np.arange(n, dtype=np.int64)
+    if injections is None:
+        injections = np.zeros(n, dtype=np.float64)
+    if use_numba is None:
+        use_numba = NUMBA_AVAILABLE
+    elif use_numba and not NUMBA_AVAILABLE:
+        raise RuntimeError("numba가 설치되어 있지 않습니다. (pip install numba)")
+    compound = compounding or CompoundingParams()
+
+    kernel = _simulate_compiled if use_numba else _simulate
+    return kernel(
+        closes,
+        np.ascontiguousarray(modes, dtype=np.int8),
+        np.ascontiguousarray(session_counts, dtype=np.int64),
+        np.ascontiguousarray(trading, dtype=np.bool_),
+        np.ascontiguousarray(ordinals, dtype=np.int64),
+        np.ascontiguousarray(injections, dtype=np.float64),
+        params.buy_threshold,
+        params.sell_threshold,
+        params.max_hold_days,
+        params.split_count,
+        params.split_ratios,
+        params.ratio_count,
+        float(initial_cash),
+        np.nan if prev_close is None else float(prev_close),
+        compounding is not None,
+        float(compound.profit_rate),
+        float(compound.loss_rate),
+        int(compound.settlement_delay_days),
+        max(1, int(compound.renewal_days)),
+    )
+
+
+def _simulate_batch(
+    closes,
+    modes,
+    session_counts,
+    trading,
+    ordinals,
+    injections,
+    buy_threshold,
+    sell_threshold,
+    max_hold_days,
+    split_count,
+    split_ratios,
+    ratio_count,
+    initial_cash,
+    prev_close,
+    compounding,
+    profit_rate,
+    loss_rate,
+    settlement_delay_days,
+    renewal_days,
+):
+    npaths, n = closes.shape
+    equity = np.empty((npaths, n))
+    trade_counts = np.zeros(npaths, dtype=np.int64)
+    for k in range(npaths):
+        path_equity, trades = _simulate(
+            closes[k], modes[k], session_counts[k], trading[k], ordinals[k], injections[k],
+            buy_threshold, sell_threshold, max_hold_days, split_count, split_ratios, ratio_count,
+            initial_cash, prev_close[k], compounding, profit_rate, loss_rate, settlement_delay_days, renewal_days,
+        )
+        equity[k] = path_equity
+        trade_counts[k] = trades.shape[0]
+    return equity, trade_counts
+
+
+if NUMBA_AVAILABLE:
+
+    @numba.njit(parallel=True, cache=True)
+    def _simulate_batch_compiled(
+        closes,
+        modes,
+        session_counts,
+        trading,
+        ordinals,
+        injections,
+        buy_threshold,
+        sell_threshold,
+        max_hold_days,
+        split_count,
+        split_ratios,
+        ratio_count,
+        initial_cash,
+        prev_close,
+        compounding,
+        profit_rate,
+        loss_rate,
+        settlement_delay_days,
+        renewal_days,
+    ):  # pragma: no cover - numba 설치 환경에서만 실행
+        npaths, n = closes.shape
+        equity = np.empty((npaths, n))
+        trade_counts = np.zeros(npaths, dtype=np.int64)
+        for k in numba.prange(npaths):
+            path_equity, trades = _simulate_compiled(
+                closes[k], modes[k], session_counts[k], trading[k], ordinals[k], injections[k],
+                buy_threshold, sell_threshold, max_hold_days, split_count, split_ratios, ratio_count,
+                initial_cash, prev_close[k], compounding, profit_rate, loss_rate, settlement_delay_days, renewal_days,
+            )
+            equity[k] = path_equity
+            trade_counts[k] = trades.shape[0]
+        return equity, trade_counts
+
+else:
+    _simulate_batch_compiled = None
+
+
+def _per_path(values, shape, dtype) -> np.ndarray:
+    """경로 공통(1차원) 또는 경로별(2차원) 입력을 (경로 수, 봉 수) 배열로 맞춤"""
+    return np.ascontiguousarray(np.broadcast_to(np.asarray(values, dtype=dtype), shape))
+
+
+def run_kernel_batch(
+    closes: np.ndarray,
+    modes: np.ndarray,
+    session_counts: np.ndarray,
+    params: ModeParams,
+    initial_cash: float,
+    prev_close=None,
+    trading: Optional[np.ndarray] = None,
+    ordinals: Optional[np.ndarray] = None,
+    injections: Optional[np.ndarray] = None,
+    compounding: Optional[CompoundingParams] = None,
+    use_numba: Optional[bool] = None,
+):
+    """
+    여러 가격 경로를 한 번에 실행 (몬테카를로·부트스트랩용)
+    각 행은 run_kernel과 같은 규칙으로 독립 실행되며, numba가 있으면 경로를 병렬(prange)로 처리한다.
+    Args:
+        closes: (경로 수, 봉 수) 종가
+        modes: (경로 수, 봉 수) 모드 코드 또는 모든 경로 공통 (봉 수,)
+        session_counts/trading/ordinals/injections: 경로 공통 (봉 수,) 또는 경로별 (경로 수, 봉 수)
+        prev_close: 경로별 첫 봉 전일 종가 (스칼라면 공통, None이면 첫 봉은 매매 없음)
+        나머지는 run_kernel과 같음
+    Returns:
+        tuple: (equity (경로 수, 봉 수), 경로별 매도 체결 수)
+    """
+    closes = np.ascontiguousarray(closes, dtype=np.float64)
+    if closes.ndim != 2:
+        raise ValueError("closes는 (경로 수, 봉 수) 2차원 배열이어야 합니다.")
+    shape = closes.shape
+    if trading is None:
+        trading = np.ones(shape[1], dtype=np.bool_)
+    if ordinals is None:
+        if compounding is not None:
+            raise ValueError("손익 복리 계산에는 ordinals(봉 날짜)가 필요합니다.")
+        ordinals = np.arange(shape[1], dtype=np.int64)
+    if injections is None:
+        injections = np.zeros(shape[1], dtype=np.float64)
+    prev_close = np.nan if prev_close is None else prev_close
+    if use_numba is None:
+        use_numba = NUMBA_AVAILABLE
+    elif use_numba and not NUMBA_AVAILABLE:
+        raise RuntimeError("numba가 설치되어 있지 않습니다. (pip install numba)")
+    compound = compounding or CompoundingParams()
+
+    kernel = _simulate_batch_compiled if use_numba else _simulate_batch
+    return kernel(
+        closes,
+        _per_path(modes, shape, np.int8),
+        _per_path(session_counts, shape, np.int64),
+        _per_path(trading, shape, np.bool_),
+        _per_path(ordinals, shape, np.int64),
+        _per_path(injections, shape, np.float64),
+        params.buy_threshold,
+        params.sell_threshold,
+        params.max_hold_days,
+        params.split_count,
+        params.split_ratios,
+        params.ratio_count,
+        float(initial_cash),
+        _per_path(prev_close, shape[:1], np.float64),
+        compounding is not None,
+        float(compound.profit_rate),
+        float(compound.loss_rate),
+        int(compound.settlement_delay_days),
+        max(1, int(compound.renewal_days)),
+    )
@@ -18,6 +18,8 @@ from typing import Any, Iterable
 
 import requests
 
+from market_data import get_market_data_client, run_concurrently
+
 
 START_DATE = dt.date(2015, 1, 1)
 REQUEST_END_DATE = dt.date(2026, 8, 5)  # exclusive; covers 2026-08-04 FX/KRX data
@@ -29,8 +31,6 @@ CORE_WEIGHTS = {"VOO": 0.50, "NASDAQ100": 0.30, "SCHD": 0.20}
 QQQM_INCEPTION = dt.date(2020, 10, 13)
 TIGER_TICKER = "133690.KS"
 
-YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-USER_AGENT = "Mozilla/5.0 (compatible; salary-etf-backtest/1.0)"
 
 
 @dataclass
@@ -61,13 +61,8 @@ def download_series(symbol: str) -> MarketSeries:
         "events": "div,splits",
         "includePrePost": "false",
     }
-    url = YAHOO_CHART_URL.format(symbol=symbol)
-    response = requests.get(url, params=params, headers={"User-Agent": USER_AGENT}, timeout=30)
-    response.raise_for_status()
-    payload = response.json()["chart"]
-    if payload.get("error"):
-        raise RuntimeError(f"Yahoo error for {symbol}: {payload['error']}")
-    result = payload["result"][0]
+    client = get_market_data_client()
+    result = client.get_chart_result(symbol, params, timeout=30)
     timestamps = result.get("timestamp") or []
     close_values = result["indicators"]["quote"][0]["close"]
     closes = {
@@ -104,7 +99,7 @@ def download_series(symbol: str) -> MarketSeries:
         splits=splits,
         first_date=min(closes),
         last_date=max(closes),
-        source_url=response.url,
+        source_url=requests.Request("GET", client.chart_url(symbol), params=params).prepare().url,
     )
 
 
@@ -535,7 +530,8 @@ def main() -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     symbols = ["VOO", "QQQ", "QQQM", "SCHD", "QLD", "KRW=X", TIGER_TICKER]
-    market = {symbol: download_series(symbol) for symbol in symbols}
+    # Downloads run concurrently; the shared client caps in-flight requests per host.
+    market = run_concurrently(download_series, symbols)
     salary_only = simulate(market, include_bonus=False)
     with_bonus = simulate(market, include_bonus=True)
     checks = {
@@ -2,16 +2,20 @@
 미국 상장 2x/3x 레버리지 ETF 전체에 대해 백테스팅을 실행하고
 결과를 엑셀 보고서로 출력하는 스크립트
 """
-import time
+import os
 import sys
 
 if sys.stdout.encoding != "utf-8":
     sys.stdout.reconfigure(encoding="utf-8")
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, numbers
 from backtester_any_ticker import AnyTickerQuantTrader
+from rsi_reference import RSIReferenceData
+from soxl_quant_system import SOXLQuantTrader
 from backtester_soxl_excel import load_parameters_from_excel, calculate_mdd
+from performance_metrics import annualized_return
 
 
 ETF_LIST = [
@@ -171,7 +175,139 @@ def write_data_row(ws, row_idx, values):
             cell.alignment = Alignment(horizontal="center")
 
 
-def run_all_etf_backtest():
+# 프로세스 풀 워커가 공유하는 데이터 (_init_worker가 프로세스마다 한 번 설정)
+_WORKER_SHARED = {}
+
+
+def _init_worker(qqq_data, rsi_reference, mode_timeline=None):
+    """
+    프로세스 풀 워커 초기화: QQQ 일봉·RSI 참조 데이터·주차별 모드 타임라인을 프로세스당 한 번만 준비
+    RSI 참조 파일 최신 여부는 부모 프로세스가 이미 확인했으므로 워커에서는 다시 확인하지 않는다.
+    """
+    SOXLQuantTrader.mark_rsi_refresh_checked()
+    _WORKER_SHARED["QQQ"] = qqq_data
+    _WORKER_SHARED["rsi_reference"] = RSIReferenceData(rsi_reference) if rsi_reference else None
+    _WORKER_SHARED["mode_timeline"] = mode_timeline
+
+
+def backtest_etf(etf, bars, start_date, end_date, initial_capital, sf_config, ag_config, shared=None):
+    """
+    ETF 한 종목 백테스트 (프로세스 풀 작업 단위)
+    Args:
+        etf: ETF_LIST 항목
+        bars: 미리 조회한 해당 티커 일봉 (None이면 트레이더가 직접 조회)
+        shared: {"QQQ": 일봉, "rsi_reference": RSI 참조 데이터, "mode_timeline": 모드 타임라인}
+                (None이면 워커 공유 데이터)
+    Returns:
+        tuple: (성공 여부, 보고서 행 또는 실패 행)
+    """
+    shared = _WORKER_SHARED if shared is None else shared
+    ticker = etf["ticker"]
+    try:
+        trader = AnyTickerQuantTrader(
+            ticker=ticker,
+            initial_capital=initial_capital,
+            sf_config=sf_config,
+            ag_config=ag_config,
+        )
+        trader.preload_stock_data({ticker: bars, "QQQ": shared.get("QQQ")})
+        if shared.get("rsi_reference") is not None:
+            trader.use_rsi_reference(shared["rsi_reference"])
+        trader.use_mode_timeline(shared.get("mode_timeline"))
+
+        # 백테스팅 내부 로그 억제 (경고·오류만 출력)
+        with trader.quiet_logging():
+            result = trader.run_backtest(start_date, end_date)
+    except Exception as e:
+        return False, {**etf, "reason": str(e)[:120]}
+
+    if "error" in result:
+        return False, {**etf, "reason": result["error"]}
+
+    daily_records = result.get("daily_records", [])
+    mdd = calculate_mdd(daily_records)
+    trading_days = result.get("trading_days", 0)
+    final_value = result.get("final_value", 0)
+    total_return = result.get("total_return", 0)
+
+    cagr = annualized_return(final_value, initial_capital, trading_days)
+
+    return True, {
+        "ticker": ticker,
+        "name": etf["name"],
+        "leverage": etf["leverage"],
+        "direction": etf["direction"],
+        "category": etf["category"],
+        "start": daily_records[0]["date"] if daily_records else start_date,
+        "end": daily_records[-1]["date"] if daily_records else end_date,
+        "trading_days": trading_days,
+        "initial_capital": initial_capital,
+        "final_value": round(final_value, 2),
+        "total_return": round(total_return, 2),
+        "cagr": round(cagr, 2),
+        "mdd": round(mdd.get("mdd_percent", 0), 2),
+        "mdd_date": mdd.get("mdd_date", ""),
+    }
+
+
+def run_etf_backtests(
+    etfs, start_date, end_date, initial_capital, sf_config, ag_config,
+    bars, qqq_data, rsi_reference, mode_timeline=None, max_workers=None, on_result=None,
+):
+    """
+    ETF 목록 백테스트를 프로세스 풀에서 병렬 실행
+    Args:
+        bars: 티커 → 미리 조회한 일봉 (없는 티커는 워커가 직접 조회)
+        qqq_data: QQQ 일봉 (워커마다 한 번만 전달)
+        rsi_reference: RSI 참조 데이터 dict (워커마다 한 번만 전달)
+        mode_timeline: 주차별 모드 타임라인 (None이면 티커마다 RSI로 모드 판정)
+        max_workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 순서대로 실행)
+        on_result: 종목이 끝날 때마다 (etf, 성공 여부, 행)으로 호출 (완료 순서)
+    Returns:
+        tuple: (성공 행 목록[총수익률 내림차순], 실패 행 목록[ETF 목록 순서])
+    """
+    rsi_reference = rsi_reference.to_dict() if hasattr(rsi_reference, "to_dict") else rsi_reference
+    max_workers = max_workers or os.cpu_count() or 1
+    jobs = [(etf, bars.get(etf["ticker"])) for etf in etfs]
+    outcomes = {}
+
+    def collect(index, ok, row):
+        outcomes[index] = (ok, row)
+        if on_result is not None:
+            on_result(jobs[index][0], ok, row)
+
+    if max_workers == 1:
+        shared = {"QQQ": qqq_data, "rsi_reference": rsi_reference or None, "mode_timeline": mode_timeline}
+        for index, (etf, etf_bars) in enumerate(jobs):
+            collect(index, *backtest_etf(etf, etf_bars, start_date, end_date, initial_capital, sf_config, ag_config, shared))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(jobs)) or 1,
+            initializer=_init_worker,
+            initargs=(qqq_data, rsi_reference, mode_timeline),
+        ) as pool:
+            futures = {
+                pool.submit(backtest_etf, etf, etf_bars, start_date, end_date, initial_capital, sf_config, ag_config): index
+                for index, (etf, etf_bars) in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    ok, row = future.result()
+                except Exception as e:
+                    # 워커 프로세스 비정상 종료 등
+                    ok, row = False, {**jobs[index][0], "reason": str(e)[:120] or type(e).__name__}
+                collect(index, ok, row)
+
+    ordered = [outcomes[index] for index in range(len(jobs))]
+    success_results = [row for ok, row in ordered if ok]
+    fail_results = [row for ok, row in ordered if not ok]
+    # 총수익률 기준 내림차순 정렬
+    success_results.sort(key=lambda x: x["total_return"], reverse=True)
+    return success_results, fail_results
+
+
+def run_all_etf_backtest(max_workers=None):
     print("=" * 70)
     print("  ALL ETF 백테스팅 (2x/3x 레버리지 ETF 전체)")
     print("=" * 70)
@@ -190,80 +326,42 @@ def run_all_etf_backtest():
     print(f"\n투자원금: ${initial_capital:,.0f}")
     print(f"백테스팅 기간: {start_date} ~ {end_date}")
     print(f"대상 ETF: {total}종")
-    print(f"예상 소요시간: 약 {total * 20 // 60}~{total * 40 // 60}분")
     print("=" * 70)
 
-    success_results = []
-    fail_results = []
-
-    for idx, etf in enumerate(ETF_LIST, 1):
-        ticker = etf["ticker"]
-        name = etf["name"]
-        print(f"\n[{idx}/{total}] {ticker} ({name}) 백테스팅 중...", end=" ", flush=True)
-
-        try:
-            trader = AnyTickerQuantTrader(
-                ticker=ticker,
-                initial_capital=initial_capital,
-                sf_config=sf_config,
-                ag_config=ag_config,
-            )
-
-            # stdout 출력 억제 (백테스팅 내부 로그가 너무 많음)
-            import io, contextlib
-            with contextlib.redirect_stdout(io.StringIO()):
-                result = trader.run_backtest(start_date, end_date)
-
-            if "error" in result:
-                reason = result["error"]
-                print(f"SKIP - {reason[:60]}")
-                fail_results.append({**etf, "reason": reason})
-                time.sleep(1)
-                continue
-
-            daily_records = result.get("daily_records", [])
-            mdd = calculate_mdd(daily_records)
-            trading_days = result.get("trading_days", 0)
-            final_value = result.get("final_value", 0)
-            total_return = result.get("total_return", 0)
-
-            cagr = 0.0
-            if trading_days > 0:
-                years = trading_days / 252
-                if years > 0 and final_value > 0:
-                    cagr = ((final_value / initial_capital) ** (1 / years) - 1) * 100
-
-            actual_start = daily_records[0]["date"] if daily_records else start_date
-            actual_end = daily_records[-1]["date"] if daily_records else end_date
-
-            success_results.append({
-                "ticker": ticker,
-                "name": name,
-                "leverage": etf["leverage"],
-                "direction": etf["direction"],
-                "category": etf["category"],
-                "start": actual_start,
-                "end": actual_end,
-                "trading_days": trading_days,
-                "initial_capital": initial_capital,
-                "final_value": round(final_value, 2),
-                "total_return": round(total_return, 2),
-                "cagr": round(cagr, 2),
-                "mdd": round(mdd.get("mdd_percent", 0), 2),
-                "mdd_date": mdd.get("mdd_date", ""),
-            })
-
-            print(f"OK  수익률: {total_return:+.2f}%  CAGR: {cagr:+.2f}%  MDD: {mdd.get('mdd_percent',0):.2f}%")
-
-        except Exception as e:
-            reason = str(e)[:120]
-            print(f"ERROR - {reason}")
-            fail_results.append({**etf, "reason": reason})
-
-        time.sleep(2)
-
-    # 총수익률 기준 내림차순 정렬
-    success_results.sort(key=lambda x: x["total_return"], reverse=True)
+    # 전체 티커 + QQQ 일봉과 RSI 참조 데이터를 한 번만 받아 워커 프로세스에 나눠준다.
+    # (동시 요청 수는 공용 시세 클라이언트가 제한)
+    print("\n일봉 데이터 일괄 조회 중...", end=" ", flush=True)
+    prefetch_trader = SOXLQuantTrader(initial_capital=initial_capital)
+    with prefetch_trader.quiet_logging():
+        period = prefetch_trader.get_backtest_data_period(start_date)
+        prefetched = prefetch_trader.get_many([etf["ticker"] for etf in ETF_LIST] + ["QQQ"], period)
+        rsi_reference = prefetch_trader.load_rsi_reference_data()
+        # 모드는 QQQ RSI로만 정해지므로 전체 ETF가 같은 타임라인을 공유
+        mode_timeline = prefetch_trader.build_mode_timeline(rsi_reference)
+    loaded = sum(1 for df in prefetched.values() if df is not None)
+    print(f"{loaded}/{len(prefetched)}종 완료 (기간: {period})")
+
+    workers = max_workers or os.cpu_count() or 1
+    print(f"\n{workers}개 프로세스로 백테스팅 중...")
+    done = [0]
+
+    def report(etf, ok, row):
+        done[0] += 1
+        prefix = f"[{done[0]}/{total}] {etf['ticker']} ({etf['name']})"
+        if ok:
+            print(f"{prefix} OK  수익률: {row['total_return']:+.2f}%  CAGR: {row['cagr']:+.2f}%  MDD: {row['mdd']:.2f}%")
+        else:
+            print(f"{prefix} SKIP - {row['reason'][:60]}")
+
+    success_results, fail_results = run_etf_backtests(
+        ETF_LIST, start_date, end_date, initial_capital, sf_config, ag_config,
+        bars=prefetched,
+        qqq_data=prefetched.get("QQQ"),
+        rsi_reference=rsi_reference,
+        mode_timeline=mode_timeline,
+        max_workers=max_workers,
+        on_result=report,
+    )
 
     # 엑셀 보고서 생성
     output_file = f"ETF_백테스팅_결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
@@ -4,6 +4,7 @@
 """
 import openpyxl
 from datetime import datetime, timedelta
+from performance_metrics import annualized_return, mdd_info
 from soxl_quant_system import SOXLQuantTrader
 
 
@@ -192,36 +193,13 @@ def validate_date(date_str: str) -> bool:
 
 def calculate_mdd(daily_records):
     """
-    최대 낙폭(MDD) 계산
+    최대 낙폭(MDD) 계산 (performance_metrics.mdd_info)
     Args:
         daily_records: 일별 기록 리스트
     Returns:
-        dict: MDD 정보
+        dict: MDD 정보 (mdd_percent, mdd_date, mdd_value, 고점 정보)
     """
-    if not daily_records:
-        return {"mdd_percent": 0.0, "mdd_date": "", "mdd_value": 0.0}
-    
-    peak = daily_records[0]['total_assets']
-    max_drawdown = 0.0
-    mdd_date = ""
-    mdd_value = 0.0
-    
-    for record in daily_records:
-        total_assets = record['total_assets']
-        if total_assets > peak:
-            peak = total_assets
-        
-        drawdown = (peak - total_assets) / peak * 100
-        if drawdown > max_drawdown:
-            max_drawdown = drawdown
-            mdd_date = record['date']
-            mdd_value = total_assets
-    
-    return {
-        "mdd_percent": max_drawdown,
-        "mdd_date": mdd_date,
-        "mdd_value": mdd_value
-    }
+    return mdd_info(daily_records)
 
 
 class AnyTickerQuantTrader(SOXLQuantTrader):
@@ -442,12 +420,12 @@ def main():
     print(f"최종보유포지션: {backtest_result['final_positions']}개")
     print(f"총 거래일수: {len(backtest_result['daily_records'])}일")
     
-    # 연평균 수익률 계산
+    # 연평균 수익률 계산 (연간 거래일 252일 기준)
     if backtest_result['trading_days'] > 0:
-        years = backtest_result['trading_days'] / 252  # 연간 거래일 약 252일
-        if years > 0:
-            annual_return = ((backtest_result['final_value'] / backtest_result['initial_capital']) ** (1 / years) - 1) * 100
-            print(f"연평균 수익률: {annual_return:+.2f}%")
+        annual_return = annualized_return(
+            backtest_result['final_value'], backtest_result['initial_capital'], backtest_result['trading_days']
+        )
+        print(f"연평균 수익률: {annual_return:+.2f}%")
     
     print("=" * 60)
 
@@ -13,12 +13,14 @@
 """
 
 import sys
-import requests
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Tuple
 from pathlib import Path
 
+from market_data import MarketDataError, get_market_data_client, parse_chart_result
+from performance_metrics import annualized_return, mdd_info
+
 if sys.stdout.encoding != "utf-8":
     try:
         sys.stdout.reconfigure(encoding="utf-8")
@@ -29,33 +31,20 @@ if sys.stdout.encoding != "utf-8":
 def get_stock_data(symbol: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
     """Yahoo Finance API로 일별 주가 데이터 조회"""
     try:
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
         params = {
             "period1": int(datetime.strptime(start_date, "%Y-%m-%d").timestamp()),
             "period2": int(datetime.strptime(end_date, "%Y-%m-%d").timestamp()),
             "interval": "1d",
         }
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        if response.status_code != 200:
-            return None
-        data = response.json()
-        if "chart" not in data or "result" not in data["chart"] or not data["chart"]["result"]:
+        result = get_market_data_client().get_chart_result(symbol, params, timeout=30)
+        df = parse_chart_result(result)
+        if df is None:
             return None
-        result = data["chart"]["result"][0]
-        timestamps = result["timestamp"]
-        quote = result["indicators"]["quote"][0]
-        df = pd.DataFrame({
-            "Date": [datetime.fromtimestamp(ts) for ts in timestamps],
-            "Open": quote.get("open", [None] * len(timestamps)),
-            "High": quote.get("high", [None] * len(timestamps)),
-            "Low": quote.get("low", [None] * len(timestamps)),
-            "Close": quote.get("close", [None] * len(timestamps)),
-            "Volume": quote.get("volume", [None] * len(timestamps)),
-        })
-        df = df.dropna(subset=["Close"])
-        df["Date"] = pd.to_datetime(df["Date"]).dt.date
+        df = df.dropna(subset=["Close"]).reset_index()
+        df["Date"] = df["Date"].dt.date
         return df
+    except MarketDataError:
+        return None
     except Exception as e:
         print(f"❌ 데이터 조회 오류: {e}")
         return None
@@ -378,20 +367,8 @@ class Muhan4Backtester:
 
 
 def calculate_mdd(daily_records: List[Dict]) -> Dict:
-    """최대 낙폭 계산"""
-    if not daily_records:
-        return {"mdd_percent": 0.0, "mdd_date": ""}
-    peak = daily_records[0]["total_assets"]
-    max_dd = 0.0
-    mdd_date = ""
-    for r in daily_records:
-        if r["total_assets"] > peak:
-            peak = r["total_assets"]
-        dd = (peak - r["total_assets"]) / peak * 100 if peak > 0 else 0
-        if dd > max_dd:
-            max_dd = dd
-            mdd_date = r["date"]
-    return {"mdd_percent": max_dd, "mdd_date": mdd_date}
+    """최대 낙폭 계산 (performance_metrics.mdd_info)"""
+    return mdd_info(daily_records)
 
 
 def main():
@@ -440,8 +417,7 @@ def main():
         return
 
     mdd = calculate_mdd(result["daily_records"])
-    years = result["trading_days"] / 252 if result["trading_days"] > 0 else 0
-    cagr = ((result["final_value"] / result["initial_capital"]) ** (1 / years) - 1) * 100 if years > 0 else 0
+    cagr = annualized_return(result["final_value"], result["initial_capital"], result["trading_days"])
 
     print("\n" + "=" * 60)
     print(f"  결과: {ticker} ({split}분할)")
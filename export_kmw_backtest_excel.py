@@ -4,9 +4,7 @@ app.py KMW 프리셋과 동일한 설정으로 백테스트 후 엑셀 저장.
 실행: python export_kmw_backtest_excel.py [출력경로.xlsx]
   생략 시 data/KMW_SOXL_backtest_YYYYMMDD_HHMMSS.xlsx
 """
-import io
 import sys
-from contextlib import redirect_stdout
 from datetime import datetime
 from pathlib import Path
 
@@ -62,8 +60,7 @@ def main():
     start_str = KMW["session_start_date"]
 
     print(f"KMW 백테스트: {start_str} ~ {end_str}")
-    buf = io.StringIO()
-    with redirect_stdout(buf):
+    with trader.quiet_logging():
         result = trader.run_backtest(start_str, end_str)
 
     if "error" in result:
@@ -0,0 +1,413 @@
+"""
+Yahoo Finance chart API 공용 클라이언트
+
+- MarketDataClient: 모든 스크립트가 공유하는 chart API 클라이언트.
+  keep-alive 세션 풀, 제한된 재시도(지수 백오프), 동일 요청 합치기(in-flight coalescing),
+  짧은 TTL 응답 캐시(최대 항목 수 LRU), 호스트별 동시 연결 제한을 제공한다. get_market_data_client()로 프로세스 공용 인스턴스를 얻는다.
+- run_concurrently: 여러 심볼 조회를 제한된 스레드 풀로 동시에 실행하는 헬퍼.
+- RecordingMarketDataClient / ReplayMarketDataClient: chart 응답을 픽스처 파일로 기록하고,
+  네트워크 없이 같은 파일에서 재생하는 오프라인 모드. 환경변수
+  MOS_QUANT_RECORD_DIR / MOS_QUANT_REPLAY_DIR를 지정하면 get_market_data_client()가 해당 모드로 생성된다.
+- parse_chart_result: chart 응답(``chart.result[0]``)을 Date 인덱스 일봉 DataFrame으로 바꾸는 파서.
+  행 단위 반복 없이 배열 연산만 사용한다.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple, TypeVar
+from pathlib import Path
+from urllib.parse import quote, urlparse
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+
+BAR_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# 일시적인 오류로 보고 재시도할 HTTP 상태
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# 응답 캐시 최대 항목 수 (초과 시 가장 오래 쓰지 않은 항목부터 제거)
+DEFAULT_CACHE_SIZE = 256
+
+# 다중 심볼 조회 스레드 수 / 호스트별 동시 요청 수 (Yahoo 429 방지)
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_PER_HOST = 4
+
+# 오프라인 기록/재생 디렉터리 환경변수
+RECORD_DIR_ENV = "MOS_QUANT_RECORD_DIR"
+REPLAY_DIR_ENV = "MOS_QUANT_REPLAY_DIR"
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class MarketDataError(RuntimeError):
+    """chart API 요청 실패 (재시도 후에도 실패했거나 응답이 비정상)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class _InFlight:
+    """진행 중인 요청 하나를 기다리는 호출자들이 결과를 공유하기 위한 자리"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.payload: Optional[dict] = None
+        self.error: Optional[BaseException] = None
+
+
+class MarketDataClient:
+    """Yahoo chart API 공용 클라이언트 (스레드 안전)"""
+
+    # 네트워크 없이 고정 데이터만 제공하는 클라이언트면 True (트레이더가 디스크 일봉 저장소를 끈다)
+    offline = False
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.5,
+        cache_ttl: float = 60.0,
+        pool_size: int = 16,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+
+        self._session = requests.Session()
+        self._session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        # 요청 키 → (저장 시각, 응답), 최근 사용 순서 (장시간 실행 프로세스에서도 cache_size개로 제한)
+        self._cache: "OrderedDict[tuple, Tuple[float, dict]]" = OrderedDict()
+        self._inflight: Dict[tuple, _InFlight] = {}
+        self.max_per_host = max_per_host
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    @staticmethod
+    def chart_url(symbol: str) -> str:
+        return YAHOO_CHART_URL.format(symbol=symbol)
+
+    @staticmethod
+    def _request_key(symbol: str, params: dict) -> tuple:
+        return (symbol.upper(), tuple(sorted((str(k), str(v)) for k, v in params.items())))
+
+    def get_chart(self, symbol: str, params: dict, timeout: float = 15, max_age: Optional[float] = None) -> dict:
+        """
+        chart API 호출 (JSON 응답 전체 반환)
+        Args:
+            symbol: 심볼
+            params: 쿼리 파라미터 (range/interval 또는 period1/period2/interval)
+            timeout: 요청 타임아웃(초)
+            max_age: 캐시 허용 나이(초). None이면 cache_ttl, 0이면 캐시를 쓰지 않음
+        Returns:
+            dict: 응답 JSON (공유 캐시 객체이므로 호출자가 수정하면 안 된다)
+        Raises:
+            MarketDataError: 재시도 후에도 실패한 경우
+        """
+        key = self._request_key(symbol, params)
+        max_age = self.cache_ttl if max_age is None else max_age
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and max_age > 0 and time.monotonic() - cached[0] < max_age:
+                self._cache.move_to_end(key)
+                return cached[1]
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                owner = _InFlight()
+                self._inflight[key] = owner
+
+        # 같은 요청이 이미 진행 중이면 그 결과를 기다려 공유한다
+        if waiter is not None:
+            waiter.done.wait()
+            if waiter.error is not None:
+                raise waiter.error
+            return waiter.payload
+
+        try:
+            owner.payload = self._request_with_retry(symbol, params, timeout)
+            with self._lock:
+                self._cache[key] = (time.monotonic(), owner.payload)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            return owner.payload
+        except BaseException as e:
+            owner.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            owner.done.set()
+
+    def get_chart_result(self, symbol: str, params: dict, timeout: float = 15, max_age: Optional[float] = None) -> dict:
+        """chart API 호출 후 ``chart.result[0]``만 반환 (결과가 없으면 MarketDataError)"""
+        data = self.get_chart(symbol, params, timeout=timeout, max_age=max_age)
+        chart = data.get('chart') or {}
+        if chart.get('error'):
+            raise MarketDataError(f"Yahoo 오류 ({symbol}): {chart['error']}")
+        if not chart.get('result'):
+            raise MarketDataError("차트 결과 없음")
+        return chart['result'][0]
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _request_with_retry(self, symbol: str, params: dict, timeout: float) -> dict:
+        url = self.chart_url(symbol)
+        host_slot = self._host_slot(url)
+        last_error: Optional[MarketDataError] = None
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                time.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
+            try:
+                with host_slot:
+                    response = self._session.get(url, params=params, timeout=timeout)
+            except requests.RequestException as e:
+                last_error = MarketDataError(f"요청 오류: {e}")
+                continue
+            if response.status_code == 200:
+                try:
+                    return response.json()
+                except ValueError as e:
+                    raise MarketDataError(f"응답 JSON 해석 실패: {e}", response.status_code)
+            last_error = MarketDataError(f"HTTP 오류: {response.status_code}", response.status_code)
+            if response.status_code not in RETRY_STATUS_CODES:
+                break
+        raise last_error
+
+    def get_many(self, symbols: Iterable[str], params: dict, timeout: float = 15, max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, object]:
+        """
+        여러 심볼의 ``chart.result[0]``을 동시에 조회
+        Returns:
+            dict: 심볼 → result dict, 실패한 심볼은 MarketDataError 인스턴스
+        """
+        def fetch(symbol: str):
+            try:
+                return self.get_chart_result(symbol, params, timeout=timeout)
+            except MarketDataError as e:
+                return e
+
+        return run_concurrently(fetch, symbols, max_workers=max_workers)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+def run_concurrently(func: Callable[[K], V], keys: Iterable[K], max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[K, V]:
+    """
+    keys 각각에 func를 제한된 스레드 풀로 실행하고 입력 순서대로 {key: 결과}를 반환한다.
+    (중복 key는 한 번만 실행, func의 예외는 그대로 전파)
+    """
+    unique_keys = list(dict.fromkeys(keys))
+    if len(unique_keys) <= 1 or max_workers <= 1:
+        return {key: func(key) for key in unique_keys}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_keys))) as executor:
+        futures = {key: executor.submit(func, key) for key in unique_keys}
+        return {key: future.result() for key, future in futures.items()}
+
+
+def _fixture_path(root: Path, symbol: str, interval: str) -> Path:
+    """픽스처 파일 경로 ({SYMBOL}_{interval}.json, 심볼의 특수문자는 URL 인코딩)"""
+    return root / f"{quote(symbol.upper(), safe='')}_{interval}.json"
+
+
+def _merge_chart_results(old: dict, new: dict) -> dict:
+    """같은 심볼/간격의 두 chart result를 타임스탬프 기준으로 합친다 (겹치면 새 값 우선)"""
+    rows = {}
+    for result in (old, new):
+        timestamps = result.get("timestamp") or []
+        quote_data = ((result.get("indicators") or {}).get("quote") or [{}])[0] or {}
+        for i, ts in enumerate(timestamps):
+            rows[ts] = {
+                key: (quote_data.get(key) or [None] * len(timestamps))[i]
+                for key in ("open", "high", "low", "close", "volume")
+            }
+    timestamps = sorted(rows)
+    merged = dict(new)
+    merged["timestamp"] = timestamps
+    merged["indicators"] = {
+        "quote": [{key: [rows[ts][key] for ts in timestamps] for key in ("open", "high", "low", "close", "volume")}]
+    }
+    events = {}
+    for result in (old, new):
+        for kind, items in (result.get("events") or {}).items():
+            events.setdefault(kind, {}).update(items)
+    if events:
+        merged["events"] = events
+    return merged
+
+
+def _slice_chart_result(result: dict, period1: Optional[int], period2: Optional[int]) -> dict:
+    """period1 <= timestamp < period2 구간만 남긴 chart result"""
+    timestamps = np.asarray(result.get("timestamp") or [], dtype="int64")
+    mask = np.ones(len(timestamps), dtype=bool)
+    if period1 is not None:
+        mask &= timestamps >= int(period1)
+    if period2 is not None:
+        mask &= timestamps < int(period2)
+    if mask.all():
+        return result
+    positions = np.flatnonzero(mask)
+    quote_data = ((result.get("indicators") or {}).get("quote") or [{}])[0] or {}
+    sliced = dict(result)
+    sliced["timestamp"] = timestamps[positions].tolist()
+    sliced["indicators"] = {
+        "quote": [{key: [values[i] for i in positions] for key, values in quote_data.items() if isinstance(values, list)}]
+    }
+    return sliced
+
+
+class RecordingMarketDataClient(MarketDataClient):
+    """실제 API를 호출하면서 응답을 심볼/간격별 픽스처 파일로 기록하는 클라이언트"""
+
+    def __init__(self, fixture_dir, **kwargs):
+        super().__init__(**kwargs)
+        self.fixture_dir = Path(fixture_dir)
+        self._file_lock = threading.Lock()
+
+    def _request_with_retry(self, symbol: str, params: dict, timeout: float) -> dict:
+        data = super()._request_with_retry(symbol, params, timeout)
+        result = ((data.get("chart") or {}).get("result") or [None])[0]
+        if result:
+            self._record(symbol, params.get("interval", "1d"), result)
+        return data
+
+    def _record(self, symbol: str, interval: str, result: dict) -> None:
+        path = _fixture_path(self.fixture_dir, symbol, interval)
+        with self._file_lock:
+            try:
+                self.fixture_dir.mkdir(parents=True, exist_ok=True)
+                if path.exists():
+                    with open(path, "r", encoding="utf-8") as f:
+                        existing = json.load(f)["chart"]["result"][0]
+                    result = _merge_chart_results(existing, result)
+                tmp_path = path.with_name(path.name + ".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"chart": {"result": [result], "error": None}}, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.warning("⚠️ %s 픽스처 기록 실패: %s", symbol, e)
+
+
+class ReplayMarketDataClient(MarketDataClient):
+    """
+    기록된 픽스처 파일만으로 chart 응답을 재생하는 오프라인 클라이언트.
+    period1/period2 요청은 해당 구간으로 잘라서, range 요청은 기록 전체를 돌려준다.
+    픽스처가 없으면 HTTP 404와 같은 MarketDataError를 낸다.
+    """
+
+    offline = True
+
+    def __init__(self, fixture_dir, **kwargs):
+        kwargs.setdefault("max_retries", 0)
+        super().__init__(**kwargs)
+        self.fixture_dir = Path(fixture_dir)
+        self._fixtures: Dict[Path, dict] = {}
+
+    def _load_fixture(self, symbol: str, interval: str) -> Optional[dict]:
+        path = _fixture_path(self.fixture_dir, symbol, interval)
+        with self._lock:
+            if path in self._fixtures:
+                return self._fixtures[path]
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            result = json.load(f)["chart"]["result"][0]
+        with self._lock:
+            self._fixtures[path] = result
+        return result
+
+    def _request_with_retry(self, symbol: str, params: dict, timeout: float) -> dict:
+        result = self._load_fixture(symbol, params.get("interval", "1d"))
+        if result is None:
+            raise MarketDataError(f"HTTP 오류: 404 (픽스처 없음: {symbol} {params.get('interval', '1d')})", 404)
+        if "period1" in params or "period2" in params:
+            result = _slice_chart_result(result, params.get("period1"), params.get("period2"))
+        return {"chart": {"result": [result], "error": None}}
+
+
+_default_client: Optional[MarketDataClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_market_data_client() -> MarketDataClient:
+    """
+    프로세스 공용 MarketDataClient
+    MOS_QUANT_REPLAY_DIR가 있으면 재생 클라이언트, MOS_QUANT_RECORD_DIR가 있으면 기록 클라이언트를 만든다.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            if os.environ.get(REPLAY_DIR_ENV):
+                _default_client = ReplayMarketDataClient(os.environ[REPLAY_DIR_ENV])
+            elif os.environ.get(RECORD_DIR_ENV):
+                _default_client = RecordingMarketDataClient(os.environ[RECORD_DIR_ENV])
+            else:
+                _default_client = MarketDataClient()
+        return _default_client
+
+
+def _quote_array(quote: dict, key: str, length: int) -> np.ndarray:
+    """quote 배열을 float64로 변환 (None → NaN, 누락 시 NaN 배열)"""
+    values = quote.get(key)
+    if values is None:
+        return np.full(length, np.nan)
+    return np.array(values, dtype="float64")
+
+
+def parse_chart_result(result: dict) -> Optional[pd.DataFrame]:
+    """
+    chart 응답 result를 일봉 DataFrame으로 변환
+    Args:
+        result: ``data['chart']['result'][0]``
+    Returns:
+        DataFrame: 정규화된 Date 인덱스(거래소 현지 날짜) + Open/High/Low/Close/Volume(float64).
+                   Close가 비어 있는 행도 그대로 포함한다. 구조가 맞지 않으면 None.
+    """
+    if not result or "timestamp" not in result or "indicators" not in result:
+        return None
+
+    quotes = result["indicators"].get("quote") or [{}]
+    quote = quotes[0] or {}
+    timestamps = np.asarray(result["timestamp"] or [], dtype="int64")
+
+    # 일봉 타임스탬프는 거래소 개장 시각이므로 거래소 UTC 오프셋을 더한 날짜가 곧 거래일이다.
+    gmtoffset = int((result.get("meta") or {}).get("gmtoffset") or 0)
+    dates = pd.to_datetime(timestamps + gmtoffset, unit="s").normalize()
+
+    df = pd.DataFrame(
+        {column: _quote_array(quote, column.lower(), len(timestamps)) for column in BAR_COLUMNS},
+        index=pd.DatetimeIndex(dates, name="Date"),
+    )
+    return df
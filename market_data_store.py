@@ -0,0 +1,243 @@
+"""
+일봉 OHLCV 로컬 저장소
+
+심볼별로 마감된 세션의 일봉을 디스크에 한 번만 기록해두고, 이후 프로세스에서는
+파일을 읽어 바로 사용한다. pyarrow(또는 fastparquet)가 설치되어 있으면 Parquet,
+없으면 NumPy 구조체 배열(.npy, memory-map 로드)로 저장한다.
+
+저장 파일 옆에 ``{SYMBOL}.meta.json``을 두어 마지막 저장 세션과
+전체 이력 여부(full_history)를 기록한다.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from market_data import BAR_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Parquet 엔진은 설치 여부만 확인 (pandas가 읽기/쓰기 때 직접 import)
+PARQUET_AVAILABLE = any(find_spec(engine) is not None for engine in ("pyarrow", "fastparquet"))
+
+
+_NPY_DTYPE = np.dtype(
+    [("Date", "datetime64[D]")] + [(column, "f8") for column in BAR_COLUMNS]
+)
+
+# Yahoo chart API range 문자열 → 조회 시작일 오프셋 (None이면 전체 이력)
+_PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+    "15y": None,
+    "max": None,
+}
+
+FULL_HISTORY_PERIODS = frozenset(period for period, offset in _PERIOD_OFFSETS.items() if offset is None)
+
+
+def period_start(period: str, today: Union[date, datetime]) -> Optional[pd.Timestamp]:
+    """
+    range 문자열이 요구하는 첫 날짜를 계산한다.
+    Returns:
+        Timestamp: 시작일, 전체 이력 기간이면 None
+    Raises:
+        KeyError: 지원하지 않는 기간 문자열
+    """
+    today_ts = pd.Timestamp(today).normalize()
+    if period == "ytd":
+        return pd.Timestamp(year=today_ts.year, month=1, day=1)
+    offset = _PERIOD_OFFSETS[period]
+    if offset is None:
+        return None
+    return today_ts - offset
+
+
+class DailyBarStore:
+    """심볼별 마감 일봉 저장소"""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        # 경로 → (mtime_ns, DataFrame): 같은 프로세스 안에서 반복 디코딩 방지
+        self._frames: Dict[Path, Tuple[int, pd.DataFrame]] = {}
+
+    # ------------------------------------------------------------------
+    # 경로/메타데이터
+    # ------------------------------------------------------------------
+    def _data_path(self, symbol: str) -> Path:
+        suffix = ".parquet" if PARQUET_AVAILABLE else ".npy"
+        return self.root / f"{symbol.upper()}{suffix}"
+
+    def _meta_path(self, symbol: str) -> Path:
+        return self.root / f"{symbol.upper()}.meta.json"
+
+    def load_meta(self, symbol: str) -> Optional[dict]:
+        """저장소 메타데이터 (last_session, full_history 등)"""
+        meta_path = self._meta_path(symbol)
+        if not meta_path.exists() or not self._data_path(symbol).exists():
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    # ------------------------------------------------------------------
+    # 읽기/쓰기
+    # ------------------------------------------------------------------
+    def load(self, symbol: str) -> Optional[pd.DataFrame]:
+        """
+        저장된 일봉 로드
+        Returns:
+            DataFrame: Date 인덱스(정규화) + Open/High/Low/Close/Volume, 없으면 None
+        """
+        path = self._data_path(symbol)
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._frames.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1].copy()
+
+        try:
+            if PARQUET_AVAILABLE:
+                df = pd.read_parquet(path)
+            else:
+                records = np.load(path, mmap_mode="r")
+                df = pd.DataFrame(
+                    {column: np.asarray(records[column]) for column in BAR_COLUMNS},
+                    index=pd.DatetimeIndex(np.asarray(records["Date"]).astype("datetime64[ns]"), name="Date"),
+                )
+        except Exception as e:
+            logger.warning("⚠️ %s 로컬 일봉 저장소 읽기 실패: %s", symbol, e)
+            return None
+
+        with self._lock:
+            self._frames[path] = (mtime_ns, df)
+        return df.copy()
+
+    def save(self, symbol: str, df: pd.DataFrame, last_session: date, full_history: bool = False) -> bool:
+        """
+        마감된 세션(last_session 이하)만 저장소에 병합한다.
+        기존 저장분은 그대로 두고 그 이후 세션만 덧붙이며, 새 데이터가 기존 저장분과
+        이어지지 않으면(중간 공백) 저장하지 않는다. full_history=True면 전체를 새로 기록한다.
+        Returns:
+            bool: 저장소가 갱신되었으면 True
+        """
+        if df is None or len(df) == 0:
+            return False
+
+        cutoff = pd.Timestamp(last_session)
+        closed = df.loc[df.index <= cutoff, list(BAR_COLUMNS)].astype("float64")
+        closed = closed[~closed.index.duplicated(keep="last")].sort_index()
+        if len(closed) == 0:
+            return False
+
+        meta = self.load_meta(symbol)
+        existing = None if full_history else self.load(symbol)
+        if existing is not None and len(existing) > 0 and meta is not None:
+            last_stored = existing.index[-1]
+            if closed.index[0] > last_stored:
+                # 저장분과 새 데이터 사이에 공백이 있으면 연속성을 보장할 수 없다
+                return False
+            tail = closed[closed.index > last_stored]
+            if len(tail) == 0:
+                return False
+            merged = pd.concat([existing, tail])
+            is_full = bool(meta.get("full_history"))
+        else:
+            merged = closed
+            is_full = full_history
+
+        merged.index.name = "Date"
+        new_meta = {
+            "symbol": symbol.upper(),
+            "first_session": merged.index[0].strftime("%Y-%m-%d"),
+            "last_session": merged.index[-1].strftime("%Y-%m-%d"),
+            "full_history": is_full,
+            "rows": int(len(merged)),
+            "format": "parquet" if PARQUET_AVAILABLE else "npy",
+            "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._write_frame(self._data_path(symbol), merged)
+            self._write_json(self._meta_path(symbol), new_meta)
+        except Exception as e:
+            logger.warning("⚠️ %s 로컬 일봉 저장 실패: %s", symbol, e)
+            return False
+        return True
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """저장소 삭제 (symbol이 None이면 전체)"""
+        if not self.root.exists():
+            return
+        if symbol is None:
+            targets = [p for p in self.root.iterdir() if p.suffix in (".parquet", ".npy") or p.name.endswith(".meta.json")]
+        else:
+            targets = [self._data_path(symbol), self._meta_path(symbol)]
+        for path in targets:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._frames.clear()
+
+    # ------------------------------------------------------------------
+    # 내부 헬퍼 (임시 파일에 쓴 뒤 교체해 반쯤 쓰인 파일을 남기지 않는다)
+    # ------------------------------------------------------------------
+    def _write_frame(self, path: Path, df: pd.DataFrame) -> None:
+        tmp_path = path.with_name(path.name + ".tmp")
+        if PARQUET_AVAILABLE:
+            df.to_parquet(tmp_path)
+        else:
+            records = np.empty(len(df), dtype=_NPY_DTYPE)
+            records["Date"] = df.index.values.astype("datetime64[D]")
+            for column in BAR_COLUMNS:
+                records[column] = df[column].to_numpy(dtype="float64")
+            with open(tmp_path, "wb") as f:
+                np.save(f, records)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _write_json(path: Path, payload: dict) -> None:
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+_STORES: Dict[Path, DailyBarStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_bar_store(root: Union[str, Path]) -> DailyBarStore:
+    """경로별 공유 저장소 인스턴스 (같은 프로세스의 트레이더들이 메모리 캐시를 공유)"""
+    key = Path(root).resolve()
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = DailyBarStore(key)
+            _STORES[key] = store
+        return store
@@ -0,0 +1,160 @@
+"""
+주차별 QQQ RSI·SF/AG 모드 타임라인 (읽기 전용, 여러 트레이더가 공유)
+
+모드는 거래 티커와 무관하게 QQQ 주간 RSI만으로 정해지므로, 여러 티커·파라미터 조합을
+실행하는 배치에서는 RSI 참조 데이터로 타임라인을 한 번만 만들어 각 트레이더에 주입한다
+(SOXLQuantTrader.use_mode_timeline). 주입된 트레이더는 주차마다 RSI 조회·모드 판정을 하지 않는다.
+
+주차 모드 규칙은 백테스트 루프와 같다: 1주전/2주전 RSI가 안전·공세 조건에 해당하면 그 모드,
+아니면 이전 주차 모드를 유지하며, FORCED_SF_WEEK 주차는 이전 주차가 안전모드면 안전모드로 고정한다.
+백테스트 시작 모드는 타임라인 값이 아니라 check_backtest_starting_state·update_mode와 같은 재귀 규칙
+(recursive_week_mode: 조건에 해당하는 주차를 최대 MAX_MODE_LOOKBACK주 전까지 찾음)으로 정한다.
+"""
+
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from rsi_reference import get_weekly_rsi_index
+
+# 이 기간 주차는 이전 주차가 안전모드면 이번 주도 안전모드로 강제 (백테스트 루프와 동일)
+FORCED_SF_WEEK = (date(2025, 12, 29), date(2026, 1, 2))
+
+# 재귀 모드 판정이 조건 주차를 찾는 최대 주 수 (_calculate_week_mode_recursive_with_reference의 max_depth)
+MAX_MODE_LOOKBACK = 20
+
+
+def week_friday(day: date) -> date:
+    """날짜가 속한 주의 금요일 (토/일은 다음 주 금요일, 백테스트 루프와 같은 기준)"""
+    return day + timedelta(days=(4 - day.weekday()) % 7)
+
+
+class WeeklyModeTimeline:
+    """
+    주차 금요일 → (주차 RSI, 모드) 읽기 전용 타임라인
+    주차 RSI는 참조 데이터에 아직 없으면(진행 중인 주차) None이고, 모드는 1주전/2주전 RSI만으로 정해진다.
+    모드가 정해지기 전 주차를 포함한 참조 데이터 주차 RSI도 함께 보관한다 (시작 모드 재귀 판정용).
+    """
+
+    __slots__ = ("_weeks", "_rsi")
+
+    def __init__(
+        self,
+        weeks: Dict[date, Tuple[Optional[float], str]],
+        rsi: Optional[Dict[date, Optional[float]]] = None,
+    ):
+        self._weeks = dict(weeks)
+        self._rsi = dict(rsi) if rsi is not None else {friday: week[0] for friday, week in self._weeks.items()}
+
+    def get(self, friday: date) -> Optional[Tuple[Optional[float], str]]:
+        """금요일의 (RSI, 모드), 타임라인 밖이면 None"""
+        return self._weeks.get(friday)
+
+    def rsi(self, friday: date) -> Optional[float]:
+        """금요일 주차 RSI (참조 데이터에 없으면 None)"""
+        return self._rsi.get(friday)
+
+    def modes_for(self, days: Iterable[date]) -> List[Optional[str]]:
+        """날짜별 해당 주차 모드 (타임라인 밖이면 None, 봉 단위 모드 배열 생성용)"""
+        weeks = self._weeks
+        result = []
+        for day in days:
+            week = weeks.get(week_friday(day))
+            result.append(week[1] if week is not None else None)
+        return result
+
+    @property
+    def fridays(self) -> List[date]:
+        return sorted(self._weeks)
+
+    def __contains__(self, friday) -> bool:
+        return friday in self._weeks
+
+    def __len__(self) -> int:
+        return len(self._weeks)
+
+    def __repr__(self) -> str:
+        fridays = self.fridays
+        span = f"{fridays[0]}~{fridays[-1]}" if fridays else "empty"
+        return f"WeeklyModeTimeline({span}, weeks={len(fridays)})"
+
+
+def build_mode_timeline(
+    rsi_data: dict,
+    case_matcher: Callable[[float, float], Tuple[bool, Optional[str]]],
+    through: Optional[date] = None,
+) -> WeeklyModeTimeline:
+    """
+    RSI 참조 데이터로 주차별 모드 타임라인 생성
+    Args:
+        rsi_data: weekly_rsi_reference.json 형식의 RSI 참조 데이터
+        case_matcher: (1주전 RSI, 2주전 RSI) → (조건 해당 여부, 모드) (SOXLQuantTrader._is_mode_case_matched)
+        through: 이 날짜가 속한 주차까지 생성 (None이면 참조 데이터 마지막 주차의 다음 주까지)
+    Returns:
+        WeeklyModeTimeline: 처음으로 조건에 해당한 주차부터의 타임라인 (RSI 공백 이후에는 다시 조건 주차부터)
+    """
+    index = get_weekly_rsi_index(rsi_data)
+    if index.last_end is None:
+        return WeeklyModeTimeline({})
+    fridays = [week_friday(date.fromisoformat(week["end"])) for week in _reference_weeks(rsi_data)]
+    if not fridays:
+        return WeeklyModeTimeline({})
+    last = week_friday(through) if through is not None else max(fridays) + timedelta(days=7)
+
+    rsi_by_friday: Dict[date, Optional[float]] = {}
+
+    def rsi(friday: date) -> Optional[float]:
+        if friday not in rsi_by_friday:
+            rsi_by_friday[friday] = index.lookup(friday.isoformat())
+        return rsi_by_friday[friday]
+
+    weeks: Dict[date, Tuple[Optional[float], str]] = {}
+    prev_mode: Optional[str] = None
+    friday = min(fridays) + timedelta(days=14)
+    while friday <= last:
+        one_week_rsi, two_weeks_rsi = rsi(friday - timedelta(days=7)), rsi(friday - timedelta(days=14))
+        if one_week_rsi is None or two_weeks_rsi is None:
+            mode = None
+        else:
+            is_matched, matched_mode = case_matcher(one_week_rsi, two_weeks_rsi)
+            mode = matched_mode if is_matched else prev_mode
+            if FORCED_SF_WEEK[0] <= friday <= FORCED_SF_WEEK[1] and prev_mode == "SF":
+                mode = "SF"
+        if mode is not None:
+            weeks[friday] = (rsi(friday), mode)
+        prev_mode = mode
+        friday += timedelta(days=7)
+    return WeeklyModeTimeline(weeks, rsi_by_friday)
+
+
+def recursive_week_mode(
+    friday: date,
+    rsi: Callable[[date], Optional[float]],
+    case_matcher: Callable[[float, float], Tuple[bool, Optional[str]]],
+    max_depth: int = MAX_MODE_LOOKBACK,
+) -> Optional[str]:
+    """
+    주차 모드를 재귀 규칙으로 판정 (SOXLQuantTrader._calculate_week_mode_recursive_with_reference와 동일)
+    조건에 해당하는 주차를 max_depth주 전까지 거슬러 찾고, 그 사이 주차는 조건이 없으므로 그 모드를 그대로 이어받는다.
+    Args:
+        rsi: 금요일 → 주차 RSI (없으면 None)
+    Returns:
+        str: 모드, 중간에 RSI가 없거나 max_depth 안에 조건 주차가 없으면 None
+    """
+    for _ in range(max_depth):
+        one_week_rsi, two_weeks_rsi = rsi(friday - timedelta(days=7)), rsi(friday - timedelta(days=14))
+        if one_week_rsi is None or two_weeks_rsi is None:
+            return None
+        is_matched, matched_mode = case_matcher(one_week_rsi, two_weeks_rsi)
+        if is_matched:
+            return matched_mode
+        friday -= timedelta(days=7)
+    return None
+
+
+def _reference_weeks(rsi_data: dict):
+    for year, payload in rsi_data.items():
+        if year == "metadata" or not hasattr(payload, "get"):
+            continue
+        for week in payload.get("weeks", ()):
+            if week.get("end"):
+                yield week
@@ -0,0 +1,352 @@
+"""
+SF/AG 전략 몬테카를로(블록 부트스트랩) 강건성 시뮬레이터
+
+과거 한 경로의 수익률·MDD만으로는 운의 영향을 알 수 없으므로, 과거 주차를 블록 단위로
+다시 뽑아 이어 붙인 가상 경로 수천 개에서 전략을 실행해 수익률·MDD 분포를 본다.
+
+- 재표본 단위는 주차 블록(연속 block_weeks주)이다. 한 주차를 고르면 그 주의 SOXL 일간 수익률과
+  QQQ 주간 수익률을 함께 가져오므로 두 자산의 동시 움직임이 유지된다
+- 가상 QQQ 주간 종가로 주간 RSI(rsi_reference와 같은 14주 계산식)를 다시 계산하고, 1주전/2주전 RSI로
+  주차 모드를 정한다 (SOXLQuantTrader._is_mode_case_matched와 같은 조건, 해당 없으면 이전 모드 유지)
+- 경로 묶음(batch)은 backtest_kernel.run_kernel_batch로 한 번에 실행하고, 묶음은 프로세스 풀에서 병렬 처리
+- 가상 경로는 모든 봉을 거래일로 보며, 날짜는 첫 주 월요일부터 주차·요일 순서대로 붙인다 (복리 정산일 계산용).
+  강제 안전모드 주차 같은 달력 고정 규칙은 적용하지 않는다
+
+사용법:
+  python monte_carlo.py --start 2011-01-01 --paths 5000 --block-weeks 4 --seed 1
+"""
+
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backtest_kernel import MODE_AG, MODE_SF, CompoundingParams, mode_params, run_kernel_batch
+from mode_timeline import week_friday
+from parameter_sweep import evaluate_config, prepare_sweep_data
+from performance_metrics import compute_metrics
+from rsi_reference import RSI_WINDOW, weekly_closes
+
+DEFAULT_BLOCK_WEEKS = 4
+DEFAULT_BATCH_SIZE = 256
+DISTRIBUTION_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+class BootstrapSource(NamedTuple):
+    """부트스트랩 재표본 원천 (과거 구간의 주차별 수익률과 시작 상태)"""
+
+    soxl_returns: np.ndarray  # 봉별 SOXL 일간 로그수익률 (첫 봉은 시작 전일 종가 대비)
+    weekdays: np.ndarray  # 봉별 요일 (0=월)
+    week_starts: np.ndarray  # 주차별 첫 봉 인덱스 (마지막 원소는 봉 수)
+    qqq_returns: np.ndarray  # 주차별 QQQ 주간 로그수익률
+    qqq_warmup: np.ndarray  # 첫 주차 이전 QQQ 주간 종가 (1주전/2주전 RSI 계산용 RSI_WINDOW + 2개)
+    start_close: float  # SOXL 시작 전일 종가
+    start_mode: int  # 첫 주차 모드 코드 (과거 경로와 동일)
+    start_monday: date
+    injections: np.ndarray  # 봉 순서 기준 시드증액 (가상 경로도 같은 봉 번호에 반영)
+    initial_capital: float
+    compounding: Optional[CompoundingParams]
+    historical_metrics: Dict  # 과거 경로 기준 지표 (분포와 비교용)
+
+    @property
+    def n_bars(self) -> int:
+        return len(self.soxl_returns)
+
+    @property
+    def n_weeks(self) -> int:
+        return len(self.qqq_returns)
+
+
+def prepare_bootstrap_source(trader, start_date: str, end_date: Optional[str] = None, sf_config=None, ag_config=None) -> BootstrapSource:
+    """
+    트레이더로 과거 구간 SOXL·QQQ 일봉을 조회해 재표본 원천 생성
+    Args:
+        trader: SOXLQuantTrader (초기자본·시드증액·손익 복리 설정도 가져옴)
+        sf_config/ag_config: 과거 경로 지표 계산용 설정 (None이면 트레이더 설정)
+    Raises:
+        ValueError: 일봉이 없거나, QQQ 주간 종가가 RSI 계산에 부족한 경우
+    """
+    data = prepare_sweep_data(trader, start_date, end_date)
+    if data.prev_close is None:
+        raise ValueError("시작일 이전 SOXL 종가가 없어 첫 봉 수익률을 계산할 수 없습니다.")
+    fetched = trader.get_many(["QQQ"], trader.get_backtest_data_period(start_date))
+    qqq = fetched.get("QQQ") if fetched else None
+    if qqq is None or len(qqq) == 0:
+        raise ValueError("QQQ 데이터를 가져올 수 없습니다.")
+
+    closes = np.concatenate(([data.prev_close], data.closes))
+    fridays = [week_friday(day) for day in data.days]
+    week_starts = [i for i in range(len(fridays)) if i == 0 or fridays[i] != fridays[i - 1]]
+    week_fridays = [fridays[i] for i in week_starts]
+
+    qqq_weekly = weekly_closes(qqq)
+    qqq_by_friday = {ts.date(): float(value) for ts, value in qqq_weekly.items()}
+    earlier = qqq_weekly[qqq_weekly.index < pd.Timestamp(week_fridays[0])]
+    if len(earlier) < RSI_WINDOW + 2 or any(friday not in qqq_by_friday for friday in week_fridays):
+        raise ValueError("QQQ 주간 종가가 부족해 주간 RSI를 다시 계산할 수 없습니다.")
+    qqq_closes = np.array([float(earlier.iloc[-1])] + [qqq_by_friday[friday] for friday in week_fridays])
+
+    historical = evaluate_config(data, sf_config or trader.sf_config, ag_config or trader.ag_config)
+    first_day = data.days[0]
+    return BootstrapSource(
+        soxl_returns=np.diff(np.log(closes)),
+        weekdays=np.array([day.weekday() for day in data.days], dtype=np.int64),
+        week_starts=np.array(week_starts + [len(data.days)], dtype=np.int64),
+        qqq_returns=np.diff(np.log(qqq_closes)),
+        qqq_warmup=earlier.to_numpy(dtype=np.float64)[-(RSI_WINDOW + 2):],
+        start_close=float(data.prev_close),
+        start_mode=int(data.modes[0]),
+        start_monday=first_day - timedelta(days=first_day.weekday()),
+        injections=data.injections,
+        initial_capital=data.initial_capital,
+        compounding=data.compounding,
+        historical_metrics=historical,
+    )
+
+
+def weekly_rsi(closes: np.ndarray, window: int = RSI_WINDOW) -> np.ndarray:
+    """
+    주간 종가 배열(마지막 축)의 RSI (rsi_reference.compute_completed_weeks와 같은 계산식, 소수 둘째 자리 반올림)
+    앞쪽 window개와 상승·하락이 모두 없는 주는 NaN
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    rsi = np.full(closes.shape, np.nan)
+    if closes.shape[-1] <= window:
+        return rsi
+    delta = np.lib.stride_tricks.sliding_window_view(np.diff(closes, axis=-1), window, axis=-1)
+    gain = np.where(delta > 0, delta, 0.0).sum(axis=-1) / window
+    loss = -np.where(delta < 0, delta, 0.0).sum(axis=-1) / window
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(loss == 0, np.where(gain == 0, np.nan, 100.0), 100 - 100 / (1 + gain / loss))
+    rsi[..., window:] = np.round(values, 2)
+    return rsi
+
+
+def matched_mode_codes(one_week_rsi: np.ndarray, two_weeks_rsi: np.ndarray) -> np.ndarray:
+    """
+    SOXLQuantTrader._is_mode_case_matched의 배열 버전
+    Returns:
+        np.ndarray: MODE_SF / MODE_AG, 조건에 해당하지 않거나 RSI가 없으면 -1
+    """
+    current, prev = one_week_rsi, two_weeks_rsi
+    with np.errstate(invalid="ignore"):
+        safe = ((prev > 65) & (prev > current)) | ((40 < prev) & (prev < 50) & (prev > current)) | ((prev >= 50) & (current < 50))
+        aggressive = ((prev < 50) & (prev < current) & (current > 50)) | ((50 < prev) & (prev < 60) & (prev < current)) | ((prev < 35) & (prev < current))
+    return np.where(safe, MODE_SF, np.where(aggressive, MODE_AG, -1)).astype(np.int8)
+
+
+def week_mode_codes(qqq_weekly_closes: np.ndarray, start_mode: int) -> np.ndarray:
+    """
+    워밍업 + 가상 주간 종가(경로, RSI_WINDOW + 2 + 주차 수)로 주차별 모드 코드 계산
+    첫 주차는 start_mode, 이후 주차는 1주전/2주전 RSI 조건 모드, 해당 없으면 이전 주차 모드 유지
+    """
+    warmup = RSI_WINDOW + 2
+    rsi = weekly_rsi(qqq_weekly_closes)
+    # 주차 w의 1주전 RSI는 종가 인덱스 warmup + w - 1, 2주전은 warmup + w - 2
+    n_weeks = qqq_weekly_closes.shape[-1] - warmup
+    one_week = rsi[..., warmup - 1:warmup - 1 + n_weeks]
+    two_weeks = rsi[..., warmup - 2:warmup - 2 + n_weeks]
+    matched = matched_mode_codes(one_week, two_weeks)
+    matched[..., 0] = start_mode
+    # 해당 없는 주차는 직전 해당 주차의 모드로 채움 (전방 채우기)
+    positions = np.where(matched >= 0, np.arange(n_weeks), 0)
+    np.maximum.accumulate(positions, axis=-1, out=positions)
+    return np.take_along_axis(matched, positions, axis=-1)
+
+
+def generate_paths(source: BootstrapSource, n_paths: int, block_weeks: int = DEFAULT_BLOCK_WEEKS, rng=None):
+    """
+    블록 부트스트랩 가상 경로 생성
+    과거 주차를 순환 블록(연속 block_weeks주) 단위로 뽑아 원래 봉 수가 찰 때까지 이어 붙인다.
+    Returns:
+        tuple: (종가, 모드 코드, 날짜 ordinal) 각각 (n_paths, 봉 수)
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n_bars, n_weeks = source.n_bars, source.n_weeks
+    block_weeks = max(1, min(block_weeks, n_weeks))
+    week_lengths = np.diff(source.week_starts)
+    # 가장 짧은 주로만 채워도 봉 수가 차도록 넉넉히 뽑는다
+    max_weeks = int(math.ceil(n_bars / max(1, week_lengths.min()))) + block_weeks
+    n_blocks = int(math.ceil(max_weeks / block_weeks))
+
+    closes = np.empty((n_paths, n_bars))
+    modes = np.empty((n_paths, n_bars), dtype=np.int8)
+    ordinals = np.empty((n_paths, n_bars), dtype=np.int64)
+    base_ordinal = source.start_monday.toordinal()
+    warmup = np.log(source.qqq_warmup)
+    for k in range(n_paths):
+        starts = rng.integers(0, n_weeks, size=n_blocks)
+        weeks = ((starts[:, None] + np.arange(block_weeks)) % n_weeks).ravel()
+        lengths = week_lengths[weeks]
+        used = int(np.searchsorted(np.cumsum(lengths), n_bars)) + 1
+        weeks, lengths = weeks[:used], lengths[:used]
+
+        bars = np.concatenate([np.arange(source.week_starts[w], source.week_starts[w + 1]) for w in weeks])[:n_bars]
+        bar_week = np.repeat(np.arange(used), lengths)[:n_bars]
+        closes[k] = source.start_close * np.exp(np.cumsum(source.soxl_returns[bars]))
+        ordinals[k] = base_ordinal + 7 * bar_week + source.weekdays[bars]
+
+        qqq_weekly = np.exp(np.concatenate((warmup, warmup[-1] + np.cumsum(source.qqq_returns[weeks]))))
+        modes[k] = week_mode_codes(qqq_weekly, source.start_mode)[bar_week]
+    return closes, modes, ordinals
+
+
+def batch_metrics(equity: np.ndarray, initial_capital: float) -> Dict[str, np.ndarray]:
+    """(경로, 봉) 총자산 배열의 경로별 총수익률·CAGR·MDD(%)·최종자산 (performance_metrics 2차원 계산)"""
+    metrics = compute_metrics(equity, initial_capital=initial_capital)
+    return {
+        "total_return": metrics["total_return"],
+        "cagr": metrics["cagr"],
+        "mdd": metrics["mdd_percent"],
+        "final_value": metrics["final_value"],
+    }
+
+
+def simulate_batch(source: BootstrapSource, params, n_paths: int, block_weeks: int, seed, use_numba=None) -> pd.DataFrame:
+    """경로 묶음 하나 생성·실행 후 경로별 지표 반환"""
+    closes, modes, ordinals = generate_paths(source, n_paths, block_weeks, np.random.default_rng(seed))
+    equity, trade_counts = run_kernel_batch(
+        closes,
+        modes,
+        np.arange(1, source.n_bars + 1, dtype=np.int64),
+        params,
+        initial_cash=source.initial_capital,
+        prev_close=source.start_close,
+        ordinals=ordinals,
+        injections=source.injections,
+        compounding=source.compounding,
+        use_numba=use_numba,
+    )
+    table = pd.DataFrame(batch_metrics(equity, source.initial_capital))
+    table["trades"] = trade_counts
+    return table
+
+
+_WORKER_SHARED = {}
+
+
+def _init_worker(source: BootstrapSource, params, block_weeks: int, use_numba):
+    """프로세스 풀 워커 초기화: 재표본 원천을 프로세스당 한 번만 받아 둔다"""
+    _WORKER_SHARED.update(source=source, params=params, block_weeks=block_weeks, use_numba=use_numba)
+
+
+def _simulate_batch_in_worker(job):
+    n_paths, seed = job
+    shared = _WORKER_SHARED
+    return simulate_batch(shared["source"], shared["params"], n_paths, shared["block_weeks"], seed, shared["use_numba"])
+
+
+def run_monte_carlo(
+    source: BootstrapSource,
+    sf_config: Dict,
+    ag_config: Dict,
+    n_paths: int = 1000,
+    block_weeks: int = DEFAULT_BLOCK_WEEKS,
+    seed: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: Optional[int] = None,
+    use_numba: Optional[bool] = None,
+) -> pd.DataFrame:
+    """
+    가상 경로 n_paths개에서 전략 실행
+    묶음마다 SeedSequence에서 나눈 독립 시드를 쓰므로 같은 seed·batch_size면 워커 수와 무관하게 같은 결과다.
+    Args:
+        max_workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 순서대로 실행)
+    Returns:
+        pd.DataFrame: 경로별 total_return/cagr/mdd(%)/final_value/trades (경로 생성 순서)
+    """
+    if n_paths <= 0:
+        raise ValueError("경로 수는 1 이상이어야 합니다.")
+    params = mode_params(sf_config, ag_config)
+    sizes = [min(batch_size, n_paths - start) for start in range(0, n_paths, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = list(zip(sizes, seeds))
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+
+    if max_workers == 1:
+        tables = [simulate_batch(source, params, size, block_weeks, batch_seed, use_numba) for size, batch_seed in jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(source, params, block_weeks, use_numba)
+        ) as pool:
+            tables = list(pool.map(_simulate_batch_in_worker, jobs))
+    return pd.concat(tables, ignore_index=True)
+
+
+def summarize_distribution(table: pd.DataFrame, percentiles: Sequence[int] = DISTRIBUTION_PERCENTILES) -> pd.DataFrame:
+    """
+    지표별 분포 요약
+    Returns:
+        pd.DataFrame: 행=total_return/cagr/mdd, 열=mean, p5... (백분위)
+    """
+    rows = {}
+    for column in ("total_return", "cagr", "mdd"):
+        values = table[column].to_numpy(dtype=np.float64)
+        row = {"mean": float(values.mean())}
+        for q, value in zip(percentiles, np.percentile(values, percentiles)):
+            row[f"p{q}"] = float(value)
+        rows[column] = row
+    summary = pd.DataFrame.from_dict(rows, orient="index")
+    summary["loss_probability"] = [float((table["total_return"] < 0).mean())] + [np.nan, np.nan]
+    return summary
+
+
+def main(argv: Optional[List[str]] = None):
+    """CLI: 파라미터.xlsx(없으면 기본 설정) 전략을 부트스트랩 경로에서 실행해 분포 출력"""
+    import argparse
+
+    from parameter_sweep import save_table, trader_from_args
+
+    if sys.stdout.encoding != "utf-8":
+        try:
+            sys.stdout.reconfigure(encoding="utf-8")
+        except Exception:
+            pass
+
+    parser = argparse.ArgumentParser(description="SF/AG 전략 블록 부트스트랩 몬테카를로")
+    parser.add_argument("--start", default="2011-01-01", help="원천 구간 시작일 YYYY-MM-DD")
+    parser.add_argument("--end", default="", help="원천 구간 종료일 YYYY-MM-DD (기본: 최신 거래일)")
+    parser.add_argument("--capital", "-c", type=float, default=40000, help="초기자본 ($)")
+    parser.add_argument("--params", default="파라미터.xlsx", help="전략 파라미터 엑셀 (없으면 기본 설정)")
+    parser.add_argument("--paths", type=int, default=1000, help="가상 경로 수")
+    parser.add_argument("--block-weeks", type=int, default=DEFAULT_BLOCK_WEEKS, help="부트스트랩 블록 길이 (주)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="한 번에 실행할 경로 수")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--output", "-o", default="", help="경로별 결과 저장 경로 (.csv 또는 .xlsx)")
+    args = parser.parse_args(argv)
+
+    trader = trader_from_args(args)
+    try:
+        with trader.quiet_logging():
+            source = prepare_bootstrap_source(trader, args.start, args.end or None)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    print(f"📅 원천 구간: {source.n_bars}봉 / {source.n_weeks}주, 블록 {args.block_weeks}주")
+    print(f"🔄 가상 경로 {args.paths:,}개 실행 중...")
+    started = datetime.now()
+    table = run_monte_carlo(
+        source, trader.sf_config, trader.ag_config, n_paths=args.paths, block_weeks=args.block_weeks,
+        seed=args.seed, batch_size=args.batch_size, max_workers=args.workers,
+    )
+    print(f"✅ 완료: {(datetime.now() - started).total_seconds():.1f}초")
+
+    historical = source.historical_metrics
+    print(f"\n📈 과거 경로: 총수익률 {historical['total_return']:+.2f}%, CAGR {historical['cagr']:+.2f}%, MDD {historical['mdd']:.2f}%")
+    print(f"   과거 총수익률 백분위: {(table['total_return'] < historical['total_return']).mean() * 100:.0f}%")
+    with pd.option_context("display.float_format", "{:,.2f}".format):
+        print(summarize_distribution(table).to_string())
+
+    if args.output:
+        save_table(table, args.output)
+
+
+if __name__ == "__main__":
+    main()
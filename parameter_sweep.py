@@ -0,0 +1,407 @@
+"""
+SF/AG 파라미터 탐색 (그리드·무작위 샘플, 프로세스 풀 병렬)
+
+파라미터.xlsx를 고쳐 backtester_soxl_excel.py를 한 번씩 다시 돌리는 대신, 여러 sf_config/ag_config
+조합을 backtest_kernel 위에서 한꺼번에 실행해 총수익률·CAGR·MDD 순위표를 만든다.
+
+- prepare_sweep_data: 트레이더로 기간 일봉·주차별 모드를 한 번만 조회해 커널 입력 배열(SweepData)로 변환
+- grid_configs / random_configs: 기준 설정에 "sf.buy_threshold" 형식 키의 값을 덮어쓴 조합 목록 생성
+- run_sweep: 조합별 커널 실행 (입력 배열은 워커마다 한 번만 전달) 후 총수익률 내림차순 DataFrame 반환
+
+모드는 QQQ 주간 RSI로만 정해지므로 모든 조합이 같은 모드 배열을 공유한다. 커널 범위 밖인
+스냅샷 재개·날짜별 전략 변형은 다루지 않는다 (run_backtest 사용).
+
+사용법:
+  python parameter_sweep.py --start 2018-01-01 --end 2026-02-27 --grid sf.buy_threshold=3,3.5,4 --grid ag.sell_threshold=2.5,3.5
+  python parameter_sweep.py --random sf.sell_threshold=0.5:3 --random sf.max_hold_days=20:45 --samples 2000 --seed 7
+"""
+
+import itertools
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest_kernel import CompoundingParams, mode_codes, mode_params, run_kernel, session_counts
+from performance_metrics import compute_metrics
+
+# 탐색 가능한 모드별 설정 항목 (split_ratios는 후보 비중 목록 중에서만 고른다)
+SWEEP_FIELDS = ("buy_threshold", "sell_threshold", "max_hold_days", "split_count", "split_ratios")
+INTEGER_FIELDS = ("max_hold_days", "split_count")
+
+RESULT_COLUMNS = ("total_return", "cagr", "mdd", "final_value", "trades")
+
+
+class SweepData(NamedTuple):
+    """모든 조합이 공유하는 봉 단위 커널 입력"""
+
+    days: Tuple[date, ...]
+    closes: np.ndarray
+    modes: np.ndarray
+    session_counts: np.ndarray
+    trading: np.ndarray
+    ordinals: np.ndarray
+    injections: np.ndarray
+    prev_close: Optional[float]
+    initial_capital: float
+    compounding: Optional[CompoundingParams]
+
+
+def compounding_params(trader) -> Optional[CompoundingParams]:
+    """트레이더의 손익 복리 설정을 커널 입력으로 변환 (사용 안 하면 None)"""
+    if not getattr(trader, "profit_loss_compounding_enabled", False):
+        return None
+    return CompoundingParams(
+        profit_rate=trader.profit_compounding_rate,
+        loss_rate=trader.loss_compounding_rate,
+        settlement_delay_days=trader.compounding_settlement_delay_days,
+        renewal_days=trader.compounding_reference_renewal_days,
+    )
+
+
+def prepare_sweep_data(trader, start_date: str, end_date: Optional[str] = None, timeline=None) -> SweepData:
+    """
+    트레이더 설정(초기자본, 시드증액, 손익 복리, 휴장일)으로 탐색 기간 커널 입력 생성
+    Args:
+        trader: SOXLQuantTrader (일봉·RSI 참조 데이터 조회에 사용, 상태는 바꾸지 않음)
+        start_date: 시작일 (YYYY-MM-DD)
+        end_date: 종료일 (None이면 확정된 최신 거래일)
+        timeline: 주차별 모드 타임라인 (None이면 trader.build_mode_timeline())
+    Returns:
+        SweepData
+    Raises:
+        ValueError: 일봉 조회 실패, 기간 내 데이터 없음, 모드를 정할 수 없는 주차가 있는 경우
+    """
+    loaded = trader._load_backtest_bars(start_date, end_date)
+    if "error" in loaded:
+        raise ValueError(loaded["error"])
+    soxl_data, start_dt, end_dt = loaded["soxl"], loaded["start_dt"], loaded["end_dt"]
+    bars = soxl_data[(soxl_data.index >= start_dt) & (soxl_data.index <= end_dt)]
+    if len(bars) == 0:
+        raise ValueError("해당 기간에 대한 데이터가 없습니다.")
+    prev_bars = soxl_data[soxl_data.index < start_dt]
+    prev_close = float(prev_bars["Close"].iloc[-1]) if len(prev_bars) else None
+
+    days = tuple(ts.date() for ts in bars.index)
+    if timeline is None:
+        timeline = trader._mode_timeline
+    if timeline is None:
+        timeline = trader.build_mode_timeline(through=days[-1])
+    modes = timeline.modes_for(days)
+    if None in modes:
+        missing = days[modes.index(None)]
+        raise ValueError(f"{missing} 주차의 모드를 정할 수 없습니다. RSI 참조 데이터를 확인해주세요.")
+
+    trading = np.array([trader.is_trading_day(day) for day in days], dtype=np.bool_)
+    injections = np.zeros(len(days), dtype=np.float64)
+    trading_index = np.flatnonzero(trading)
+    for seed in trader.seed_increases:
+        seed_day = datetime.strptime(seed["date"], "%Y-%m-%d").date()
+        # 시드증액은 해당 날짜 이후 첫 거래일 봉에 반영 (시작일 이전 시드는 첫 거래일)
+        for i in trading_index:
+            if days[i] >= seed_day:
+                injections[i] += float(seed.get("amount", 0) or 0)
+                break
+
+    return SweepData(
+        days=days,
+        closes=bars["Close"].to_numpy(dtype=np.float64),
+        modes=mode_codes(modes),
+        session_counts=session_counts(days, trader.us_holidays),
+        trading=trading,
+        ordinals=np.array([day.toordinal() for day in days], dtype=np.int64),
+        injections=injections,
+        prev_close=prev_close,
+        initial_capital=float(trader.initial_capital),
+        compounding=compounding_params(trader),
+    )
+
+
+def window_data(data: SweepData, start: int, stop: int) -> SweepData:
+    """
+    봉 구간 [start, stop)만 잘라낸 입력 (구간 시작에 초기자본으로 새로 시작하는 백테스트와 같음)
+    전일 종가는 구간 직전 봉 종가이고, 시드증액은 구간 안에 반영되는 것만 남는다.
+    """
+    prev_close = float(data.closes[start - 1]) if start > 0 else data.prev_close
+    return data._replace(
+        days=data.days[start:stop],
+        closes=data.closes[start:stop],
+        modes=data.modes[start:stop],
+        session_counts=data.session_counts[start:stop],
+        trading=data.trading[start:stop],
+        ordinals=data.ordinals[start:stop],
+        injections=data.injections[start:stop],
+        prev_close=prev_close,
+    )
+
+
+def _split_key(key: str) -> Tuple[str, str]:
+    mode, _, field = key.partition(".")
+    if mode not in ("sf", "ag") or field not in SWEEP_FIELDS:
+        raise ValueError(f"지원하지 않는 탐색 키입니다: {key} (예: sf.buy_threshold, ag.max_hold_days)")
+    return mode, field
+
+
+def apply_overrides(base_sf: Dict, base_ag: Dict, overrides: Dict) -> Tuple[Dict, Dict]:
+    """기준 설정 복사본에 {"sf.buy_threshold": 3.0, ...} 값을 덮어쓴 (sf_config, ag_config)"""
+    configs = {"sf": deepcopy(base_sf), "ag": deepcopy(base_ag)}
+    for key, value in overrides.items():
+        mode, field = _split_key(key)
+        if field == "split_ratios":
+            configs[mode][field] = [float(ratio) for ratio in value]
+        else:
+            configs[mode][field] = int(value) if field in INTEGER_FIELDS else float(value)
+    return configs["sf"], configs["ag"]
+
+
+def grid_configs(base_sf: Dict, base_ag: Dict, grid: Dict[str, Sequence]) -> List[Dict]:
+    """
+    그리드의 모든 조합 생성
+    Args:
+        grid: {"sf.buy_threshold": [3.0, 3.5], "ag.max_hold_days": [5, 7], "sf.split_ratios": [[...], [...]], ...}
+    Returns:
+        List[Dict]: [{"params": 덮어쓴 값, "sf_config": ..., "ag_config": ...}, ...] (빈 그리드면 기준 설정 1개)
+    """
+    keys = list(grid)
+    for key in keys:
+        _split_key(key)
+    configs = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        params = dict(zip(keys, values))
+        sf_config, ag_config = apply_overrides(base_sf, base_ag, params)
+        configs.append({"params": params, "sf_config": sf_config, "ag_config": ag_config})
+    return configs
+
+
+def random_configs(
+    base_sf: Dict, base_ag: Dict, space: Dict[str, Sequence], samples: int, seed: Optional[int] = None
+) -> List[Dict]:
+    """
+    무작위 샘플 조합 생성
+    Args:
+        space: {"sf.sell_threshold": (0.5, 3.0), ...} 구간(low, high) 또는 후보 값 목록(list)
+               구간은 정수 항목이면 양 끝 포함 정수, 실수 항목이면 소수 둘째 자리까지 균등 추출
+               split_ratios는 후보 비중 목록(list)만 가능
+        samples: 조합 수
+        seed: 난수 시드 (같은 시드면 같은 조합)
+    Returns:
+        List[Dict]: grid_configs와 같은 형식
+    """
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(samples):
+        params = {}
+        for key, choices in space.items():
+            _, field = _split_key(key)
+            if field == "split_ratios" and not isinstance(choices, list):
+                raise ValueError(f"{key}는 후보 비중 목록(list)으로 지정해야 합니다.")
+            if isinstance(choices, list):
+                params[key] = choices[int(rng.integers(len(choices)))]
+            elif field in INTEGER_FIELDS:
+                params[key] = int(rng.integers(int(choices[0]), int(choices[1]) + 1))
+            else:
+                params[key] = round(float(rng.uniform(choices[0], choices[1])), 2)
+        sf_config, ag_config = apply_overrides(base_sf, base_ag, params)
+        configs.append({"params": params, "sf_config": sf_config, "ag_config": ag_config})
+    return configs
+
+
+def equity_metrics(equity: np.ndarray, initial_capital: float, trading_days: int) -> Dict:
+    """
+    총자산 배열의 총수익률·CAGR·MDD (%)
+    MDD는 SOXLQuantTrader.calculate_mdd와 같은 고점 대비 최대 낙폭이다 (performance_metrics).
+    """
+    if len(equity) == 0:
+        return {"total_return": 0.0, "cagr": 0.0, "mdd": 0.0, "final_value": float(initial_capital)}
+    metrics = compute_metrics(equity, initial_capital=initial_capital, trading_days=trading_days)
+    return {
+        "total_return": metrics["total_return"],
+        "cagr": metrics["cagr"],
+        "mdd": metrics["mdd_percent"],
+        "final_value": metrics["final_value"],
+    }
+
+
+def evaluate_config(data: SweepData, sf_config: Dict, ag_config: Dict, use_numba: Optional[bool] = None) -> Dict:
+    """조합 하나를 커널로 실행해 성과 지표 반환"""
+    equity, trades = run_kernel(
+        data.closes,
+        data.modes,
+        data.session_counts,
+        mode_params(sf_config, ag_config),
+        initial_cash=data.initial_capital,
+        prev_close=data.prev_close,
+        trading=data.trading,
+        ordinals=data.ordinals,
+        injections=data.injections,
+        compounding=data.compounding,
+        use_numba=use_numba,
+    )
+    metrics = equity_metrics(equity, data.initial_capital, int(data.trading.sum()))
+    metrics["trades"] = int(len(trades))
+    return metrics
+
+
+_WORKER_SHARED = {}
+
+
+def _init_worker(data: SweepData, use_numba: Optional[bool]):
+    """프로세스 풀 워커 초기화: 공유 입력 배열을 프로세스당 한 번만 받아 둔다"""
+    _WORKER_SHARED["data"] = data
+    _WORKER_SHARED["use_numba"] = use_numba
+
+
+def _evaluate_chunk(chunk: List[Tuple[int, Dict, Dict]]) -> List[Tuple[int, Dict]]:
+    data, use_numba = _WORKER_SHARED["data"], _WORKER_SHARED["use_numba"]
+    return [(index, evaluate_config(data, sf, ag, use_numba)) for index, sf, ag in chunk]
+
+
+def run_sweep(
+    data: SweepData,
+    configs: Iterable[Dict],
+    max_workers: Optional[int] = None,
+    use_numba: Optional[bool] = None,
+    chunk_size: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    조합별 커널 실행 후 순위표 생성
+    Args:
+        data: prepare_sweep_data 결과 (워커마다 한 번만 전달)
+        configs: grid_configs/random_configs 결과
+        max_workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 순서대로 실행)
+        use_numba: run_kernel에 그대로 전달
+        chunk_size: 워커 작업 단위 조합 수 (None이면 워커당 약 4묶음)
+    Returns:
+        pd.DataFrame: 조합 키 열 + total_return/cagr/mdd(%)/final_value/trades, 총수익률 내림차순
+    """
+    configs = list(configs)
+    jobs = [(index, config["sf_config"], config["ag_config"]) for index, config in enumerate(configs)]
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs) or 1))
+
+    results: Dict[int, Dict] = {}
+    if max_workers == 1:
+        for index, sf_config, ag_config in jobs:
+            results[index] = evaluate_config(data, sf_config, ag_config, use_numba)
+    else:
+        chunk_size = chunk_size or max(1, math.ceil(len(jobs) / (max_workers * 4)))
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(data, use_numba)) as pool:
+            for chunk_results in pool.map(_evaluate_chunk, chunks):
+                results.update(chunk_results)
+
+    rows = [{**configs[index]["params"], **results[index]} for index in range(len(configs))]
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return pd.DataFrame(columns=list(RESULT_COLUMNS))
+    return table.sort_values("total_return", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def _parse_values(text: str) -> List[float]:
+    return [float(value) for value in text.split(",") if value.strip()]
+
+
+def _parse_assignment(text: str) -> Tuple[str, str]:
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise ValueError(f"'키=값' 형식이어야 합니다: {text}")
+    _split_key(key.strip())
+    return key.strip(), value.strip()
+
+
+def add_search_arguments(parser) -> None:
+    """기간·기준 설정·탐색 공간 CLI 인자 추가 (parameter_sweep, walk_forward 공용)"""
+    parser.add_argument("--start", default="2018-01-01", help="시작일 YYYY-MM-DD")
+    parser.add_argument("--end", default="", help="종료일 YYYY-MM-DD (기본: 최신 거래일)")
+    parser.add_argument("--capital", "-c", type=float, default=40000, help="초기자본 ($)")
+    parser.add_argument("--params", default="파라미터.xlsx", help="기준 파라미터 엑셀 (없으면 기본 설정)")
+    parser.add_argument("--grid", action="append", default=[], help="그리드 키=값1,값2,... (반복 가능)")
+    parser.add_argument("--random", action="append", default=[], help="무작위 키=최소:최대 또는 키=값1,값2 (반복 가능)")
+    parser.add_argument("--samples", type=int, default=1000, help="무작위 조합 수")
+    parser.add_argument("--seed", type=int, default=None, help="무작위 시드")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--output", "-o", default="", help="전체 결과 저장 경로 (.csv 또는 .xlsx)")
+
+
+def trader_from_args(args):
+    """--params 엑셀(없으면 기본 설정)과 --capital로 기준 트레이더 생성"""
+    from soxl_quant_system import SOXLQuantTrader
+
+    sf_config = ag_config = None
+    if os.path.exists(args.params):
+        from backtester_soxl_excel import load_parameters_from_excel
+
+        ag_config, sf_config = load_parameters_from_excel(args.params)
+    return SOXLQuantTrader(initial_capital=args.capital, sf_config=sf_config, ag_config=ag_config)
+
+
+def configs_from_args(args, trader) -> List[Dict]:
+    """--random이 있으면 무작위 샘플, 아니면 --grid 조합 (둘 다 없으면 기준 설정 1개)"""
+    if args.random:
+        space = {}
+        for text in args.random:
+            key, value = _parse_assignment(text)
+            if ":" in value:
+                low, high = value.split(":", 1)
+                space[key] = (float(low), float(high))
+            else:
+                space[key] = _parse_values(value)
+        return random_configs(trader.sf_config, trader.ag_config, space, args.samples, args.seed)
+    grid = dict(_parse_assignment(text) for text in args.grid)
+    return grid_configs(trader.sf_config, trader.ag_config, {k: _parse_values(v) for k, v in grid.items()})
+
+
+def save_table(table: pd.DataFrame, path: str) -> None:
+    """결과표를 .xlsx 또는 .csv로 저장"""
+    if path.lower().endswith(".xlsx"):
+        table.to_excel(path, index=False)
+    else:
+        table.to_csv(path, index=False, encoding="utf-8-sig")
+    print(f"📁 결과 저장: {path}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """CLI: 파라미터.xlsx(없으면 기본 설정)를 기준으로 그리드/무작위 탐색 후 상위 조합 출력"""
+    import argparse
+
+    if sys.stdout.encoding != "utf-8":
+        try:
+            sys.stdout.reconfigure(encoding="utf-8")
+        except Exception:
+            pass
+
+    parser = argparse.ArgumentParser(description="SF/AG 파라미터 탐색")
+    add_search_arguments(parser)
+    parser.add_argument("--top", type=int, default=20, help="출력할 상위 조합 수")
+    args = parser.parse_args(argv)
+
+    trader = trader_from_args(args)
+    try:
+        configs = configs_from_args(args, trader)
+        with trader.quiet_logging():
+            data = prepare_sweep_data(trader, args.start, args.end or None)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    print(f"📅 기간: {data.days[0]} ~ {data.days[-1]} ({int(data.trading.sum())}거래일)")
+    print(f"🔄 {len(configs):,}개 조합 실행 중...")
+    started = datetime.now()
+    table = run_sweep(data, configs, max_workers=args.workers)
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"✅ 완료: {elapsed:.1f}초")
+
+    with pd.option_context("display.max_columns", None, "display.width", 200, "display.float_format", "{:,.2f}".format):
+        print(table.head(args.top).to_string())
+
+    if args.output:
+        save_table(table, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+총자산(equity) 곡선 성과 지표 (NumPy 벡터 연산)
+
+고점 대비 낙폭(MDD)과 연평균 수익률(CAGR)을 여러 모듈이 각자 Python 루프로 계산하던 것을
+한 곳으로 모았다. 모든 함수는 마지막 축을 시간 축으로 보므로 1차원(곡선 하나)과
+2차원(경로 수, 봉 수) 배열을 같은 코드로 처리한다.
+
+- running_peak / drawdown_series: 누적 최고자산, 봉별 낙폭(%)
+- annualized_return: 거래일 252일 기준 CAGR(%)
+- compute_metrics: 총수익률, CAGR, MDD(최고자산일·최저일 포함), 샤프/소르티노, 수중 기간, 보유 비중을 한 번에 계산
+- mdd_info / metrics_from_records: 백테스트 daily_records용 (SOXLQuantTrader.calculate_mdd와 같은 결과 형식)
+- DrawdownTracker: 새 봉만 받아 고점·MDD를 이어서 갱신하는 온라인 누적기 (dict로 저장/복원, mdd_info와 같은 결과)
+
+고점은 0에서 시작하므로 첫 양수 자산이 첫 고점이 되고, 고점이 0 이하인 구간의 낙폭은 0이다.
+같은 MDD가 여러 번이면 가장 이른 날짜를, 같은 고점이 여러 번이면 처음 도달한 날짜를 쓴다.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 연환산 기준 거래일 수
+TRADING_DAYS_PER_YEAR = 252
+
+
+def running_peak(equity: np.ndarray) -> np.ndarray:
+    """누적 최고자산 (0부터 시작, 마지막 축 기준)"""
+    equity = np.asarray(equity, dtype=np.float64)
+    return np.maximum.accumulate(np.maximum(equity, 0.0), axis=-1)
+
+
+def drawdown_series(equity: np.ndarray, peaks: Optional[np.ndarray] = None) -> np.ndarray:
+    """봉별 고점 대비 낙폭 (%, 양수)"""
+    equity = np.asarray(equity, dtype=np.float64)
+    if peaks is None:
+        peaks = running_peak(equity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(peaks > 0, (peaks - equity) / peaks * 100, 0.0)
+
+
+def annualized_return(final_value, initial_capital, trading_days, periods_per_year: int = TRADING_DAYS_PER_YEAR):
+    """
+    연평균 수익률 (%), 거래일 수 / periods_per_year를 연수로 사용
+    최종자산이 0 이하이거나 기간이 0이면 0 (배열 입력이면 원소별)
+    """
+    final_value = np.asarray(final_value, dtype=np.float64)
+    years = np.asarray(trading_days, dtype=np.float64) / periods_per_year
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        growth = final_value / initial_capital
+        valid = (years > 0) & (growth > 0) & np.isfinite(growth)
+        cagr = np.where(valid, (np.where(valid, growth, 1.0) ** (1 / np.where(valid, years, 1.0)) - 1) * 100, 0.0)
+    return float(cagr) if cagr.ndim == 0 else cagr
+
+
+def _first_index_of_peak(equity: np.ndarray, peaks: np.ndarray) -> np.ndarray:
+    """봉별 현재 고점에 처음 도달한 봉 인덱스 (고점이 아직 없으면 -1)"""
+    prior = np.concatenate((np.zeros(peaks.shape[:-1] + (1,)), peaks[..., :-1]), axis=-1)
+    index = np.arange(equity.shape[-1])
+    new_high = np.where(equity > prior, index, -1)
+    return np.maximum.accumulate(new_high, axis=-1)
+
+
+def _longest_run(flags: np.ndarray) -> np.ndarray:
+    """마지막 축 기준 연속 True 최대 길이"""
+    index = np.arange(flags.shape[-1])
+    last_false = np.maximum.accumulate(np.where(flags, -1, index), axis=-1)
+    runs = np.where(flags, index - last_false, 0)
+    return runs.max(axis=-1) if runs.shape[-1] else np.zeros(flags.shape[:-1], dtype=np.int64)
+
+
+def _dates_at(dates, positions: np.ndarray):
+    if dates is None:
+        return None
+    dates = np.asarray(dates, dtype=object)
+    return np.where(positions >= 0, dates[np.maximum(positions, 0)], "")
+
+
+def compute_metrics(
+    equity: np.ndarray,
+    dates: Optional[Sequence[str]] = None,
+    initial_capital: Optional[float] = None,
+    trading_days=None,
+    holdings: Optional[np.ndarray] = None,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+) -> Dict:
+    """
+    총자산 곡선 성과 지표
+    Args:
+        equity: (봉 수,) 또는 (곡선 수, 봉 수) 총자산
+        dates: 봉 날짜 (있으면 *_date 항목 포함, 모든 곡선 공통)
+        initial_capital: 수익률 기준 금액 (None이면 곡선별 첫 총자산)
+        trading_days: CAGR 연수 계산용 거래일 수 (None이면 봉 수)
+        holdings: equity와 같은 모양의 보유 수량/평가금액 (있으면 exposure 포함)
+        periods_per_year: 연환산 봉 수
+    Returns:
+        Dict: 1차원 입력이면 스칼라, 2차원이면 곡선별 배열
+            final_value, total_return(%), cagr(%), mdd_percent(%), mdd_index, mdd_value, mdd_peak_index,
+            overall_peak_index, overall_peak_value, sharpe, sortino (봉 수익률 연환산, 시드증액 포함 그대로),
+            time_under_water(낙폭 > 0 봉 비율), max_time_under_water(최장 연속 봉 수), exposure(보유 봉 비율),
+            dates가 있으면 mdd_date, mdd_peak_date, overall_peak_date
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    single = equity.ndim == 1
+    curves = np.atleast_2d(equity)
+    n = curves.shape[-1]
+    if n == 0:
+        raise ValueError("총자산 배열이 비어 있습니다.")
+
+    peaks = running_peak(curves)
+    drawdowns = drawdown_series(curves, peaks)
+    mdd_index = drawdowns.argmax(axis=-1)
+    rows = np.arange(curves.shape[0])
+    mdd_percent = drawdowns[rows, mdd_index]
+    peak_index = _first_index_of_peak(curves, peaks)
+    mdd_peak_index = np.where(mdd_percent > 0, peak_index[rows, mdd_index], -1)
+    mdd_index = np.where(mdd_percent > 0, mdd_index, -1)
+    overall_peak_index = np.where(peaks[:, -1] > 0, peak_index[:, -1], -1)
+
+    base = curves[:, 0] if initial_capital is None else np.full(curves.shape[0], float(initial_capital))
+    final_value = curves[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total_return = np.where(base != 0, (final_value - base) / base * 100, 0.0)
+    cagr = annualized_return(final_value, base, n if trading_days is None else trading_days, periods_per_year)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(curves[:, :-1] > 0, curves[:, 1:] / curves[:, :-1] - 1, 0.0)
+    if returns.shape[-1] >= 2:
+        mean = returns.mean(axis=-1)
+        std = returns.std(axis=-1, ddof=1)
+        downside = np.sqrt((np.minimum(returns, 0.0) ** 2).mean(axis=-1))
+        scale = np.sqrt(periods_per_year)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std > 0, mean / std * scale, 0.0)
+            sortino = np.where(downside > 0, mean / downside * scale, 0.0)
+    else:
+        sharpe = sortino = np.zeros(curves.shape[0])
+
+    under_water = drawdowns > 0
+    metrics = {
+        "final_value": final_value,
+        "total_return": total_return,
+        "cagr": np.broadcast_to(cagr, final_value.shape),
+        "mdd_percent": mdd_percent,
+        "mdd_index": mdd_index,
+        "mdd_value": np.where(mdd_index >= 0, curves[rows, np.maximum(mdd_index, 0)], 0.0),
+        "mdd_peak_index": mdd_peak_index,
+        "overall_peak_index": overall_peak_index,
+        "overall_peak_value": peaks[:, -1],
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "time_under_water": under_water.mean(axis=-1),
+        "max_time_under_water": _longest_run(under_water),
+    }
+    if holdings is not None:
+        metrics["exposure"] = (np.atleast_2d(np.asarray(holdings, dtype=np.float64)) > 0).mean(axis=-1)
+    if dates is not None:
+        metrics["mdd_date"] = _dates_at(dates, mdd_index)
+        metrics["mdd_peak_date"] = _dates_at(dates, mdd_peak_index)
+        metrics["overall_peak_date"] = _dates_at(dates, overall_peak_index)
+
+    if single:
+        return {key: value[0].item() if hasattr(value[0], "item") else value[0] for key, value in metrics.items()}
+    return metrics
+
+
+def metrics_from_records(daily_records: List[Dict], initial_capital: Optional[float] = None, trading_days=None) -> Dict:
+    """백테스트 daily_records(total_assets, date, holdings)로 compute_metrics 실행 (빈 목록이면 {})"""
+    if not daily_records:
+        return {}
+    equity = np.fromiter((float(record.get("total_assets", 0.0) or 0.0) for record in daily_records), dtype=np.float64, count=len(daily_records))
+    dates = [record.get("date", "") for record in daily_records]
+    holdings = None
+    if all("holdings" in record for record in daily_records):
+        holdings = np.fromiter((float(record["holdings"] or 0) for record in daily_records), dtype=np.float64, count=len(daily_records))
+    return compute_metrics(equity, dates, initial_capital, trading_days, holdings)
+
+
+def mdd_info(daily_records: List[Dict]) -> Dict:
+    """
+    daily_records의 MDD 정보 (SOXLQuantTrader.calculate_mdd 결과 형식)
+    Returns:
+        Dict: mdd_percent, mdd_date, mdd_value, mdd_peak_date, overall_peak_date, overall_peak_value
+    """
+    if not daily_records:
+        return {
+            "mdd_percent": 0.0,
+            "mdd_date": "",
+            "mdd_value": 0.0,
+            "mdd_peak_date": "",
+            "overall_peak_date": "",
+            "overall_peak_value": 0.0,
+        }
+    metrics = metrics_from_records(daily_records)
+    return {key: metrics[key] for key in ("mdd_percent", "mdd_date", "mdd_value", "mdd_peak_date", "overall_peak_date", "overall_peak_value")}
+
+
+class DrawdownTracker:
+    """
+    온라인 MDD 누적기: 봉을 순서대로 받아 고점·최대 낙폭·날짜를 갱신 (봉당 O(1))
+    전체 daily_records를 한 번에 넣은 mdd_info와 같은 결과이며, to_dict/from_dict로 스냅샷에 저장해
+    다음 실행에서 last_date 이후 봉만 이어서 넣는다.
+    """
+
+    __slots__ = ("peak_value", "peak_date", "mdd_percent", "mdd_date", "mdd_value", "mdd_peak_date", "last_date", "bars")
+
+    def __init__(self):
+        self.peak_value = 0.0
+        self.peak_date = ""
+        self.mdd_percent = 0.0
+        self.mdd_date = ""
+        self.mdd_value = 0.0
+        self.mdd_peak_date = ""
+        self.last_date = ""
+        self.bars = 0
+
+    def update(self, date: str, value: float) -> None:
+        """봉 하나 반영 (고점은 처음 도달한 날짜, 같은 MDD는 가장 이른 날짜 유지)"""
+        if value > self.peak_value:
+            self.peak_value = value
+            self.peak_date = date
+        if self.peak_value > 0:
+            drawdown = (self.peak_value - value) / self.peak_value * 100
+            if drawdown > self.mdd_percent:
+                self.mdd_percent = drawdown
+                self.mdd_date = date
+                self.mdd_value = value
+                self.mdd_peak_date = self.peak_date
+        self.last_date = date
+        self.bars += 1
+
+    def update_records(self, daily_records: List[Dict]) -> int:
+        """
+        daily_records 중 last_date 이후 봉만 반영
+        Returns:
+            int: 반영한 봉 수
+        """
+        added = 0
+        for record in daily_records:
+            date = str(record.get("date", ""))
+            if self.last_date and date <= self.last_date:
+                continue
+            self.update(date, float(record.get("total_assets", 0.0) or 0.0))
+            added += 1
+        return added
+
+    def mdd_info(self) -> Dict:
+        """mdd_info(daily_records)와 같은 형식의 결과"""
+        return {
+            "mdd_percent": self.mdd_percent,
+            "mdd_date": self.mdd_date,
+            "mdd_value": self.mdd_value,
+            "mdd_peak_date": self.mdd_peak_date,
+            "overall_peak_date": self.peak_date,
+            "overall_peak_value": self.peak_value,
+        }
+
+    def to_dict(self) -> Dict:
+        """JSON 저장용 dict"""
+        return {
+            "peakValue": self.peak_value,
+            "peakDate": self.peak_date,
+            "mddPercent": self.mdd_percent,
+            "mddDate": self.mdd_date,
+            "mddValue": self.mdd_value,
+            "mddPeakDate": self.mdd_peak_date,
+            "lastDate": self.last_date,
+            "bars": self.bars,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DrawdownTracker":
+        """to_dict 결과로 복원 (형식이 맞지 않으면 ValueError)"""
+        tracker = cls()
+        try:
+            tracker.peak_value = float(data["peakValue"])
+            tracker.peak_date = str(data["peakDate"])
+            tracker.mdd_percent = float(data["mddPercent"])
+            tracker.mdd_date = str(data["mddDate"])
+            tracker.mdd_value = float(data["mddValue"])
+            tracker.mdd_peak_date = str(data["mddPeakDate"])
+            tracker.last_date = str(data["lastDate"])
+            tracker.bars = int(data.get("bars", 0))
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"MDD 누적기 형식이 올바르지 않습니다: {e}") from e
+        return tracker
+
+    def __repr__(self) -> str:
+        return f"DrawdownTracker(mdd={self.mdd_percent:.2f}%, peak={self.peak_value:.2f}, last={self.last_date or '-'})"
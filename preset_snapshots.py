@@ -0,0 +1,524 @@
+"""
+프리셋 스냅샷 시뮬레이션 (Streamlit 세션 없이 호출할 수 있는 부분)
+
+app.py의 자동 스냅샷 저장은 프리셋마다 임시 트레이더로 시뮬레이션해 저장용 스냅샷(보유 포지션, 현금잔고,
+복리 시드, 최대 MDD와 MDD 누적기)을 만든다. 세션 설정(sf/ag 설정, 테스트 날짜)은 호출 측이 settings로 넘긴다.
+
+- configure_app_trader: 앱 공통 손익 복리 설정 적용
+- build_snapshot_from_positions: 트레이더 보유 포지션 → 저장용 스냅샷
+- simulate_preset_snapshot: 프리셋 하나 시뮬레이션 → (스냅샷, 오류 메시지)
+- prepare_preset_shared_data / simulate_presets: 공용 일봉·RSI 참조 데이터·모드 타임라인을 한 번만 준비하고
+  전체 프리셋을 스레드 풀에서 동시에 시뮬레이션
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import pandas as pd
+
+from market_data import run_concurrently
+from performance_metrics import DrawdownTracker
+from soxl_quant_system import SOXLQuantTrader
+
+logger = logging.getLogger(__name__)
+
+APP_COMPOUNDING_ENABLED = True
+APP_PROFIT_COMPOUNDING_RATE = 0.70
+APP_LOSS_COMPOUNDING_RATE = 0.20
+APP_COMPOUNDING_SETTLEMENT_DAYS = 7
+APP_COMPOUNDING_RENEWAL_DAYS = 10
+
+MAX_MDD_KEY = "maxMdd"
+MDD_CALCULATION_VERSION = "full_history_v1"
+MDD_TRACKER_KEY = "mddTracker"
+
+
+def configure_app_trader(trader: SOXLQuantTrader) -> SOXLQuantTrader:
+    if hasattr(trader, "set_profit_loss_compounding"):
+        trader.set_profit_loss_compounding(
+            enabled=APP_COMPOUNDING_ENABLED,
+            profit_rate=APP_PROFIT_COMPOUNDING_RATE,
+            loss_rate=APP_LOSS_COMPOUNDING_RATE,
+            settlement_delay_days=APP_COMPOUNDING_SETTLEMENT_DAYS,
+            renewal_days=APP_COMPOUNDING_RENEWAL_DAYS,
+        )
+    return trader
+
+def is_snapshot_position(key: str, value: object) -> bool:
+    if not isinstance(key, str) or "_" not in key or not isinstance(value, dict):
+        return False
+    _, date_str = key.split("_", 1)
+    try:
+        datetime.strptime(date_str, "%Y-%m-%d")
+        return int(value.get("shares", 0) or 0) > 0
+    except Exception:
+        return False
+
+def snapshot_has_positions(snapshot: dict) -> bool:
+    return any(
+        is_snapshot_position(key, value)
+        for key, value in (snapshot or {}).items()
+    )
+
+def snapshot_position_items(snapshot: dict) -> list:
+    return [
+        (key, value)
+        for key, value in (snapshot or {}).items()
+        if is_snapshot_position(key, value)
+    ]
+
+def snapshot_max_mdd(snapshot: dict) -> dict:
+    if not isinstance(snapshot, dict):
+        return {}
+    raw = snapshot.get(MAX_MDD_KEY)
+    if not isinstance(raw, dict):
+        return {}
+    try:
+        percent = float(raw.get("percent", 0.0) or 0.0)
+    except Exception:
+        percent = 0.0
+    if percent <= 0:
+        return {}
+    result = dict(raw)
+    result["percent"] = percent
+    return result
+
+def snapshot_max_mdd_percent(snapshot: dict) -> float:
+    return float(snapshot_max_mdd(snapshot).get("percent", 0.0) or 0.0)
+
+def merge_snapshot_max_mdd(snapshot: dict, previous_snapshot: dict) -> dict:
+    if not isinstance(snapshot, dict):
+        return snapshot
+    current_info = snapshot_max_mdd(snapshot)
+    previous_info = snapshot_max_mdd(previous_snapshot)
+    current_version = current_info.get("calculationVersion")
+    previous_version = previous_info.get("calculationVersion")
+    if previous_info and not current_info:
+        snapshot[MAX_MDD_KEY] = previous_info
+    elif (
+        previous_info
+        and current_version == previous_version
+        and previous_info.get("percent", 0.0) > current_info.get("percent", 0.0)
+    ):
+        snapshot[MAX_MDD_KEY] = previous_info
+    previous_tracker = (previous_snapshot or {}).get(MDD_TRACKER_KEY) if isinstance(previous_snapshot, dict) else None
+    if MDD_TRACKER_KEY not in snapshot and isinstance(previous_tracker, dict):
+        snapshot[MDD_TRACKER_KEY] = dict(previous_tracker)
+    return snapshot
+
+def make_max_mdd_record(
+    preset_name: str,
+    mdd_info: dict,
+    current_price: Optional[float] = None,
+) -> dict:
+    try:
+        percent = float((mdd_info or {}).get("mdd_percent", 0.0) or 0.0)
+    except Exception:
+        percent = 0.0
+    if percent <= 0:
+        return {}
+
+    record = {
+        "percent": round(percent, 4),
+        "date": str((mdd_info or {}).get("mdd_date") or datetime.now().strftime("%Y-%m-%d")),
+        "updatedAt": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "preset": str(preset_name or ""),
+    }
+    calculation_version = str((mdd_info or {}).get("calculation_version") or "").strip()
+    if calculation_version:
+        record["calculationVersion"] = calculation_version
+    if (mdd_info or {}).get("mdd_value") is not None:
+        record["value"] = float((mdd_info or {}).get("mdd_value") or 0.0)
+    if (mdd_info or {}).get("mdd_peak_date"):
+        record["peakDate"] = str((mdd_info or {}).get("mdd_peak_date"))
+    if (mdd_info or {}).get("overall_peak_value") is not None:
+        record["peakValue"] = float((mdd_info or {}).get("overall_peak_value") or 0.0)
+    if current_price is not None:
+        try:
+            record["soxlPrice"] = round(float(current_price), 4)
+        except Exception:
+            pass
+    return record
+
+def apply_max_mdd_record(snapshot: dict, record: dict) -> bool:
+    if not isinstance(snapshot, dict) or not isinstance(record, dict):
+        return False
+    try:
+        new_percent = float(record.get("percent", 0.0) or 0.0)
+    except Exception:
+        new_percent = 0.0
+    current = snapshot_max_mdd(snapshot)
+    new_version = record.get("calculationVersion")
+    current_version = current.get("calculationVersion")
+    if new_version and new_version != current_version:
+        snapshot[MAX_MDD_KEY] = record
+        return True
+    if new_percent <= snapshot_max_mdd_percent(snapshot):
+        return False
+    snapshot[MAX_MDD_KEY] = record
+    return True
+
+def record_snapshot_max_mdd(
+    preset_name: str,
+    snapshot: dict,
+    mdd_info: dict,
+    current_price: Optional[float] = None,
+) -> tuple:
+    if not preset_name or not isinstance(snapshot, dict):
+        return snapshot, snapshot_max_mdd(snapshot), False
+    record = make_max_mdd_record(preset_name, mdd_info, current_price)
+    changed = apply_max_mdd_record(snapshot, record)
+    return snapshot, snapshot_max_mdd(snapshot), changed
+
+def build_portfolio_mdd_records(
+    sim_result: dict,
+    portfolio: dict,
+    snapshot: dict,
+    current_date: str,
+    positions: list = None,
+) -> list:
+    """Build MDD records without inventing a historical peak from current cost basis."""
+    records = []
+
+    if isinstance(sim_result, dict):
+        for record in sim_result.get("daily_records", []) or []:
+            if isinstance(record, dict) and "total_assets" in record:
+                records.append(record)
+
+    current_assets = float(portfolio.get("total_portfolio_value", 0.0) or 0.0)
+    if current_assets > 0:
+        records.append({
+            "date": current_date or datetime.now().strftime("%Y-%m-%d"),
+            "total_assets": current_assets,
+            "source": "current_portfolio",
+        })
+
+    return records
+
+def calculate_trader_live_mdd_info(
+    trader: SOXLQuantTrader,
+    sim_result: dict,
+    snapshot: dict,
+) -> tuple:
+    try:
+        soxl_data = trader.get_stock_data("SOXL", "1mo")
+        if soxl_data is None or len(soxl_data) == 0:
+            return {}, None
+        current_price = float(soxl_data.iloc[-1]["Close"])
+        current_date = soxl_data.index[-1].strftime("%Y-%m-%d")
+        total_position_value = sum(
+            float(pos.get("shares", 0) or 0) * current_price
+            for pos in trader.positions
+        )
+        total_invested = sum(float(pos.get("amount", 0.0) or 0.0) for pos in trader.positions)
+        portfolio = {
+            "total_invested": total_invested,
+            "total_position_value": total_position_value,
+            "unrealized_pnl": total_position_value - total_invested,
+            "available_cash": float(getattr(trader, "available_cash", 0.0) or 0.0),
+            "total_portfolio_value": float(getattr(trader, "available_cash", 0.0) or 0.0) + total_position_value,
+        }
+        mdd_records = build_portfolio_mdd_records(
+            sim_result,
+            portfolio,
+            snapshot,
+            current_date,
+            trader.positions,
+        )
+        return trader.calculate_mdd(mdd_records), current_price
+    except Exception:
+        return {}, None
+
+def make_preset_trader(preset: dict, settings: dict, shared: Optional[dict] = None) -> SOXLQuantTrader:
+    """
+    프리셋용 임시 트레이더 생성.
+    shared가 있으면 미리 받은 일봉·RSI 참조 데이터·모드 타임라인을 주입해 프리셋마다 다시 조회하지 않는다.
+    """
+    trader = SOXLQuantTrader(
+        initial_capital=preset['initial_capital'],
+        sf_config=settings.get('sf_config'),
+        ag_config=settings.get('ag_config'),
+    )
+    configure_app_trader(trader)
+    trader.session_start_date = preset.get('session_start_date')
+    trader.set_seed_increases(preset.get('seed_increases') or [])
+    if settings.get('test_today_override'):
+        trader.set_test_today(settings['test_today_override'])
+    trader.clear_cache()
+    if shared:
+        trader.preload_stock_data(shared.get("bars") or {})
+        if shared.get("rsi_reference") is not None:
+            trader.use_rsi_reference(shared["rsi_reference"])
+        trader.use_mode_timeline(shared.get("mode_timeline"))
+    return trader
+
+def preset_mdd_fingerprint(preset: dict, settings: dict) -> str:
+    """MDD 누적기를 이어서 쓸 수 있는 설정인지 가리는 지문. 설정이 바뀌면 전체 기간을 다시 계산한다."""
+    payload = {
+        "version": MDD_CALCULATION_VERSION,
+        "initial_capital": preset.get('initial_capital'),
+        "session_start_date": preset.get('session_start_date'),
+        "seed_increases": preset.get('seed_increases') or [],
+        "sf_config": settings.get('sf_config'),
+        "ag_config": settings.get('ag_config'),
+        "compounding": [
+            APP_COMPOUNDING_ENABLED,
+            APP_PROFIT_COMPOUNDING_RATE,
+            APP_LOSS_COMPOUNDING_RATE,
+            APP_COMPOUNDING_SETTLEMENT_DAYS,
+            APP_COMPOUNDING_RENEWAL_DAYS,
+        ],
+        "test_today": settings.get('test_today_override'),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+def snapshot_mdd_tracker(snapshot: dict, fingerprint: str) -> Optional[DrawdownTracker]:
+    """스냅샷에 저장된 MDD 누적기 (지문이 다르거나 형식이 깨졌으면 None)"""
+    raw = (snapshot or {}).get(MDD_TRACKER_KEY) if isinstance(snapshot, dict) else None
+    if not isinstance(raw, dict) or raw.get("fingerprint") != fingerprint:
+        return None
+    try:
+        return DrawdownTracker.from_dict(raw)
+    except ValueError:
+        return None
+
+def store_snapshot_mdd_tracker(snapshot: dict, tracker: DrawdownTracker, fingerprint: str) -> None:
+    snapshot[MDD_TRACKER_KEY] = dict(tracker.to_dict(), fingerprint=fingerprint)
+
+def closed_session_records(sim_result: dict, latest_session: str, after: str = "") -> list:
+    """시뮬레이션 daily_records 중 after 이후 ~ 마지막 완료 세션까지의 기록"""
+    records = []
+    for record in (sim_result or {}).get("daily_records", []) or []:
+        if not isinstance(record, dict) or "total_assets" not in record:
+            continue
+        date_str = str(record.get("date", ""))
+        if after < date_str <= latest_session:
+            records.append(record)
+    return records
+
+def replay_preset_mdd_tracker(
+    preset: dict,
+    settings: dict,
+    shared: Optional[dict] = None,
+) -> Optional[DrawdownTracker]:
+    """Replay the preset's complete daily equity curve into a fresh MDD tracker."""
+    try:
+        trader = make_preset_trader(preset, settings, shared)
+        result = trader.simulate_from_start_to_today(
+            preset.get('session_start_date'), quiet=True
+        )
+        if not isinstance(result, dict) or result.get('error'):
+            return None
+        latest_session = trader.get_latest_trading_day().strftime("%Y-%m-%d")
+        records = closed_session_records(result, latest_session)
+        if not records:
+            return None
+        tracker = DrawdownTracker()
+        tracker.update_records(records)
+        return tracker
+    except Exception:
+        return None
+
+def update_preset_mdd_tracker(
+    preset: dict,
+    trader: SOXLQuantTrader,
+    sim_result: dict,
+    previous_snapshot: dict,
+    fingerprint: str,
+    settings: dict,
+    shared: Optional[dict] = None,
+) -> Optional[DrawdownTracker]:
+    """
+    이전 스냅샷의 MDD 누적기에 새로 완료된 세션만 반영.
+    누적기가 없거나(첫 실행, 설정 변경) 스냅샷 시뮬레이션 구간과 이어지지 않으면 전체 기간을 한 번 재계산한다.
+    """
+    tracker = snapshot_mdd_tracker(previous_snapshot, fingerprint)
+    if tracker is not None and tracker.last_date:
+        try:
+            latest_session = trader.get_latest_trading_day().strftime("%Y-%m-%d")
+            if tracker.last_date >= latest_session:
+                return tracker
+            new_records = closed_session_records(sim_result, latest_session, after=tracker.last_date)
+            if new_records and new_records[0]["date"] == trader._get_next_trading_day(tracker.last_date):
+                tracker.update_records(new_records)
+                return tracker
+        except Exception:
+            pass
+    return replay_preset_mdd_tracker(preset, settings, shared)
+
+def build_snapshot_from_positions(
+    trader: SOXLQuantTrader,
+    previous_snapshot: dict,
+    include_runtime_state: bool = True,
+    preserve_saved_positions: bool = True,
+) -> dict:
+    """트레이더 보유 포지션을 저장용 스냅샷으로 변환. 기존 저장 수량은 우선 보존."""
+    current_snapshot = {}
+    for pos in trader.positions:
+        buy_date = pos['buy_date']
+        buy_date_str = buy_date.strftime('%Y-%m-%d') if isinstance(buy_date, (datetime, pd.Timestamp)) else str(buy_date)
+        snap_key = f"{pos['round']}_{buy_date_str}"
+        saved = previous_snapshot.get(snap_key) if previous_snapshot and preserve_saved_positions else None
+        if not saved and previous_snapshot and preserve_saved_positions:
+            for sk, sv in previous_snapshot.items():
+                if sk.endswith(f"_{buy_date_str}"):
+                    saved = sv
+                    break
+        if saved:
+            current_snapshot[snap_key] = {
+                'shares': int(saved['shares']),
+                'buy_price': float(pos['buy_price']),
+                'amount': float(saved['shares']) * float(pos['buy_price']),
+                'round': int(pos['round']),
+                'mode': str(pos.get('mode') or saved.get('mode') or 'SF'),
+            }
+        else:
+            current_snapshot[snap_key] = {
+                'shares': int(pos['shares']),
+                'buy_price': float(pos['buy_price']),
+                'amount': float(pos['amount']),
+                'round': int(pos['round']),
+                'mode': str(pos.get('mode') or 'SF'),
+            }
+
+    # 아직 체결되지 않은 전날 표시 주문은 자동 프리셋 순회 중에도 보존한다.
+    # 같은 회차·주문일 포지션이 생겼다면 체결된 것이므로 pending 메타데이터를 제거한다.
+    pending_buy = (previous_snapshot or {}).get("pending_buy")
+    if isinstance(pending_buy, dict):
+        try:
+            pending_key = f"{int(pending_buy['round'])}_{pending_buy['order_date']}"
+        except Exception:
+            pending_key = ""
+        if pending_key and pending_key not in current_snapshot:
+            current_snapshot["pending_buy"] = dict(pending_buy)
+    if include_runtime_state:
+        current_snapshot['available_cash'] = float(getattr(trader, 'available_cash', 0.0) or 0.0)
+        current_snapshot['processed_seed_dates'] = sorted(list(getattr(trader, 'processed_seed_dates', set()) or []))
+        try:
+            current_snapshot['as_of_date'] = trader.get_latest_trading_day().strftime("%Y-%m-%d")
+        except Exception:
+            # Keep a prior exact checkpoint if market-calendar data is temporarily
+            # unavailable. Falling back to a wall-clock date could skip trades.
+            previous_as_of = str((previous_snapshot or {}).get('as_of_date') or '').strip()
+            if previous_as_of:
+                current_snapshot['as_of_date'] = previous_as_of
+        if not snapshot_has_positions(current_snapshot):
+            try:
+                latest_day = trader.get_latest_trading_day().date()
+                resume_day = latest_day
+                for _ in range(14):
+                    resume_day -= timedelta(days=1)
+                    if not trader.is_market_closed(datetime(resume_day.year, resume_day.month, resume_day.day)):
+                        break
+                current_snapshot['cash_snapshot_date'] = resume_day.strftime("%Y-%m-%d")
+            except Exception:
+                current_snapshot['cash_snapshot_date'] = datetime.now().strftime("%Y-%m-%d")
+    if getattr(trader, 'profit_loss_compounding_enabled', False):
+        current_snapshot['compound_seed'] = float(getattr(trader, 'compound_seed', 0.0) or 0.0)
+        current_snapshot['compound_reference_seed'] = float(getattr(trader, 'compound_reference_seed', 0.0) or 0.0)
+        current_snapshot['compound_profit_rate'] = float(getattr(trader, 'profit_compounding_rate', 0.0) or 0.0)
+        current_snapshot['compound_loss_rate'] = float(getattr(trader, 'loss_compounding_rate', 0.0) or 0.0)
+    merge_snapshot_max_mdd(current_snapshot, previous_snapshot or {})
+    return current_snapshot
+
+def simulate_preset_snapshot(
+    preset_name: str,
+    preset: dict,
+    previous_snapshot: dict,
+    settings: dict,
+    shared: Optional[dict] = None,
+) -> tuple:
+    """
+    프리셋 하나를 임시 트레이더로 시뮬레이션하고 저장용 스냅샷을 반환.
+    세션 설정은 settings로 받으므로 워커 스레드에서도 호출할 수 있다.
+    """
+    temp_trader = make_preset_trader(preset, settings, shared)
+
+    start_date = preset.get('session_start_date')
+    if previous_snapshot:
+        sim_result = temp_trader.simulate_from_snapshot_to_today(previous_snapshot, start_date, quiet=True)
+    else:
+        sim_result = temp_trader.simulate_from_start_to_today(start_date, quiet=True)
+    if sim_result and "error" in sim_result:
+        return None, sim_result["error"]
+
+    current_snapshot = build_snapshot_from_positions(temp_trader, previous_snapshot or {})
+    _, current_price = calculate_trader_live_mdd_info(
+        temp_trader,
+        sim_result,
+        current_snapshot,
+    )
+    fingerprint = preset_mdd_fingerprint(preset, settings)
+    tracker = update_preset_mdd_tracker(
+        preset, temp_trader, sim_result, previous_snapshot or {}, fingerprint, settings, shared
+    )
+    mdd_info = {}
+    if tracker is not None:
+        store_snapshot_mdd_tracker(current_snapshot, tracker, fingerprint)
+        mdd_info = dict(tracker.mdd_info(), calculation_version=MDD_CALCULATION_VERSION)
+    record_snapshot_max_mdd(preset_name, current_snapshot, mdd_info, current_price)
+    return current_snapshot, None
+
+def prepare_preset_shared_data(presets: dict, settings: dict) -> dict:
+    """
+    전체 프리셋이 함께 쓸 SOXL/QQQ 일봉·RSI 참조 데이터·주차별 모드 타임라인을 한 번만 준비.
+    일봉은 가장 이른 시작일 기준 기간으로 받으며, 준비에 실패하면 빈 dict (각 트레이더가 직접 조회).
+    """
+    try:
+        trader = SOXLQuantTrader()
+        if settings.get('test_today_override'):
+            trader.set_test_today(settings['test_today_override'])
+        start_dates = sorted(
+            str(preset.get('session_start_date'))
+            for preset in presets.values()
+            if preset.get('session_start_date')
+        )
+        period = trader.get_backtest_data_period(start_dates[0]) if start_dates else "1y"
+        bars = trader.get_many(["SOXL", "QQQ"], period)
+        rsi_reference = trader.load_rsi_reference_data()
+        return {
+            "bars": bars,
+            "rsi_reference": rsi_reference,
+            # 모드는 QQQ RSI로만 정해지므로 전체 프리셋이 같은 타임라인을 공유
+            "mode_timeline": trader.build_mode_timeline(rsi_reference),
+        }
+    except Exception as e:
+        logger.warning("⚠️ 프리셋 공용 데이터 준비 실패 (프리셋별 조회로 진행): %s", e)
+        return {}
+
+def simulate_presets(
+    presets: Dict[str, dict],
+    previous_snapshots: Dict[str, dict],
+    settings: dict,
+    max_workers: Optional[int] = None,
+) -> dict:
+    """
+    전체 프리셋을 스레드 풀에서 동시에 시뮬레이션.
+    공용 데이터(prepare_preset_shared_data)와 프로세스 공용 시세 클라이언트·시뮬레이션 캐시·체크포인트를 함께 쓴다.
+    Args:
+        presets: 프리셋 이름 → 프리셋 설정
+        previous_snapshots: 프리셋 이름 → 이전 저장 스냅샷 (없으면 시작일부터 시뮬레이션)
+        settings: sf_config / ag_config / test_today_override
+        max_workers: 최대 동시 실행 수 (None이면 프리셋 수)
+    Returns:
+        dict: 프리셋 이름 → (스냅샷 또는 None, 오류 메시지 또는 None), presets 순서
+    """
+    shared = prepare_preset_shared_data(presets, settings)
+
+    def simulate(preset_name: str) -> tuple:
+        try:
+            return simulate_preset_snapshot(
+                preset_name,
+                presets[preset_name],
+                (previous_snapshots or {}).get(preset_name, {}),
+                settings,
+                shared,
+            )
+        except Exception as e:
+            return None, str(e)
+
+    return run_concurrently(simulate, list(presets), max_workers=max_workers or len(presets) or 1)
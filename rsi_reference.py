@@ -0,0 +1,370 @@
+"""
+주간 RSI 참조 데이터(weekly_rsi_reference.json) 인덱스
+
+- WeeklyRSIIndex: 연도별 주차 목록을 한 번만 펼쳐 날짜 → RSI 조회를 O(1)/O(log n)으로 처리
+- get_weekly_rsi_index: 같은 참조 딕셔너리에 대해 인덱스를 재사용하는 헬퍼
+- RSIReferenceData / load_rsi_reference: 파일 경로+수정시각 기준으로 프로세스 전체에서
+  한 번만 파싱하는 읽기 전용 참조 데이터 뷰
+- append_completed_weeks / write_rsi_reference: 마지막 기록 주차 이후 완료된 금요일만
+  계산해 덧붙이는 증분 업데이트와 원자적 파일 저장
+"""
+
+import json
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import date as date_cls, datetime, timedelta
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 가장 가까운 이전 주차를 대신 사용할 수 있는 최대 간격 (이 값 이상이면 다른 주차로 간주)
+FALLBACK_MAX_GAP_DAYS = 7
+
+_INDEX_CACHE_SIZE = 8
+
+# 주간 RSI 계산 기간 (14주 단순 이동평균 방식이므로 직전 15개 주간 종가만 있으면 계산 가능)
+RSI_WINDOW = 14
+# 참조 데이터를 처음부터 만들 때의 첫 주차 금요일
+FIRST_REFERENCE_FRIDAY = date_cls(2010, 1, 1)
+# 정규장 마감 시각 (ET)
+SESSION_CLOSE_HOUR = 16
+
+# 필요한 일수를 덮는 가장 짧은 조회 기간 (마지막 항목 이후는 15y)
+_FETCH_PERIODS = (("3mo", 90), ("6mo", 180), ("1y", 365), ("2y", 730), ("5y", 1825))
+
+
+def _parse_day(text: str) -> date_cls:
+    return datetime.strptime(text, "%Y-%m-%d").date()
+
+
+class WeeklyRSIIndex:
+    """
+    주간 RSI 참조 데이터 조회용 인덱스
+
+    - 주차에 포함되는 모든 날짜를 date 문자열 → RSI 딕셔너리로 펼쳐 둠 (정확한 주차 조회)
+    - 주차 종료일을 정렬해 두고 bisect로 가장 가까운 이전 주차를 찾음 (7일 이내 대체 조회)
+
+    같은 주차가 여러 연도에 중복 기록된 경우 기존 선형 탐색과 동일하게
+    최신 연도, 같은 연도 안에서는 먼저 나온 주차가 우선한다.
+    """
+
+    __slots__ = ("_by_day", "_ends", "_end_rsis", "week_count", "last_end")
+
+    def __init__(self, rsi_data: Optional[dict]):
+        # 기존 탐색 순서: 최신 연도부터, 연도 안에서는 목록 순서대로
+        ordered: List[Tuple[str, str, object]] = []
+        for year in sorted((y for y in (rsi_data or {}) if y != "metadata"), reverse=True):
+            year_data = rsi_data[year]
+            if not isinstance(year_data, Mapping) or "weeks" not in year_data:
+                continue
+            for week_data in year_data["weeks"]:
+                ordered.append((week_data["start"], week_data["end"], week_data["rsi"]))
+
+        by_day: Dict[str, object] = {}
+        # 우선순위가 낮은 주차부터 채우고 높은 주차가 덮어쓰도록 역순으로 처리
+        for start, end, rsi in reversed(ordered):
+            day = _parse_day(start)
+            last = _parse_day(end)
+            while day <= last:
+                by_day[day.isoformat()] = rsi
+                day += timedelta(days=1)
+
+        # 종료일 기준 안정 정렬 (동일 종료일이면 기존 로직처럼 뒤쪽 항목이 선택됨)
+        by_end = sorted(ordered, key=lambda week: week[1])
+
+        self._by_day = by_day
+        self._ends = [week[1] for week in by_end]
+        self._end_rsis = [week[2] for week in by_end]
+        self.week_count = len(ordered)
+        # 참조 데이터에 기록된 마지막 주차 종료일 (없으면 None)
+        self.last_end = self._ends[-1] if self._ends else None
+
+    def __len__(self) -> int:
+        return self.week_count
+
+    def lookup(self, date_str: str) -> Optional[float]:
+        """
+        'YYYY-MM-DD' 날짜의 RSI 값
+        1단계: 해당 날짜가 포함되는 주차
+        2단계: 종료일이 해당 날짜 이전인 가장 가까운 주차 (7일 미만 차이일 때만)
+        """
+        if date_str in self._by_day:
+            return float(self._by_day[date_str])
+
+        pos = bisect_right(self._ends, date_str) - 1
+        if pos < 0:
+            return None
+        gap_days = (_parse_day(date_str) - _parse_day(self._ends[pos])).days
+        if gap_days < FALLBACK_MAX_GAP_DAYS:
+            return float(self._end_rsis[pos])
+        return None
+
+
+def _fingerprint(rsi_data: dict) -> tuple:
+    """참조 딕셔너리가 제자리에서 갱신되었는지 판단하기 위한 가벼운 지문 (연도별 주차 수/마지막 주차)"""
+    parts = []
+    for year, year_data in rsi_data.items():
+        if year == "metadata" or not isinstance(year_data, Mapping):
+            continue
+        weeks = year_data.get("weeks") or []
+        last = weeks[-1] if weeks else {}
+        parts.append((year, id(weeks), len(weeks), last.get("end"), last.get("rsi")))
+    return tuple(parts)
+
+
+_index_cache: "OrderedDict[int, Tuple[dict, tuple, WeeklyRSIIndex]]" = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def get_weekly_rsi_index(rsi_data: dict) -> WeeklyRSIIndex:
+    """
+    참조 딕셔너리에 대한 WeeklyRSIIndex 반환
+    같은 딕셔너리 객체로 반복 호출하면 처음 만든 인덱스를 재사용한다 (최근 8개 유지).
+    """
+    if isinstance(rsi_data, RSIReferenceData):
+        return rsi_data.index
+
+    key = id(rsi_data)
+    fingerprint = _fingerprint(rsi_data)
+    with _index_lock:
+        cached = _index_cache.get(key)
+        # 원본 객체를 함께 보관하므로 id가 다른 객체에 재사용될 일은 없음
+        if cached is not None and cached[0] is rsi_data and cached[1] == fingerprint:
+            _index_cache.move_to_end(key)
+            return cached[2]
+
+    index = WeeklyRSIIndex(rsi_data)
+    with _index_lock:
+        _index_cache[key] = (rsi_data, fingerprint, index)
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class RSIReferenceData(Mapping):
+    """
+    weekly_rsi_reference.json의 읽기 전용 뷰
+
+    기존 딕셔너리처럼 rsi_data[year]['weeks'] 형태로 읽을 수 있고(연도/주차는 수정 불가),
+    미리 만든 WeeklyRSIIndex를 index 속성으로 제공한다.
+    여러 트레이더/스레드가 같은 객체를 공유하므로 수정이 필요하면 to_dict() 복사본을 사용한다.
+    """
+
+    __slots__ = ("_data", "index", "path", "mtime_ns")
+
+    def __init__(self, raw: dict, path: str = "", mtime_ns: int = 0):
+        self._data = _freeze(raw)
+        self.index = WeeklyRSIIndex(self._data)
+        self.path = path
+        self.mtime_ns = mtime_ns
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"RSIReferenceData(path={self.path!r}, weeks={len(self.index)})"
+
+    def to_dict(self) -> dict:
+        """수정 가능한 일반 dict 복사본"""
+        return _thaw(self._data)
+
+
+_reference_cache: Dict[str, Tuple[int, int, RSIReferenceData]] = {}
+_reference_lock = threading.Lock()
+
+
+def load_rsi_reference(path) -> Optional[RSIReferenceData]:
+    """
+    RSI 참조 파일을 읽기 전용 뷰로 로드 (파일이 없으면 None)
+    경로와 파일 수정시각(mtime)/크기가 같으면 프로세스 전체에서 파싱 결과를 재사용한다.
+    JSON 파싱 오류 등은 호출자에게 그대로 전달된다.
+    """
+    file_path = os.path.abspath(str(path))
+    with _reference_lock:
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            _reference_cache.pop(file_path, None)
+            return None
+
+        cached = _reference_cache.get(file_path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        reference = RSIReferenceData(raw, file_path, stat.st_mtime_ns)
+        _reference_cache[file_path] = (stat.st_mtime_ns, stat.st_size, reference)
+        return reference
+
+
+def clear_rsi_reference_cache(path=None) -> None:
+    """메모된 참조 데이터 제거 (path가 없으면 전체)"""
+    with _reference_lock:
+        if path is None:
+            _reference_cache.clear()
+        else:
+            _reference_cache.pop(os.path.abspath(str(path)), None)
+
+
+def last_completed_friday(now_et: datetime) -> date_cls:
+    """
+    주간 종가가 확정된 가장 최근 금요일 (W-FRI 주차 라벨)
+    금요일 당일은 정규장 마감(16:00 ET) 이후부터 완료된 주차로 본다.
+    """
+    cutoff = now_et.date() if now_et.hour >= SESSION_CLOSE_HOUR else now_et.date() - timedelta(days=1)
+    return cutoff - timedelta(days=(cutoff.weekday() - 4) % 7)
+
+
+def latest_reference_end(rsi_data: Optional[Mapping]) -> Optional[date_cls]:
+    """참조 데이터 전체에서 가장 늦은 주차 종료일"""
+    ends = [
+        week_data["end"]
+        for year, year_data in (rsi_data or {}).items()
+        if year != "metadata" and isinstance(year_data, Mapping)
+        for week_data in year_data.get("weeks", ())
+    ]
+    return _parse_day(max(ends)) if ends else None
+
+
+def fetch_period_for(last_end: Optional[date_cls], through: date_cls, window: int = RSI_WINDOW) -> str:
+    """마지막 기록 주차 이후 새 주차와 RSI 계산용 직전 window+1주를 덮는 가장 짧은 조회 기간"""
+    if last_end is None:
+        return "15y"
+    days_needed = (through - last_end).days + (window + 2) * 7
+    for period, days in _FETCH_PERIODS:
+        if days_needed <= days:
+            return period
+    return "15y"
+
+
+def weekly_closes(daily: pd.DataFrame) -> pd.Series:
+    """일봉 → 금요일 기준(W-FRI) 주간 종가"""
+    return daily["Close"].resample("W-FRI").last().dropna()
+
+
+def compute_completed_weeks(
+    closes: pd.Series,
+    after: Optional[date_cls],
+    through: date_cls,
+    window: int = RSI_WINDOW,
+) -> List[dict]:
+    """
+    after 이후 ~ through 이하 금요일의 주간 RSI 항목 계산
+    주차마다 직전 window개 종가 변화만 사용하므로 새 주차 하나당 계산량은 일정하다.
+    (rolling(window).mean() 기반 기존 계산식과 같은 값)
+    """
+    values = closes.to_numpy(dtype="float64")
+    fridays = closes.index
+    start = after if after is not None else FIRST_REFERENCE_FRIDAY - timedelta(days=1)
+
+    weeks = []
+    for pos in range(window, len(values)):
+        friday = fridays[pos].date()
+        if friday <= start or friday > through:
+            continue
+        delta = np.diff(values[pos - window:pos + 1])
+        gain = delta[delta > 0].sum() / window
+        loss = -delta[delta < 0].sum() / window
+        if loss == 0:
+            if gain == 0:
+                continue
+            rsi = 100.0
+        else:
+            rsi = 100 - (100 / (1 + gain / loss))
+
+        # 해당 주의 시작일 (월요일) / 주차 번호
+        week_start = friday - timedelta(days=4)
+        weeks.append({
+            "start": week_start.strftime("%Y-%m-%d"),
+            "end": friday.strftime("%Y-%m-%d"),
+            "week": week_start.isocalendar()[1],
+            "rsi": round(float(rsi), 2),
+        })
+    return weeks
+
+
+def append_completed_weeks(
+    rsi_data: dict,
+    fetch_daily: Callable[[str], Optional[pd.DataFrame]],
+    through: date_cls,
+    window: int = RSI_WINDOW,
+) -> Optional[List[dict]]:
+    """
+    참조 데이터(수정 가능한 dict)에 마지막 기록 주차 이후 완료된 금요일만 덧붙임
+    Args:
+        rsi_data: 참조 데이터 (제자리에서 수정됨)
+        fetch_daily: 조회 기간 문자열을 받아 QQQ 일봉을 돌려주는 함수
+        through: 포함할 마지막 금요일 (last_completed_friday 결과)
+    Returns:
+        List[dict]: 추가된 주차 목록 (조회 실패 시 None)
+    """
+    last_end = latest_reference_end(rsi_data)
+    if last_end is not None and last_end >= through:
+        return []
+
+    daily = fetch_daily(fetch_period_for(last_end, through, window))
+    if daily is None or len(daily) == 0:
+        return None
+
+    new_weeks = compute_completed_weeks(weekly_closes(daily), last_end, through, window)
+    for week_data in new_weeks:
+        # 주차는 금요일이 속한 연도에 기록
+        year = week_data["end"][:4]
+        if year not in rsi_data:
+            rsi_data[year] = {"description": f"{year}년 주간 RSI 데이터", "weeks": []}
+        rsi_data[year]["weeks"].append(week_data)
+    return new_weeks
+
+
+def refresh_metadata(rsi_data: dict, today_str: str, updated_by: Optional[str] = None) -> int:
+    """메타데이터(마지막 업데이트/연도 수/주차 수) 갱신 후 총 주차 수 반환"""
+    years = [key for key in rsi_data if key != "metadata"]
+    total_weeks = sum(len(rsi_data[year].get("weeks", [])) for year in years)
+    metadata = {
+        "last_updated": today_str,
+        "total_years": len(years),
+        "total_weeks": total_weeks,
+        "description": "QQQ 주간 RSI 참조 데이터 (14주 Wilder's RSI)",
+    }
+    if updated_by:
+        metadata["updated_by"] = updated_by
+    rsi_data["metadata"] = metadata
+    return total_weeks
+
+
+def write_rsi_reference(path, text: str) -> None:
+    """참조 파일 원자적 저장 (임시 파일에 쓴 뒤 교체해 읽는 쪽이 중간 상태를 보지 않게 함)"""
+    file_path = os.path.abspath(str(path))
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, file_path)
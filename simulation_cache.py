@@ -0,0 +1,96 @@
+"""
+시뮬레이션 결과 공유 캐시
+
+- SimulationCache: 크기(LRU)와 TTL로 제한되는 스레드 안전 캐시. 항목마다 만료 시간을 따로 줄 수 있다.
+- simulation_key: 설정(전략 파라미터, 시드증액, 복리 설정, 시작일, 티커 등)과 마지막 완료 세션을
+  정렬된 JSON으로 직렬화해 SHA-256으로 해시한 키. 같은 설정·같은 세션이면 트레이더 인스턴스가
+  달라도 같은 키가 되므로, 결과가 그 거래일 동안 재사용된다.
+- get_simulation_cache: 프로세스 전역 인스턴스 (모든 트레이더가 공유)
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# 기본 보관 개수 / 만료 시간(초). 키에 마지막 완료 세션이 들어가므로 TTL은 메모리 상한 역할만 한다.
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+
+
+def _json_default(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def simulation_key(fields: Dict[str, Any]) -> str:
+    """캐시 키 생성 (필드 순서·dict 키 순서와 무관한 SHA-256 16진 문자열)"""
+    text = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=_json_default)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SimulationCache:
+    """LRU + TTL 시뮬레이션 결과 캐시 (스레드 안전)
+
+    값은 복사하지 않고 그대로 공유하므로, 호출자는 돌려받은 값을 수정하면 안 된다.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """키에 해당하는 값 (없거나 만료되었으면 None, 공유 객체이므로 수정 금지)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        값 저장 (가장 오래 쓰지 않은 항목부터 max_entries를 넘는 만큼 제거)
+        Args:
+            ttl_seconds: 이 항목의 만료 시간(초). None이면 ttl_seconds 기본값
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_default_cache: Optional[SimulationCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_simulation_cache() -> SimulationCache:
+    """프로세스 공용 SimulationCache 인스턴스"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SimulationCache()
+        return _default_cache
@@ -0,0 +1,223 @@
+"""
+증분 시뮬레이션 체크포인트 저장소
+
+simulate_from_start_to_today는 설정(전략 파라미터, 시드증액, 복리 설정, 시작일, 티커 등)별로
+마지막 완료 세션까지의 상태를 체크포인트로 남기고, 다음 실행에서는 그 다음 봉부터만 이어서
+시뮬레이션한다. 매일 갱신 비용이 전체 기간이 아니라 새로 생긴 봉 수에 비례한다.
+
+체크포인트는 엔진 상태(포지션, 현금, 모드, 카운터, MDD 추적기 등)만 담은 작은 JSON과
+일별 기록(daily_records)의 append-only 로그({key}.records.jsonl)로 나뉜다. 이어서 실행한 뒤에는
+새 봉의 기록과 그 사이 매도로 갱신된 미청산 매수 행만 로그 끝에 덧붙이고, 체크포인트 JSON에는
+확정된 로그 길이(바이트)를 기록한다. 로그의 그 이후 부분(저장 도중 중단된 행)은 읽지 않고 다음 저장 때 잘라낸다.
+
+- encode_value / decode_value: datetime, pd.Timestamp, set을 포함한 포트폴리오 상태를 JSON으로 왕복 변환
+- CheckpointStore: 설정 키별 체크포인트 JSON + 일별 기록 로그 저장소 (임시 파일에 쓴 뒤 교체, 오래된 파일 정리)
+- get_checkpoint_store: 경로별 프로세스 공용 인스턴스
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 체크포인트 형식 버전 (필드 구성이 바뀌면 올려서 이전 파일을 무시)
+CHECKPOINT_VERSION = 2
+
+# 일별 기록 로그 파일 접미사 ({key}.records.jsonl)
+RECORDS_SUFFIX = ".records.jsonl"
+
+# 보관할 체크포인트 파일 수 (설정 조합별 1개, 가장 오래 갱신되지 않은 파일부터 삭제)
+DEFAULT_MAX_FILES = 32
+
+
+def encode_value(value: Any) -> Any:
+    """JSON으로 저장할 수 있는 값으로 변환 (날짜/집합은 태그 dict로 감싼다)"""
+    if isinstance(value, pd.Timestamp):
+        return {"__timestamp__": value.isoformat()}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": [encode_value(item) for item in sorted(value, key=str)]}
+    if isinstance(value, dict):
+        return {str(key): encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    """encode_value의 역변환"""
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) == 1:
+        (tag, payload), = value.items()
+        if tag == "__timestamp__":
+            return pd.Timestamp(payload)
+        if tag == "__datetime__":
+            return datetime.fromisoformat(payload)
+        if tag == "__date__":
+            return date.fromisoformat(payload)
+        if tag == "__set__":
+            return {decode_value(item) for item in payload}
+    return {key: decode_value(item) for key, item in value.items()}
+
+
+class CheckpointStore:
+    """설정 키별 시뮬레이션 체크포인트 저장소 ({key}.json + {key}.records.jsonl)"""
+
+    def __init__(self, root: Union[str, Path], max_files: int = DEFAULT_MAX_FILES):
+        self.root = Path(root)
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _records_path(self, key: str) -> Path:
+        return self.root / f"{key}{RECORDS_SUFFIX}"
+
+    def load(self, key: str) -> Optional[Dict]:
+        """
+        체크포인트 로드 (호출마다 새 객체로 디코딩하므로 돌려받은 값은 수정해도 된다)
+        Returns:
+            dict: 체크포인트, 없거나 읽을 수 없거나 형식 버전이 다르면 None
+        """
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != CHECKPOINT_VERSION:
+            return None
+        return decode_value(payload.get("checkpoint"))
+
+    def save(self, key: str, checkpoint: Dict) -> bool:
+        """
+        체크포인트 저장 (같은 키의 이전 체크포인트를 교체)
+        Returns:
+            bool: 저장에 성공하면 True
+        """
+        payload = {"version": CHECKPOINT_VERSION, "checkpoint": encode_value(checkpoint)}
+        path = self._path(key)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with self._lock:
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp_path, path)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning("⚠️ 시뮬레이션 체크포인트 저장 실패: %s", e)
+                return False
+            self._prune()
+        return True
+
+    def append_records(self, key: str, rows: Iterable[Tuple[int, Dict]], offset: int = 0) -> Optional[int]:
+        """
+        일별 기록 로그에 행 추가 (같은 위치의 행이 다시 나오면 나중 행이 이전 행을 대체)
+        Args:
+            rows: (기록 위치, 기록) 목록
+            offset: 현재 체크포인트가 확정한 로그 길이 (그 뒤의 미확정 행은 잘라냄, 0이면 새로 씀)
+        Returns:
+            int: 추가 후 로그 길이(바이트), 실패하면 None
+        """
+        path = self._records_path(key)
+        with self._lock:
+            try:
+                data = "".join(
+                    json.dumps([index, encode_value(record)], ensure_ascii=False, separators=(",", ":")) + "\n"
+                    for index, record in rows
+                ).encode("utf-8")
+                self.root.mkdir(parents=True, exist_ok=True)
+                with open(path, "r+b" if offset else "wb") as f:
+                    f.truncate(offset)
+                    f.seek(offset)
+                    f.write(data)
+                return offset + len(data)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning("⚠️ 시뮬레이션 기록 로그 저장 실패: %s", e)
+                return None
+
+    def load_records(self, key: str, size: int, count: int) -> Optional[List[Dict]]:
+        """
+        체크포인트가 확정한 로그 길이(size)까지 읽어 일별 기록 count개를 복원
+        Returns:
+            list: 일별 기록, 로그가 없거나 짧거나 빠진 행이 있으면 None
+        """
+        try:
+            with open(self._records_path(key), "rb") as f:
+                data = f.read(size)
+        except OSError:
+            return None
+        if len(data) != size:
+            return None
+        records: List[Any] = [None] * count
+        try:
+            for line in data.splitlines():
+                index, record = json.loads(line)
+                if index < count:
+                    records[index] = record
+        except (TypeError, ValueError):
+            return None
+        if any(record is None for record in records):
+            return None
+        return [decode_value(record) for record in records]
+
+    def clear(self) -> None:
+        """저장된 체크포인트 전체 삭제"""
+        if not self.root.exists():
+            return
+        with self._lock:
+            for path in [*self.root.glob("*.json"), *self.root.glob(f"*{RECORDS_SUFFIX}")]:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _prune(self) -> None:
+        files = []
+        for path in self.root.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime_ns, path))
+            except OSError:
+                pass
+        files.sort(reverse=True)
+        for _, path in files[self.max_files:]:
+            for stale in (path, self._records_path(path.stem)):
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+
+_STORES: Dict[Path, CheckpointStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_checkpoint_store(root: Union[str, Path]) -> CheckpointStore:
+    """경로별 공유 체크포인트 저장소 인스턴스"""
+    key = Path(root).resolve()
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = CheckpointStore(key)
+            _STORES[key] = store
+        return store
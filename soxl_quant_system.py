@@ -1,4 +1,4 @@
-import requests
+import copy
 import json
 from datetime import datetime, timedelta, timezone
 import pandas as pd
@@ -9,12 +9,42 @@ from openpyxl.styles import Font, PatternFill, Alignment
 import os
 
 import sys
-import io
-from contextlib import redirect_stdout
+import logging
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from us_market_calendar import is_us_equity_trading_day
+from backtest_engine import ArrayBacktestEngine
+from us_market_calendar import (
+    TradingSessionIndex,
+    get_trading_session_index,
+    is_us_equity_trading_day,
+    sessions_after,
+    sessions_between,
+)
+from market_data import (
+    BAR_COLUMNS,
+    DEFAULT_MAX_WORKERS,
+    MarketDataError,
+    get_market_data_client,
+    parse_chart_result,
+    run_concurrently,
+)
+from market_data_store import get_bar_store, period_start
+from simulation_cache import get_simulation_cache, simulation_key
+from simulation_checkpoint import CHECKPOINT_VERSION, get_checkpoint_store
+from mode_timeline import WeeklyModeTimeline, build_mode_timeline, recursive_week_mode, week_friday
+from performance_metrics import mdd_info
+from rsi_reference import (
+    append_completed_weeks,
+    get_weekly_rsi_index,
+    last_completed_friday,
+    latest_reference_end,
+    load_rsi_reference,
+    refresh_metadata,
+    write_rsi_reference,
+)
 
 
 try:
@@ -24,11 +54,73 @@ except ZoneInfoNotFoundError:  # Windows installations without the IANA tzdata p
 
     US_EASTERN_TZ = gettz("America/New_York")
 
+logger = logging.getLogger(__name__)
+# 조용한 시뮬레이션(quiet=True)용 로거: 경고 이상만 통과하므로 debug/info 메시지는 포맷팅되지 않음
+_quiet_logger = logging.getLogger(f"{__name__}.quiet")
+_quiet_logger.setLevel(logging.WARNING)
+
 
 class SOXLQuantTrader:
     """SOXL 퀀트투자 시스템"""
 
-    
+    # 수동 데이터 보정 (Yahoo Finance API가 제공하지 않거나 Close를 비워 주는 날짜), 심볼별로 분리
+    MANUAL_CORRECTIONS = {
+        "SOXL": {
+            "2025-12-12": {
+                "Open": 46.92,
+                "High": 47.38,
+                "Low": 41.06,
+                "Close": 41.71,
+                "Volume": 138088200
+            },
+            # API가 Close=None이면 dropna로 제거되어 3/23 LOC가 전일=3/19로 오판됨
+            "2026-03-20": {
+                "Open": 54.69,
+                "High": 55.36,
+                "Low": 49.00,
+                "Close": 51.14,
+                "Volume": 101773000
+            },
+        },
+    }
+
+
+    # RSI 참조 데이터 갱신 방식: "background"(생성자는 바로 반환, 필요한 주차가 없을 때만 대기) 또는 "sync"
+    RSI_REFRESH_MODE = "background"
+    # 백그라운드 갱신 완료를 기다리는 최대 시간 (초)
+    RSI_REFRESH_WAIT_SECONDS = 120.0
+    # 프로세스 전역 RSI 갱신 상태 (모든 트레이더 인스턴스가 공유)
+    _rsi_refresh_lock = threading.Lock()
+    _rsi_refresh_checked_on: Optional[str] = None
+    _rsi_refresh_thread: Optional[threading.Thread] = None
+
+    # run_backtest 일별 루프: "array"(backtest_engine.ArrayBacktestEngine) 또는 "legacy"(기존 iterrows 루프)
+    BACKTEST_ENGINE = "array"
+    # 배열 엔진이 기본 구현을 그대로 따르는 메서드 (하위 클래스가 재정의하면 legacy 루프 사용)
+    _ARRAY_ENGINE_HOOKS = (
+        "get_mode_config",
+        "get_current_config",
+        "get_position_config",
+        "determine_mode",
+        "_is_mode_case_matched",
+        "check_sell_conditions",
+        "execute_sell",
+        "execute_buy",
+        "can_buy_next_round",
+        "calculate_position_size",
+        "is_trading_day",
+        "calculate_stop_loss_date",
+        "get_trading_date_after",
+        "_process_compounding_for_date",
+        "get_rsi_from_reference",
+    )
+
+    # 로그 출력 (레벨은 logging 설정으로 제어, quiet_logging() 안에서는 경고 이상만 출력)
+    logger = logger
+
+    # 마지막 완료 세션의 일봉이 아직 반영되지 않은 시뮬레이션 결과의 캐시 유지 시간 (초)
+    INCOMPLETE_SIMULATION_CACHE_SECONDS = 60
+
     def _resolve_data_path(self, filename: str) -> Path:
         base_dir = Path(__file__).resolve().parent
         data_dir = base_dir / "data"
@@ -41,8 +133,10 @@ class SOXLQuantTrader:
         Args:
             filename: RSI 참조 파일명
         Returns:
-            dict: RSI 참조 데이터
+            dict: RSI 참조 데이터 (읽기 전용 RSIReferenceData, 여러 트레이더가 공유)
         """
+        if self._rsi_reference_override is not None:
+            return self._rsi_reference_override
         try:
             # PyInstaller 실행파일에서 파일 경로 처리
             if getattr(sys, 'frozen', False):
@@ -62,34 +156,33 @@ class SOXLQuantTrader:
             data_dir = os.path.dirname(file_path)
             if data_dir and not os.path.exists(data_dir):
                 os.makedirs(data_dir, exist_ok=True)
-                print(f"📁 {data_dir} 폴더 생성 완료")
+                self.logger.debug("📁 %s 폴더 생성 완료", data_dir)
             
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    rsi_data = json.load(f)
-                
+            # 경로+수정시각 기준 프로세스 전역 캐시 (파일이 바뀔 때만 다시 파싱)
+            rsi_data = load_rsi_reference(file_path)
+            if rsi_data is not None:
                 # 메타데이터 출력
                 metadata = rsi_data.get('metadata', {})
                 total_weeks = metadata.get('total_weeks', 0)
                 last_updated = metadata.get('last_updated', 'Unknown')
                 
-                print(f"[INFO] RSI 참조 데이터 로드 완료")
-                print(f"   - 파일 경로: {file_path}")
-                print(f"   - 총 {len(rsi_data)-1}개 연도 데이터 ({total_weeks}주차)")
-                print(f"   - 마지막 업데이트: {last_updated}")
+                self.logger.debug("[INFO] RSI 참조 데이터 로드 완료")
+                self.logger.debug("   - 파일 경로: %s", file_path)
+                self.logger.debug("   - 총 %s개 연도 데이터 (%s주차)", len(rsi_data)-1, total_weeks)
+                self.logger.debug("   - 마지막 업데이트: %s", last_updated)
                 
                 return rsi_data
             else:
-                print(f"⚠️ RSI 참조 파일이 없습니다: {file_path}")
+                self.logger.warning("⚠️ RSI 참조 파일이 없습니다: %s", file_path)
                 return {}
         except Exception as e:
-            print(f"[ERROR] RSI 참조 데이터 로드 오류: {e}")
+            self.logger.error("[ERROR] RSI 참조 데이터 로드 오류: %s", e)
             return {}
     
     def get_rsi_from_reference(self, date: datetime, rsi_data: dict) -> float:
         """
         특정 날짜의 RSI 값을 참조 데이터에서 가져오기 (JSON 형식)
-        JSON 파일 전체에서 해당 날짜를 찾는 강력한 검색 로직
+        참조 데이터를 한 번 인덱싱(WeeklyRSIIndex)한 뒤 날짜 조회는 상수/로그 시간으로 처리
         Args:
             date: 확인할 날짜
             rsi_data: RSI 참조 데이터 (JSON)
@@ -100,51 +193,25 @@ class SOXLQuantTrader:
             if not rsi_data:
                 return None
             
-            date_str = date.strftime('%Y-%m-%d')
-            
-            # 1단계: 모든 연도에서 해당 날짜가 포함되는 주차 찾기
-            available_years = [y for y in rsi_data.keys() if y != 'metadata']
-            available_years.sort(reverse=True)  # 최신 연도부터 검색
-            
-            for year in available_years:
-                if 'weeks' not in rsi_data[year]:
-                    continue
-                    
-                weeks = rsi_data[year]['weeks']
-                
-                # 해당 날짜가 포함되는 주차 찾기
-                for week_data in weeks:
-                    start_date = week_data['start']
-                    end_date = week_data['end']
-                    if start_date <= date_str <= end_date:
-                        return float(week_data['rsi'])
-            
+            # 1단계: 해당 날짜가 포함되는 주차 (최신 연도 우선)
             # 2단계: 정확한 주차가 없으면 가장 가까운 이전 주차의 RSI 사용
             # 단, 7일 이상 차이나면 다른 주차이므로 None 반환 (실시간 계산 유도)
-            all_weeks = []
-            for year in available_years:
-                if 'weeks' not in rsi_data[year]:
-                    continue
-                for week_data in rsi_data[year]['weeks']:
-                    week_data_copy = week_data.copy()
-                    week_data_copy['year'] = year
-                    all_weeks.append(week_data_copy)
-            
-            # 종료일 기준으로 정렬
-            all_weeks.sort(key=lambda x: x['end'])
-            
-            # 해당 날짜보다 이전의 가장 가까운 주차 찾기 (7일 이내만)
-            for week_data in reversed(all_weeks):
-                if week_data['end'] <= date_str:
-                    gap_days = (datetime.strptime(date_str, '%Y-%m-%d') - datetime.strptime(week_data['end'], '%Y-%m-%d')).days
-                    if gap_days < 7:
-                        return float(week_data['rsi'])
-                    else:
-                        return None
-            
-            return None
+            date_str = date.strftime('%Y-%m-%d')
+            index = get_weekly_rsi_index(rsi_data)
+            rsi = index.lookup(date_str)
+            if rsi is not None or index.last_end is None or date_str <= index.last_end:
+                return rsi
+
+            # 파일에 아직 없는 주차: 백그라운드 갱신이 진행 중이었다면 끝난 뒤 최신 파일에서 다시 조회
+            if not self.wait_for_rsi_refresh(self.RSI_REFRESH_WAIT_SECONDS):
+                return None
+            path = getattr(rsi_data, "path", "") or self._resolve_data_path("weekly_rsi_reference.json")
+            fresh = load_rsi_reference(path)
+            if fresh is None or fresh is rsi_data:
+                return None
+            return fresh.index.lookup(date_str)
         except Exception as e:
-            print(f"[ERROR] RSI 참조 데이터 조회 오류: {e}")
+            self.logger.error("[ERROR] RSI 참조 데이터 조회 오류: %s", e)
             return None
     
     def check_and_update_rsi_data(self, filename: str = "weekly_rsi_reference.json") -> bool:
@@ -173,25 +240,24 @@ class SOXLQuantTrader:
             data_dir = os.path.dirname(file_path)
             if data_dir and not os.path.exists(data_dir):
                 os.makedirs(data_dir, exist_ok=True)
-                print(f"📁 {data_dir} 폴더 생성 완료")
+                self.logger.debug("📁 %s 폴더 생성 완료", data_dir)
             
             # 기존 RSI 데이터 로드
-            if os.path.exists(file_path):
+            existing_data = load_rsi_reference(file_path)
+            if existing_data is not None:
                 #print(f"🔍 JSON 파일 로드 시도: {file_path}")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
                 
                 # 디버깅: 로드된 데이터 구조 확인
-                print(f"[SUCCESS] JSON 파일 로드 성공!")
+                self.logger.debug("[SUCCESS] JSON 파일 로드 성공!")
                 #print(f"   - 파일 크기: {os.path.getsize(file_path)} bytes")
                 #print(f"   - 로드된 키들: {list(existing_data.keys())}")
                 #print(f"   - 총 연도 수: {len([k for k in existing_data.keys() if k != 'metadata'])}")
                 
                 # 2024년, 2025년 데이터 확인
                 if '2024' in existing_data:
-                    print(f"   - 2024년 데이터: {len(existing_data['2024']['weeks'])}주차")
+                    self.logger.debug("   - 2024년 데이터: %s주차", len(existing_data['2024']['weeks']))
                 if '2025' in existing_data:
-                    print(f"   - 2025년 데이터: {len(existing_data['2025']['weeks'])}주차")
+                    self.logger.debug("   - 2025년 데이터: %s주차", len(existing_data['2025']['weeks']))
                 
                 metadata = existing_data.get('metadata', {})
                 last_updated = metadata.get('last_updated', '')
@@ -209,20 +275,20 @@ class SOXLQuantTrader:
                         # 오늘 날짜가 가장 최근 주차 종료일보다 7일 이상 지났으면 업데이트 필요
                         days_since_latest = (today - latest_week_end).days
                         if days_since_latest > 7:
-                            print(f"⚠️ 최신 주간 RSI가 {days_since_latest}일 전 데이터입니다. 업데이트가 필요합니다.")
+                            self.logger.info("⚠️ 최신 주간 RSI가 %s일 전 데이터입니다. 업데이트가 필요합니다.", days_since_latest)
                             latest_rsi_missing = True
                         else:
-                            print(f"✅ 최신 주간 RSI 확인: {latest_week['end']} ({days_since_latest}일 전)")
+                            self.logger.debug("✅ 최신 주간 RSI 확인: %s (%s일 전)", latest_week['end'], days_since_latest)
                     else:
-                        print("⚠️ 현재 연도 데이터가 비어있습니다. 업데이트가 필요합니다.")
+                        self.logger.info("⚠️ 현재 연도 데이터가 비어있습니다. 업데이트가 필요합니다.")
                         latest_rsi_missing = True
                 else:
-                    print("⚠️ 현재 연도 데이터가 없습니다. 업데이트가 필요합니다.")
+                    self.logger.info("⚠️ 현재 연도 데이터가 없습니다. 업데이트가 필요합니다.")
                     latest_rsi_missing = True
                 
                 if last_updated:
                     last_update_date = datetime.strptime(last_updated, '%Y-%m-%d')
-                    print(f"📅 RSI 참조 데이터 마지막 업데이트: {last_updated}")
+                    self.logger.debug("📅 RSI 참조 데이터 마지막 업데이트: %s", last_updated)
                     
                     # 마지막 업데이트 이후 새로운 금요일(완료된 주차)이 지났는지 확인
                     # 새로운 금요일이 지났으면 해당 주차의 RSI를 계산해야 하므로 업데이트 필요
@@ -232,44 +298,44 @@ class SOXLQuantTrader:
                     latest_passed_friday = today - timedelta(days=days_since_friday)
                     
                     if last_update_date >= latest_passed_friday and not latest_rsi_missing:
-                        print(f"[SUCCESS] RSI 참조 데이터가 최신 상태입니다. (마지막 완료 금요일: {latest_passed_friday.strftime('%Y-%m-%d')})")
+                        self.logger.debug("[SUCCESS] RSI 참조 데이터가 최신 상태입니다. (마지막 완료 금요일: %s)", latest_passed_friday.strftime('%Y-%m-%d'))
                         return True
                     
                     if latest_rsi_missing:
-                        print(f"⚠️ 최신 주간 RSI 값이 비어있어 업데이트가 필요합니다.")
+                        self.logger.info("⚠️ 최신 주간 RSI 값이 비어있어 업데이트가 필요합니다.")
                     else:
-                        print(f"⚠️ 마지막 업데이트({last_updated}) 이후 새로운 완료 주차({latest_passed_friday.strftime('%Y-%m-%d')})가 있어 업데이트가 필요합니다.")
+                        self.logger.info("⚠️ 마지막 업데이트(%s) 이후 새로운 완료 주차(%s)가 있어 업데이트가 필요합니다.", last_updated, latest_passed_friday.strftime('%Y-%m-%d'))
                 else:
-                    print("⚠️ RSI 참조 데이터 메타데이터가 없습니다.")
+                    self.logger.info("⚠️ RSI 참조 데이터 메타데이터가 없습니다.")
                     latest_rsi_missing = True
             else:
-                print("⚠️ RSI 참조 파일이 없습니다. 전체 데이터 생성이 필요합니다.")
+                self.logger.info("⚠️ RSI 참조 파일이 없습니다. 전체 데이터 생성이 필요합니다.")
                 latest_rsi_missing = True
             
             # 최신 RSI가 비어있거나 업데이트가 필요한 경우 False 반환 (자동 업데이트 트리거)
             if latest_rsi_missing:
-                print("\n[INFO] 최신 주간 RSI 값이 비어있어 자동 업데이트를 진행합니다.")
+                self.logger.info("[INFO] 최신 주간 RSI 값이 비어있어 자동 업데이트를 진행합니다.")
             else:
-                print("\n[INFO] RSI 참조 데이터 업데이트가 필요합니다.")
+                self.logger.info("[INFO] RSI 참조 데이터 업데이트가 필요합니다.")
             
             return False
             
         except Exception as e:
-            print(f"[ERROR] RSI 데이터 확인 오류: {e}")
+            self.logger.warning("[ERROR] RSI 데이터 확인 오류: %s", e)
             return False
     
     def update_rsi_reference_file(self, filename: str = "weekly_rsi_reference.json") -> bool:
         """
         RSI 참조 파일을 최신 데이터로 업데이트 (JSON 형식)
-        오늘 날짜까지의 주간 RSI를 자동으로 계산하여 업데이트
+        마지막 기록 주차 이후 완료된 금요일의 주간 RSI만 계산하여 추가
         Args:
             filename: RSI 참조 파일명
         Returns:
             bool: 업데이트 성공 여부
         """
         try:
-            print("[INFO] RSI 참조 데이터 업데이트 중...")
-            print("[INFO] 오늘 날짜까지의 주간 RSI를 자동 계산하여 업데이트합니다.")
+            self.logger.info("[INFO] RSI 참조 데이터 업데이트 중...")
+            self.logger.info("[INFO] 마지막 기록 이후 완료된 주차의 RSI만 계산하여 추가합니다.")
             
             # PyInstaller 실행파일에서 파일 경로 처리
             if getattr(sys, 'frozen', False):
@@ -284,7 +350,7 @@ class SOXLQuantTrader:
             data_dir = os.path.dirname(file_path)
             if data_dir and not os.path.exists(data_dir):
                 os.makedirs(data_dir, exist_ok=True)
-                print(f"📁 {data_dir} 폴더 생성 완료")
+                self.logger.info("📁 %s 폴더 생성 완료", data_dir)
             
             # 기존 JSON 데이터 로드
             existing_data = {}
@@ -292,108 +358,113 @@ class SOXLQuantTrader:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     existing_data = json.load(f)
             
-            # 현재 연도와 주차 계산
             today = datetime.now()
-            current_year = today.strftime('%Y')
-            
-            # QQQ 데이터 가져오기 (15년 - update_rsi_data.py와 동일한 기간으로 정확한 RSI 계산)
-            print("[INFO] QQQ 데이터 가져오는 중 (15y)...")
-            qqq_data = self.get_stock_data("QQQ", "15y")
-            if qqq_data is None:
-                print("[ERROR] QQQ 데이터를 가져올 수 없습니다.")
-                return False
             
-            # 주간 데이터로 변환
-            weekly_data = qqq_data.resample('W-FRI').agg({
-                'Open': 'first',
-                'High': 'max',
-                'Low': 'min',
-                'Close': 'last',
-                'Volume': 'sum'
-            }).dropna()
+            # 마지막 기록 주차 다음 ~ 정규장이 마감된 가장 최근 금요일까지만 계산
+            # (14주 이동평균 RSI이므로 새 주차마다 직전 15주 종가만 필요, 기존 주차는 다시 계산하지 않음)
+            through = last_completed_friday(self.get_us_eastern_now())
+            last_end = latest_reference_end(existing_data)
+            self.logger.info("[INFO] 마지막 기록 주차: %s → 완료된 금요일: %s", last_end or '없음', through)
             
-            print(f"[INFO] 주간 데이터 {len(weekly_data)}주 계산 완료")
-            
-            # 현재 연도 데이터 초기화
-            if current_year not in existing_data:
-                existing_data[current_year] = {
-                    "description": f"{current_year}년 주간 RSI 데이터",
-                    "weeks": []
-                }
-            
-            # 최근 12주 RSI 계산 및 업데이트
-            recent_weeks = weekly_data.tail(12)  # 최근 12주
-            
-            # 완료된 주차만 필터링: 금요일(주 마감일)이 오늘 이전인 주차만 계산
-            # 불완전한 주(금요일이 아직 지나지 않은 주)는 제외하여 모든 거래일 데이터 기반의 정확한 RSI만 저장
-            today_ts = pd.Timestamp(today.date())
-            recent_weeks = recent_weeks[recent_weeks.index <= today_ts]
-            print(f"[INFO] 완료된 주차 필터링: {len(recent_weeks)}주 (오늘 {today.strftime('%Y-%m-%d')} 이전 금요일까지)")
-            
-            for i, (week_end, week_row) in enumerate(recent_weeks.iterrows()):
-                # 해당 주의 시작일 계산 (월요일)
-                week_start = week_end - timedelta(days=4)  # 금요일에서 4일 전 = 월요일
-                
-                # 주차 번호 계산 (해당 연도의 몇 번째 주인지)
-                week_num = week_start.isocalendar()[1]
-                
-                # RSI 계산
-                data_until_week = qqq_data[qqq_data.index <= week_end]
-                if len(data_until_week) >= 20:  # 충분한 데이터가 있을 때
-                    rsi_value = self.calculate_weekly_rsi(data_until_week)
-                    if rsi_value is not None:
-                        # 기존 데이터에서 해당 주차 찾기
-                        week_exists = False
-                        for j, existing_week in enumerate(existing_data[current_year]['weeks']):
-                            if existing_week['week'] == week_num:
-                                # 기존 데이터 업데이트 (항상 최신 계산값으로 덮어씀 - 정확한 RSI 유지)
-                                existing_data[current_year]['weeks'][j] = {
-                                    "start": week_start.strftime('%Y-%m-%d'),
-                                    "end": week_end.strftime('%Y-%m-%d'),
-                                    "week": week_num,
-                                    "rsi": round(rsi_value, 2)
-                                }
-                                week_exists = True
-                                break
-                        
-                        if not week_exists:
-                            # 새로운 주차 데이터 추가
-                            existing_data[current_year]['weeks'].append({
-                                "start": week_start.strftime('%Y-%m-%d'),
-                                "end": week_end.strftime('%Y-%m-%d'),
-                                "week": week_num,
-                                "rsi": round(rsi_value, 2)
-                            })
-                        
-                        print(f"   주차 {week_num}: {week_start.strftime('%m-%d')} ~ {week_end.strftime('%m-%d')} | RSI: {rsi_value:.2f}")
+            new_weeks = append_completed_weeks(existing_data, lambda period: self.get_stock_data("QQQ", period), through)
+            if new_weeks is None:
+                self.logger.warning("[ERROR] QQQ 데이터를 가져올 수 없습니다.")
+                return False
             
-            # 주차별로 정렬
-            existing_data[current_year]['weeks'].sort(key=lambda x: x['week'])
+            for week_data in new_weeks:
+                self.logger.info("   주차 %s: %s ~ %s | RSI: %.2f", week_data['week'], week_data['start'][5:], week_data['end'][5:], week_data['rsi'])
             
             # 메타데이터 업데이트
-            total_weeks = sum(len(year_data['weeks']) for year, year_data in existing_data.items() if year != 'metadata')
-            existing_data['metadata'] = {
-                "last_updated": today.strftime('%Y-%m-%d'),
-                "total_years": len([k for k in existing_data.keys() if k != 'metadata']),
-                "total_weeks": total_weeks,
-                "description": "QQQ 주간 RSI 참조 데이터 (14주 Wilder's RSI)"
-            }
+            total_weeks = refresh_metadata(existing_data, today.strftime('%Y-%m-%d'))
             
-            # JSON 파일로 저장
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(existing_data, f, ensure_ascii=False, indent=2)
+            # JSON 파일로 저장 (임시 파일 교체 방식 - 읽는 쪽이 쓰다 만 파일을 보지 않음)
+            write_rsi_reference(file_path, json.dumps(existing_data, ensure_ascii=False, indent=2))
             
-            print("[SUCCESS] RSI 참조 데이터 업데이트 완료!")
-            print(f"   - {current_year}년 데이터 업데이트")
-            print(f"   - 총 {total_weeks}개 주차 데이터")
-            print(f"   - 마지막 업데이트: {today.strftime('%Y-%m-%d')}")
+            self.logger.info("[SUCCESS] RSI 참조 데이터 업데이트 완료!")
+            self.logger.info("   - 추가된 주차: %s개", len(new_weeks))
+            self.logger.info("   - 총 %s개 주차 데이터", total_weeks)
+            self.logger.info("   - 마지막 업데이트: %s", today.strftime('%Y-%m-%d'))
             
             return True
             
         except Exception as e:
-            print(f"[ERROR] RSI 참조 파일 업데이트 오류: {e}")
+            self.logger.error("[ERROR] RSI 참조 파일 업데이트 오류: %s", e)
             return False
     
+    @staticmethod
+    def _run_rsi_reference_update() -> bool:
+        """RSI 참조 파일 갱신 (전용 트레이더 인스턴스로 실행해 호출한 트레이더의 상태를 건드리지 않음)"""
+        try:
+            logger.info("[INFO] RSI 참조 데이터 업데이트 중...")
+            if SOXLQuantTrader().update_rsi_reference_file():
+                logger.info("[SUCCESS] RSI 참조 데이터 업데이트 완료")
+                return True
+            logger.error("[ERROR] RSI 참조 데이터 업데이트 실패")
+        except Exception as e:
+            # RSI 업데이트 실패해도 백테스트는 계속 진행
+            logger.warning("[WARNING] RSI 업데이트 중 오류 발생 (무시하고 계속 진행): %s", str(e)[:100])
+        return False
+
+    def _refresh_rsi_reference_once(self) -> None:
+        """
+        RSI 참조 데이터 최신 여부를 프로세스당 하루 한 번만 확인
+        갱신이 필요하면 RSI_REFRESH_MODE에 따라 백그라운드 스레드("background") 또는
+        현재 스레드("sync")에서 update_rsi_reference_file을 실행한다.
+        """
+        cls = SOXLQuantTrader
+        today_str = datetime.now().strftime('%Y-%m-%d')
+        with cls._rsi_refresh_lock:
+            if cls._rsi_refresh_checked_on == today_str:
+                return
+            cls._rsi_refresh_checked_on = today_str
+
+        try:
+            if self.check_and_update_rsi_data():
+                return
+        except Exception as e:
+            self.logger.warning("[WARNING] RSI 업데이트 중 오류 발생 (무시하고 계속 진행): %s", str(e)[:100])
+            return
+
+        if self.RSI_REFRESH_MODE == "sync":
+            cls._run_rsi_reference_update()
+            return
+
+        worker = threading.Thread(target=cls._run_rsi_reference_update, name="rsi-reference-refresh", daemon=True)
+        with cls._rsi_refresh_lock:
+            cls._rsi_refresh_thread = worker
+        worker.start()
+        self.logger.info("[INFO] RSI 참조 데이터 백그라운드 업데이트 시작")
+
+    @classmethod
+    def mark_rsi_refresh_checked(cls, day: Optional[str] = None) -> None:
+        """
+        RSI 참조 데이터 최신 여부를 이미 확인한 것으로 표시 (그 날짜에는 생성자가 다시 확인하지 않음)
+        부모 프로세스가 이미 확인한 프로세스 풀 워커 등에서 사용한다.
+        Args:
+            day: 확인한 날짜 (YYYY-MM-DD, None이면 오늘)
+        """
+        with SOXLQuantTrader._rsi_refresh_lock:
+            SOXLQuantTrader._rsi_refresh_checked_on = day or datetime.now().strftime('%Y-%m-%d')
+
+    @classmethod
+    def rsi_refresh_in_progress(cls) -> bool:
+        """백그라운드 RSI 참조 데이터 갱신이 진행 중인지 여부"""
+        worker = cls._rsi_refresh_thread
+        return worker is not None and worker.is_alive()
+
+    @classmethod
+    def wait_for_rsi_refresh(cls, timeout: Optional[float] = None) -> bool:
+        """
+        백그라운드 RSI 갱신이 끝날 때까지 대기
+        Returns:
+            bool: 이번 프로세스에서 백그라운드 갱신이 시작되어 완료되었으면 True
+        """
+        worker = cls._rsi_refresh_thread
+        if worker is None or worker is threading.current_thread():
+            return False
+        worker.join(timeout)
+        return not worker.is_alive()
+
     def __init__(self, initial_capital: float = 40000, sf_config: Optional[Dict] = None, ag_config: Optional[Dict] = None):
         """
         초기화
@@ -407,7 +478,26 @@ class SOXLQuantTrader:
 
         # 성능 최적화를 위한 캐시
         self._stock_data_cache = {}  # 주식 데이터 캐시
-        self._simulation_cache = {}  # 시뮬레이션 결과 캐시
+        # 미리 조회해 주입한 일봉 (심볼 → DataFrame, preload_stock_data 참고)
+        self._preloaded_bars: Dict[str, pd.DataFrame] = {}
+        # 주입한 RSI 참조 데이터 (use_rsi_reference 참고, None이면 파일 사용)
+        self._rsi_reference_override = None
+        # 주입한 주차별 모드 타임라인 (use_mode_timeline 참고, None이면 주차마다 RSI로 판정)
+        self._mode_timeline = None
+        # 시뮬레이션 결과 캐시 (프로세스 공용 LRU, 키 = 설정 + 마지막 완료 세션 해시)
+        self._simulation_cache = get_simulation_cache()
+        # 공용 chart API 클라이언트 (세션 풀/재시도/요청 합치기/응답 캐시)
+        self._market_data = get_market_data_client()
+        # 마감된 세션 일봉의 디스크 저장소 (프로세스·인스턴스 간 공유, 오프라인 재생 모드에서는 사용 안 함)
+        self._bar_store = None if self._market_data.offline else get_bar_store(self._resolve_data_path("bars"))
+        # 시작일 기반 시뮬레이션의 마지막 완료 세션 체크포인트 (다음 실행은 새 봉만 이어서 계산)
+        self._checkpoint_store = None if self._market_data.offline else get_checkpoint_store(
+            self._resolve_data_path("checkpoints")
+        )
+        # 마지막 배열 엔진 실행의 루프 상태 (체크포인트 저장용, 기존 루프로 실행했으면 None)
+        self._last_backtest_loop: Optional[Dict] = None
+        # 마지막 체크포인트 이어서 실행의 기록 로그 위치 (다음 저장 때 바뀐 행만 덧붙임, 전체 실행이면 None)
+        self._checkpoint_tail: Optional[Dict] = None
         
         # 데이터 경고 저장 (Close가 None인 날짜들)
         self._data_warnings = []
@@ -424,17 +514,8 @@ class SOXLQuantTrader:
         # 이 집합에는 운영 중 임시로 추가할 휴장일(YYYY-MM-DD)만 넣는다.
         self.us_holidays = set()
         
-        # RSI 참조 데이터 확인 및 업데이트 (오류 발생 시에도 계속 진행)
-        try:
-            if not self.check_and_update_rsi_data():
-                print("[INFO] RSI 참조 데이터 업데이트 중...")
-                if self.update_rsi_reference_file():
-                    print("[SUCCESS] RSI 참조 데이터 업데이트 완료")
-                else:
-                    print("[ERROR] RSI 참조 데이터 업데이트 실패")
-        except Exception as e:
-            # RSI 업데이트 실패해도 백테스트는 계속 진행
-            print(f"[WARNING] RSI 업데이트 중 오류 발생 (무시하고 계속 진행): {str(e)[:100]}")
+        # RSI 참조 데이터 확인 (프로세스당 하루 한 번, 갱신이 필요하면 백그라운드에서 진행)
+        self._refresh_rsi_reference_once()
         
         # SF모드 설정 (사용자 지정 또는 기본값)
         if sf_config is not None:
@@ -483,6 +564,10 @@ class SOXLQuantTrader:
         # 주차 추적 (모드 전환 제어용)
         self.current_week_friday: Optional[datetime] = None  # 현재 주차의 금요일
 
+        # 백테스트 일별 이벤트(주차 모드/매수/매도) 기록 여부 (True일 때만 backtest_events에 dict로 쌓음)
+        self.record_backtest_events = False
+        self.backtest_events: List[Dict] = []
+
         # Optional realized P/L compounding for buy sizing. Disabled unless a caller enables it.
         self.profit_loss_compounding_enabled = False
         self.profit_compounding_rate = 0.0
@@ -499,15 +584,15 @@ class SOXLQuantTrader:
         """테스트용 오늘 날짜 설정/해제. None 또는 빈문자면 해제."""
         if not date_str:
             self.test_today_override = None
-            print("🧪 테스트 날짜 해제됨 (실제 오늘 날짜 사용)")
+            self.logger.info("🧪 테스트 날짜 해제됨 (실제 오늘 날짜 사용)")
             return
         try:
             # 형식 검증
             _ = datetime.strptime(date_str, "%Y-%m-%d")
             self.test_today_override = date_str
-            print(f"🧪 테스트 날짜 설정: {date_str}")
+            self.logger.info("🧪 테스트 날짜 설정: %s", date_str)
         except ValueError:
-            print("❌ 날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식으로 입력해주세요.")
+            self.logger.warning("❌ 날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식으로 입력해주세요.")
 
     def get_today_date(self) -> datetime:
         """Return the effective market date at midnight."""
@@ -607,7 +692,7 @@ class SOXLQuantTrader:
         else:
             current_dt = pd.Timestamp(current_date).to_pydatetime()
         current_dt = current_dt.replace(hour=0, minute=0, second=0, microsecond=0)
-        current_key = current_dt.strftime("%Y-%m-%d")
+        current_key = current_dt.date().isoformat()
         if current_key in self._compound_processed_dates:
             return
         self._compound_processed_dates.add(current_key)
@@ -641,7 +726,7 @@ class SOXLQuantTrader:
         self.seed_increases.append(seed_increase)
         # 날짜순으로 정렬
         self.seed_increases.sort(key=lambda x: x["date"])
-        print(f"시드증액 추가: {date} - ${amount:,.0f} ({description})")
+        self.logger.info("시드증액 추가: %s - $%s (%s)", date, f"{amount:,.0f}", description)
 
     def set_seed_increases(self, seeds: Optional[List[Dict]] = None) -> None:
         """
@@ -716,10 +801,7 @@ class SOXLQuantTrader:
             if total > 0:
                 self.current_investment_capital = total
                 ref_day = rows.index[-1].strftime("%Y-%m-%d")
-                print(
-                    f"💰 스냅샷 기준 투자원금(총자산): ${total:,.0f} "
-                    f"(스냅샷일 {snapshot_max_date} → 종가 기준일 {ref_day}, ${px:.2f})"
-                )
+                self.logger.info("💰 스냅샷 기준 투자원금(총자산): $%s (스냅샷일 %s → 종가 기준일 %s, $%.2f)", f"{total:,.0f}", snapshot_max_date, ref_day, px)
         except Exception:
             pass
 
@@ -953,11 +1035,7 @@ class SOXLQuantTrader:
         공식: available_cash = (시뮬 시점 총자산) - snapshot_total_invested
         """
         try:
-            if quiet:
-                buf = io.StringIO()
-                with redirect_stdout(buf):
-                    res = self.run_backtest(original_start_date, max_snap_date)
-            else:
+            with self.quiet_logging(quiet):
                 res = self.run_backtest(original_start_date, max_snap_date)
             if res and "error" in res:
                 return None
@@ -981,11 +1059,9 @@ class SOXLQuantTrader:
         rsi_ref_data = {}
         try:
             rsi_file_path = str(self._resolve_data_path("weekly_rsi_reference.json"))
-            if os.path.exists(rsi_file_path):
-                with open(rsi_file_path, "r", encoding="utf-8") as f:
-                    rsi_ref_data = json.load(f)
+            rsi_ref_data = load_rsi_reference(rsi_file_path) or {}
         except Exception as e:
-            print(f"⚠️ RSI 참조 데이터 로드 실패: {e}")
+            self.logger.warning("⚠️ RSI 참조 데이터 로드 실패: %s", e)
 
         qqq_data = self.get_stock_data("QQQ", "6mo")
         weekly_df = None
@@ -1055,12 +1131,195 @@ class SOXLQuantTrader:
             pos_key = f"{pos.get('round')}_{buy_date_dt.strftime('%Y-%m-%d')}"
             if correct_mode:
                 if correct_mode != pos.get("mode"):
-                    print(f"🔧 스냅샷 mode 누락 → 매수일 기준 재계산: {pos_key} = {pos.get('mode')} → {correct_mode}")
+                    self.logger.debug("🔧 스냅샷 mode 누락 → 매수일 기준 재계산: %s = %s → %s", pos_key, pos.get('mode'), correct_mode)
                 pos["mode"] = correct_mode
             else:
-                print(f"⚠️ {pos_key}: mode 재계산 실패 (RSI 데이터 부족) → 기본값 {pos.get('mode')} 유지")
+                self.logger.warning("⚠️ %s: mode 재계산 실패 (RSI 데이터 부족) → 기본값 %s 유지", pos_key, pos.get('mode'))
             pos.pop("_mode_needs_recalc", None)
 
+    def _simulation_cache_fields(self) -> Dict:
+        """시뮬레이션 결과를 좌우하는 트레이더 설정 (설정을 추가하는 하위 클래스는 여기에 덧붙인다)"""
+        compounding = None
+        if getattr(self, "profit_loss_compounding_enabled", False):
+            compounding = [
+                self.profit_compounding_rate,
+                self.loss_compounding_rate,
+                getattr(self, "compounding_settlement_delay_days", 0),
+                getattr(self, "compounding_reference_renewal_days", 0),
+            ]
+        return {
+            "trader": f"{type(self).__module__}.{type(self).__qualname__}",
+            "ticker": self.ticker,
+            "initial_capital": self.initial_capital,
+            "sf_config": self.sf_config,
+            "ag_config": self.ag_config,
+            "seed_increases": sorted((si["date"], float(si.get("amount", 0) or 0)) for si in self.seed_increases),
+            "compounding": compounding,
+            "us_holidays": self.us_holidays,
+        }
+
+    def _simulation_cache_key(self, kind: str, last_session, **extra) -> str:
+        """공용 시뮬레이션 캐시 키: 설정 + 마지막 완료 세션 + 호출별 입력(시작일, 스냅샷 등)의 해시"""
+        fields = self._simulation_cache_fields()
+        fields.update(extra, kind=kind, last_session=last_session)
+        return simulation_key(fields)
+
+    def _capture_portfolio_state(self) -> Dict:
+        """시뮬레이션 이후 포트폴리오 상태 (캐시/체크포인트 저장용 복사본)"""
+        return copy.deepcopy({
+            "positions": self.positions,
+            "available_cash": self.available_cash,
+            "current_round": self.current_round,
+            "current_investment_capital": self.current_investment_capital,
+            "trading_days_count": self.trading_days_count,
+            "processed_seed_dates": self.processed_seed_dates,
+            "current_mode": self.current_mode,
+            "current_week_friday": self.current_week_friday,
+            "compound_seed": self.compound_seed,
+            "compound_reference_seed": self.compound_reference_seed,
+            "compound_settlements": self.compound_settlements,
+            "compound_processed_dates": self._compound_processed_dates,
+        })
+
+    def _restore_portfolio_state(self, state: Dict) -> None:
+        """_capture_portfolio_state()로 저장한 상태를 복원 (저장본은 그대로 두고 복사해서 적용)"""
+        state = copy.deepcopy(state)
+        self.positions = state["positions"]
+        self.available_cash = state["available_cash"]
+        self.current_round = state["current_round"]
+        self.current_investment_capital = state["current_investment_capital"]
+        self.trading_days_count = state["trading_days_count"]
+        self.processed_seed_dates = state["processed_seed_dates"]
+        self.current_mode = state["current_mode"]
+        self.current_week_friday = state["current_week_friday"]
+        self.compound_seed = state["compound_seed"]
+        self.compound_reference_seed = state["compound_reference_seed"]
+        self.compound_settlements = state["compound_settlements"]
+        self._compound_processed_dates = state["compound_processed_dates"]
+
+    def _store_simulation(self, cache_key: str, result: Dict, last_session=None) -> None:
+        """
+        시뮬레이션 결과와 포트폴리오 상태를 공용 캐시에 저장
+        마지막 완료 세션(last_session)의 일봉이 아직 결과에 없으면 잠시 뒤 다시 계산하도록 짧게만 보관한다.
+        """
+        if not isinstance(result, dict) or "error" in result:
+            return
+        ttl = None
+        records = result.get("daily_records")
+        if last_session is not None and records and records[-1].get("date", "") < last_session.strftime("%Y-%m-%d"):
+            ttl = self.INCOMPLETE_SIMULATION_CACHE_SECONDS
+        self._simulation_cache.put(cache_key, {"result": result, "state": self._capture_portfolio_state()}, ttl)
+
+    def _checkpoint_key(self, start_date: str) -> str:
+        """증분 시뮬레이션 체크포인트 키: 설정 + 시작일 (마지막 완료 세션은 체크포인트 안에 기록)"""
+        return self._simulation_cache_key("checkpoint", None, start_date=start_date, version=CHECKPOINT_VERSION)
+
+    def _resume_backtest_from_checkpoint(
+        self, checkpoint_key: str, checkpoint: Dict, start_date: str, end_date: str
+    ) -> Optional[Dict]:
+        """
+        체크포인트(마지막 완료 세션까지의 상태) 다음 봉부터 end_date까지만 이어서 실행
+        전체 재실행과 같은 daily_records와 포트폴리오 상태를 만든다.
+        Returns:
+            Dict: run_backtest와 같은 요약 결과, 이어서 실행할 수 없으면 None (전체 재실행)
+        """
+        # 기존 루프 엔진이나 일별 이벤트 기록은 처음부터 다시 실행해야 같은 결과가 나온다
+        if not self._use_array_engine() or self.record_backtest_events:
+            return None
+        session = checkpoint["session"]
+        if end_date < session:
+            return None
+
+        bars = self._load_backtest_bars(session, end_date)
+        if "error" in bars:
+            return None
+        soxl_data = bars["soxl"]
+        session_end = datetime.strptime(session, "%Y-%m-%d").replace(hour=23, minute=59, second=59)
+        history = soxl_data[soxl_data.index <= session_end]
+        # 체크포인트 세션 종가가 바뀌었으면(액면분할 조정, 데이터 정정) 이전 구간부터 다시 계산
+        if (
+            len(history) == 0
+            or history.index[-1].strftime("%Y-%m-%d") != session
+            or float(history["Close"].iloc[-1]) != checkpoint["close"]
+        ):
+            self.logger.debug("♻️ 체크포인트 세션(%s) 종가가 달라 전체 재시뮬레이션", session)
+            return None
+        new_bars = soxl_data[(soxl_data.index > session_end) & (soxl_data.index <= bars["end_dt"])]
+        tail = checkpoint["records"]
+        daily_records = self._checkpoint_store.load_records(checkpoint_key, tail["size"], tail["count"])
+        if daily_records is None:
+            return None
+        # 아직 매도되지 않은 매수 행 (새 봉에서 매도되면 매도일/매도가/실현손익이 채워지므로 다음 저장 때 다시 기록)
+        open_rows = [
+            index for index, record in enumerate(daily_records)
+            if record["buy_round"] and record["buy_quantity"] > 0
+            and record["buy_executed_price"] > 0 and not record["sell_date"]
+        ]
+
+        self.backtest_events = []
+        self._restore_portfolio_state(checkpoint["state"])
+        loop = checkpoint["loop"]
+        self._last_backtest_loop = None
+        if len(new_bars):
+            self.logger.debug("⏩ 체크포인트(%s) 이후 %s개 봉만 시뮬레이션", session, len(new_bars))
+            week_modes = loop["week_modes"]
+            array_engine = ArrayBacktestEngine(self, new_bars, self.load_rsi_reference_data())
+            new_records = array_engine.run(
+                checkpoint["close"],
+                loop["current_mode"],
+                loop["current_week_rsi"],
+                week_modes,
+                False,
+                resume={
+                    "current_week": loop["current_week"],
+                    "current_week_friday": loop["current_week_friday"],
+                    "total_realized_pnl": loop["total_realized_pnl"],
+                    "bar_offset": loop["bars"],
+                    "open_buy_rows": [daily_records[index] for index in open_rows],
+                },
+            )
+            if isinstance(new_records, dict):
+                return None
+            daily_records = daily_records + new_records
+            self._last_backtest_loop = dict(array_engine.loop_state, week_modes=week_modes)
+        self._checkpoint_tail = dict(tail, open_rows=open_rows)
+        return self._finish_backtest(start_date, end_date, (self._last_backtest_loop or loop)["bars"], daily_records)
+
+    def _save_checkpoint(self, checkpoint_key: str, start_date: str, result: Dict, last_session) -> None:
+        """
+        마지막 배열 엔진 실행의 종료 상태를 체크포인트로 저장
+        마지막 완료 세션(last_session) 이후의 봉은 아직 확정되지 않았으므로 저장하지 않는다.
+        체크포인트에서 이어서 실행했으면 일별 기록은 새 봉의 행과 다시 매도된 기존 매수 행만 로그에 덧붙인다.
+        """
+        loop = self._last_backtest_loop
+        if self._checkpoint_store is None or loop is None:
+            return
+        if not isinstance(result, dict) or "error" in result:
+            return
+        records = result.get("daily_records")
+        if not records or records[-1]["date"] > last_session.strftime("%Y-%m-%d"):
+            return
+        tail = self._checkpoint_tail
+        if tail is None:
+            size = self._checkpoint_store.append_records(checkpoint_key, enumerate(records))
+        else:
+            rows = [(index, records[index]) for index in tail["open_rows"]]
+            rows.extend(enumerate(records[tail["count"]:], tail["count"]))
+            size = self._checkpoint_store.append_records(checkpoint_key, rows, tail["size"])
+        if size is None:
+            return
+        state = self._capture_portfolio_state()
+        # _finish_backtest가 최종 총자산으로 맞춘 투자원금 대신 루프 종료 시점 값을 저장
+        state["current_investment_capital"] = loop["current_investment_capital"]
+        self._checkpoint_store.save(checkpoint_key, {
+            "start_date": start_date,
+            "session": records[-1]["date"],
+            "close": float(records[-1]["close_price"]),
+            "state": state,
+            "loop": loop,
+            "records": {"size": size, "count": len(records)},
+        })
+
     def simulate_from_snapshot_to_today(self, snapshot: dict, original_start_date: str, quiet: bool = True) -> Dict:
         """
         스냅샷을 기반으로 스냅샷 최신일 이후만 시뮬레이션. 스냅샷에 없는 회차는 생성되지 않음.
@@ -1083,6 +1342,19 @@ class SOXLQuantTrader:
             else:
                 return self.simulate_from_start_to_today(original_start_date, quiet)
 
+        # 같은 스냅샷 내용(포지션·예수금·매수 추천수량 등)·원래 시작일·마지막 완료 세션이면 이전 결과 재사용
+        latest_trading_day = self.get_latest_trading_day().date()
+        cache_key = self._simulation_cache_key(
+            "snapshot", latest_trading_day,
+            snapshot=snapshot, original_start_date=original_start_date,
+        )
+        cached = self._simulation_cache.get(cache_key)
+        if cached is not None:
+            self.logger.debug("⚡ 스냅샷 기반 시뮬레이션 캐시 사용 (%s)", max_snap_date)
+            self._restore_portfolio_state(cached["state"])
+            self._sync_investment_capital_to_latest_total_assets()
+            return cached["result"]
+
         # [버그픽스] 스냅샷에 mode가 저장돼있지 않은 과거 포지션은 매수일 주간 RSI로 재계산.
         # 이 작업을 run_backtest 호출 전에 수행해, 재시뮬 매도조건 체크가 올바른 모드(SF/AG)로
         # 동작하도록 한다. (이전엔 모두 SF로 기본값 처리되어 공세 포지션이 잘못 매도됐음)
@@ -1098,7 +1370,6 @@ class SOXLQuantTrader:
             if sim_cash is not None:
                 available_cash = sim_cash
 
-        latest_trading_day = self.get_latest_trading_day().date()
         max_dt = datetime.strptime(max_snap_date, "%Y-%m-%d").date()
         if max_dt >= latest_trading_day:
             # 스냅샷이 이미 최신이면 시뮬레이션 없이 스냅샷만 적용
@@ -1117,39 +1388,7 @@ class SOXLQuantTrader:
             return {"from_snapshot": True, "max_snap_date": max_snap_date}
 
         start_after_snap = self._get_next_trading_day(max_snap_date)
-        seed_increases_str = ""
-        if self.seed_increases:
-            sorted_seeds = sorted(self.seed_increases, key=lambda x: x["date"])
-            seed_increases_str = "_".join([f"{s['date']}_{s['amount']}" for s in sorted_seeds])
-        compounding_cache_key = (
-            f"comp_{int(getattr(self, 'profit_loss_compounding_enabled', False))}_"
-            f"{getattr(self, 'profit_compounding_rate', 0.0)}_"
-            f"{getattr(self, 'loss_compounding_rate', 0.0)}_"
-            f"{getattr(self, 'compounding_settlement_delay_days', 0)}_"
-            f"{getattr(self, 'compounding_reference_renewal_days', 0)}"
-        )
         pending_buy = self._pending_buy_from_snapshot(snapshot)
-        pending_cache_key = (
-            f"pending_{pending_buy['round']}_{pending_buy['order_date']}_{pending_buy['quantity']}"
-            if pending_buy
-            else "pending_none"
-        )
-        cache_key = (
-            f"snap_{self.ticker}_{max_snap_date}_{self.initial_capital}_"
-            f"{self.test_today_override or 'real'}_{seed_increases_str}_"
-            f"{compounding_cache_key}_{pending_cache_key}"
-        )
-        if cache_key in self._simulation_cache:
-            cached, cache_time = self._simulation_cache[cache_key]
-            if (datetime.now() - cache_time).seconds < 30:
-                if not quiet:
-                    print(f"⚡ 스냅샷 기반 시뮬레이션 캐시 사용 ({max_snap_date})")
-                self.positions = cached.get("positions", [])
-                self.available_cash = cached.get("available_cash", self.initial_capital)
-                self.current_round = cached.get("current_round", 1)
-                self._sync_investment_capital_to_latest_total_assets()
-                self._restore_compounding_from_snapshot(cached)
-                return cached.get("result", {})
 
         latest_seed_date = None
         if self.seed_increases:
@@ -1169,17 +1408,7 @@ class SOXLQuantTrader:
 
         self._pending_buy_recommendation = pending_buy
         try:
-            if quiet:
-                buf = io.StringIO()
-                with redirect_stdout(buf):
-                    result = self.run_backtest(
-                        start_after_snap, end_date_str,
-                        initial_positions=positions,
-                        initial_cash=available_cash,
-                        snapshot_max_date=max_snap_date,
-                        initial_processed_seed_dates=self._snapshot_processed_seed_dates(snapshot),
-                    )
-            else:
+            with self.quiet_logging(quiet):
                 result = self.run_backtest(
                     start_after_snap, end_date_str,
                     initial_positions=positions,
@@ -1209,15 +1438,7 @@ class SOXLQuantTrader:
         if soxl_prune is not None and len(soxl_prune) > 0:
             self._prune_positions_failing_loc_verification(soxl_prune)
 
-        cached = {
-            "positions": self.positions.copy(),
-            "available_cash": self.available_cash,
-            "current_round": self.current_round,
-            "compound_seed": getattr(self, "compound_seed", None),
-            "compound_reference_seed": getattr(self, "compound_reference_seed", None),
-            "result": result,
-        }
-        self._simulation_cache[cache_key] = (cached, datetime.now())
+        self._store_simulation(cache_key, result, latest_trading_day)
         return result
 
     def simulate_from_start_to_today(self, start_date: str, quiet: bool = True) -> Dict:
@@ -1229,31 +1450,15 @@ class SOXLQuantTrader:
         Returns:
             Dict: run_backtest 요약 결과
         """
-        # 캐시 키 생성 (시작일 + 초기투자금 + 테스트날짜 + 시드증액 정보)
-        # 시드증액 정보를 문자열로 변환하여 캐시 키에 포함
-        seed_increases_str = ""
-        if self.seed_increases:
-            # 시드증액을 날짜와 금액 기준으로 정렬하여 문자열로 변환
-            sorted_seeds = sorted(self.seed_increases, key=lambda x: x["date"])
-            seed_increases_str = "_".join([f"{s['date']}_{s['amount']}" for s in sorted_seeds])
-        
-        compounding_cache_key = (
-            f"comp_{int(getattr(self, 'profit_loss_compounding_enabled', False))}_"
-            f"{getattr(self, 'profit_compounding_rate', 0.0)}_"
-            f"{getattr(self, 'loss_compounding_rate', 0.0)}_"
-            f"{getattr(self, 'compounding_settlement_delay_days', 0)}_"
-            f"{getattr(self, 'compounding_reference_renewal_days', 0)}"
-        )
-        cache_key = f"{self.ticker}_{start_date}_{self.initial_capital}_{self.test_today_override or 'real'}_{seed_increases_str}_{compounding_cache_key}"
-        
-        # 캐시된 결과가 있고 2분 이내면 재사용
-        if cache_key in self._simulation_cache:
-            cached_result, cache_time = self._simulation_cache[cache_key]
-            if (datetime.now() - cache_time).seconds < 30:  # 30초 캐시
-                print(f"⚡ 시뮬레이션 결과 캐시에서 로드 ({start_date})")
-                return cached_result
-        
         latest_trading_day = self.get_latest_trading_day()
+
+        # 설정 + 시작일 + 마지막 완료 세션이 같으면 (다른 인스턴스의 결과라도) 재사용
+        cache_key = self._simulation_cache_key("start", latest_trading_day.date(), start_date=start_date)
+        cached = self._simulation_cache.get(cache_key)
+        if cached is not None:
+            self.logger.debug("⚡ 시뮬레이션 결과 캐시에서 로드 (%s)", start_date)
+            self._restore_portfolio_state(cached["state"])
+            return cached["result"]
         
         # 시드증액 날짜 중 가장 늦은 날짜 확인 (시드증액이 시뮬레이션에 반영되도록)
         latest_seed_date = None
@@ -1278,23 +1483,28 @@ class SOXLQuantTrader:
             end_dt = effective_end_date
             if start_dt > end_dt:
                 if not quiet:
-                    print(f"⚠️ 백테스트 스킵: 시작일({start_dt})이 종료일({end_dt})보다 늦음")
+                    self.logger.warning("⚠️ 백테스트 스킵: 시작일(%s)이 종료일(%s)보다 늦음", start_dt, end_dt)
                 self.reset_portfolio()
                 minimal_result = {"skipped": True, "start_date": start_date, "end_date": end_date_str}
-                self._simulation_cache[cache_key] = (minimal_result, datetime.now())
+                self._store_simulation(cache_key, minimal_result)
                 return minimal_result
         except Exception:
             pass
         
-        if quiet:
-            buf = io.StringIO()
-            with redirect_stdout(buf):
+        # 같은 설정·시작일의 체크포인트가 있으면 그 다음 봉부터만 이어서 계산
+        checkpoint_key = self._checkpoint_key(start_date)
+        checkpoint = self._checkpoint_store.load(checkpoint_key) if self._checkpoint_store is not None else None
+        self._checkpoint_tail = None
+        with self.quiet_logging(quiet):
+            result = None
+            if checkpoint is not None:
+                result = self._resume_backtest_from_checkpoint(checkpoint_key, checkpoint, start_date, end_date_str)
+            if result is None:
                 result = self.run_backtest(start_date, end_date_str)
-        else:
-            result = self.run_backtest(start_date, end_date_str)
+        self._save_checkpoint(checkpoint_key, start_date, result, latest_trading_day.date())
         
         # 캐시에 저장
-        self._simulation_cache[cache_key] = (result, datetime.now())
+        self._store_simulation(cache_key, result, latest_trading_day.date())
         
         return result
     
@@ -1362,9 +1572,256 @@ class SOXLQuantTrader:
             while not self.is_trading_day(latest):
                 latest -= timedelta(days=1)
 
-        print(f"📊 계산된 최신 거래일: {latest.strftime('%Y-%m-%d')}")
+        self.logger.debug("📊 계산된 최신 거래일: %s", latest.strftime('%Y-%m-%d'))
         return latest
-        
+
+    def preload_stock_data(self, frames: Dict[str, Optional[pd.DataFrame]]) -> None:
+        """
+        미리 조회한 일봉 주입 (배치 실행에서 같은 데이터를 티커·프로세스마다 다시 받지 않도록)
+        주입한 심볼은 get_stock_data가 요청 기간만큼 잘라낸 사본으로 반환한다 (None인 항목은 무시).
+        여러 스레드의 트레이더가 같은 프레임을 주입받아도 서로의 수정에 영향받지 않는다.
+        """
+        for symbol, df in frames.items():
+            if df is not None:
+                self._preloaded_bars[symbol.upper()] = df
+
+    def use_rsi_reference(self, rsi_data) -> None:
+        """RSI 참조 데이터 주입 (load_rsi_reference_data가 파일 대신 반환, None이면 다시 파일 사용)"""
+        self._rsi_reference_override = rsi_data
+
+    def build_mode_timeline(self, rsi_data: Optional[dict] = None, through=None) -> WeeklyModeTimeline:
+        """
+        RSI 참조 데이터로 주차별 (RSI, 모드) 타임라인 생성 (배치 실행에서 한 번 만들어 use_mode_timeline으로 공유)
+        Args:
+            rsi_data: RSI 참조 데이터 (None이면 load_rsi_reference_data)
+            through: 이 날짜가 속한 주차까지 생성 (None이면 참조 데이터 마지막 주차의 다음 주까지)
+        """
+        if rsi_data is None:
+            rsi_data = self.load_rsi_reference_data()
+        return build_mode_timeline(rsi_data, self._is_mode_case_matched, through)
+
+    def use_mode_timeline(self, timeline: Optional[WeeklyModeTimeline]) -> None:
+        """
+        주차별 모드 타임라인 주입 (None이면 해제)
+        타임라인에 있는 주차는 백테스트 시작 상태와 배열 엔진 주차 전환에서 RSI 조회·모드 판정을 생략하고,
+        백테스트 데이터 조회 시 QQQ 일봉도 받지 않는다.
+        """
+        self._mode_timeline = timeline
+
+    def use_market_data(self, provider, bar_store=None, checkpoint_store=None) -> None:
+        """
+        시세 제공자 교체 (예: ReplayMarketDataClient로 네트워크 없는 결정적 실행)
+        Args:
+            provider: get_chart_result/get_many를 제공하는 MarketDataClient 계열 객체
+            bar_store: 사용할 DailyBarStore (None이면 디스크 일봉 저장소를 쓰지 않음)
+            checkpoint_store: 사용할 CheckpointStore (None이면 증분 시뮬레이션 체크포인트를 쓰지 않음)
+        """
+        self._market_data = provider
+        self._bar_store = bar_store
+        self._checkpoint_store = checkpoint_store
+        self.clear_cache()
+        self.clear_simulation_cache()
+
+    def _last_closed_session_date(self):
+        """정규장이 마감된 가장 최근 세션 날짜 (오늘 장이 끝났으면 오늘)."""
+        et_now = self.get_us_eastern_now()
+        session = et_now.date()
+        if self.is_trading_day(session) and self.is_regular_session_closed_now():
+            return session
+        session -= timedelta(days=1)
+        while not self.is_trading_day(session):
+            session -= timedelta(days=1)
+        return session
+
+    def _stored_bars_for_period(self, symbol: str, period: str) -> Optional[pd.DataFrame]:
+        """
+        요청 기간을 모두 덮는 저장분이 있으면 저장소 전체 프레임을 반환 (신선도는 보지 않음).
+        15y/max는 전체 이력으로 기록된 저장소만, 나머지 기간은 시작일을 덮는 저장소만 인정한다.
+        """
+        if self._bar_store is None:
+            return None
+        try:
+            meta = self._bar_store.load_meta(symbol)
+            if not meta:
+                return None
+            start = period_start(period, self.get_today_date())
+            if start is None and not meta.get("full_history"):
+                return None
+            df = self._bar_store.load(symbol)
+            if df is None or len(df) == 0:
+                return None
+            # range 시작일이 주말/휴장일이면 첫 일봉이 며칠 늦을 수 있으므로 1주일 여유를 둔다
+            if start is not None and df.index[0] > start + timedelta(days=7) and not meta.get("full_history"):
+                return None
+            return df
+        except KeyError:
+            # 저장소가 모르는 기간 문자열은 네트워크로 조회
+            return None
+        except Exception as e:
+            self.logger.warning("⚠️ %s 로컬 일봉 저장소 사용 실패: %s", symbol, e)
+            return None
+
+    def _slice_to_period(self, df: pd.DataFrame, period: str) -> pd.DataFrame:
+        """저장소 프레임을 요청 기간(range)만큼 잘라낸다."""
+        start = period_start(period, self.get_today_date())
+        return df if start is None else df[df.index >= start]
+
+    def _load_stored_bars(self, symbol: str, period: str) -> Optional[pd.DataFrame]:
+        """
+        로컬 일봉 저장소에서 데이터 로드.
+        마감된 세션이 모두 저장돼 있고 장중 세션이 없을 때만 반환하며,
+        그 외(장중, 저장분 부족, 기간 미충족)에는 None을 돌려 네트워크 조회로 넘긴다.
+        """
+        if self._bar_store is None:
+            return None
+        et_now = self.get_us_eastern_now()
+        if self.is_trading_day(et_now) and not self.is_regular_session_closed_now():
+            return None
+        meta = self._bar_store.load_meta(symbol)
+        if not meta or meta.get("last_session") != self._last_closed_session_date().strftime('%Y-%m-%d'):
+            return None
+        df = self._stored_bars_for_period(symbol, period)
+        return None if df is None else self._slice_to_period(df, period)
+
+    def _merge_incremental_tail(self, symbol: str, base: pd.DataFrame, tail: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        증분 조회로 받은 꼬리 구간을 저장분 뒤에 붙인다.
+        겹치는 세션의 Close가 저장분과 다르면(분할 등으로 과거 가격이 재조정된 경우)
+        저장소를 비우고 None을 반환해 전체 이력 재조회로 넘긴다.
+        """
+        overlap = tail.index.intersection(base.index)
+        if len(overlap) > 0:
+            stored_close = base.loc[overlap, 'Close'].to_numpy(dtype=float)
+            fetched_close = tail.loc[overlap, 'Close'].to_numpy(dtype=float)
+            if not np.allclose(stored_close, fetched_close, rtol=0.005):
+                self.logger.warning("⚠️ %s 저장된 일봉과 API 가격이 다릅니다 (분할/재조정 의심) → 전체 이력 재조회", symbol)
+                self._bar_store.clear(symbol)
+                return None
+        new_rows = tail[tail.index > base.index[-1]]
+        return pd.concat([base, new_rows]) if len(new_rows) > 0 else base
+
+    def _persist_closed_bars(self, symbol: str, df: pd.DataFrame, full_history: bool = False) -> None:
+        """
+        네트워크로 받은 일봉 중 마감된 세션만 저장소에 기록.
+        최근 2주 안에 달력상 거래일인데 빠진 세션이 있으면(API가 Close를 비워 제거된 경우)
+        그 직전까지만 기록해 다음 조회 때 다시 받도록 한다.
+        """
+        try:
+            if self._bar_store is None or df is None or len(df) == 0:
+                return
+            last_session = self._last_closed_session_date()
+            present = set(df.index.date)
+            day = max(df.index[0].date(), last_session - timedelta(days=14))
+            while day <= last_session:
+                if self.is_trading_day(day) and day not in present:
+                    last_session = day - timedelta(days=1)
+                    break
+                day += timedelta(days=1)
+            if self._bar_store.save(symbol, df, last_session, full_history=full_history):
+                self.logger.debug("💾 %s 일봉 로컬 저장소 갱신 (~%s)", symbol, last_session.strftime('%Y-%m-%d'))
+        except Exception as e:
+            self.logger.warning("⚠️ %s 로컬 일봉 저장 실패: %s", symbol, e)
+
+    def _apply_chart_corrections(self, symbol: str, df: pd.DataFrame, result: dict) -> pd.DataFrame:
+        """
+        parse_chart_result 결과에 보정을 적용하고 Close가 없는 행을 제거한다.
+        - 최신 일봉 Close가 null이면 meta.regularMarketPrice로 보정
+        - 최근 10일의 API 누락/수동 보정 날짜 기록 (웹앱 경고용)
+        - MANUAL_CORRECTIONS 적용 (한 번의 인덱스 대입)
+        """
+        meta = result.get('meta', {}) or {}
+
+        # Yahoo가 최신 일봉의 OHLCV는 내려주면서 Close만 null로 두는 경우가 있다.
+        # 정규장 종료 가격이 meta에 있으면 해당 최신 일봉 Close로 보정한다.
+        try:
+            if len(df) > 0 and pd.isna(df['Close'].iat[-1]):
+                latest_date = df.index[-1].date()
+                regular_price = meta.get('regularMarketPrice')
+                regular_time = meta.get('regularMarketTime')
+                gmtoffset = int(meta.get('gmtoffset', 0) or 0)
+                regular_dt_et = None
+                if regular_time:
+                    regular_dt_et = datetime.utcfromtimestamp(int(regular_time)) + timedelta(seconds=gmtoffset)
+
+                is_prior_bar = latest_date < self.get_today_date().date()
+                is_regular_close_tick = (
+                    regular_dt_et is not None
+                    and regular_dt_et.date() == latest_date
+                    and (regular_dt_et.hour > 16 or (regular_dt_et.hour == 16 and regular_dt_et.minute >= 0))
+                )
+
+                if regular_price is not None and (is_prior_bar or is_regular_close_tick):
+                    df.iloc[-1, df.columns.get_loc('Close')] = float(regular_price)
+                    self.logger.debug("✅ [자동 보정] %s %s Close=meta.regularMarketPrice $%.2f", symbol, latest_date.strftime('%Y-%m-%d'), float(regular_price))
+        except Exception as e:
+            self.logger.warning("⚠️ %s 최신 Close 자동 보정 실패: %s", symbol, e)
+
+        manual_corrections = self.MANUAL_CORRECTIONS.get(symbol, {})
+
+        date_strs = df.index.strftime('%Y-%m-%d')
+        close_missing = df['Close'].isna().to_numpy()
+        corrected = date_strs.isin(list(manual_corrections))
+
+        # 원본 API 응답에서 Close가 None인 날짜 및 수동 보정 날짜 (수동 보정 전, 최근 10일만)
+        today = pd.Timestamp(self.get_today_date().date())
+        recent = ((today - df.index).days <= 10)
+        flagged = recent & (close_missing | corrected)
+        api_missing_close_dates = list(date_strs[flagged])
+        api_original_values = {
+            date_str: (None if pd.isna(close) else float(close))
+            for date_str, close in zip(api_missing_close_dates, df['Close'].to_numpy()[flagged])
+        }
+
+        # 원본 API 응답 정보 저장 (웹앱 경고용)
+        if api_missing_close_dates:
+            if not hasattr(self, '_api_missing_close_dates'):
+                self._api_missing_close_dates = {}
+            if not hasattr(self, '_api_original_values'):
+                self._api_original_values = {}
+
+            symbol_missing = self._api_missing_close_dates.setdefault(symbol, [])
+            symbol_values = self._api_original_values.setdefault(symbol, {})
+            existing_dates = set(symbol_missing)
+            for date_str in api_missing_close_dates:
+                if date_str not in existing_dates:
+                    symbol_missing.append(date_str)
+                symbol_values[date_str] = api_original_values.get(date_str)
+
+        # 수동 보정 정보 저장 (웹앱에서 표시용)
+        if manual_corrections:
+            if not hasattr(self, '_manual_corrections_info'):
+                self._manual_corrections_info = {}
+            corrections_info = self._manual_corrections_info.setdefault(symbol, {})
+            for date_str, correction_data in manual_corrections.items():
+                corrections_info[date_str] = {
+                    'original_close': api_original_values.get(date_str),
+                    'corrected_close': correction_data.get('Close')
+                }
+
+        # 수동 보정 적용: 응답에 있는 보정 날짜만 골라 한 번에 대입
+        if corrected.any():
+            corrections_df = pd.DataFrame.from_dict(manual_corrections, orient='index')
+            corrections_df.index = pd.to_datetime(corrections_df.index)
+            columns = list(BAR_COLUMNS)
+            updates = corrections_df.reindex(index=df.index[corrected], columns=columns).to_numpy(dtype='float64')
+            current = df.loc[corrected, columns].to_numpy()
+            df.loc[corrected, columns] = np.where(np.isnan(updates), current, updates)
+            for date_str in date_strs[corrected]:
+                self.logger.debug("✅ [수동 보정] %s %s 데이터 적용: Close=$%.2f", symbol, date_str, manual_corrections[date_str]['Close'])
+
+        # Close가 None인 날짜가 있으면 경고 출력 (수동 보정된 날짜 제외)
+        missing_close_dates = list(date_strs[close_missing & ~corrected])
+        if missing_close_dates:
+            self.logger.warning("⚠️ [경고] 다음 날짜들의 Close 값이 None입니다: %s", ', '.join(missing_close_dates))
+            self.logger.warning("   이 날짜들은 dropna()로 제거됩니다. 수동 보정이 필요할 수 있습니다.")
+            # 경고를 인스턴스 변수에 저장하여 웹앱에서 접근 가능하도록
+            if not hasattr(self, '_data_warnings'):
+                self._data_warnings = []
+            self._data_warnings.extend(missing_close_dates)
+
+        # NaN 값 제거 (Close가 None인 행은 제거)
+        return df.dropna(subset=['Close'])  # Close가 있으면 유효한 거래일로 간주
+
     def get_stock_data(self, symbol: str, period: str = "1mo") -> Optional[pd.DataFrame]:
         """
         Yahoo Finance API를 통해 주식 데이터 가져오기 (캐싱 적용)
@@ -1374,6 +1831,10 @@ class SOXLQuantTrader:
         Returns:
             DataFrame: 주식 데이터 (Date, Open, High, Low, Close, Volume)
         """
+        preloaded = self._preloaded_bars.get(symbol.upper())
+        if preloaded is not None:
+            return self._slice_to_period(preloaded, period).copy()
+
         # 캐시 키 생성
         cache_key = f"{symbol}_{period}"
         current_time = datetime.now()
@@ -1382,21 +1843,25 @@ class SOXLQuantTrader:
         if cache_key in self._stock_data_cache:
             cached_data, cache_time = self._stock_data_cache[cache_key]
             if (current_time - cache_time).seconds < 60:  # 1분 캐시
-                print(f"📊 {symbol} 데이터 캐시에서 로드 (기간: {period})")
+                self.logger.debug("📊 %s 데이터 캐시에서 로드 (기간: %s)", symbol, period)
                 return cached_data
+
+        # 마감 세션이 모두 로컬 저장소에 있으면 네트워크 요청 없이 사용
+        stored_df = self._load_stored_bars(symbol, period)
+        if stored_df is not None:
+            self._stock_data_cache[cache_key] = (stored_df, current_time)
+            self.logger.debug("📊 %s 데이터 로컬 저장소에서 로드 (%s일치, 기간: %s)", symbol, len(stored_df), period)
+            return stored_df
         
         try:
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
+            # period2는 내일 0시로 맞춰 같은 날 반복 조회가 공용 클라이언트 캐시/요청 합치기를 타도록 한다.
+            period2 = int(datetime.combine(current_time.date() + timedelta(days=1), datetime.min.time()).timestamp())
+
             # 장기 백테스트는 전체 가능 기간을 우선 사용하고, 실패하면 기존 범위로 폴백한다.
             if period == "15y":
                 full_history_params = {
                     'period1': 0,
-                    'period2': int((current_time + timedelta(days=1)).timestamp()),
+                    'period2': period2,
                     'interval': '1d',
                     'events': 'history'
                 }
@@ -1408,232 +1873,90 @@ class SOXLQuantTrader:
                 ]
             else:
                 params_list = [{'range': period, 'interval': '1d'}]
+
+            # 저장소가 요청 기간을 덮고 있으면 마지막 저장 세션부터의 꼬리 구간만 먼저 요청한다.
+            # (겹치는 1개 세션으로 저장분과의 일치 여부를 확인하고, 실패 시 기존 전체 조회로 폴백)
+            incremental_base = self._stored_bars_for_period(symbol, period)
+            incremental_params = None
+            if incremental_base is not None:
+                last_stored = incremental_base.index[-1]
+                incremental_params = {
+                    'period1': int(datetime(last_stored.year, last_stored.month, last_stored.day, tzinfo=timezone.utc).timestamp()),
+                    'period2': period2,
+                    'interval': '1d'
+                }
+                params_list = [incremental_params] + params_list
             
-            print(f"[INFO] {symbol} 데이터 가져오는 중...")
+            self.logger.debug("[INFO] %s 데이터 가져오는 중...", symbol)
             
-            # 여러 파라미터 시도
+            # 여러 파라미터 시도 (HTTP 재시도/백오프는 공용 클라이언트가 담당)
             for i, params in enumerate(params_list):
                 try:
                     param_label = params.get('range') or f"period1={params.get('period1')}, period2={params.get('period2')}"
-                    print(f"   시도 {i+1}/{len(params_list)}: {param_label}")
-                    response = requests.get(url, headers=headers, params=params, timeout=15)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
+                    self.logger.debug("   시도 %s/%s: %s", i+1, len(params_list), param_label)
+                    result = self._market_data.get_chart_result(symbol, params, timeout=15)
+
+                    df = parse_chart_result(result)
+                    if df is not None:
+                        # 최신 Close 보정, 수동 보정, 누락 Close 경고 후 Close 없는 행 제거
+                        df = self._apply_chart_corrections(symbol, df, result)
+
+                        if params is incremental_params:
+                            merged = self._merge_incremental_tail(symbol, incremental_base, df)
+                            if merged is None:
+                                continue
+                            self.logger.debug("   증분 조회: %s개 일봉 수신 (저장분 %s일치에 병합)", len(df), len(incremental_base))
+                            self._persist_closed_bars(symbol, merged)
+                            df = self._slice_to_period(merged, period)
+                            self._stock_data_cache[cache_key] = (df, current_time)
+                            self.logger.debug("[SUCCESS] %s 데이터 가져오기 성공! (%s일치 데이터)", symbol, len(df))
+                            return df
+
+                        # 마감된 세션은 로컬 저장소에 기록 (전체 이력 조회면 저장소를 새로 작성)
+                        self._persist_closed_bars(
+                            symbol,
+                            df,
+                            full_history=params.get('period1') == 0 or params.get('range') == 'max',
+                        )
                         
-                        if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
-                            result = data['chart']['result'][0]
-                            
-                            if 'timestamp' in result and 'indicators' in result:
-                                timestamps = result['timestamp']
-                                quote_data = result['indicators']['quote'][0]
-                                
-                                # 디버깅: 12월 12일 timestamp 확인
-                                target_debug_ts = int(datetime(2025, 12, 12, 0, 0, 0).timestamp())
-                                target_debug_date = datetime(2025, 12, 12).date()
-                                
-                                # 12월 12일 timestamp가 있는지 확인
-                                dec12_timestamp_found = False
-                                dec12_index_in_array = None
-                                for i, ts in enumerate(timestamps):
-                                    ts_date = datetime.fromtimestamp(ts).date()
-                                    if ts_date == target_debug_date:
-                                        dec12_timestamp_found = True
-                                        dec12_index_in_array = i
-                                        print(f"🔍 [DEBUG] 12월 12일 timestamp 발견! 인덱스: {i}, timestamp: {ts}")
-                                        break
-                                
-                                if not dec12_timestamp_found:
-                                    print(f"⚠️ [DEBUG] 12월 12일 timestamp가 Yahoo Finance API 응답에 없습니다!")
-                                    # 12월 12일 전후 날짜 확인
-                                    nearby_dates = []
-                                    for ts in timestamps:
-                                        ts_date = datetime.fromtimestamp(ts).date()
-                                        if abs((ts_date - target_debug_date).days) <= 3:
-                                            nearby_dates.append((ts_date, ts))
-                                    if nearby_dates:
-                                        print(f"   주변 날짜 timestamps:")
-                                        for date, ts in sorted(nearby_dates):
-                                            print(f"     {date.strftime('%Y-%m-%d')}: {ts}")
-                                
-                                # DataFrame 생성
-                                df_data = {
-                                    'Date': [datetime.fromtimestamp(ts) for ts in timestamps],
-                                    'Open': quote_data.get('open', [None] * len(timestamps)),
-                                    'High': quote_data.get('high', [None] * len(timestamps)),
-                                    'Low': quote_data.get('low', [None] * len(timestamps)),
-                                    'Close': quote_data.get('close', [None] * len(timestamps)),
-                                    'Volume': quote_data.get('volume', [None] * len(timestamps))
-                                }
-                                
-                                df = pd.DataFrame(df_data)
-                                meta = result.get('meta', {}) or {}
-
-                                # Yahoo가 최신 일봉의 OHLCV는 내려주면서 Close만 null로 두는 경우가 있다.
-                                # 정규장 종료 가격이 meta에 있으면 해당 최신 일봉 Close로 보정한다.
-                                try:
-                                    if len(df) > 0 and pd.isna(df.iloc[-1]['Close']):
-                                        latest_idx = df.index[-1]
-                                        latest_date = df.loc[latest_idx, 'Date'].date()
-                                        regular_price = meta.get('regularMarketPrice')
-                                        regular_time = meta.get('regularMarketTime')
-                                        gmtoffset = int(meta.get('gmtoffset', 0) or 0)
-                                        regular_dt_et = None
-                                        if regular_time:
-                                            regular_dt_et = datetime.utcfromtimestamp(int(regular_time)) + timedelta(seconds=gmtoffset)
-
-                                        is_prior_bar = latest_date < self.get_today_date().date()
-                                        is_regular_close_tick = (
-                                            regular_dt_et is not None
-                                            and regular_dt_et.date() == latest_date
-                                            and (regular_dt_et.hour > 16 or (regular_dt_et.hour == 16 and regular_dt_et.minute >= 0))
-                                        )
-
-                                        if regular_price is not None and (is_prior_bar or is_regular_close_tick):
-                                            df.loc[latest_idx, 'Close'] = float(regular_price)
-                                            adjclose_data = result.get('indicators', {}).get('adjclose', [])
-                                            if adjclose_data and adjclose_data[0].get('adjclose'):
-                                                adjclose_data[0]['adjclose'][-1] = float(regular_price)
-                                            print(f"✅ [자동 보정] {symbol} {latest_date.strftime('%Y-%m-%d')} Close=meta.regularMarketPrice ${float(regular_price):.2f}")
-                                except Exception as e:
-                                    print(f"⚠️ {symbol} 최신 Close 자동 보정 실패: {e}")
-                                
-                                # 수동 데이터 보정 적용 (Yahoo Finance API가 제공하지 않는 날짜)
-                                # SOXL만 보정 적용 (symbol별로 분리)
-                                manual_corrections = {}
-                                if symbol == "SOXL":
-                                    manual_corrections = {
-                                        "2025-12-12": {
-                                            "Open": 46.92,
-                                            "High": 47.38,
-                                            "Low": 41.06,
-                                            "Close": 41.71,
-                                            "Volume": 138088200
-                                        },
-                                        # API가 Close=None이면 dropna로 제거되어 3/23 LOC가 전일=3/19로 오판됨
-                                        "2026-03-20": {
-                                            "Open": 54.69,
-                                            "High": 55.36,
-                                            "Low": 49.00,
-                                            "Close": 51.14,
-                                            "Volume": 101773000
-                                        },
-                                    }
-                                
-                                # 원본 API 응답에서 Close가 None인 날짜 감지 및 수동 보정 정보 저장 (수동 보정 전)
-                                # 최근 10일만 확인하여 웹앱에서 경고 표시용
-                                api_missing_close_dates = []
-                                api_original_values = {}  # 날짜별 원본 API 값 저장
-                                today = self.get_today_date().date()
-                                
-                                for idx, row in df.iterrows():
-                                    date_obj = row['Date'].date() if hasattr(row['Date'], 'date') else pd.Timestamp(row['Date']).date()
-                                    # 최근 10일만 확인
-                                    if (today - date_obj).days <= 10:
-                                        date_str = row['Date'].strftime('%Y-%m-%d')
-                                        original_close = row['Close']
-                                        
-                                        # Close가 None인 경우 또는 수동 보정이 적용될 날짜인 경우 저장
-                                        if pd.isna(original_close) or date_str in manual_corrections:
-                                            api_missing_close_dates.append(date_str)
-                                            # 원본 API 값 저장 (None이면 None, 값이 있으면 그 값)
-                                            api_original_values[date_str] = None if pd.isna(original_close) else float(original_close)
-                                
-                                # 원본 API 응답 정보 저장 (웹앱 경고용)
-                                if api_missing_close_dates:
-                                    if not hasattr(self, '_api_missing_close_dates'):
-                                        self._api_missing_close_dates = {}
-                                    if not hasattr(self, '_api_original_values'):
-                                        self._api_original_values = {}
-                                    
-                                    if symbol not in self._api_missing_close_dates:
-                                        self._api_missing_close_dates[symbol] = []
-                                    if symbol not in self._api_original_values:
-                                        self._api_original_values[symbol] = {}
-                                    
-                                    # 중복 제거 및 추가
-                                    existing_dates = set(self._api_missing_close_dates[symbol])
-                                    for date_str in api_missing_close_dates:
-                                        if date_str not in existing_dates:
-                                            self._api_missing_close_dates[symbol].append(date_str)
-                                        # 원본 값 저장 (업데이트)
-                                        self._api_original_values[symbol][date_str] = api_original_values.get(date_str)
-                                
-                                # 수동 보정 정보 저장 (웹앱에서 표시용)
-                                if manual_corrections:
-                                    if not hasattr(self, '_manual_corrections_info'):
-                                        self._manual_corrections_info = {}
-                                    if symbol not in self._manual_corrections_info:
-                                        self._manual_corrections_info[symbol] = {}
-                                    # 수동 보정 정보 저장
-                                    for date_str, correction_data in manual_corrections.items():
-                                        self._manual_corrections_info[symbol][date_str] = {
-                                            'original_close': api_original_values.get(date_str),
-                                            'corrected_close': correction_data.get('Close')
-                                        }
-                                
-                                # Close가 None인 날짜 감지 및 경고 (수동 보정 적용 전)
-                                missing_close_dates = []
-                                for idx, row in df.iterrows():
-                                    if pd.isna(row['Close']):
-                                        date_str = row['Date'].strftime('%Y-%m-%d')
-                                        missing_close_dates.append(date_str)
-                                
-                                # 수동 보정 적용 (해당 symbol에 대한 보정만 적용)
-                                for date_str, correction_data in manual_corrections.items():
-                                    for idx, row in df.iterrows():
-                                        if row['Date'].strftime('%Y-%m-%d') == date_str:
-                                            print(f"✅ [수동 보정] {symbol} {date_str} 데이터 적용: Close=${correction_data['Close']:.2f}")
-                                            df.loc[idx, 'Open'] = correction_data.get('Open', row['Open'])
-                                            df.loc[idx, 'High'] = correction_data.get('High', row['High'])
-                                            df.loc[idx, 'Low'] = correction_data.get('Low', row['Low'])
-                                            df.loc[idx, 'Close'] = correction_data['Close']
-                                            df.loc[idx, 'Volume'] = correction_data.get('Volume', row['Volume'])
-                                            # missing_close_dates에서 제거
-                                            if date_str in missing_close_dates:
-                                                missing_close_dates.remove(date_str)
-                                            break
-                                
-                                # Close가 None인 날짜가 있으면 경고 출력
-                                if missing_close_dates:
-                                    print(f"⚠️ [경고] 다음 날짜들의 Close 값이 None입니다: {', '.join(missing_close_dates)}")
-                                    print(f"   이 날짜들은 dropna()로 제거됩니다. 수동 보정이 필요할 수 있습니다.")
-                                    # 경고를 인스턴스 변수에 저장하여 웹앱에서 접근 가능하도록
-                                    if not hasattr(self, '_data_warnings'):
-                                        self._data_warnings = []
-                                    self._data_warnings.extend(missing_close_dates)
-                                
-                                # NaN 값 제거 (Close가 None인 행은 제거)
-                                df = df.dropna(subset=['Close'])  # Close가 있으면 유효한 거래일로 간주
-                                df.set_index('Date', inplace=True)
-                                df.index = df.index.normalize()
-                                
-                                # 캐시에 저장
-                                self._stock_data_cache[cache_key] = (df, current_time)
-                                
-                                print(f"[SUCCESS] {symbol} 데이터 가져오기 성공! ({len(df)}일치 데이터)")
-                                return df
-                            else:
-                                print(f"   ❌ 차트 데이터 구조 오류")
-                        else:
-                            print(f"   ❌ 차트 결과 없음")
+                        # 캐시에 저장
+                        self._stock_data_cache[cache_key] = (df, current_time)
+                        
+                        self.logger.debug("[SUCCESS] %s 데이터 가져오기 성공! (%s일치 데이터)", symbol, len(df))
+                        return df
                     else:
-                        print(f"   ❌ HTTP 오류: {response.status_code}")
+                        self.logger.warning("   ❌ 차트 데이터 구조 오류")
                         
+                except MarketDataError as e:
+                    self.logger.debug("   ❌ %s", e)
                 except Exception as e:
-                    print(f"   ❌ 요청 오류: {e}")
+                    self.logger.warning("   ❌ 요청 오류: %s", e)
                     
                 # 마지막 시도가 아니면 계속
                 if i < len(params_list) - 1:
-                    print(f"   다음 파라미터로 재시도...")
+                    self.logger.debug("   다음 파라미터로 재시도...")
             
-            print(f"❌ {symbol} 모든 파라미터 시도 실패")
+            self.logger.warning("❌ %s 모든 파라미터 시도 실패", symbol)
             return None
                 
         except Exception as e:
-            print(f"❌ {symbol} 데이터 가져오기 오류: {e}")
+            self.logger.warning("❌ %s 데이터 가져오기 오류: %s", symbol, e)
             return None
     
+    def get_many(self, symbols: List[str], period: str = "1mo", max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        여러 심볼의 일봉을 동시에 가져오기 (심볼별로 get_stock_data 호출)
+        호스트별 동시 요청 수는 공용 클라이언트가 제한하므로 전체 소요 시간은
+        가장 느린 단일 요청에 가깝다.
+        Args:
+            symbols: 심볼 리스트 (예: ["SOXL", "QQQ"])
+            period: 기간
+            max_workers: 최대 스레드 수
+        Returns:
+            dict: 심볼 → DataFrame (실패 시 None)
+        """
+        return run_concurrently(lambda symbol: self.get_stock_data(symbol, period), symbols, max_workers=max_workers)
+
     def get_intraday_last_price(self, symbol: str) -> Optional[Tuple[datetime, float]]:
         """
         분봉(1m) 기준으로 오늘의 최신 가격을 가져온다.
@@ -1641,19 +1964,9 @@ class SOXLQuantTrader:
             Optional[Tuple[datetime, float]]: (마지막 시각, 마지막 가격)
         """
         try:
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
             params = {'range': '1d', 'interval': '1m'}
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            if response.status_code != 200:
-                return None
-            data = response.json()
-            result = data.get('chart', {}).get('result', [])
-            if not result:
-                return None
-            result0 = result[0]
+            # 최신 가격이 목적이므로 응답 캐시는 쓰지 않는다 (동시 요청은 하나로 합쳐짐)
+            result0 = self._market_data.get_chart_result(symbol, params, timeout=10, max_age=0)
             timestamps = result0.get('timestamp') or []
             indicators = result0.get('indicators', {})
             quotes = indicators.get('quote', [])
@@ -1681,12 +1994,12 @@ class SOXLQuantTrader:
             dict: {날짜문자열: RSI값} 딕셔너리
         """
         try:
-            print(f"📊 RSI 실시간 계산 시작 (15y 데이터 기반, 대상: {len(target_fridays)}개 주차)")
+            self.logger.debug("📊 RSI 실시간 계산 시작 (15y 데이터 기반, 대상: %s개 주차)", len(target_fridays))
             
             # 15년치 QQQ 데이터 가져오기 (update_rsi_data.py와 동일 - 정확한 RSI 계산)
             qqq_long = self.get_stock_data("QQQ", "15y")
             if qqq_long is None:
-                print("❌ QQQ 15년 데이터를 가져올 수 없습니다.")
+                self.logger.warning('❌ QQQ 15년 데이터를 가져올 수 없습니다.')
                 return {}
             
             # 주간 데이터로 변환 (금요일 기준)
@@ -1699,7 +2012,7 @@ class SOXLQuantTrader:
             }).dropna()
             
             if len(weekly_df) < window + 1:
-                print(f"❌ 주간 데이터 부족 (필요: {window+1}주, 현재: {len(weekly_df)}주)")
+                self.logger.warning("❌ 주간 데이터 부족 (필요: %s주, 현재: %s주)", window+1, len(weekly_df))
                 return {}
             
             # RSI 계산
@@ -1721,12 +2034,12 @@ class SOXLQuantTrader:
                     if matched_idx < len(rsi) and not pd.isna(rsi.iloc[matched_idx]):
                         rsi_value = round(rsi.iloc[matched_idx], 2)
                         result[friday_dt.strftime('%Y-%m-%d')] = rsi_value
-                        print(f"   ✅ {friday_dt.strftime('%Y-%m-%d')} → RSI: {rsi_value}")
+                        self.logger.debug("   ✅ %s → RSI: %s", friday_dt.strftime('%Y-%m-%d'), rsi_value)
             
             return result
             
         except Exception as e:
-            print(f"❌ RSI 실시간 계산 오류: {e}")
+            self.logger.warning("❌ RSI 실시간 계산 오류: %s", e)
             return {}
 
     def calculate_weekly_rsi(self, df: pd.DataFrame, window: int = 14) -> float:
@@ -1751,14 +2064,15 @@ class SOXLQuantTrader:
             }).dropna()
             
 
-            # 디버깅: 주간 데이터 확인
-            print(f"   주간 데이터 변환 결과:")
-            print(f"   - 기간: {weekly_df.index[0].strftime('%Y-%m-%d')} ~ {weekly_df.index[-1].strftime('%Y-%m-%d')}")
-            print(f"   - 주간 데이터 수: {len(weekly_df)}주")
-            print(f"   - 최근 5주 종가: {weekly_df['Close'].tail(5).values}")
+            debug = self.logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                self.logger.debug("   주간 데이터 변환 결과:")
+                self.logger.debug("   - 기간: %s ~ %s", weekly_df.index[0].strftime('%Y-%m-%d'), weekly_df.index[-1].strftime('%Y-%m-%d'))
+                self.logger.debug("   - 주간 데이터 수: %s주", len(weekly_df))
+                self.logger.debug("   - 최근 5주 종가: %s", weekly_df['Close'].tail(5).values)
             
             if len(weekly_df) < window + 1:
-                print(f"❌ 주간 RSI 계산을 위한 데이터 부족 (필요: {window+1}주, 현재: {len(weekly_df)}주)")
+                self.logger.warning("❌ 주간 RSI 계산을 위한 데이터 부족 (필요: %s주, 현재: %s주)", window + 1, len(weekly_df))
                 return None
             
 
@@ -1769,31 +2083,27 @@ class SOXLQuantTrader:
             rs = gain / loss
             rsi = 100 - (100 / (1 + rs))
             
-
-            # 디버깅 정보 출력
             latest_rsi = rsi.iloc[-1]
-            print(f"📈 QQQ 주간 RSI: {latest_rsi:.2f}")
-
-            print(f"   데이터 기간: {weekly_df.index[0].strftime('%Y-%m-%d')} ~ {weekly_df.index[-1].strftime('%Y-%m-%d')}")
-            print(f"   주간 데이터 수: {len(weekly_df)}주")
-            print(f"   최근 3개 RSI: {[f'{x:.2f}' if not np.isnan(x) else 'NaN' for x in rsi.tail(3).values]}")
-            
-            # 상세 계산 과정 출력
-            print(f"   최근 3개 계산 과정:")
-            for i in range(-3, 0):
-                if i + len(weekly_df) >= 0:
-                    date_str = weekly_df.index[i].strftime('%Y-%m-%d')
-                    delta_val = delta.iloc[i]
-                    gain_val = gain.iloc[i]
-                    loss_val = loss.iloc[i]
-                    rs_val = rs.iloc[i]
-                    rsi_val = rsi.iloc[i]
-                    print(f"   {date_str}: delta={delta_val:+.4f}, gain={gain_val:.4f}, loss={loss_val:.4f}, RS={rs_val:.4f}, RSI={rsi_val:.2f}")
+            self.logger.debug("📈 QQQ 주간 RSI: %.2f", latest_rsi)
+
+            # 상세 계산 과정 (디버그 로그가 켜진 경우에만 포맷팅)
+            if debug:
+                self.logger.debug("   데이터 기간: %s ~ %s", weekly_df.index[0].strftime('%Y-%m-%d'), weekly_df.index[-1].strftime('%Y-%m-%d'))
+                self.logger.debug("   주간 데이터 수: %s주", len(weekly_df))
+                self.logger.debug("   최근 3개 RSI: %s", [f'{x:.2f}' if not np.isnan(x) else 'NaN' for x in rsi.tail(3).values])
+                self.logger.debug("   최근 3개 계산 과정:")
+                for i in range(-3, 0):
+                    if i + len(weekly_df) >= 0:
+                        self.logger.debug(
+                            "   %s: delta=%+.4f, gain=%.4f, loss=%.4f, RS=%.4f, RSI=%.2f",
+                            weekly_df.index[i].strftime('%Y-%m-%d'),
+                            delta.iloc[i], gain.iloc[i], loss.iloc[i], rs.iloc[i], rsi.iloc[i],
+                        )
             
             return latest_rsi
             
         except Exception as e:
-            print(f"❌ 주간 RSI 계산 오류: {e}")
+            self.logger.error("❌ 주간 RSI 계산 오류: %s", e)
             return None
     
 
@@ -1852,15 +2162,15 @@ class SOXLQuantTrader:
         # _is_mode_case_matched를 사용하여 조건 확인
         is_matched, matched_mode = self._is_mode_case_matched(current_rsi, prev_rsi)
         
-        print(f"🔍 determine_mode 호출: 1주전 RSI={current_rsi:.2f}, 2주전 RSI={prev_rsi:.2f}, 전주모드={prev_mode}")
+        self.logger.debug("🔍 determine_mode 호출: 1주전 RSI=%.2f, 2주전 RSI=%.2f, 전주모드=%s", current_rsi, prev_rsi, prev_mode)
         
         # 조건에 해당하면 해당 모드 반환
         if is_matched:
-            print(f"   → 결과: {matched_mode} (조건에 해당)")
+            self.logger.debug("   → 결과: %s (조건에 해당)", matched_mode)
             return matched_mode
         
         # 조건에 없으면 전주 모드 유지
-        print(f"   → 결과: {prev_mode} (전주 모드 유지 - 조건에 해당하지 않음)")
+        self.logger.debug("   → 결과: %s (전주 모드 유지 - 조건에 해당하지 않음)", prev_mode)
         return prev_mode
     
     def _calculate_week_mode_recursive_with_reference(self, target_friday: datetime, rsi_ref_data: dict, max_depth: int = 20) -> tuple[str | None, bool]:
@@ -1875,7 +2185,7 @@ class SOXLQuantTrader:
             tuple: (모드("SF" 또는 "AG"), 성공 여부)
         """
         if max_depth <= 0:
-            print(f"❌ 모드판정실패: 최대 재귀 깊이 도달 ({target_friday.strftime('%Y-%m-%d')})")
+            self.logger.warning("❌ 모드판정실패: 최대 재귀 깊이 도달 (%s)", target_friday.strftime('%Y-%m-%d'))
             return None, False
         
         # 1주전, 2주전 금요일 계산
@@ -1900,7 +2210,7 @@ class SOXLQuantTrader:
                 if two_weeks_ago_rsi is None:
                     two_weeks_ago_rsi = fallback.get(two_weeks_ago_friday.strftime('%Y-%m-%d'))
             except Exception as e:
-                print(f"⚠️ RSI 실시간 계산 폴백 실패: {e}")
+                self.logger.warning("⚠️ RSI 실시간 계산 폴백 실패: %s", e)
         
         if one_week_ago_rsi is None or two_weeks_ago_rsi is None:
             failure_reason = []
@@ -1908,7 +2218,7 @@ class SOXLQuantTrader:
                 failure_reason.append(f"1주전 RSI 데이터 없음")
             if two_weeks_ago_rsi is None:
                 failure_reason.append(f"2주전 RSI 데이터 없음")
-            print(f"❌ 모드판정실패: {target_friday.strftime('%Y-%m-%d')} 주차 모드 계산 불가 - {', '.join(failure_reason)}")
+            self.logger.warning("❌ 모드판정실패: %s 주차 모드 계산 불가 - %s", target_friday.strftime('%Y-%m-%d'), ', '.join(failure_reason))
             return None, False
         
         # 조건에 해당하는지 확인
@@ -1916,15 +2226,15 @@ class SOXLQuantTrader:
         
         if is_matched:
             # 조건에 해당하는 모드를 찾았음
-            print(f"✅ {target_friday.strftime('%Y-%m-%d')} 주차 모드 계산: 1주전 RSI={one_week_ago_rsi:.2f}, 2주전 RSI={two_weeks_ago_rsi:.2f} → {matched_mode} (조건에 해당)")
+            self.logger.debug("✅ %s 주차 모드 계산: 1주전 RSI=%.2f, 2주전 RSI=%.2f → %s (조건에 해당)", target_friday.strftime('%Y-%m-%d'), one_week_ago_rsi, two_weeks_ago_rsi, matched_mode)
             return matched_mode, True
         
         # 조건에 해당하지 않으면 이전 주차의 모드를 재귀적으로 확인
-        print(f"🔍 {target_friday.strftime('%Y-%m-%d')} 주차: 조건에 해당하지 않음, 이전 주차 확인 중...")
+        self.logger.debug("🔍 %s 주차: 조건에 해당하지 않음, 이전 주차 확인 중...", target_friday.strftime('%Y-%m-%d'))
         prev_week_mode, success = self._calculate_week_mode_recursive_with_reference(one_week_ago_friday, rsi_ref_data, max_depth - 1)
         
         if not success:
-            print(f"❌ 모드판정실패: {target_friday.strftime('%Y-%m-%d')} 주차의 이전 주차 모드 계산 실패")
+            self.logger.warning("❌ 모드판정실패: %s 주차의 이전 주차 모드 계산 실패", target_friday.strftime('%Y-%m-%d'))
             return None, False
         
         # 이전 주차의 모드를 사용하여 현재 주차의 모드 결정
@@ -1932,9 +2242,9 @@ class SOXLQuantTrader:
         
         # determine_mode가 prev_week_mode를 반환했는지 확인
         if final_mode == prev_week_mode:
-            print(f"✅ {target_friday.strftime('%Y-%m-%d')} 주차 모드: {final_mode} (이전 주차 모드 유지)")
+            self.logger.debug("✅ %s 주차 모드: %s (이전 주차 모드 유지)", target_friday.strftime('%Y-%m-%d'), final_mode)
         else:
-            print(f"✅ {target_friday.strftime('%Y-%m-%d')} 주차 모드: {final_mode} (이전 주차 모드 {prev_week_mode}에서 변경)")
+            self.logger.debug("✅ %s 주차 모드: %s (이전 주차 모드 %s에서 변경)", target_friday.strftime('%Y-%m-%d'), final_mode, prev_week_mode)
         
         return final_mode, True
     
@@ -1951,7 +2261,7 @@ class SOXLQuantTrader:
             tuple: (모드("SF" 또는 "AG"), 성공 여부)
         """
         if max_depth <= 0:
-            print(f"❌ 모드판정실패: 최대 재귀 깊이 도달 ({target_friday.strftime('%Y-%m-%d')})")
+            self.logger.warning("❌ 모드판정실패: 최대 재귀 깊이 도달 (%s)", target_friday.strftime('%Y-%m-%d'))
             return None, False
         
         # 1주전, 2주전 금요일 계산
@@ -1991,7 +2301,7 @@ class SOXLQuantTrader:
                 failure_reason.append(f"1주전 RSI 데이터 없음")
             if two_weeks_ago_rsi is None:
                 failure_reason.append(f"2주전 RSI 데이터 없음")
-            print(f"❌ 모드판정실패: {target_friday.strftime('%Y-%m-%d')} 주차 모드 계산 불가 - {', '.join(failure_reason)}")
+            self.logger.warning("❌ 모드판정실패: %s 주차 모드 계산 불가 - %s", target_friday.strftime('%Y-%m-%d'), ', '.join(failure_reason))
             return None, False
         
         # 조건에 해당하는지 확인
@@ -1999,15 +2309,15 @@ class SOXLQuantTrader:
         
         if is_matched:
             # 조건에 해당하는 모드를 찾았음
-            print(f"✅ {target_friday.strftime('%Y-%m-%d')} 주차 모드 계산: 1주전 RSI={one_week_ago_rsi:.2f}, 2주전 RSI={two_weeks_ago_rsi:.2f} → {matched_mode} (조건에 해당)")
+            self.logger.debug("✅ %s 주차 모드 계산: 1주전 RSI=%.2f, 2주전 RSI=%.2f → %s (조건에 해당)", target_friday.strftime('%Y-%m-%d'), one_week_ago_rsi, two_weeks_ago_rsi, matched_mode)
             return matched_mode, True
         
         # 조건에 해당하지 않으면 이전 주차의 모드를 재귀적으로 확인
-        print(f"🔍 {target_friday.strftime('%Y-%m-%d')} 주차: 조건에 해당하지 않음, 이전 주차 확인 중...")
+        self.logger.debug("🔍 %s 주차: 조건에 해당하지 않음, 이전 주차 확인 중...", target_friday.strftime('%Y-%m-%d'))
         prev_week_mode, success = self._calculate_week_mode_recursive(one_week_ago_friday, weekly_df, rsi, max_depth - 1)
         
         if not success:
-            print(f"❌ 모드판정실패: {target_friday.strftime('%Y-%m-%d')} 주차의 이전 주차 모드 계산 실패")
+            self.logger.warning("❌ 모드판정실패: %s 주차의 이전 주차 모드 계산 실패", target_friday.strftime('%Y-%m-%d'))
             return None, False
         
         # 이전 주차의 모드를 사용하여 현재 주차의 모드 결정
@@ -2017,9 +2327,9 @@ class SOXLQuantTrader:
         
         # determine_mode가 prev_week_mode를 반환했는지 확인
         if final_mode == prev_week_mode:
-            print(f"✅ {target_friday.strftime('%Y-%m-%d')} 주차 모드: {final_mode} (이전 주차 모드 유지)")
+            self.logger.debug("✅ %s 주차 모드: %s (이전 주차 모드 유지)", target_friday.strftime('%Y-%m-%d'), final_mode)
         else:
-            print(f"✅ {target_friday.strftime('%Y-%m-%d')} 주차 모드: {final_mode} (이전 주차 모드 {prev_week_mode}에서 변경)")
+            self.logger.debug("✅ %s 주차 모드: %s (이전 주차 모드 %s에서 변경)", target_friday.strftime('%Y-%m-%d'), final_mode, prev_week_mode)
         
         return final_mode, True
     
@@ -2041,11 +2351,9 @@ class SOXLQuantTrader:
             rsi_ref_data = {}
             try:
                 rsi_file_path = str(self._resolve_data_path("weekly_rsi_reference.json"))
-                if os.path.exists(rsi_file_path):
-                    with open(rsi_file_path, 'r', encoding='utf-8') as f:
-                        rsi_ref_data = json.load(f)
+                rsi_ref_data = load_rsi_reference(rsi_file_path) or {}
             except Exception as e:
-                print(f"⚠️ RSI 참조 데이터 로드 실패: {e}")
+                self.logger.warning("⚠️ RSI 참조 데이터 로드 실패: %s", e)
 
         if rsi_ref_data:
             mode, success = self._calculate_week_mode_recursive_with_reference(
@@ -2063,7 +2371,7 @@ class SOXLQuantTrader:
         }).dropna()
 
         if len(weekly_df) < 15:
-            print("⚠️ 완료 주간 데이터 부족, 현재 주차 모드 계산 불가")
+            self.logger.warning('⚠️ 완료 주간 데이터 부족, 현재 주차 모드 계산 불가')
             return None, False
 
         delta = weekly_df['Close'].diff()
@@ -2106,7 +2414,7 @@ class SOXLQuantTrader:
                 
                 if current_week_friday_date == this_week_friday_date:
                     if self.current_mode:
-                        print(f"✅ 같은 주 내 모드 유지: {this_week_friday_date} 주차 모드 = {self.current_mode}")
+                        self.logger.debug("✅ 같은 주 내 모드 유지: %s 주차 모드 = %s", this_week_friday_date, self.current_mode)
                         return self.current_mode
                     # 모드가 없으면 초기화만 진행
             
@@ -2116,19 +2424,19 @@ class SOXLQuantTrader:
                 if not self.is_regular_session_closed_now():
                     # 금요일 장 종료 전에는 모드를 업데이트하지 않음
                     if self.current_mode:
-                        print(f"⏳ 금요일 장 종료 전: {today.strftime('%Y-%m-%d')} 장 종료 전이므로 모드 업데이트하지 않음 (현재 모드: {self.current_mode})")
+                        self.logger.debug("⏳ 금요일 장 종료 전: %s 장 종료 전이므로 모드 업데이트하지 않음 (현재 모드: %s)", today.strftime('%Y-%m-%d'), self.current_mode)
                         return self.current_mode
                     else:
-                        print(f"⏳ 금요일 장 종료 전: {today.strftime('%Y-%m-%d')} 장 종료 전이지만 현재 모드가 없어 완료 RSI로 이번 주 모드를 계산합니다.")
+                        self.logger.debug("⏳ 금요일 장 종료 전: %s 장 종료 전이지만 현재 모드가 없어 완료 RSI로 이번 주 모드를 계산합니다.", today.strftime('%Y-%m-%d'))
                         fallback_mode, success = self._calculate_week_mode_from_completed_rsi(
                             this_week_friday, qqq_data
                         )
                         if success and fallback_mode:
                             self.current_week_friday = this_week_friday
                             self.current_mode = fallback_mode
-                            print(f"✅ 금요일 장중 모드 복구: {this_week_friday.strftime('%Y-%m-%d')} 주차 모드 = {self.current_mode}")
+                            self.logger.debug("✅ 금요일 장중 모드 복구: %s 주차 모드 = %s", this_week_friday.strftime('%Y-%m-%d'), self.current_mode)
                             return self.current_mode
-                        print(f"⏳ 금요일 장 종료 전: {today.strftime('%Y-%m-%d')} 완료 RSI 기반 모드 계산 실패")
+                        self.logger.debug("⏳ 금요일 장 종료 전: %s 완료 RSI 기반 모드 계산 실패", today.strftime('%Y-%m-%d'))
                         return None
             
             # 새로운 주차이거나 초기화인 경우 모드 업데이트
@@ -2145,7 +2453,7 @@ class SOXLQuantTrader:
             }).dropna()
             
             if len(weekly_df) < 15:
-                print("⚠️ 주간 데이터 부족, 현재 모드 유지")
+                self.logger.warning("⚠️ 주간 데이터 부족, 현재 모드 유지")
                 return self.current_mode
             
             # 제공된 함수 방식으로 RSI 계산
@@ -2170,11 +2478,9 @@ class SOXLQuantTrader:
             rsi_ref_data = {}
             try:
                 rsi_file_path = str(self._resolve_data_path("weekly_rsi_reference.json"))
-                if os.path.exists(rsi_file_path):
-                    with open(rsi_file_path, 'r', encoding='utf-8') as f:
-                        rsi_ref_data = json.load(f)
+                rsi_ref_data = load_rsi_reference(rsi_file_path) or {}
             except Exception as e:
-                print(f"⚠️ RSI 참조 데이터 로드 실패: {e}")
+                self.logger.warning("⚠️ RSI 참조 데이터 로드 실패: %s", e)
 
             # 1주전과 2주전 금요일 계산
             one_week_ago_friday = latest_completed_friday  # 지난주 금요일 (1주전)
@@ -2186,7 +2492,7 @@ class SOXLQuantTrader:
             
             # 참조 데이터에 없으면 15년치 데이터로 정확한 RSI 실시간 계산
             if one_week_ago_rsi is None or two_weeks_ago_rsi is None:
-                print(f"⚠️ [update_mode] RSI 참조 데이터 부재 → 15년 데이터 기반 실시간 계산 진행")
+                self.logger.warning("⚠️ [update_mode] RSI 참조 데이터 부재 → 15년 데이터 기반 실시간 계산 진행")
                 target_fridays = []
                 if one_week_ago_rsi is None:
                     target_fridays.append(one_week_ago_friday)
@@ -2204,7 +2510,7 @@ class SOXLQuantTrader:
                     two_weeks_ago_rsi = realtime_rsi.get(two_weeks_key)
             
             if one_week_ago_rsi is None or two_weeks_ago_rsi is None:
-                print("⚠️ RSI 계산 실패, 현재 모드 유지")
+                self.logger.warning("⚠️ RSI 계산 실패, 현재 모드 유지")
                 return self.current_mode
             
             # 전주 모드를 재귀적으로 계산 (참조 데이터 버전 우선)
@@ -2213,7 +2519,7 @@ class SOXLQuantTrader:
                 prev_week_mode, success = self._calculate_week_mode_recursive(one_week_ago_friday, weekly_df, rsi)
             
             if not success:
-                print(f"❌ 모드판정실패: 전주 모드를 계산할 수 없어 현재 주차의 모드를 결정할 수 없습니다.")
+                self.logger.warning("❌ 모드판정실패: 전주 모드를 계산할 수 없어 현재 주차의 모드를 결정할 수 없습니다.")
                 return None
             
             # 현재 주차의 모드 결정
@@ -2221,10 +2527,10 @@ class SOXLQuantTrader:
             
             if is_matched:
                 new_mode = matched_mode
-                print(f"✅ 현재 주차 모드: {new_mode} (조건에 해당)")
+                self.logger.debug("✅ 현재 주차 모드: %s (조건에 해당)", new_mode)
             else:
                 new_mode = prev_week_mode
-                print(f"✅ 현재 주차 모드: {new_mode} (전주 모드 유지 - 조건에 해당하지 않음)")
+                self.logger.debug("✅ 현재 주차 모드: %s (전주 모드 유지 - 조건에 해당하지 않음)", new_mode)
             
             if new_mode != self.current_mode:
                 self.current_mode = new_mode
@@ -2232,7 +2538,7 @@ class SOXLQuantTrader:
             return self.current_mode
             
         except Exception as e:
-            print(f"❌ 모드 업데이트 오류: {e}")
+            self.logger.error("❌ 모드 업데이트 오류: %s", e)
             return self.current_mode
     
     def get_current_config(self) -> Dict:
@@ -2311,26 +2617,22 @@ class SOXLQuantTrader:
             return datetime(int(value.year), int(value.month), int(value.day))
         raise TypeError(f"지원하지 않는 날짜 형식입니다: {type(value).__name__}")
 
+    def _session_index(self) -> TradingSessionIndex:
+        """거래 세션 인덱스 (표준 휴장일 + self.us_holidays 임시 휴장일 반영, 휴장일 구성별로 공유)"""
+        return get_trading_session_index(self.us_holidays)
+
     def get_trading_date_after(self, start_date, trading_days: int) -> datetime:
         """Return the date after ``trading_days`` sessions, excluding start_date."""
         trading_days = int(trading_days)
         if trading_days < 0:
             raise ValueError("trading_days는 0 이상이어야 합니다.")
 
-        current_date = self._market_date(start_date)
-        counted = 0
-        while counted < trading_days:
-            current_date += timedelta(days=1)
-            if self.is_trading_day(current_date):
-                counted += 1
-        return current_date
+        start = self._market_date(start_date)
+        return self._market_date(self._session_index().session_after(start, trading_days))
 
     def get_previous_trading_date(self, start_date) -> datetime:
         """Return the closest trading date strictly before start_date."""
-        current_date = self._market_date(start_date) - timedelta(days=1)
-        while not self.is_trading_day(current_date):
-            current_date -= timedelta(days=1)
-        return current_date
+        return self._market_date(self._session_index().previous_session(self._market_date(start_date)))
 
     def count_trading_days(self, start_date, end_date) -> int:
         """Count sessions in ``(start_date, end_date]``.
@@ -2338,18 +2640,22 @@ class SOXLQuantTrader:
         This matches the maximum-holding-period rule: the execution date is day
         zero and the next trading session is holding day one.
         """
-        start = self._market_date(start_date)
-        end = self._market_date(end_date)
-        if end <= start:
-            return 0
-
-        count = 0
-        current_date = start
-        while current_date < end:
-            current_date += timedelta(days=1)
-            if self.is_trading_day(current_date):
-                count += 1
-        return count
+        return self._session_index().sessions_between(self._market_date(start_date), self._market_date(end_date))
+
+    def count_trading_days_many(self, start_dates, end_date) -> np.ndarray:
+        """여러 시작일(포지션 매수일 등)의 보유 거래일 수를 한 번에 계산 (count_trading_days와 같은 규칙)"""
+        start_dates = [self._market_date(start) for start in start_dates]
+        if not start_dates:
+            return np.zeros(0, dtype=np.int64)
+        return sessions_between(start_dates, [self._market_date(end_date)], self.us_holidays)
+
+    def get_trading_dates_after_many(self, start_dates, trading_days) -> List[datetime]:
+        """여러 시작일에 대한 N거래일 후 날짜(손절예정일 등)를 한 번에 계산 (trading_days는 정수 또는 시작일별 목록)"""
+        start_dates = [self._market_date(start) for start in start_dates]
+        if not start_dates:
+            return []
+        result = sessions_after(start_dates, trading_days, self.us_holidays)
+        return [self._market_date(day) for day in result.astype(object)]
 
     def calculate_stop_loss_date(self, buy_date: datetime, max_hold_days: int) -> str:
         """
@@ -2370,7 +2676,7 @@ class SOXLQuantTrader:
             return current_date.strftime(f"%m.%d.({weekday_korean})")
             
         except Exception as e:
-            print(f"⚠️ 손절예정일 계산 오류: {e}")
+            self.logger.warning("⚠️ 손절예정일 계산 오류: %s", e)
             # 오류 시 기본값 반환
             fallback_date = buy_date + timedelta(days=max_hold_days)
             weekday_korean = weekdays_korean[fallback_date.weekday()]
@@ -2426,10 +2732,7 @@ class SOXLQuantTrader:
         pending_quantity = self._pending_buy_quantity(self.current_round, current_date)
         if pending_quantity is not None:
             target_shares = pending_quantity
-            print(
-                f"📌 저장된 매수 추천수량 적용: {self.current_round}회차 "
-                f"{current_date.strftime('%Y-%m-%d')} = {target_shares}주"
-            )
+            self.logger.debug("📌 저장된 매수 추천수량 적용: %s회차 %s = %s주", self.current_round, current_date.strftime('%Y-%m-%d'), target_shares)
         else:
             # LOC 주문가 기준 매수 수량은 정수 주식만 주문하므로 소수점은 절삭한다.
             target_shares = int(target_amount / target_price)
@@ -2468,13 +2771,15 @@ class SOXLQuantTrader:
                 position["strategy_name"] = active_buy_config["strategy_name"]
         
         # 디버깅: 매수 시점의 모드 확인 및 검증
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         if mode is not None and mode != buy_mode:
-            print(f"⚠️ execute_buy 모드 불일치: 전달된 모드={mode}, buy_mode={buy_mode}, self.current_mode={self.current_mode}")
-        print(f"🔍 execute_buy: 매수일 {current_date.strftime('%Y-%m-%d')}, 전달된 모드: {mode}, 저장할 모드: {buy_mode}, 현재 self.current_mode: {self.current_mode}")
+            self.logger.debug("⚠️ execute_buy 모드 불일치: 전달된 모드=%s, buy_mode=%s, self.current_mode=%s", mode, buy_mode, self.current_mode)
+        if debug:
+            self.logger.debug("🔍 execute_buy: 매수일 %s, 전달된 모드: %s, 저장할 모드: %s, 현재 self.current_mode: %s", current_date.strftime('%Y-%m-%d'), mode, buy_mode, self.current_mode)
         
         # 포지션에 모드가 제대로 저장되었는지 확인
         if position.get('mode') != buy_mode:
-            print(f"❌ CRITICAL: 포지션에 모드 저장 실패! 예상: {buy_mode}, 실제: {position.get('mode')}")
+            self.logger.warning("❌ CRITICAL: 포지션에 모드 저장 실패! 예상: %s, 실제: %s", buy_mode, position.get('mode'))
             position['mode'] = buy_mode  # 강제로 수정
         
         self.positions.append(position)
@@ -2482,14 +2787,15 @@ class SOXLQuantTrader:
         # 저장 후 검증
         saved_position = self.positions[-1]
         if saved_position.get('mode') != buy_mode:
-            print(f"❌ CRITICAL: 포지션 저장 후 모드 불일치! 예상: {buy_mode}, 실제: {saved_position.get('mode')}")
+            self.logger.warning("❌ CRITICAL: 포지션 저장 후 모드 불일치! 예상: %s, 실제: %s", buy_mode, saved_position.get('mode'))
             self.positions[-1]['mode'] = buy_mode  # 강제로 수정
 
         self.available_cash -= actual_amount
         self.current_round += 1  # 매수 성공 시에만 회차 증가
         
 
-        print(f"✅ {self.current_round-1}회차 매수 실행: {actual_shares}주 @ ${actual_price:.2f} (목표가: ${target_price:.2f}, 실제투자: ${actual_amount:,.0f})")
+        if debug:
+            self.logger.debug("✅ %s회차 매수 실행: %s주 @ $%.2f (목표가: $%.2f, 실제투자: $%s)", self.current_round-1, actual_shares, actual_price, target_price, f"{actual_amount:,.0f}")
         
         return True
     
@@ -2558,12 +2864,12 @@ class SOXLQuantTrader:
                     })
                 sold_rounds.append(position["round"])
 
-                print("🧾 과거 종가 매도 보정 실행 (목표가 도달)")
-                print(f"   - 회차: {position['round']}회차")
-                print(f"   - 매수일: {buy_date.strftime('%Y-%m-%d')} | 매수가: ${position['buy_price']:.2f}")
-                print(f"   - 목표가: ${target_price:.2f}")
-                print(f"   - sell_date: {sell_date.strftime('%Y-%m-%d')} | 종가: ${sell_close:.2f}")
-                print(f"   - 실현손익: ${profit:,.0f} ({profit_rate:+.2f}%)")
+                self.logger.info("🧾 과거 종가 매도 보정 실행 (목표가 도달)")
+                self.logger.info("   - 회차: %s회차", position['round'])
+                self.logger.info("   - 매수일: %s | 매수가: $%.2f", buy_date.strftime('%Y-%m-%d'), position['buy_price'])
+                self.logger.info("   - 목표가: $%.2f", target_price)
+                self.logger.info("   - sell_date: %s | 종가: $%.2f", sell_date.strftime('%Y-%m-%d'), sell_close)
+                self.logger.info("   - 실현손익: $%s (%+.2f%%)", f"{profit:,.0f}", profit_rate)
                 continue  # 이미 매도 처리했으므로 다음 포지션으로
 
             # 2. 손절예정일이 지난 경우 종가 기준으로 LOC 매도
@@ -2597,17 +2903,17 @@ class SOXLQuantTrader:
                     })
                 sold_rounds.append(position["round"])
 
-                print("🧾 과거 종가 매도 보정 실행 (손절예정일 경과)")
-                print(f"   - 회차: {position['round']}회차")
-                print(f"   - 매수일: {buy_date.strftime('%Y-%m-%d')} | 매수가: ${position['buy_price']:.2f}")
-                print(f"   - 손절예정일: {stop_loss_date.strftime('%Y-%m-%d')}")
-                print(f"   - sell_date: {sell_date.strftime('%Y-%m-%d')} | 종가: ${sell_close:.2f}")
-                print(f"   - 실현손익: ${profit:,.0f} ({profit_rate:+.2f}%)")
+                self.logger.info("🧾 과거 종가 매도 보정 실행 (손절예정일 경과)")
+                self.logger.info("   - 회차: %s회차", position['round'])
+                self.logger.info("   - 매수일: %s | 매수가: $%.2f", buy_date.strftime('%Y-%m-%d'), position['buy_price'])
+                self.logger.info("   - 손절예정일: %s", stop_loss_date.strftime('%Y-%m-%d'))
+                self.logger.info("   - sell_date: %s | 종가: $%.2f", sell_date.strftime('%Y-%m-%d'), sell_close)
+                self.logger.info("   - 실현손익: $%s (%+.2f%%)", f"{profit:,.0f}", profit_rate)
 
         if sold_rounds:
             sold_count = len(sold_rounds)
             self.current_round = max(1, self.current_round - sold_count)
-            print(f"🔄 보정 후 current_round: {self.current_round} (총 {sold_count}개 회차 보정 매도)")
+            self.logger.info("🔄 보정 후 current_round: %s (총 %s개 회차 보정 매도)", self.current_round, sold_count)
 
     def check_sell_conditions(self, row: pd.Series, current_date: datetime, prev_close: float, return_debug_info: bool = False) -> List[Dict]:
         """
@@ -2624,12 +2930,14 @@ class SOXLQuantTrader:
         debug_info = []  # 디버깅 정보 저장
         self._process_compounding_for_date(current_date)
         
-        # 디버깅: 보유 포지션 수 확인
-        print(f"🔍 매도 조건 확인: 보유 포지션 {len(self.positions)}개")
+        # 디버깅: 보유 포지션 수 확인 (debug 로그가 꺼져 있으면 메시지를 만들지 않음)
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        self.logger.debug("🔍 매도 조건 확인: 보유 포지션 %s개", len(self.positions))
         # 모든 포지션 목록 출력 (디버깅용)
-        for idx, pos in enumerate(self.positions):
-            buy_date_str = pos['buy_date'].strftime('%Y-%m-%d') if isinstance(pos['buy_date'], (datetime, pd.Timestamp)) else str(pos['buy_date'])
-            print(f"   포지션 {idx+1}: {pos['round']}회차, 매수일: {buy_date_str}, 모드: {pos.get('mode', 'N/A')}, 매수가: ${pos.get('buy_price', 0):.2f}")
+        if debug:
+            for idx, pos in enumerate(self.positions):
+                buy_date_str = pos['buy_date'].strftime('%Y-%m-%d') if isinstance(pos['buy_date'], (datetime, pd.Timestamp)) else str(pos['buy_date'])
+                self.logger.debug("   포지션 %s: %s회차, 매수일: %s, 모드: %s, 매수가: $%.2f", idx+1, pos['round'], buy_date_str, pos.get('mode', 'N/A'), pos.get('buy_price', 0))
         
         for position in self.positions:
             buy_date = position["buy_date"]
@@ -2651,12 +2959,14 @@ class SOXLQuantTrader:
             
             # 디버깅: 매도 조건 상세 정보
             daily_close = row['Close']
-            buy_date_str = buy_date.strftime('%Y-%m-%d') if isinstance(buy_date, (datetime, pd.Timestamp)) else str(buy_date)
-            print(f"   📦 {position['round']}회차 (매수일: {buy_date_str}): 매수가 ${position_buy_price:.2f} → 매도목표가 ${sell_price:.2f} (현재가 ${daily_close:.2f})")
-            print(f"      보유기간: {hold_days}일 (최대: {position_config['max_hold_days']}일, 손절예정일: {stop_loss_date.strftime('%Y-%m-%d')})")
-            
-            # 디버깅 정보 수집
-            position_debug = {
+            if debug or return_debug_info:
+                buy_date_str = buy_date.strftime('%Y-%m-%d') if isinstance(buy_date, (datetime, pd.Timestamp)) else str(buy_date)
+            if debug:
+                self.logger.debug("   📦 %s회차 (매수일: %s): 매수가 $%.2f → 매도목표가 $%.2f (현재가 $%.2f)", position['round'], buy_date_str, position_buy_price, sell_price, daily_close)
+                self.logger.debug("      보유기간: %s일 (최대: %s일, 손절예정일: %s)", hold_days, position_config['max_hold_days'], stop_loss_date.strftime('%Y-%m-%d'))
+            
+            # 디버깅 정보 수집 (return_debug_info일 때만)
+            position_debug = {} if not return_debug_info else {
                 "round": position['round'],
                 "buy_date": buy_date_str,
                 "mode": position.get('mode', 'N/A'),
@@ -2675,7 +2985,7 @@ class SOXLQuantTrader:
             
             # 1. LOC 매도 조건: 종가가 매도목표가에 도달했을 때 (종가 >= 매도목표가)
             if daily_close >= sell_price:
-                print(f"      ✅ 매도 조건 1: 목표가 도달 (${daily_close:.2f} >= ${sell_price:.2f})")
+                self.logger.debug("      ✅ 매도 조건 1: 목표가 도달 ($%.2f >= $%.2f)", daily_close, sell_price)
                 position_debug["will_sell"] = True
                 position_debug["sell_reason"] = "목표가 도달"
                 sell_positions.append({
@@ -2688,7 +2998,8 @@ class SOXLQuantTrader:
             
             # 2. 손절예정일 경과 시 매도 (당일 종가에 LOC 매도)
             elif current_date >= stop_loss_date:
-                print(f"      ✅ 매도 조건 2: 손절예정일 경과 (현재: {current_date.strftime('%Y-%m-%d')} >= 손절예정일: {stop_loss_date.strftime('%Y-%m-%d')})")
+                if debug:
+                    self.logger.debug("      ✅ 매도 조건 2: 손절예정일 경과 (현재: %s >= 손절예정일: %s)", current_date.strftime('%Y-%m-%d'), stop_loss_date.strftime('%Y-%m-%d'))
                 position_debug["will_sell"] = True
                 position_debug["sell_reason"] = f"손절예정일 경과 (보유기간: {hold_days}일)"
                 # 손절예정일 당일은 매도추천 리스트에 표시, 다음날부터 미표시
@@ -2702,7 +3013,8 @@ class SOXLQuantTrader:
                 })
             else:
                 # 매도 조건을 만족하지 않아도 매도 추천 리스트에 포함 (보유 중 상태로 표시)
-                print(f"      ⏳ 매도 조건 미충족: 종가 ${daily_close:.2f} < 목표가 ${sell_price:.2f}, 손절예정일 미경과 ({current_date.strftime('%Y-%m-%d')} < {stop_loss_date.strftime('%Y-%m-%d')})")
+                if debug:
+                    self.logger.debug("      ⏳ 매도 조건 미충족: 종가 $%.2f < 목표가 $%.2f, 손절예정일 미경과 (%s < %s)", daily_close, sell_price, current_date.strftime('%Y-%m-%d'), stop_loss_date.strftime('%Y-%m-%d'))
                 position_debug["will_sell"] = False
                 position_debug["sell_reason"] = "보유 중"
                 sell_positions.append({
@@ -2717,9 +3029,9 @@ class SOXLQuantTrader:
         
         # 디버깅: 매도 추천 결과
         if sell_positions:
-            print(f"✅ 매도 추천 {len(sell_positions)}건 생성됨")
+            self.logger.debug("✅ 매도 추천 %s건 생성됨", len(sell_positions))
         else:
-            print("❌ 매도 추천 없음")
+            self.logger.debug('❌ 매도 추천 없음')
         
         if getattr(self, "profit_loss_compounding_enabled", False):
             for sell_info in sell_positions:
@@ -2766,9 +3078,10 @@ class SOXLQuantTrader:
             })
         
 
-        print(f"✅ {sold_round}회차 매도 실행: {position['shares']}주 @ ${sell_price:.2f}")
-        print(f"   매도 사유: {sell_info['reason']}")
-        print(f"   수익: ${profit:,.0f} ({profit_rate:+.2f}%)")
+        self.logger.debug("✅ %s회차 매도 실행: %s주 @ $%.2f", sold_round, position['shares'], sell_price)
+        self.logger.debug("   매도 사유: %s", sell_info['reason'])
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("   수익: $%s (%+.2f%%)", f"{profit:,.0f}", profit_rate)
         
 
         return proceeds, sold_round
@@ -2817,10 +3130,10 @@ class SOXLQuantTrader:
         position["buy_price"] = new_buy_price
         position["amount"] = new_amount
         
-        print(f"✅ {position['round']}회차 포지션 수정 완료 (인덱스: {position_index})")
-        print(f"   기존: {old_shares}주 @ ${old_buy_price:.2f} (${old_amount:,.0f})")
-        print(f"   수정: {new_shares}주 @ ${new_buy_price:.2f} (${new_amount:,.0f})")
-        print(f"   예수금 조정: ${cash_adjustment:+,.0f}")
+        self.logger.info("✅ %s회차 포지션 수정 완료 (인덱스: %s)", position['round'], position_index)
+        self.logger.info("   기존: %s주 @ $%.2f ($%s)", old_shares, old_buy_price, f"{old_amount:,.0f}")
+        self.logger.info("   수정: %s주 @ $%.2f ($%s)", new_shares, new_buy_price, f"{new_amount:,.0f}")
+        self.logger.info("   예수금 조정: $%s", f"{cash_adjustment:+,.0f}")
         
         return True
     
@@ -2869,7 +3182,7 @@ class SOXLQuantTrader:
                 self.positions.pop(i)
             if removed:
                 self.current_round = len(self.positions) + 1 if self.positions else 1
-                print(f"⚠️ LOC 미충족으로 제거된 포지션: {', '.join(removed)}")
+                self.logger.warning("⚠️ LOC 미충족으로 제거된 포지션: %s", ', '.join(removed))
                 self._sync_investment_capital_to_latest_total_assets()
         except Exception:
             pass
@@ -2883,13 +3196,13 @@ class SOXLQuantTrader:
         Returns:
             Dict: 매매 추천 정보
         """
-        print("=" * 60)
-        print("🚀 SOXL 퀀트투자 일일 매매 추천")
-        print("=" * 60)
+        self.logger.debug("=" * 60)
+        self.logger.debug("🚀 SOXL 퀀트투자 일일 매매 추천")
+        self.logger.debug("=" * 60)
         
         # 현재 상태를 최신으로 업데이트 (시작일부터 현재까지 시뮬레이션)
         if not skip_simulate and self.session_start_date:
-            print("🔄 트레이더 상태를 최신으로 업데이트 중...")
+            self.logger.debug("🔄 트레이더 상태를 최신으로 업데이트 중...")
             sim_result = self.simulate_from_start_to_today(self.session_start_date, quiet=True)
             if "error" in sim_result:
                 return {"error": f"상태 업데이트 실패: {sim_result['error']}"}
@@ -2901,9 +3214,9 @@ class SOXLQuantTrader:
         if is_market_closed:
             latest_trading_day = self.get_latest_trading_day()
             if today.weekday() >= 5:
-                print(f"📅 주말입니다. 최신 거래일({latest_trading_day.strftime('%Y-%m-%d')}) 데이터를 사용합니다.")
+                self.logger.debug("📅 주말입니다. 최신 거래일(%s) 데이터를 사용합니다.", latest_trading_day.strftime('%Y-%m-%d'))
             else:
-                print(f"📅 휴장일입니다. 최신 거래일({latest_trading_day.strftime('%Y-%m-%d')}) 데이터를 사용합니다.")
+                self.logger.debug("📅 휴장일입니다. 최신 거래일(%s) 데이터를 사용합니다.", latest_trading_day.strftime('%Y-%m-%d'))
         
         # 1. SOXL 데이터 가져오기
         soxl_data = self.get_stock_data("SOXL", "1mo")
@@ -2931,7 +3244,7 @@ class SOXLQuantTrader:
             for si in unprocessed_today_seeds:
                 self.processed_seed_dates.add(si["date"])
             seed_dates_str = ", ".join(si["date"] for si in unprocessed_today_seeds)
-            print(f"💰 오늘 시드증액 반영: {seed_dates_str} - ${total_seed:,.0f} 추가 (매수추천에 반영)")
+            self.logger.debug("💰 오늘 시드증액 반영: %s - $%s 추가 (매수추천에 반영)", seed_dates_str, f"{total_seed:,.0f}")
         
         # 장중에는 오늘 날짜 데이터 제외 (종가가 확정되지 않았으므로)
         today_date = today.date()
@@ -2951,11 +3264,9 @@ class SOXLQuantTrader:
         rsi_ref_data = {}
         try:
             rsi_file_path = str(self._resolve_data_path("weekly_rsi_reference.json"))
-            if os.path.exists(rsi_file_path):
-                with open(rsi_file_path, 'r', encoding='utf-8') as f:
-                    rsi_ref_data = json.load(f)
+            rsi_ref_data = load_rsi_reference(rsi_file_path) or {}
         except Exception as e:
-            print(f"⚠️ RSI 참조 데이터 로드 실패: {e}")
+            self.logger.warning("⚠️ RSI 참조 데이터 로드 실패: %s", e)
 
         # 시뮬레이션 후 포지션 모드를 백업하여 이후 모드 재계산 시 보존
         position_mode_backup = {}
@@ -2973,7 +3284,7 @@ class SOXLQuantTrader:
             stored_mode = pos.get('mode')
             if stored_mode:
                 position_mode_backup[pos_key] = stored_mode
-                print(f"🔍 포지션 모드 백업: {pos_key} = {stored_mode}")
+                self.logger.debug("🔍 포지션 모드 백업: %s = %s", pos_key, stored_mode)
         
         # 3-0. 포지션 모드 재검증 및 수정 (매수일 기준으로 재계산, 수량/금액도 재계산)
         # QQQ 데이터로 주간 RSI 계산
@@ -3059,15 +3370,15 @@ class SOXLQuantTrader:
                         
                         # 저장된 모드와 비교
                         if current_stored_mode != correct_mode:
-                            print(f"⚠️ 포지션 모드 불일치 감지: {pos_key}")
-                            print(f"   매수일: {buy_date_dt.strftime('%Y-%m-%d')}, 저장된 모드: {current_stored_mode}, 올바른 모드: {correct_mode}")
-                            print(f"   RSI 값: 1주전={one_week_ago_rsi:.2f}, 2주전={two_weeks_ago_rsi:.2f}")
-                            print(f"🔧 포지션 모드 수정: {pos_key} = {current_stored_mode} → {correct_mode}")
+                            self.logger.warning("⚠️ 포지션 모드 불일치 감지: %s", pos_key)
+                            self.logger.debug("   매수일: %s, 저장된 모드: %s, 올바른 모드: %s", buy_date_dt.strftime('%Y-%m-%d'), current_stored_mode, correct_mode)
+                            self.logger.debug("   RSI 값: 1주전=%.2f, 2주전=%.2f", one_week_ago_rsi, two_weeks_ago_rsi)
+                            self.logger.debug("🔧 포지션 모드 수정: %s = %s → %s", pos_key, current_stored_mode, correct_mode)
                             
                             # 모드는 매도 조건 계산에 필요하지만, 실제 체결 수량/금액은
                             # 스냅샷이나 체결 확인값을 원천값으로 유지한다.
                             pos['mode'] = correct_mode
-                            print(f"   (체결 수량/금액 유지: {pos['shares']}주 @ ${pos['amount']:,.0f})")
+                            self.logger.debug("   (체결 수량/금액 유지: %s주 @ $%s)", pos['shares'], f"{pos['amount']:,.0f}")
         
         # 3-1. 12/29일 매수 포지션 보정 (안전모드/회차만 보정, 체결 수량은 유지)
         target_date = datetime(2025, 12, 29)
@@ -3162,9 +3473,9 @@ class SOXLQuantTrader:
                 # (시작일의 모드가 아닌 오늘 날짜 기준 모드를 사용해야 함)
                 if start_week_friday.date() == this_week_friday_calc.date():
                     force_recalculate = True
-                    print(f"🔄 시작일({self.session_start_date})이 이번 주 내에 있음. 오늘 날짜 기준 모드 강제 재계산")
+                    self.logger.debug("🔄 시작일(%s)이 이번 주 내에 있음. 오늘 날짜 기준 모드 강제 재계산", self.session_start_date)
             except Exception as e:
-                print(f"⚠️ 시작일 확인 중 오류: {e}")
+                self.logger.warning("⚠️ 시작일 확인 중 오류: %s", e)
         
         # 같은 주 내에서는 모드를 재계산하지 않음 (월요일에 정해진 모드는 그 주 내내 유지)
         # 월~금은 모드가 변경되지 말아야 함 (금요일 장 종료 전에도 같은 주 모드 유지)
@@ -3250,9 +3561,9 @@ class SOXLQuantTrader:
                         if is_matched:
                             # 조건에 해당하는 모드가 있으면 그 모드를 사용
                             if expected_mode != self.current_mode:
-                                print(f"⚠️ 모드 불일치 감지: 현재 모드={self.current_mode}, 예상 모드={expected_mode}")
-                                print(f"   RSI 값: 1주전={one_week_ago_rsi:.2f}, 2주전={two_weeks_ago_rsi:.2f}")
-                                print(f"🔄 모드 재계산 필요 (잘못된 모드 감지)")
+                                self.logger.warning("⚠️ 모드 불일치 감지: 현재 모드=%s, 예상 모드=%s", self.current_mode, expected_mode)
+                                self.logger.debug("   RSI 값: 1주전=%.2f, 2주전=%.2f", one_week_ago_rsi, two_weeks_ago_rsi)
+                                self.logger.debug("🔄 모드 재계산 필요 (잘못된 모드 감지)")
                                 # 모드 재계산
                                 temp_current_mode = self.current_mode
                                 self.current_week_friday = None
@@ -3260,9 +3571,9 @@ class SOXLQuantTrader:
                                 new_mode = self.update_mode(qqq_data)
                                 if new_mode is None:
                                     return {"error": "모드 판정 실패: 전주 모드를 계산할 수 없어 현재 주차의 모드를 결정할 수 없습니다."}
-                                print(f"✅ 모드 재계산 완료: {this_week_friday_date} 주차 모드 = {new_mode}")
+                                self.logger.debug("✅ 모드 재계산 완료: %s 주차 모드 = %s", this_week_friday_date, new_mode)
                             else:
-                                print(f"✅ 같은 주 내 모드 유지: {this_week_friday_date} 주차 모드 = {self.current_mode} (검증 완료)")
+                                self.logger.debug("✅ 같은 주 내 모드 유지: %s 주차 모드 = %s (검증 완료)", this_week_friday_date, self.current_mode)
                                 new_mode = self.current_mode
                         else:
                             # 조건에 해당하지 않으면 전주 모드 사용해야 함
@@ -3273,9 +3584,9 @@ class SOXLQuantTrader:
                                 prev_week_mode, success = self._calculate_week_mode_recursive(one_week_ago_friday, weekly_df_temp, rsi)
                             
                             if success and prev_week_mode != self.current_mode:
-                                print(f"⚠️ 모드 불일치 감지: 현재 모드={self.current_mode}, 전주 모드={prev_week_mode}")
-                                print(f"   RSI 값: 1주전={one_week_ago_rsi:.2f}, 2주전={two_weeks_ago_rsi:.2f}")
-                                print(f"🔄 모드 재계산 필요 (전주 모드와 불일치)")
+                                self.logger.warning("⚠️ 모드 불일치 감지: 현재 모드=%s, 전주 모드=%s", self.current_mode, prev_week_mode)
+                                self.logger.debug("   RSI 값: 1주전=%.2f, 2주전=%.2f", one_week_ago_rsi, two_weeks_ago_rsi)
+                                self.logger.debug("🔄 모드 재계산 필요 (전주 모드와 불일치)")
                                 # 모드 재계산
                                 temp_current_mode = self.current_mode
                                 self.current_week_friday = None
@@ -3283,26 +3594,26 @@ class SOXLQuantTrader:
                                 new_mode = self.update_mode(qqq_data)
                                 if new_mode is None:
                                     return {"error": "모드 판정 실패: 전주 모드를 계산할 수 없어 현재 주차의 모드를 결정할 수 없습니다."}
-                                print(f"✅ 모드 재계산 완료: {this_week_friday_date} 주차 모드 = {new_mode}")
+                                self.logger.debug("✅ 모드 재계산 완료: %s 주차 모드 = %s", this_week_friday_date, new_mode)
                             else:
-                                print(f"✅ 같은 주 내 모드 유지: {this_week_friday_date} 주차 모드 = {self.current_mode} (검증 완료)")
+                                self.logger.debug("✅ 같은 주 내 모드 유지: %s 주차 모드 = %s (검증 완료)", this_week_friday_date, self.current_mode)
                                 new_mode = self.current_mode
                     else:
                         # RSI 값을 가져올 수 없으면 모드 유지
-                        print(f"✅ 같은 주 내 모드 유지: {this_week_friday_date} 주차 모드 = {self.current_mode} (RSI 검증 불가)")
+                        self.logger.debug("✅ 같은 주 내 모드 유지: %s 주차 모드 = %s (RSI 검증 불가)", this_week_friday_date, self.current_mode)
                         new_mode = self.current_mode
                 else:
                     # 주간 데이터가 부족하면 모드 유지
-                    print(f"✅ 같은 주 내 모드 유지: {this_week_friday_date} 주차 모드 = {self.current_mode} (데이터 부족)")
+                    self.logger.debug("✅ 같은 주 내 모드 유지: %s 주차 모드 = %s (데이터 부족)", this_week_friday_date, self.current_mode)
                     new_mode = self.current_mode
             except Exception as e:
                 # 검증 중 오류 발생 시 모드 유지
-                print(f"⚠️ 모드 검증 중 오류 발생: {e}, 모드 유지")
-                print(f"✅ 같은 주 내 모드 유지: {this_week_friday_date} 주차 모드 = {self.current_mode}")
+                self.logger.warning("⚠️ 모드 검증 중 오류 발생: %s, 모드 유지", e)
+                self.logger.debug("✅ 같은 주 내 모드 유지: %s 주차 모드 = %s", this_week_friday_date, self.current_mode)
                 new_mode = self.current_mode
         elif is_monday:
             # 월요일인 경우 항상 모드를 재계산 (이번 주 모드를 올바르게 설정)
-            print(f"🔄 월요일 모드 재계산: {this_week_friday_date} 주차 (월요일이므로 항상 재계산)")
+            self.logger.debug("🔄 월요일 모드 재계산: %s 주차 (월요일이므로 항상 재계산)", this_week_friday_date)
             # 같은 주 체크를 우회하기 위해 current_week_friday를 임시로 None으로 설정
             temp_current_mode = self.current_mode
             self.current_week_friday = None
@@ -3310,7 +3621,7 @@ class SOXLQuantTrader:
             new_mode = self.update_mode(qqq_data)
             if new_mode is None:
                 return {"error": "모드 판정 실패: 전주 모드를 계산할 수 없어 현재 주차의 모드를 결정할 수 없습니다."}
-            print(f"✅ 월요일 모드 재계산 완료: {this_week_friday_date} 주차 모드 = {new_mode}")
+            self.logger.debug("✅ 월요일 모드 재계산 완료: %s 주차 모드 = %s", this_week_friday_date, new_mode)
         elif force_recalculate:
             # 강제 재계산이 필요한 경우 (시작일이 이번 주 내에 있는 경우)
             # 같은 주 체크를 우회하기 위해 current_week_friday를 임시로 None으로 설정
@@ -3320,12 +3631,12 @@ class SOXLQuantTrader:
             temp_current_mode = self.current_mode
             self.current_week_friday = None
             self.current_mode = None  # 전주 모드를 올바르게 계산하도록 None으로 설정
-            print(f"🔄 모드 재계산 필요 (오늘 날짜 기준, 실시간 QQQ 데이터 사용)")
+            self.logger.debug("🔄 모드 재계산 필요 (오늘 날짜 기준, 실시간 QQQ 데이터 사용)")
             new_mode = self.update_mode(qqq_data)
             # update_mode()가 모드 판정 실패 시 None 반환
             if new_mode is None:
                 return {"error": "모드 판정 실패: 전주 모드를 계산할 수 없어 현재 주차의 모드를 결정할 수 없습니다."}
-            print(f"✅ 오늘 날짜 기준 모드 재계산 완료: {this_week_friday_calc.strftime('%Y-%m-%d')} 주차 모드 = {new_mode}")
+            self.logger.debug("✅ 오늘 날짜 기준 모드 재계산 완료: %s 주차 모드 = %s", this_week_friday_calc.strftime('%Y-%m-%d'), new_mode)
         elif old_week_friday_date is None or old_week_friday_date != this_week_friday_date:
             # 새로운 주차인 경우 모드 재계산
             # 단, 금요일이면서 장이 종료되지 않았으면 모드를 업데이트하지 않음
@@ -3333,10 +3644,10 @@ class SOXLQuantTrader:
             if today.weekday() == 4 and not self.is_regular_session_closed_now():
                 # 금요일 장 종료 전에는 모드를 업데이트하지 않음
                 if self.current_mode:
-                    print(f"⏳ 금요일 장 종료 전: {today.strftime('%Y-%m-%d')} 장 종료 전이므로 모드 업데이트하지 않음 (현재 모드: {self.current_mode})")
+                    self.logger.debug("⏳ 금요일 장 종료 전: %s 장 종료 전이므로 모드 업데이트하지 않음 (현재 모드: %s)", today.strftime('%Y-%m-%d'), self.current_mode)
                     new_mode = self.current_mode
                 else:
-                    print(f"⏳ 금요일 장 종료 전: {today.strftime('%Y-%m-%d')} 장 종료 전이지만 현재 모드가 없어 완료 RSI로 이번 주 모드를 계산합니다.")
+                    self.logger.debug("⏳ 금요일 장 종료 전: %s 장 종료 전이지만 현재 모드가 없어 완료 RSI로 이번 주 모드를 계산합니다.", today.strftime('%Y-%m-%d'))
                     fallback_mode, success = self._calculate_week_mode_from_completed_rsi(
                         this_week_friday_calc, qqq_data, rsi_ref_data
                     )
@@ -3345,16 +3656,16 @@ class SOXLQuantTrader:
                     self.current_week_friday = this_week_friday_calc
                     self.current_mode = fallback_mode
                     new_mode = fallback_mode
-                    print(f"✅ 금요일 장중 모드 복구: {this_week_friday_date} 주차 모드 = {new_mode}")
+                    self.logger.debug("✅ 금요일 장중 모드 복구: %s 주차 모드 = %s", this_week_friday_date, new_mode)
             else:
                 # 금요일 장 종료 후이거나 금요일이 아닌 경우 모드 재계산
-                print(f"🔄 새로운 주차 모드 계산: {this_week_friday_date} 주차")
+                self.logger.debug("🔄 새로운 주차 모드 계산: %s 주차", this_week_friday_date)
                 new_mode = self.update_mode(qqq_data)
                 if new_mode is None:
                     return {"error": "모드 판정 실패: 전주 모드를 계산할 수 없어 현재 주차의 모드를 결정할 수 없습니다."}
         else:
             # 같은 주 내이고 시작일이 다른 주에 있으면 모드 유지
-            print(f"✅ 같은 주 내 모드 유지: {this_week_friday_date} 주차 모드 = {self.current_mode}")
+            self.logger.debug("✅ 같은 주 내 모드 유지: %s 주차 모드 = %s", this_week_friday_date, self.current_mode)
             new_mode = self.current_mode
         
         today = self.get_today_date()
@@ -3365,11 +3676,9 @@ class SOXLQuantTrader:
         rsi_ref_data = {}
         try:
             rsi_file_path = str(self._resolve_data_path("weekly_rsi_reference.json"))
-            if os.path.exists(rsi_file_path):
-                with open(rsi_file_path, 'r', encoding='utf-8') as f:
-                    rsi_ref_data = json.load(f)
+            rsi_ref_data = load_rsi_reference(rsi_file_path) or {}
         except Exception as e:
-            print(f"⚠️ RSI 참조 데이터 로드 실패: {e}")
+            self.logger.warning("⚠️ RSI 참조 데이터 로드 실패: %s", e)
         
         # 오늘 날짜 기준으로 가장 최근 완료된 주차(지난주 금요일) 찾기
         today_date = today.date()
@@ -3396,7 +3705,7 @@ class SOXLQuantTrader:
         
         # 참조 데이터에 없으면 15년치 데이터로 정확한 RSI 실시간 계산
         if one_week_ago_rsi is None or two_weeks_ago_rsi is None:
-            print(f"⚠️ RSI 참조 데이터 부재 → 15년 데이터 기반 실시간 계산 진행")
+            self.logger.warning("⚠️ RSI 참조 데이터 부재 → 15년 데이터 기반 실시간 계산 진행")
             target_fridays = []
             if one_week_ago_rsi is None:
                 target_fridays.append(one_week_ago_friday)
@@ -3642,6 +3951,31 @@ class SOXLQuantTrader:
         else:
             print("보유 포지션 없음")
     
+    @contextmanager
+    def quiet_logging(self, quiet: bool = True):
+        """
+        블록 안에서 이 트레이더의 debug/info 로그를 끈다 (경고·오류는 그대로 출력)
+        로거 수준에서 걸러지므로 꺼진 메시지는 문자열 포맷팅도 하지 않는다.
+        Args:
+            quiet: False면 아무것도 바꾸지 않음
+        """
+        if not quiet:
+            yield
+            return
+        previous = self.__dict__.get("logger")
+        self.logger = _quiet_logger
+        try:
+            yield
+        finally:
+            if previous is None:
+                del self.logger
+            else:
+                self.logger = previous
+
+    def _record_backtest_event(self, current_date, event: str, **fields) -> None:
+        """백테스트 일별 이벤트를 backtest_events에 dict로 추가 (호출 측에서 record_backtest_events 확인)"""
+        self.backtest_events.append({"date": current_date.strftime('%Y-%m-%d'), "event": event, **fields})
+
     def reset_portfolio(self):
         """포트폴리오 초기화 (백테스팅용)"""
         self.positions = []
@@ -3662,11 +3996,43 @@ class SOXLQuantTrader:
             self._reset_compounding_state(self.initial_capital)
     
     def clear_cache(self):
-        """캐시 초기화 (설정 변경 시 호출)"""
+        """
+        캐시 초기화 (설정 변경 시 호출)
+        공용 시뮬레이션 캐시는 설정·세션이 키에 들어가므로 비우지 않는다 (clear_simulation_cache 참고).
+        """
         self._stock_data_cache.clear()
+        self.logger.info("🧹 캐시 초기화 완료")
+
+    def clear_simulation_cache(self):
+        """프로세스 공용 시뮬레이션 결과 캐시 비우기 (시세 제공자 교체 등 키에 없는 입력이 바뀐 경우)"""
         self._simulation_cache.clear()
-        print("🧹 캐시 초기화 완료")
     
+    def _starting_state_from_timeline(self, start_date: str) -> Optional[dict]:
+        """
+        주입된 모드 타임라인의 주차 RSI로 시작 상태 결정 (check_backtest_starting_state와 같은 재귀 규칙)
+        시작 주차와 1·2주전 RSI가 모두 있고 이전 주차 모드를 정할 수 있어야 함, 아니면 None (참조 데이터로 판정)
+        """
+        timeline = self._mode_timeline
+        try:
+            start_friday = week_friday(datetime.strptime(start_date, "%Y-%m-%d").date())
+        except ValueError:
+            return None
+        start_week_rsi, prev_week_rsi, two_weeks_ago_rsi = (
+            timeline.rsi(start_friday - timedelta(days=7 * offset)) for offset in range(3)
+        )
+        if start_week_rsi is None or prev_week_rsi is None or two_weeks_ago_rsi is None:
+            return None
+        prev_week_mode = recursive_week_mode(start_friday - timedelta(days=7), timeline.rsi, self._is_mode_case_matched)
+        if prev_week_mode is None:
+            return None
+        return {
+            "start_mode": self.determine_mode(prev_week_rsi, two_weeks_ago_rsi, prev_week_mode),
+            "start_round": 1,
+            "start_week_rsi": start_week_rsi,
+            "prev_week_rsi": prev_week_rsi,
+            "two_weeks_ago_rsi": two_weeks_ago_rsi,
+        }
+
     def check_backtest_starting_state(self, start_date: str, rsi_ref_data: dict) -> dict:
         """
         백테스팅 시작 시점의 상태 확인
@@ -3676,6 +4042,10 @@ class SOXLQuantTrader:
         Returns:
             dict: 시작 시점 상태 정보
         """
+        if self._mode_timeline is not None:
+            timeline_state = self._starting_state_from_timeline(start_date)
+            if timeline_state is not None:
+                return timeline_state
         try:
             start_dt = datetime.strptime(start_date, "%Y-%m-%d")
             
@@ -3714,7 +4084,7 @@ class SOXLQuantTrader:
                     if two_weeks_ago_rsi is None:
                         two_weeks_ago_rsi = fallback_rsi.get(two_weeks_ago_friday.strftime('%Y-%m-%d'))
                 except Exception as e:
-                    print(f"⚠️ RSI 실시간 계산 폴백 실패: {e}")
+                    self.logger.warning("⚠️ RSI 실시간 계산 폴백 실패: %s", e)
             
             # 시작 모드 결정
             # 시작일 이전 주차의 모드를 계산하여 시작 모드 결정
@@ -3728,7 +4098,7 @@ class SOXLQuantTrader:
                 prev_week_mode, success = self._calculate_week_mode_recursive_with_reference(prev_week_friday, rsi_ref_data)
                 
                 if not success:
-                    print(f"❌ 모드판정실패: 백테스팅 시작일 이전 주차 모드 계산 실패")
+                    self.logger.warning("❌ 모드판정실패: 백테스팅 시작일 이전 주차 모드 계산 실패")
                     return {
                         "error": f"백테스팅 시작일 이전 주차 모드 계산 실패",
                         "start_mode": None,
@@ -3738,20 +4108,20 @@ class SOXLQuantTrader:
                         "two_weeks_ago_rsi": two_weeks_ago_rsi
                     }
                 
-                print(f"🔍 백테스팅 시작 모드 계산:")
-                print(f"   시작일: {start_date}")
-                print(f"   시작 주차 금요일: {start_week_friday.strftime('%Y-%m-%d')}")
-                print(f"   1주전 RSI: {prev_week_rsi:.2f}, 2주전 RSI: {two_weeks_ago_rsi:.2f}")
-                print(f"   이전 주차 모드: {prev_week_mode}")
+                self.logger.debug("🔍 백테스팅 시작 모드 계산:")
+                self.logger.debug("   시작일: %s", start_date)
+                self.logger.debug("   시작 주차 금요일: %s", start_week_friday.strftime('%Y-%m-%d'))
+                self.logger.debug("   1주전 RSI: %.2f, 2주전 RSI: %.2f", prev_week_rsi, two_weeks_ago_rsi)
+                self.logger.debug("   이전 주차 모드: %s", prev_week_mode)
                 
                 # 시작 모드 결정 (이전 주차의 모드를 사용)
                 start_mode = self.determine_mode(prev_week_rsi, two_weeks_ago_rsi, prev_week_mode)
-                print(f"   결정된 시작 모드: {start_mode}")
+                self.logger.debug("   결정된 시작 모드: %s", start_mode)
             else:
-                print(f"[ERROR] 백테스팅 시작 시점의 RSI 데이터가 없습니다.")
-                print(f"   시작 주차 RSI: {start_week_rsi}")
-                print(f"   1주전 RSI: {prev_week_rsi}")
-                print(f"   2주전 RSI: {two_weeks_ago_rsi}")
+                self.logger.error("[ERROR] 백테스팅 시작 시점의 RSI 데이터가 없습니다.")
+                self.logger.debug("   시작 주차 RSI: %s", start_week_rsi)
+                self.logger.debug("   1주전 RSI: %s", prev_week_rsi)
+                self.logger.debug("   2주전 RSI: %s", two_weeks_ago_rsi)
                 return {
                     "error": f"백테스팅 시작 시점의 RSI 데이터가 없습니다. 1주전: {prev_week_rsi}, 2주전: {two_weeks_ago_rsi}",
                     "start_mode": "SF",
@@ -3765,13 +4135,13 @@ class SOXLQuantTrader:
             # (실제로는 과거 매수 기록이 있어야 정확하지만, 여기서는 간단히 추정)
             estimated_round = 1  # 기본값
             
-            print(f"[INFO] 백테스팅 시작 상태:")
-            print(f"   - 시작일: {start_date}")
-            print(f"   - 시작 주차 RSI: {start_week_rsi:.2f}")
-            print(f"   - 1주전 RSI: {prev_week_rsi:.2f}")
-            print(f"   - 2주전 RSI: {two_weeks_ago_rsi:.2f}")
-            print(f"   - 시작 모드: {start_mode}")
-            print(f"   - 시작 회차: {estimated_round}회차")
+            self.logger.debug("[INFO] 백테스팅 시작 상태:")
+            self.logger.debug("   - 시작일: %s", start_date)
+            self.logger.debug("   - 시작 주차 RSI: %.2f", start_week_rsi)
+            self.logger.debug("   - 1주전 RSI: %.2f", prev_week_rsi)
+            self.logger.debug("   - 2주전 RSI: %.2f", two_weeks_ago_rsi)
+            self.logger.debug("   - 시작 모드: %s", start_mode)
+            self.logger.debug("   - 시작 회차: %s회차", estimated_round)
             
             return {
                 "start_mode": start_mode,
@@ -3782,7 +4152,7 @@ class SOXLQuantTrader:
             }
             
         except Exception as e:
-            print(f"[ERROR] 백테스팅 시작 상태 확인 오류: {e}")
+            self.logger.error("[ERROR] 백테스팅 시작 상태 확인 오류: %s", e)
             return {
                 "start_mode": "SF",
                 "start_round": 1,
@@ -3791,81 +4161,29 @@ class SOXLQuantTrader:
                 "two_weeks_ago_rsi": None
             }
     
-    def run_backtest(
-        self,
-        start_date: str,
-        end_date: str = None,
-        initial_positions: List[dict] = None,
-        initial_cash: float = None,
-        snapshot_max_date: str = None,
-        initial_processed_seed_dates: Optional[set] = None,
-    ) -> Dict:
+    def get_backtest_data_period(self, start_date: str) -> str:
         """
-        백테스팅 실행
+        run_backtest가 조회하는 일봉 기간(range) 결정 (시작일 180일 전부터 확보)
         Args:
-            start_date: 시작 날짜 (YYYY-MM-DD 형식)
-            end_date: 종료 날짜 (None이면 오늘까지)
-            initial_positions: 스냅샷 기반 시 초기 포지션 (스냅샷에 없는 회차 생성 방지)
-            initial_cash: 스냅샷 기반 시 초기 현금잔고
-            snapshot_max_date: 스냅샷 최신일 (시드증액 처리용)
+            start_date: 백테스팅 시작일 (YYYY-MM-DD)
         Returns:
-            Dict: 백테스팅 결과
+            str: "1y", "2y" 또는 "15y"
         """
-        from_snapshot = bool(initial_positions is not None and initial_cash is not None and snapshot_max_date)
-
-        print(f"🔄 백테스팅 시작: {start_date} ~ {end_date or '오늘'}" + (" (스냅샷 기반)" if from_snapshot else ""))
-        
-        # 로그 저장용 리스트 초기화
-        self.backtest_logs = []
-
-        
-        # RSI 참조 데이터 로드
-        rsi_ref_data = self.load_rsi_reference_data()
-        
-        if from_snapshot:
-            # 스냅샷 기반: reset 없이 초기 상태 로드 (스냅샷에 없는 회차는 생성되지 않음)
-            self.positions = list(initial_positions)
-            self.available_cash = float(initial_cash)
-            self.current_round = len(initial_positions) + 1  # 보유 N개 → 다음 N+1회차
-            # current_investment_capital은 SOXL 데이터 로드 후 스냅샷 기준일 총자산으로 설정
-            max_dt = datetime.strptime(snapshot_max_date, "%Y-%m-%d").date()
-            if initial_processed_seed_dates is not None:
-                self.processed_seed_dates = set(initial_processed_seed_dates)
-            else:
-                self.processed_seed_dates = {si["date"] for si in self.seed_increases
-                                             if datetime.strptime(si["date"], "%Y-%m-%d").date() <= max_dt}
-            self.trading_days_count = 0
-            self.current_week_friday = None
-        else:
-            self.reset_portfolio()
+        data_start = datetime.strptime(start_date, "%Y-%m-%d") - timedelta(days=180)
+        period_days = (self.get_us_eastern_now() - data_start).days
+        if period_days <= 365:
+            return "1y"
+        if period_days <= 730:
+            return "2y"
+        # 5년 이상은 15년으로 통일 (정확한 RSI/데이터, SOXL은 2010년 출시)
+        return "15y"
 
-        
-        # 백테스팅 시작 상태 확인
-        starting_state = self.check_backtest_starting_state(start_date, rsi_ref_data)
-        
-        # RSI 데이터가 없는 경우 백테스팅 중단
-        if "error" in starting_state:
-            return {"error": starting_state["error"]}
-        
-        # 시작 모드와 회차 설정 (스냅샷 기반이면 회차는 이미 설정됨)
-        self.current_mode = starting_state["start_mode"]
-        if not from_snapshot:
-            self.current_round = starting_state["start_round"]
-        
-        print(f"🎯 백테스팅 시작 설정:")
-        print(f"   - 모드: {self.current_mode}")
-        print(f"   - 회차: {self.current_round}")
-        _ratios = self.get_current_config().get("split_ratios") or []
-        if 1 <= self.current_round <= len(_ratios):
-            print(
-                f"   - 1회시드 예상: ${self.initial_capital * _ratios[self.current_round - 1]:,.0f}"
-            )
-        else:
-            print(
-                f"   - 1회시드 예상: (다음 매수 회차 {self.current_round} — "
-                f"분할 비중 {len(_ratios)}회 범위 밖, 표시 생략)"
-            )
-        
+    def _load_backtest_bars(self, start_date: str, end_date: Optional[str]) -> Dict:
+        """
+        백테스트 기간의 SOXL 일봉 조회 (장 마감 전 당일 봉 제외, 종료일 보정 포함)
+        Returns:
+            Dict: {"soxl": 전체 SOXL 일봉, "start_dt": 시작 시각, "end_dt": 종료 시각} 또는 {"error": ...}
+        """
         # 날짜 파싱 (종료일은 해당 날짜의 23:59:59로 설정하여 당일 데이터 포함)
         market_now = self.get_us_eastern_now()
         try:
@@ -3889,32 +4207,20 @@ class SOXLQuantTrader:
         
 
         # 충분한 기간의 데이터 가져오기
-        data_start = start_dt - timedelta(days=180)
-        
-
-        # SOXL 데이터 가져오기 (2011년부터 데이터 확보)
-        period_days = (market_now - data_start).days
-        if period_days <= 365:
-            period = "1y"
-        elif period_days <= 730:
-            period = "2y"
-
-        elif period_days <= 1825:  # 5년
-            period = "15y"  # 15년으로 통일 (정확한 RSI/데이터)
+        period = self.get_backtest_data_period(start_date)
 
-        elif period_days <= 3650:  # 10년
-            period = "15y"  # 15년으로 통일
-        else:
-            period = "15y"  # 15년 (SOXL은 2010년 출시)
-            
-        soxl_data = self.get_stock_data("SOXL", period)
+        # SOXL·QQQ 동시 조회 (모드 타임라인이 주입되어 있으면 QQQ는 필요 없음)
+        symbols = ["SOXL"] if self._mode_timeline is not None else ["SOXL", "QQQ"]
+        fetched = self.get_many(symbols, period)
+        soxl_data = fetched.get("SOXL")
         if soxl_data is None:
             return {"error": "SOXL 데이터를 가져올 수 없습니다."}
         
-        # QQQ 데이터 가져오기
-        qqq_data = self.get_stock_data("QQQ", period)
+        qqq_data = fetched.get("QQQ")
         if qqq_data is None:
-            return {"error": "QQQ 데이터를 가져올 수 없습니다."}
+            if self._mode_timeline is None:
+                return {"error": "QQQ 데이터를 가져올 수 없습니다."}
+            qqq_data = soxl_data.iloc[:0]
         
         # 정규장 미마감이고, 마지막 인덱스 날짜가 오늘이면 무조건 제외 (공급사 조기 생성 일봉 방지)
         try:
@@ -3948,6 +4254,90 @@ class SOXLQuantTrader:
         except Exception:
             pass
 
+        return {"soxl": soxl_data, "start_dt": start_dt, "end_dt": end_dt}
+
+    def run_backtest(
+        self,
+        start_date: str,
+        end_date: str = None,
+        initial_positions: List[dict] = None,
+        initial_cash: float = None,
+        snapshot_max_date: str = None,
+        initial_processed_seed_dates: Optional[set] = None,
+        engine: Optional[str] = None,
+    ) -> Dict:
+        """
+        백테스팅 실행
+        Args:
+            start_date: 시작 날짜 (YYYY-MM-DD 형식)
+            end_date: 종료 날짜 (None이면 오늘까지)
+            initial_positions: 스냅샷 기반 시 초기 포지션 (스냅샷에 없는 회차 생성 방지)
+            initial_cash: 스냅샷 기반 시 초기 현금잔고
+            snapshot_max_date: 스냅샷 최신일 (시드증액 처리용)
+            engine: 일별 루프 엔진 "array" 또는 "legacy" (None이면 BACKTEST_ENGINE)
+        Returns:
+            Dict: 백테스팅 결과
+        """
+        from_snapshot = bool(initial_positions is not None and initial_cash is not None and snapshot_max_date)
+
+        self.logger.info("🔄 백테스팅 시작: %s ~ %s%s", start_date, end_date or '오늘', " (스냅샷 기반)" if from_snapshot else "")
+        
+        # 일별 이벤트 목록 초기화 (record_backtest_events가 True일 때만 채워짐)
+        self.backtest_events = []
+        self._last_backtest_loop = None
+
+        
+        # RSI 참조 데이터 로드
+        rsi_ref_data = self.load_rsi_reference_data()
+        
+        if from_snapshot:
+            # 스냅샷 기반: reset 없이 초기 상태 로드 (스냅샷에 없는 회차는 생성되지 않음)
+            self.positions = list(initial_positions)
+            self.available_cash = float(initial_cash)
+            self.current_round = len(initial_positions) + 1  # 보유 N개 → 다음 N+1회차
+            # current_investment_capital은 SOXL 데이터 로드 후 스냅샷 기준일 총자산으로 설정
+            max_dt = datetime.strptime(snapshot_max_date, "%Y-%m-%d").date()
+            if initial_processed_seed_dates is not None:
+                self.processed_seed_dates = set(initial_processed_seed_dates)
+            else:
+                self.processed_seed_dates = {si["date"] for si in self.seed_increases
+                                             if datetime.strptime(si["date"], "%Y-%m-%d").date() <= max_dt}
+            self.trading_days_count = 0
+            self.current_week_friday = None
+        else:
+            self.reset_portfolio()
+
+        
+        # 백테스팅 시작 상태 확인
+        starting_state = self.check_backtest_starting_state(start_date, rsi_ref_data)
+        
+        # RSI 데이터가 없는 경우 백테스팅 중단
+        if "error" in starting_state:
+            return {"error": starting_state["error"]}
+        
+        # 시작 모드와 회차 설정 (스냅샷 기반이면 회차는 이미 설정됨)
+        self.current_mode = starting_state["start_mode"]
+        if not from_snapshot:
+            self.current_round = starting_state["start_round"]
+        
+        self.logger.debug("🎯 백테스팅 시작 설정:")
+        self.logger.debug("   - 모드: %s", self.current_mode)
+        self.logger.debug("   - 회차: %s", self.current_round)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            _ratios = self.get_current_config().get("split_ratios") or []
+            if 1 <= self.current_round <= len(_ratios):
+                self.logger.debug("   - 1회시드 예상: $%s", f"{self.initial_capital * _ratios[self.current_round - 1]:,.0f}")
+            else:
+                self.logger.debug(
+                    "   - 1회시드 예상: (다음 매수 회차 %s — 분할 비중 %s회 범위 밖, 표시 생략)",
+                    self.current_round, len(_ratios),
+                )
+        
+        bars = self._load_backtest_bars(start_date, end_date)
+        if "error" in bars:
+            return bars
+        soxl_data, start_dt, end_dt = bars["soxl"], bars["start_dt"], bars["end_dt"]
+
         # 스냅샷 재개: 스냅샷 기준일 종가로 총자산 → 투자원금 (1회시드·일일 추천과 동일 기준)
         if from_snapshot and snapshot_max_date:
             self.current_investment_capital = 0.0
@@ -3968,7 +4358,7 @@ class SOXLQuantTrader:
                         except Exception:
                             pass
                     self.current_investment_capital = cap_fb
-                    print(f"💰 스냅샷 투자원금 폴백(초기+시드): ${cap_fb:,.0f}")
+                    self.logger.debug("💰 스냅샷 투자원금 폴백(초기+시드): $%s", f"{cap_fb:,.0f}")
                 except Exception:
                     pass
         
@@ -3989,7 +4379,7 @@ class SOXLQuantTrader:
         total_invested = sum(p.get("amount", 0) for p in self.positions) if from_snapshot else 0  # 총 투자금
         cash_balance = self.available_cash if from_snapshot else self.initial_capital  # 현금 잔고
         
-        print(f"📊 총 {len(soxl_backtest)}일 백테스팅 진행...")
+        self.logger.debug("📊 총 %s일 백테스팅 진행...", len(soxl_backtest))
         
 
         # 백테스팅 시작일의 전일 종가 설정
@@ -4001,9 +4391,9 @@ class SOXLQuantTrader:
             prev_data = soxl_data[soxl_data.index <= start_date_prev]
             if len(prev_data) > 0:
                 prev_close = prev_data.iloc[-1]['Close']
-                print(f"📅 백테스팅 시작 전일 종가: {prev_close:.2f} (날짜: {prev_data.index[-1].strftime('%Y-%m-%d')})")
+                self.logger.debug("📅 백테스팅 시작 전일 종가: %.2f (날짜: %s)", prev_close, prev_data.index[-1].strftime('%Y-%m-%d'))
             else:
-                print("⚠️ 백테스팅 시작 전일 데이터를 찾을 수 없습니다.")
+                self.logger.debug('⚠️ 백테스팅 시작 전일 데이터를 찾을 수 없습니다.')
         
         current_week_friday = None  # 현재 주차의 금요일 (로컬 변수)
         previous_day_sold_rounds = 0  # 전날 매도된 회차 수 추적
@@ -4019,8 +4409,26 @@ class SOXLQuantTrader:
         start_week_friday = start_dt + timedelta(days=days_until_friday)
         start_week_friday_str = start_week_friday.strftime('%Y-%m-%d')
         week_modes[start_week_friday_str] = current_mode
-        print(f"🔍 시작 주차 모드 저장: {start_week_friday_str} = {current_mode}")
+        self.logger.debug("🔍 시작 주차 모드 저장: %s = %s", start_week_friday_str, current_mode)
+
+        if self._use_array_engine(engine):
+            array_engine = ArrayBacktestEngine(self, soxl_backtest, rsi_ref_data)
+            daily_records = array_engine.run(
+                prev_close,
+                current_mode,
+                current_week_rsi,
+                week_modes,
+                from_snapshot,
+            )
+            if isinstance(daily_records, dict):
+                return daily_records
+            self._last_backtest_loop = dict(array_engine.loop_state, week_modes=week_modes)
+            return self._finish_backtest(start_date, end_date, len(soxl_backtest), daily_records)
         
+        # 일별 로그/이벤트 가드 (꺼져 있으면 메시지·이벤트를 만들지 않음)
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        record_events = self.record_backtest_events
+
         for i, (current_date, row) in enumerate(soxl_backtest.iterrows()):
             current_price = row['Close']
             # 당일 시드증액(입금) — 일별기록·엑셀 반영용
@@ -4032,7 +4440,7 @@ class SOXLQuantTrader:
                 holding_rounds = len(self.positions)
                 # 다음 매수 회차 = 보유 회차 수 + 1
                 self.current_round = holding_rounds + 1
-                print(f"🔄 전날 매도 완료: {previous_day_sold_rounds}개 회차 매도 → 보유: {holding_rounds}개 → 다음 매수: {self.current_round}회차")
+                self.logger.debug("🔄 전날 매도 완료: %s개 회차 매도 → 보유: %s개 → 다음 매수: %s회차", previous_day_sold_rounds, holding_rounds, self.current_round)
                 previous_day_sold_rounds = 0  # 반영 후 초기화
             
 
@@ -4077,10 +4485,11 @@ class SOXLQuantTrader:
                     for seed in unprocessed_seeds:
                         self.processed_seed_dates.add(seed["date"])
                     
-                    seed_dates_str = ", ".join([si["date"] for si in unprocessed_seeds])
-                    print(f"💰 시드증액 반영: {current_date_str} (시드증액 날짜: {seed_dates_str}) - ${total_seed_increase:,.0f} 추가")
-                    print(f"   현재 총자산: ${current_total_assets:,.0f} + 시드증액: ${total_seed_increase:,.0f} = ${new_investment_capital:,.0f}")
-                    print(f"   투자원금 갱신: ${old_capital:,.0f} → ${new_investment_capital:,.0f}")
+                    if debug:
+                        seed_dates_str = ", ".join([si["date"] for si in unprocessed_seeds])
+                        self.logger.debug("💰 시드증액 반영: %s (시드증액 날짜: %s) - $%s 추가", current_date_str, seed_dates_str, f"{total_seed_increase:,.0f}")
+                        self.logger.debug("   현재 총자산: $%s + 시드증액: $%s = $%s", f"{current_total_assets:,.0f}", f"{total_seed_increase:,.0f}", f"{new_investment_capital:,.0f}")
+                        self.logger.debug("   투자원금 갱신: $%s → $%s", f"{old_capital:,.0f}", f"{new_investment_capital:,.0f}")
                 
                 # 10거래일마다 투자원금 업데이트는 매매 처리 후로 이동 (아래 참조)
             
@@ -4096,214 +4505,225 @@ class SOXLQuantTrader:
                 # self.current_week_friday도 업데이트 (get_daily_recommendation에서 사용)
                 self.current_week_friday = this_week_friday
                 
-                # 새로운 주차의 RSI 값 가져오기 (해당 주차의 금요일 기준)
-                current_week_rsi = self.get_rsi_from_reference(this_week_friday, rsi_ref_data)
+                # 주입된 모드 타임라인에 이번 주차가 있으면 RSI 조회·모드 판정 생략 (배열 엔진과 동일)
+                timeline_week = self._mode_timeline.get(this_week_friday.date()) if self._mode_timeline is not None else None
+                if timeline_week is not None and timeline_week[0] is not None:
+                    current_week_rsi, current_mode = timeline_week
+                    week_modes[this_week_friday.strftime('%Y-%m-%d')] = current_mode
+                    self.current_mode = current_mode
+                else:
+                    # 새로운 주차의 RSI 값 가져오기 (해당 주차의 금요일 기준)
+                    current_week_rsi = self.get_rsi_from_reference(this_week_friday, rsi_ref_data)
                 
-                # 모드 업데이트 (2주전 RSI와 1주전 RSI 비교)
-                # 2주전과 1주전 RSI 계산
-                prev_week_friday = this_week_friday - timedelta(days=7)  # 1주전
-                two_weeks_ago_friday = this_week_friday - timedelta(days=14)  # 2주전
+                    # 모드 업데이트 (2주전 RSI와 1주전 RSI 비교)
+                    # 2주전과 1주전 RSI 계산
+                    prev_week_friday = this_week_friday - timedelta(days=7)  # 1주전
+                    two_weeks_ago_friday = this_week_friday - timedelta(days=14)  # 2주전
                 
-                prev_week_rsi = self.get_rsi_from_reference(prev_week_friday, rsi_ref_data)  # 1주전 RSI
-                two_weeks_ago_rsi = self.get_rsi_from_reference(two_weeks_ago_friday, rsi_ref_data)  # 2주전 RSI
+                    prev_week_rsi = self.get_rsi_from_reference(prev_week_friday, rsi_ref_data)  # 1주전 RSI
+                    two_weeks_ago_rsi = self.get_rsi_from_reference(two_weeks_ago_friday, rsi_ref_data)  # 2주전 RSI
                 
-                # RSI 데이터가 없는 경우 실시간 계산 폴백
-                missing_fridays = []
-                if current_week_rsi is None:
-                    missing_fridays.append(this_week_friday)
-                if prev_week_rsi is None:
-                    missing_fridays.append(prev_week_friday)
-                if two_weeks_ago_rsi is None:
-                    missing_fridays.append(two_weeks_ago_friday)
+                    # RSI 데이터가 없는 경우 실시간 계산 폴백
+                    missing_fridays = []
+                    if current_week_rsi is None:
+                        missing_fridays.append(this_week_friday)
+                    if prev_week_rsi is None:
+                        missing_fridays.append(prev_week_friday)
+                    if two_weeks_ago_rsi is None:
+                        missing_fridays.append(two_weeks_ago_friday)
                 
-                if missing_fridays:
-                    try:
-                        fallback_rsi = self.calculate_weekly_rsi_for_dates(missing_fridays)
-                        if current_week_rsi is None:
-                            current_week_rsi = fallback_rsi.get(this_week_friday.strftime('%Y-%m-%d'))
-                        if prev_week_rsi is None:
-                            prev_week_rsi = fallback_rsi.get(prev_week_friday.strftime('%Y-%m-%d'))
-                        if two_weeks_ago_rsi is None:
-                            two_weeks_ago_rsi = fallback_rsi.get(two_weeks_ago_friday.strftime('%Y-%m-%d'))
-                    except Exception as e:
-                        print(f"⚠️ RSI 실시간 계산 폴백 실패: {e}")
+                    if missing_fridays:
+                        try:
+                            fallback_rsi = self.calculate_weekly_rsi_for_dates(missing_fridays)
+                            if current_week_rsi is None:
+                                current_week_rsi = fallback_rsi.get(this_week_friday.strftime('%Y-%m-%d'))
+                            if prev_week_rsi is None:
+                                prev_week_rsi = fallback_rsi.get(prev_week_friday.strftime('%Y-%m-%d'))
+                            if two_weeks_ago_rsi is None:
+                                two_weeks_ago_rsi = fallback_rsi.get(two_weeks_ago_friday.strftime('%Y-%m-%d'))
+                        except Exception as e:
+                            self.logger.warning("⚠️ RSI 실시간 계산 폴백 실패: %s", e)
                 
-                if current_week_rsi is None:
-                    return {"error": f"RSI 데이터가 없습니다. 주차: {this_week_friday.strftime('%Y-%m-%d')}"}
-                if prev_week_rsi is None or two_weeks_ago_rsi is None:
-                    return {"error": f"RSI 데이터가 없습니다. 1주전 RSI: {prev_week_rsi}, 2주전 RSI: {two_weeks_ago_rsi}"}
+                    if current_week_rsi is None:
+                        return {"error": f"RSI 데이터가 없습니다. 주차: {this_week_friday.strftime('%Y-%m-%d')}"}
+                    if prev_week_rsi is None or two_weeks_ago_rsi is None:
+                        return {"error": f"RSI 데이터가 없습니다. 1주전 RSI: {prev_week_rsi}, 2주전 RSI: {two_weeks_ago_rsi}"}
                 
-                # 모드 결정 (2주전 vs 1주전 비교)
-                # 중요: 이전 주차의 모드를 사용하여 현재 주차의 모드를 결정
-                # 하지만 RSI가 같으면 이전 모드를 유지하므로, 이전 주차의 모드가 중요함
-                # 이전 주차의 모드를 정확히 계산하기 위해 이전 주차의 1주전/2주전 RSI를 사용
-                prev_week_prev_rsi = self.get_rsi_from_reference(prev_week_friday - timedelta(days=7), rsi_ref_data)  # 이전 주차의 1주전 RSI
-                prev_week_two_weeks_rsi = self.get_rsi_from_reference(prev_week_friday - timedelta(days=14), rsi_ref_data)  # 이전 주차의 2주전 RSI
+                    # 모드 결정 (2주전 vs 1주전 비교)
+                    # 중요: 이전 주차의 모드를 사용하여 현재 주차의 모드를 결정
+                    # 하지만 RSI가 같으면 이전 모드를 유지하므로, 이전 주차의 모드가 중요함
+                    # 이전 주차의 모드를 정확히 계산하기 위해 이전 주차의 1주전/2주전 RSI를 사용
+                    prev_week_prev_rsi = self.get_rsi_from_reference(prev_week_friday - timedelta(days=7), rsi_ref_data)  # 이전 주차의 1주전 RSI
+                    prev_week_two_weeks_rsi = self.get_rsi_from_reference(prev_week_friday - timedelta(days=14), rsi_ref_data)  # 이전 주차의 2주전 RSI
                 
-                # 이전 주차의 모드를 정확히 계산하기 위해 순차적으로 이전 주차들의 모드를 계산
-                # 전전주, 전전전주의 모드를 확인하여 전 주의 모드를 정확히 결정
-                prev_week_friday_str = prev_week_friday.strftime('%Y-%m-%d')
+                    # 이전 주차의 모드를 정확히 계산하기 위해 순차적으로 이전 주차들의 모드를 계산
+                    # 전전주, 전전전주의 모드를 확인하여 전 주의 모드를 정확히 결정
+                    prev_week_friday_str = prev_week_friday.strftime('%Y-%m-%d')
                 
-                # 이전 주차의 모드가 이미 계산되어 있으면 사용 (우선순위 1)
-                if prev_week_friday_str in week_modes:
-                    actual_prev_week_mode = week_modes[prev_week_friday_str]
-                    print(f"🔍 이전 주차 모드 (저장된 값 사용): {prev_week_friday_str} = {actual_prev_week_mode}")
-                    # current_mode도 동기화
-                    if current_mode != actual_prev_week_mode:
-                        print(f"⚠️ current_mode 동기화: {current_mode} → {actual_prev_week_mode}")
-                        current_mode = actual_prev_week_mode
-                elif prev_week_prev_rsi is not None and prev_week_two_weeks_rsi is not None:
-                    # 이전 주차의 모드를 계산
-                    actual_prev_week_mode = current_mode  # 기본값은 현재 모드
+                    # 이전 주차의 모드가 이미 계산되어 있으면 사용 (우선순위 1)
+                    if prev_week_friday_str in week_modes:
+                        actual_prev_week_mode = week_modes[prev_week_friday_str]
+                        self.logger.debug("🔍 이전 주차 모드 (저장된 값 사용): %s = %s", prev_week_friday_str, actual_prev_week_mode)
+                        # current_mode도 동기화
+                        if current_mode != actual_prev_week_mode:
+                            self.logger.debug("⚠️ current_mode 동기화: %s → %s", current_mode, actual_prev_week_mode)
+                            current_mode = actual_prev_week_mode
+                    elif prev_week_prev_rsi is not None and prev_week_two_weeks_rsi is not None:
+                        # 이전 주차의 모드를 계산
+                        actual_prev_week_mode = current_mode  # 기본값은 현재 모드
                     
-                    # 이전 주차의 모드를 계산하기 위해 전전주, 전전전주의 모드를 확인
-                    prev_prev_week_friday = prev_week_friday - timedelta(days=7)
-                    prev_prev_prev_week_friday = prev_week_friday - timedelta(days=14)
+                        # 이전 주차의 모드를 계산하기 위해 전전주, 전전전주의 모드를 확인
+                        prev_prev_week_friday = prev_week_friday - timedelta(days=7)
+                        prev_prev_prev_week_friday = prev_week_friday - timedelta(days=14)
                     
-                    prev_prev_week_friday_str = prev_prev_week_friday.strftime('%Y-%m-%d')
-                    prev_prev_prev_week_friday_str = prev_prev_prev_week_friday.strftime('%Y-%m-%d')
+                        prev_prev_week_friday_str = prev_prev_week_friday.strftime('%Y-%m-%d')
+                        prev_prev_prev_week_friday_str = prev_prev_prev_week_friday.strftime('%Y-%m-%d')
                     
-                    # 전전주의 모드 확인
-                    # 시작 모드는 check_backtest_starting_state()에서 재귀적으로 계산된 값이다.
-                    # 여기서 임의로 SF를 기본값으로 두면 스냅샷 이후 재개 첫 주의 매수 모드가
-                    # AG에서 SF로 뒤집혀 회차별 비중이 잘못 적용될 수 있다.
-                    prev_prev_week_mode = current_mode
-                    if prev_prev_week_friday_str in week_modes:
-                        prev_prev_week_mode = week_modes[prev_prev_week_friday_str]
-                        print(f"🔍 전전주 모드 (저장된 값 사용): {prev_prev_week_friday_str} = {prev_prev_week_mode}")
-                    else:
-                        # 전전주의 모드를 계산하기 위해 전전전주의 모드 확인
-                        prev_prev_prev_week_mode = current_mode
-                        if prev_prev_prev_week_friday_str in week_modes:
-                            prev_prev_prev_week_mode = week_modes[prev_prev_prev_week_friday_str]
-                            print(f"🔍 전전전주 모드 (저장된 값 사용): {prev_prev_prev_week_friday_str} = {prev_prev_prev_week_mode}")
+                        # 전전주의 모드 확인
+                        # 시작 모드는 check_backtest_starting_state()에서 재귀적으로 계산된 값이다.
+                        # 여기서 임의로 SF를 기본값으로 두면 스냅샷 이후 재개 첫 주의 매수 모드가
+                        # AG에서 SF로 뒤집혀 회차별 비중이 잘못 적용될 수 있다.
+                        prev_prev_week_mode = current_mode
+                        if prev_prev_week_friday_str in week_modes:
+                            prev_prev_week_mode = week_modes[prev_prev_week_friday_str]
+                            self.logger.debug("🔍 전전주 모드 (저장된 값 사용): %s = %s", prev_prev_week_friday_str, prev_prev_week_mode)
+                        else:
+                            # 전전주의 모드를 계산하기 위해 전전전주의 모드 확인
+                            prev_prev_prev_week_mode = current_mode
+                            if prev_prev_prev_week_friday_str in week_modes:
+                                prev_prev_prev_week_mode = week_modes[prev_prev_prev_week_friday_str]
+                                self.logger.debug("🔍 전전전주 모드 (저장된 값 사용): %s = %s", prev_prev_prev_week_friday_str, prev_prev_prev_week_mode)
                         
-                        # 전전주의 RSI 확인
-                        prev_prev_prev_rsi = self.get_rsi_from_reference(prev_prev_prev_week_friday, rsi_ref_data)
-                        prev_prev_prev_two_weeks_rsi = self.get_rsi_from_reference(prev_prev_prev_week_friday - timedelta(days=7), rsi_ref_data)
+                            # 전전주의 RSI 확인
+                            prev_prev_prev_rsi = self.get_rsi_from_reference(prev_prev_prev_week_friday, rsi_ref_data)
+                            prev_prev_prev_two_weeks_rsi = self.get_rsi_from_reference(prev_prev_prev_week_friday - timedelta(days=7), rsi_ref_data)
                         
-                        if prev_prev_prev_rsi is not None and prev_prev_prev_two_weeks_rsi is not None:
-                            prev_prev_week_mode = self.determine_mode(prev_prev_prev_rsi, prev_prev_prev_two_weeks_rsi, prev_prev_prev_week_mode)
-                            print(f"🔍 전전주 모드 계산: 1주전 RSI={prev_prev_prev_rsi:.2f}, 2주전 RSI={prev_prev_prev_two_weeks_rsi:.2f}, 이전 모드={prev_prev_prev_week_mode} → {prev_prev_week_mode}")
-                            # 전전주 모드 저장
-                            week_modes[prev_prev_week_friday_str] = prev_prev_week_mode
+                            if prev_prev_prev_rsi is not None and prev_prev_prev_two_weeks_rsi is not None:
+                                prev_prev_week_mode = self.determine_mode(prev_prev_prev_rsi, prev_prev_prev_two_weeks_rsi, prev_prev_prev_week_mode)
+                                self.logger.debug("🔍 전전주 모드 계산: 1주전 RSI=%.2f, 2주전 RSI=%.2f, 이전 모드=%s → %s", prev_prev_prev_rsi, prev_prev_prev_two_weeks_rsi, prev_prev_prev_week_mode, prev_prev_week_mode)
+                                # 전전주 모드 저장
+                                week_modes[prev_prev_week_friday_str] = prev_prev_week_mode
                     
-                    # 이전 주차의 모드 계산 (전전주 모드 사용)
-                    calculated_prev_week_mode = self.determine_mode(prev_week_prev_rsi, prev_week_two_weeks_rsi, prev_prev_week_mode)
-                    print(f"🔍 이전 주차 모드 재계산: 1주전 RSI={prev_week_prev_rsi:.2f}, 2주전 RSI={prev_week_two_weeks_rsi:.2f}, 전전주 모드={prev_prev_week_mode} → {calculated_prev_week_mode}")
+                        # 이전 주차의 모드 계산 (전전주 모드 사용)
+                        calculated_prev_week_mode = self.determine_mode(prev_week_prev_rsi, prev_week_two_weeks_rsi, prev_prev_week_mode)
+                        self.logger.debug("🔍 이전 주차 모드 재계산: 1주전 RSI=%.2f, 2주전 RSI=%.2f, 전전주 모드=%s → %s", prev_week_prev_rsi, prev_week_two_weeks_rsi, prev_prev_week_mode, calculated_prev_week_mode)
                     
-                    # 이전 주차 모드 저장
-                    week_modes[prev_week_friday_str] = calculated_prev_week_mode
+                        # 이전 주차 모드 저장
+                        week_modes[prev_week_friday_str] = calculated_prev_week_mode
                     
-                    # 재계산된 모드를 사용 (더 정확함)
-                    actual_prev_week_mode = calculated_prev_week_mode
-                    # current_mode도 업데이트하여 동기화
-                    if current_mode != calculated_prev_week_mode:
-                        print(f"⚠️ 이전 주차 모드 불일치: current_mode={current_mode}, 재계산={calculated_prev_week_mode}")
-                        current_mode = calculated_prev_week_mode
+                        # 재계산된 모드를 사용 (더 정확함)
+                        actual_prev_week_mode = calculated_prev_week_mode
+                        # current_mode도 업데이트하여 동기화
+                        if current_mode != calculated_prev_week_mode:
+                            self.logger.debug("⚠️ 이전 주차 모드 불일치: current_mode=%s, 재계산=%s", current_mode, calculated_prev_week_mode)
+                            current_mode = calculated_prev_week_mode
+                        else:
+                            self.logger.debug("✅ 이전 주차 모드 일치 확인: %s", current_mode)
                     else:
-                        print(f"✅ 이전 주차 모드 일치 확인: {current_mode}")
-                else:
-                    # RSI 데이터가 없으면 current_mode 사용
-                    actual_prev_week_mode = current_mode
-                    print(f"⚠️ 이전 주차 RSI 데이터 없음, current_mode 사용: {current_mode}")
+                        # RSI 데이터가 없으면 current_mode 사용
+                        actual_prev_week_mode = current_mode
+                        self.logger.debug("⚠️ 이전 주차 RSI 데이터 없음, current_mode 사용: %s", current_mode)
                 
-                # 이번 주 모드 결정 (이전 주차 모드 사용)
-                new_mode = self.determine_mode(prev_week_rsi, two_weeks_ago_rsi, actual_prev_week_mode)
+                    # 이번 주 모드 결정 (이전 주차 모드 사용)
+                    new_mode = self.determine_mode(prev_week_rsi, two_weeks_ago_rsi, actual_prev_week_mode)
                 
-                # 12/29~1/2 주차 특별 검증
-                if this_week_friday.date() >= datetime(2025, 12, 29).date() and this_week_friday.date() <= datetime(2026, 1, 2).date():
-                    print(f"🔍 [12/29~1/2 주차 검증]")
-                    print(f"   이번주 금요일: {this_week_friday.strftime('%Y-%m-%d')}")
-                    print(f"   1주전 RSI: {prev_week_rsi:.2f}, 2주전 RSI: {two_weeks_ago_rsi:.2f}")
-                    print(f"   이전 주차 모드: {actual_prev_week_mode}")
-                    print(f"   결정된 모드: {new_mode}")
-                    # 안전모드 조건 확인
-                    safe_cond1 = two_weeks_ago_rsi > 65 and two_weeks_ago_rsi > prev_week_rsi
-                    safe_cond2 = 40 < two_weeks_ago_rsi < 50 and two_weeks_ago_rsi > prev_week_rsi
-                    safe_cond3 = two_weeks_ago_rsi >= 50 and prev_week_rsi < 50
-                    ag_cond1 = two_weeks_ago_rsi < 50 and two_weeks_ago_rsi < prev_week_rsi and prev_week_rsi > 50
-                    ag_cond2 = 50 < two_weeks_ago_rsi < 60 and two_weeks_ago_rsi < prev_week_rsi
-                    ag_cond3 = two_weeks_ago_rsi < 35 and two_weeks_ago_rsi < prev_week_rsi
-                    print(f"   안전모드 조건: cond1={safe_cond1}, cond2={safe_cond2}, cond3={safe_cond3}")
-                    print(f"   공세모드 조건: cond1={ag_cond1}, cond2={ag_cond2}, cond3={ag_cond3}")
-                    if not (safe_cond1 or safe_cond2 or safe_cond3) and not (ag_cond1 or ag_cond2 or ag_cond3):
-                        print(f"   ⚠️ 조건 충족 없음 → 이전 주차 모드 유지: {actual_prev_week_mode}")
-                        # 이전 주차가 안전모드였다면 이번 주도 안전모드여야 함
-                        if actual_prev_week_mode == "SF" and new_mode != "SF":
-                            print(f"   ❌ CRITICAL: 이전 주차가 안전모드인데 이번 주가 공세모드로 결정됨! 강제로 안전모드로 수정")
-                            new_mode = "SF"
+                    # 12/29~1/2 주차 특별 검증
+                    if this_week_friday.date() >= datetime(2025, 12, 29).date() and this_week_friday.date() <= datetime(2026, 1, 2).date():
+                        self.logger.debug("🔍 [12/29~1/2 주차 검증]")
+                        self.logger.debug("   이번주 금요일: %s", this_week_friday.strftime('%Y-%m-%d'))
+                        self.logger.debug("   1주전 RSI: %.2f, 2주전 RSI: %.2f", prev_week_rsi, two_weeks_ago_rsi)
+                        self.logger.debug("   이전 주차 모드: %s", actual_prev_week_mode)
+                        self.logger.debug("   결정된 모드: %s", new_mode)
+                        # 안전모드 조건 확인
+                        safe_cond1 = two_weeks_ago_rsi > 65 and two_weeks_ago_rsi > prev_week_rsi
+                        safe_cond2 = 40 < two_weeks_ago_rsi < 50 and two_weeks_ago_rsi > prev_week_rsi
+                        safe_cond3 = two_weeks_ago_rsi >= 50 and prev_week_rsi < 50
+                        ag_cond1 = two_weeks_ago_rsi < 50 and two_weeks_ago_rsi < prev_week_rsi and prev_week_rsi > 50
+                        ag_cond2 = 50 < two_weeks_ago_rsi < 60 and two_weeks_ago_rsi < prev_week_rsi
+                        ag_cond3 = two_weeks_ago_rsi < 35 and two_weeks_ago_rsi < prev_week_rsi
+                        self.logger.debug("   안전모드 조건: cond1=%s, cond2=%s, cond3=%s", safe_cond1, safe_cond2, safe_cond3)
+                        self.logger.debug("   공세모드 조건: cond1=%s, cond2=%s, cond3=%s", ag_cond1, ag_cond2, ag_cond3)
+                        if not (safe_cond1 or safe_cond2 or safe_cond3) and not (ag_cond1 or ag_cond2 or ag_cond3):
+                            self.logger.debug("   ⚠️ 조건 충족 없음 → 이전 주차 모드 유지: %s", actual_prev_week_mode)
+                            # 이전 주차가 안전모드였다면 이번 주도 안전모드여야 함
+                            if actual_prev_week_mode == "SF" and new_mode != "SF":
+                                self.logger.debug("   ❌ CRITICAL: 이전 주차가 안전모드인데 이번 주가 공세모드로 결정됨! 강제로 안전모드로 수정")
+                                new_mode = "SF"
                 
-                # 디버깅: 모드 결정 과정 로그
-                prev_rsi_display = f"{prev_week_rsi:.2f}" if prev_week_rsi is not None else "None"
-                two_weeks_rsi_display = f"{two_weeks_ago_rsi:.2f}" if two_weeks_ago_rsi is not None else "None"
-                print(f"🔍 주차 모드 결정: 날짜={current_date.strftime('%Y-%m-%d')}, 이번주 금요일={this_week_friday.strftime('%Y-%m-%d')}")
-                print(f"   1주전 금요일: {prev_week_friday.strftime('%Y-%m-%d')}, RSI: {prev_rsi_display}")
-                print(f"   2주전 금요일: {two_weeks_ago_friday.strftime('%Y-%m-%d')}, RSI: {two_weeks_rsi_display}")
-                print(f"   이전 주차 모드: {current_mode} → 결정된 모드: {new_mode}")
+                    # 디버깅: 모드 결정 과정 로그
+                    if debug:
+                        prev_rsi_display = f"{prev_week_rsi:.2f}" if prev_week_rsi is not None else "None"
+                        two_weeks_rsi_display = f"{two_weeks_ago_rsi:.2f}" if two_weeks_ago_rsi is not None else "None"
+                        self.logger.debug("🔍 주차 모드 결정: 날짜=%s, 이번주 금요일=%s", current_date.strftime('%Y-%m-%d'), this_week_friday.strftime('%Y-%m-%d'))
+                        self.logger.debug("   1주전 금요일: %s, RSI: %s", prev_week_friday.strftime('%Y-%m-%d'), prev_rsi_display)
+                        self.logger.debug("   2주전 금요일: %s, RSI: %s", two_weeks_ago_friday.strftime('%Y-%m-%d'), two_weeks_rsi_display)
+                        self.logger.debug("   이전 주차 모드: %s → 결정된 모드: %s", current_mode, new_mode)
                 
-                # 12/29~1/2 주차 특별 디버깅
-                if this_week_friday.date() >= datetime(2025, 12, 29).date() and this_week_friday.date() <= datetime(2026, 1, 2).date():
-                    print(f"⚠️ [12/29~1/2 주차 디버깅]")
-                    print(f"   이번주 금요일: {this_week_friday.strftime('%Y-%m-%d')}")
-                    print(f"   1주전 RSI: {prev_week_rsi:.2f}, 2주전 RSI: {two_weeks_ago_rsi:.2f}")
-                    print(f"   이전 주차 모드: {current_mode}")
-                    print(f"   결정된 모드: {new_mode}")
-                    # determine_mode 조건 확인
-                    safe_cond1 = prev_week_rsi > 65 and prev_week_rsi > two_weeks_ago_rsi
-                    safe_cond2 = 40 < prev_week_rsi < 50 and prev_week_rsi > two_weeks_ago_rsi
-                    safe_cond3 = prev_week_rsi >= 50 and two_weeks_ago_rsi < 50
-                    ag_cond1 = prev_week_rsi < 50 and prev_week_rsi < two_weeks_ago_rsi and two_weeks_ago_rsi > 50
-                    ag_cond2 = 50 < prev_week_rsi < 60 and prev_week_rsi < two_weeks_ago_rsi
-                    ag_cond3 = prev_week_rsi < 35 and prev_week_rsi < two_weeks_ago_rsi
-                    print(f"   안전모드 조건: cond1={safe_cond1}, cond2={safe_cond2}, cond3={safe_cond3}")
-                    print(f"   공세모드 조건: cond1={ag_cond1}, cond2={ag_cond2}, cond3={ag_cond3}")
-                    if not (safe_cond1 or safe_cond2 or safe_cond3) and not (ag_cond1 or ag_cond2 or ag_cond3):
-                        print(f"   ⚠️ 조건 충족 없음 → 이전 모드 유지: {current_mode}")
+                    # 12/29~1/2 주차 특별 디버깅
+                    if debug and this_week_friday.date() >= datetime(2025, 12, 29).date() and this_week_friday.date() <= datetime(2026, 1, 2).date():
+                        self.logger.debug("⚠️ [12/29~1/2 주차 디버깅]")
+                        self.logger.debug("   이번주 금요일: %s", this_week_friday.strftime('%Y-%m-%d'))
+                        self.logger.debug("   1주전 RSI: %.2f, 2주전 RSI: %.2f", prev_week_rsi, two_weeks_ago_rsi)
+                        self.logger.debug("   이전 주차 모드: %s", current_mode)
+                        self.logger.debug("   결정된 모드: %s", new_mode)
+                        # determine_mode 조건 확인
+                        safe_cond1 = prev_week_rsi > 65 and prev_week_rsi > two_weeks_ago_rsi
+                        safe_cond2 = 40 < prev_week_rsi < 50 and prev_week_rsi > two_weeks_ago_rsi
+                        safe_cond3 = prev_week_rsi >= 50 and two_weeks_ago_rsi < 50
+                        ag_cond1 = prev_week_rsi < 50 and prev_week_rsi < two_weeks_ago_rsi and two_weeks_ago_rsi > 50
+                        ag_cond2 = 50 < prev_week_rsi < 60 and prev_week_rsi < two_weeks_ago_rsi
+                        ag_cond3 = prev_week_rsi < 35 and prev_week_rsi < two_weeks_ago_rsi
+                        self.logger.debug("   안전모드 조건: cond1=%s, cond2=%s, cond3=%s", safe_cond1, safe_cond2, safe_cond3)
+                        self.logger.debug("   공세모드 조건: cond1=%s, cond2=%s, cond3=%s", ag_cond1, ag_cond2, ag_cond3)
+                        if not (safe_cond1 or safe_cond2 or safe_cond3) and not (ag_cond1 or ag_cond2 or ag_cond3):
+                            self.logger.debug("   ⚠️ 조건 충족 없음 → 이전 모드 유지: %s", current_mode)
                 
-                if new_mode != current_mode:
-                    print(f"🔄 백테스팅 모드 전환: {current_mode} → {new_mode} (1주전 RSI: {prev_rsi_display}, 2주전 RSI: {two_weeks_rsi_display})")
-                    print(f"   현재 회차: {self.current_round} → 최대 회차: {7 if new_mode == 'SF' else 8}")
-                else:
-                    # 모드가 변경되지 않았어도 주차 시작 시점임을 명확히 표시
-                    print(f"📅 주차 시작: {current_date.strftime('%Y-%m-%d')} (모드: {current_mode} 유지)")
+                    if debug and new_mode != current_mode:
+                        self.logger.debug("🔄 백테스팅 모드 전환: %s → %s (1주전 RSI: %s, 2주전 RSI: %s)", current_mode, new_mode, prev_rsi_display, two_weeks_rsi_display)
+                        self.logger.debug("   현재 회차: %s → 최대 회차: %s", self.current_round, 7 if new_mode == 'SF' else 8)
+                    elif debug:
+                        # 모드가 변경되지 않았어도 주차 시작 시점임을 명확히 표시
+                        self.logger.debug("📅 주차 시작: %s (모드: %s 유지)", current_date.strftime('%Y-%m-%d'), current_mode)
                 
-                # 모드 업데이트 전 검증
-                if current_mode != new_mode:
-                    print(f"⚠️ 모드 변경: {current_mode} → {new_mode}")
-                else:
-                    print(f"✅ 모드 유지: {current_mode}")
+                    # 모드 업데이트 전 검증
+                    if current_mode != new_mode:
+                        self.logger.debug("⚠️ 모드 변경: %s → %s", current_mode, new_mode)
+                    else:
+                        self.logger.debug("✅ 모드 유지: %s", current_mode)
                 
-                # 현재 주차의 모드 저장 (먼저 저장)
-                this_week_friday_str = this_week_friday.strftime('%Y-%m-%d')
-                week_modes[this_week_friday_str] = new_mode
+                    # 현재 주차의 모드 저장 (먼저 저장)
+                    this_week_friday_str = this_week_friday.strftime('%Y-%m-%d')
+                    week_modes[this_week_friday_str] = new_mode
                 
-                # current_mode 업데이트 (week_modes와 동기화)
-                current_mode = new_mode
-                self.current_mode = new_mode  # 클래스 변수도 업데이트 (모드가 변경되지 않았어도 주차 시작 시점에 명확히 설정)
+                    # current_mode 업데이트 (week_modes와 동기화)
+                    current_mode = new_mode
+                    self.current_mode = new_mode  # 클래스 변수도 업데이트 (모드가 변경되지 않았어도 주차 시작 시점에 명확히 설정)
                 
-                # 12/29~1/2 주차 강제 검증 및 수정
-                if this_week_friday.date() >= datetime(2025, 12, 29).date() and this_week_friday.date() <= datetime(2026, 1, 2).date():
-                    print(f"🔍 [12/29~1/2 주차 강제 검증]")
-                    print(f"   이전 주차 모드: {actual_prev_week_mode}")
-                    print(f"   결정된 모드: {new_mode}")
-                    if actual_prev_week_mode == "SF":
-                        if new_mode != "SF":
-                            print(f"❌ CRITICAL: 이전 주차가 안전모드인데 이번 주가 공세모드로 결정됨! 강제로 안전모드로 수정")
-                            new_mode = "SF"
-                            current_mode = "SF"
-                            self.current_mode = "SF"
-                            week_modes[this_week_friday_str] = "SF"
+                    # 12/29~1/2 주차 강제 검증 및 수정
+                    if this_week_friday.date() >= datetime(2025, 12, 29).date() and this_week_friday.date() <= datetime(2026, 1, 2).date():
+                        self.logger.debug("🔍 [12/29~1/2 주차 강제 검증]")
+                        self.logger.debug("   이전 주차 모드: %s", actual_prev_week_mode)
+                        self.logger.debug("   결정된 모드: %s", new_mode)
+                        if actual_prev_week_mode == "SF":
+                            if new_mode != "SF":
+                                self.logger.debug("❌ CRITICAL: 이전 주차가 안전모드인데 이번 주가 공세모드로 결정됨! 강제로 안전모드로 수정")
+                                new_mode = "SF"
+                                current_mode = "SF"
+                                self.current_mode = "SF"
+                                week_modes[this_week_friday_str] = "SF"
+                            else:
+                                self.logger.debug("✅ 이전 주차가 안전모드이고 이번 주도 안전모드로 올바르게 결정됨")
                         else:
-                            print(f"✅ 이전 주차가 안전모드이고 이번 주도 안전모드로 올바르게 결정됨")
-                    else:
-                        print(f"⚠️ 이전 주차가 공세모드: {actual_prev_week_mode}")
+                            self.logger.debug("⚠️ 이전 주차가 공세모드: %s", actual_prev_week_mode)
                 
                 # 모드 변경 시 current_round 유지 (최대 회차만 변경)
                 
                 current_week += 1  # 주차 번호 증가 (0 → 1, 1 → 2, ...)
-                current_rsi_display = f"{current_week_rsi:.2f}" if current_week_rsi is not None else "None"
-                print(f"📅 주차 {current_week}: ~{this_week_friday.strftime('%m-%d')} | RSI: {current_rsi_display} | 모드: {current_mode} | self.current_mode: {self.current_mode}")
+                if debug:
+                    current_rsi_display = f"{current_week_rsi:.2f}" if current_week_rsi is not None else "None"
+                    self.logger.debug("📅 주차 %s: ~%s | RSI: %s | 모드: %s | self.current_mode: %s", current_week, this_week_friday.strftime('%m-%d'), current_rsi_display, current_mode, self.current_mode)
+                if record_events:
+                    self._record_backtest_event(current_date, "week", week=current_week, mode=current_mode, rsi=current_week_rsi)
             
             # 매매 실행 (전일 종가가 있는 경우만)
             if prev_close is not None:
@@ -4313,9 +4733,8 @@ class SOXLQuantTrader:
                 config = self.get_mode_config(current_mode, current_date, soxl_history_to_date)
                 
                 # 디버깅: 매매 실행 시점의 모드 확인
-                debug_mode_msg = f"🔍 {current_date.strftime('%Y-%m-%d')} 매매 실행 - 현재 주차 모드: {current_mode}"
-                print(debug_mode_msg)
-                self.backtest_logs.append(debug_mode_msg)
+                if debug:
+                    self.logger.debug("🔍 %s 매매 실행 - 현재 주차 모드: %s", current_date.strftime('%Y-%m-%d'), current_mode)
                 
 
                 # 매수/매도 가격 계산 (전일 종가 기준)
@@ -4324,17 +4743,17 @@ class SOXLQuantTrader:
                 
                 # 매도 조건 확인 및 실행
                 # 1월 13일 특별 디버깅
-                if current_date.strftime('%Y-%m-%d') == '2025-01-13':
-                    print(f"⚠️ 1월 13일 특별 디버깅 (매도 조건 확인 전):")
-                    print(f"   - 현재 포지션 수: {len(self.positions)}")
+                if debug and current_date.strftime('%Y-%m-%d') == '2025-01-13':
+                    self.logger.debug("⚠️ 1월 13일 특별 디버깅 (매도 조건 확인 전):")
+                    self.logger.debug("   - 현재 포지션 수: %s", len(self.positions))
                     if self.positions:
-                        print(f"   - 보유 포지션 목록:")
+                        self.logger.debug("   - 보유 포지션 목록:")
                         for pos in self.positions:
                             buy_date_str = pos['buy_date'].strftime('%Y-%m-%d') if isinstance(pos['buy_date'], (datetime, pd.Timestamp)) else str(pos['buy_date'])
                             pos_config = self.get_position_config(pos)
                             target_price = pos["buy_price"] * (1 + pos_config["sell_threshold"] / 100)
-                            print(f"      {pos['round']}회차: 매수일 {buy_date_str}, 모드 {pos.get('mode', 'N/A')}, 매수가 ${pos.get('buy_price', 0):.2f}, 목표가 ${target_price:.2f}")
-                            print(f"         당일 종가: ${row['Close']:.2f}, 매도 조건: {row['Close']:.2f} >= {target_price:.2f} = {row['Close'] >= target_price}")
+                            self.logger.debug("      %s회차: 매수일 %s, 모드 %s, 매수가 $%.2f, 목표가 $%.2f", pos['round'], buy_date_str, pos.get('mode', 'N/A'), pos.get('buy_price', 0), target_price)
+                            self.logger.debug("         당일 종가: $%.2f, 매도 조건: %.2f >= %.2f = %s", row['Close'], row['Close'], target_price, row['Close'] >= target_price)
                 
                 # ── 매수 회차를 매도 처리 전에 미리 결정 (보유 포지션 수 + 1) ──
                 # LOC 주문 특성상 매수/매도가 동시에 장 마감 시 체결되므로,
@@ -4344,14 +4763,14 @@ class SOXLQuantTrader:
                 sell_recommendations = self.check_sell_conditions(row, current_date, prev_close)
                 
                 # 1월 13일 특별 디버깅 (매도 조건 확인 후)
-                if current_date.strftime('%Y-%m-%d') == '2025-01-13':
-                    print(f"⚠️ 1월 13일 특별 디버깅 (매도 조건 확인 후):")
-                    print(f"   - 매도 추천 수: {len(sell_recommendations)}")
+                if debug and current_date.strftime('%Y-%m-%d') == '2025-01-13':
+                    self.logger.debug("⚠️ 1월 13일 특별 디버깅 (매도 조건 확인 후):")
+                    self.logger.debug("   - 매도 추천 수: %s", len(sell_recommendations))
                     if sell_recommendations:
                         for sell_info in sell_recommendations:
                             pos = sell_info["position"]
                             buy_date_str = pos['buy_date'].strftime('%Y-%m-%d') if isinstance(pos['buy_date'], (datetime, pd.Timestamp)) else str(pos['buy_date'])
-                            print(f"      매도 추천: {pos['round']}회차 (매수일: {buy_date_str}), 사유: {sell_info['reason']}, 매도가: ${sell_info['sell_price']:.2f}")
+                            self.logger.debug("      매도 추천: %s회차 (매수일: %s), 사유: %s, 매도가: $%.2f", pos['round'], buy_date_str, sell_info['reason'], sell_info['sell_price'])
 
                 daily_realized = 0
                 sell_date = ""
@@ -4387,12 +4806,18 @@ class SOXLQuantTrader:
 
                         "realized_pnl": realized_pnl
                     })
+                    if record_events:
+                        self._record_backtest_event(
+                            current_date, "sell",
+                            round=sold_round, shares=position["shares"],
+                            price=sell_info["sell_price"], realized_pnl=realized_pnl,
+                        )
                 
                 # 매도 후 current_round를 매도 전 미리 결정한 값으로 설정
                 # (매수와 매도는 LOC로 동시에 체결되므로, 매도 전 보유 수 기준)
                 if sold_rounds:
                     self.current_round = buy_round_for_today
-                    print(f"🔄 매도 발생: {len(sold_rounds)}건 매도 → 매수 회차는 매도 전 기준 유지: {self.current_round}회차")
+                    self.logger.debug("🔄 매도 발생: %s건 매도 → 매수 회차는 매도 전 기준 유지: %s회차", len(sold_rounds), self.current_round)
                 
                 # 매수 조건 확인 및 실행
                 # 스냅샷 기반이든 아니든 동일하게 LOC 매수 조건 충족 시 자동 체결 처리
@@ -4414,31 +4839,34 @@ class SOXLQuantTrader:
                     daily_close = row['Close']
                     
                     # 디버깅: 매수 조건 확인
-                    log_msg = f"🔍 {current_date.strftime('%Y-%m-%d')} 매수 조건 확인:\n"
-                    log_msg += f"   전일 종가(prev_close): ${prev_close:.2f}\n"
-                    log_msg += f"   당일 종가(daily_close): ${daily_close:.2f}\n"
-                    log_msg += f"   매수가(buy_price): ${buy_price:.2f} = prev_close * {1 + config['buy_threshold'] / 100}\n"
-                    log_msg += f"   매수 조건: 매수가 > 종가 = {buy_price:.2f} > {daily_close:.2f} = {buy_price > daily_close}\n"
-                    log_msg += f"   현재 회차: {self.current_round}, 현금잔고: ${self.available_cash:,.0f}"
-                    
-                    print(log_msg)
-                    self.backtest_logs.append(log_msg)
+                    if debug:
+                        self.logger.debug(
+                            "🔍 %s 매수 조건 확인:\n"
+                            "   전일 종가(prev_close): $%.2f\n"
+                            "   당일 종가(daily_close): $%.2f\n"
+                            "   매수가(buy_price): $%.2f = prev_close * %s\n"
+                            "   매수 조건: 매수가 > 종가 = %.2f > %.2f = %s\n"
+                            "   현재 회차: %s, 현금잔고: $%s",
+                            current_date.strftime('%Y-%m-%d'), prev_close, daily_close,
+                            buy_price, 1 + config['buy_threshold'] / 100,
+                            buy_price, daily_close, buy_price > daily_close,
+                            self.current_round, f"{self.available_cash:,.0f}",
+                        )
                     
                     if buy_price > daily_close:
-                        success_msg = f"✅ 매수 조건 충족! 매수 실행 시도..."
-                        print(success_msg)
-                        self.backtest_logs.append(success_msg)
+                        self.logger.debug("✅ 매수 조건 충족! 매수 실행 시도...")
                         
                         # 매수 실행 전 모드 확인 및 검증
                         mode_before_buy = current_mode
                         if current_mode != self.current_mode:
-                            print(f"⚠️ 매수 전 모드 불일치 감지! current_mode={current_mode}, self.current_mode={self.current_mode}")
-                            print(f"   → current_mode를 self.current_mode로 동기화")
+                            self.logger.debug("⚠️ 매수 전 모드 불일치 감지! current_mode=%s, self.current_mode=%s", current_mode, self.current_mode)
+                            self.logger.debug("   → current_mode를 self.current_mode로 동기화")
                             # 강제로 동기화 (self.current_mode가 더 최신일 수 있음)
                             current_mode = self.current_mode
                         
                         # 매수 시점의 모드 로그 (디버깅)
-                        print(f"🔍 매수 실행 전: 날짜={current_date.strftime('%Y-%m-%d')}, 주차 모드={current_mode}, self.current_mode={self.current_mode}")
+                        if debug:
+                            self.logger.debug("🔍 매수 실행 전: 날짜=%s, 주차 모드=%s, self.current_mode=%s", current_date.strftime('%Y-%m-%d'), current_mode, self.current_mode)
                         
                         self._active_buy_config = config.copy()
                         try:
@@ -4446,9 +4874,7 @@ class SOXLQuantTrader:
                         finally:
                             self._active_buy_config = None
                         if buy_success:  # 목표가 기준 수량으로 계산하여 종가에 매수, 매수 시점의 모드 전달
-                            exec_msg = f"✅ 매수 체결 성공! (모드: {current_mode})"
-                            print(exec_msg)
-                            self.backtest_logs.append(exec_msg)
+                            self.logger.debug("✅ 매수 체결 성공! (모드: %s)", current_mode)
                             
                             buy_executed = True
                             position = self.positions[-1]
@@ -4459,17 +4885,21 @@ class SOXLQuantTrader:
                             # 디버깅: 저장된 모드 확인 및 검증
                             stored_mode = position.get("mode", "N/A")
                             if stored_mode != current_mode:
-                                error_msg = f"❌ CRITICAL: 모드 불일치 감지! 매수일={current_date.strftime('%Y-%m-%d')}, 전달된 모드={current_mode}, 저장된 모드={stored_mode}"
-                                print(error_msg)
-                                self.backtest_logs.append(error_msg)
+                                self.logger.warning("❌ CRITICAL: 모드 불일치 감지! 매수일=%s, 전달된 모드=%s, 저장된 모드=%s", current_date.strftime('%Y-%m-%d'), current_mode, stored_mode)
                                 # 강제로 올바른 모드로 수정
                                 position["mode"] = current_mode
                                 self.positions[-1]["mode"] = current_mode
-                                print(f"🔧 모드 수정 완료: {stored_mode} → {current_mode}")
-                            else:
-                                print(f"✅ 모드 일치 확인: 매수일={current_date.strftime('%Y-%m-%d')}, 모드={stored_mode}")
+                                self.logger.debug("🔧 모드 수정 완료: %s → %s", stored_mode, current_mode)
+                            elif debug:
+                                self.logger.debug("✅ 모드 일치 확인: 매수일=%s, 모드=%s", current_date.strftime('%Y-%m-%d'), stored_mode)
                             total_invested += buy_amount
                             cash_balance -= buy_amount
+                            if record_events:
+                                self._record_backtest_event(
+                                    current_date, "buy",
+                                    round=current_round_before_buy, shares=buy_quantity,
+                                    price=buy_price_executed, amount=buy_amount, mode=current_mode,
+                                )
                             
                             # 매수 체결 시 매도목표가 재계산 (매수체결된 날의 종가 기준)
                             sell_price = daily_close * (1 + config["sell_threshold"] / 100)
@@ -4478,17 +4908,11 @@ class SOXLQuantTrader:
                             sell_date = ""
                             sell_executed_price = 0
                         else:
-                            fail_msg = f"❌ 매수 실행 실패 (execute_buy returned False)"
-                            print(fail_msg)
-                            self.backtest_logs.append(fail_msg)
+                            self.logger.debug("❌ 매수 실행 실패 (execute_buy returned False)")
                     else:
-                        nocond_msg = f"❌ 매수 조건 불충족: 매수가 <= 종가 ({buy_price:.2f} <= {daily_close:.2f})"
-                        print(nocond_msg)
-                        self.backtest_logs.append(nocond_msg)
+                        self.logger.debug("❌ 매수 조건 불충족: 매수가 <= 종가 (%.2f <= %.2f)", buy_price, daily_close)
                 else:
-                    nobuy_msg = f"❌ 매수 불가능: can_buy_next_round() = False"
-                    print(nobuy_msg)
-                    self.backtest_logs.append(nobuy_msg)
+                    self.logger.debug("❌ 매수 불가능: can_buy_next_round() = False")
                 
                 # 일일 처리 완료 후 다음 날을 위한 current_round 재계산
                 # 보유 N개 → 다음 N+1회차, 보유 0개 → 1회차부터 다시 (전량 매도 후 회차 리셋)
@@ -4497,7 +4921,7 @@ class SOXLQuantTrader:
                 else:
                     self.current_round = 1
                 if sold_rounds:
-                    print(f"🔄 일일 처리 완료 (매도 {len(sold_rounds)}건): 보유 {len(self.positions)}개 → 다음 날 매수 회차: {self.current_round}")
+                    self.logger.debug("🔄 일일 처리 완료 (매도 %s건): 보유 %s개 → 다음 날 매수 회차: %s", len(sold_rounds), len(self.positions), self.current_round)
                 
                 # 10거래일마다 투자원금 업데이트 (매매 처리 완료 후 실행)
                 # 매수추천 시점의 투자원금과 백테스트 실제 매수 시 투자원금이 동일하도록
@@ -4511,7 +4935,8 @@ class SOXLQuantTrader:
                     old_capital = self.current_investment_capital
                     self.current_investment_capital = total_assets_for_update
                     
-                    print(f"💰 투자원금 업데이트: {self.trading_days_count}거래일째 - ${old_capital:,.0f} → ${total_assets_for_update:,.0f}")
+                    if debug:
+                        self.logger.debug("💰 투자원금 업데이트: %s거래일째 - $%s → $%s", self.trading_days_count, f"{old_capital:,.0f}", f"{total_assets_for_update:,.0f}")
                 
                 # 현재 보유 주식수와 평가손익 계산
                 total_shares = sum([pos["shares"] for pos in self.positions])
@@ -4614,7 +5039,7 @@ class SOXLQuantTrader:
                                         )
                                         
                                     except Exception as e:
-                                        print(f"⚠️ 보유기간 계산 오류: {e}")
+                                        self.logger.debug("⚠️ 보유기간 계산 오류: %s", e)
                                         record['holding_days'] = 0
                                     
                                     record['sell_date'] = sold_pos["sell_date"]
@@ -4626,19 +5051,33 @@ class SOXLQuantTrader:
             
             # 진행상황 출력
             if (i + 1) % 10 == 0:
-                print(f"진행: {i+1}/{len(soxl_backtest)}일 ({(i+1)/len(soxl_backtest)*100:.1f}%)")
+                self.logger.debug("진행: %s/%s일 (%.1f%%)", i+1, len(soxl_backtest), (i+1)/len(soxl_backtest)*100)
 
             
             prev_close = current_price
-        
-        # 최종 결과 계산
-        
+
+        return self._finish_backtest(start_date, end_date, len(soxl_backtest), daily_records)
+
+    def _use_array_engine(self, engine: Optional[str] = None) -> bool:
+        """배열 엔진 사용 여부 (엔진 규칙이 전제하는 메서드가 재정의되어 있으면 legacy 루프)"""
+        engine = engine or self.BACKTEST_ENGINE
+        if engine not in ("array", "legacy"):
+            raise ValueError(f"지원하지 않는 백테스트 엔진입니다: {engine}")
+        if engine == "legacy":
+            return False
+        return all(
+            getattr(type(self), name) is getattr(SOXLQuantTrader, name)
+            for name in self._ARRAY_ENGINE_HOOKS
+        )
+
+    def _finish_backtest(self, start_date: str, end_date: Optional[str], trading_days: int, daily_records: List[Dict]) -> Dict:
+        """일별 루프 이후 공통 마무리: 다음 회차/투자원금 정리와 결과 요약 생성"""
         # 백테스팅 완료 후 current_round를 올바르게 설정 (보유 N개 → 다음 N+1회차, 0개 → 1회차)
         if self.positions:
             self.current_round = len(self.positions) + 1
         else:
             self.current_round = 1
-        print(f"🔄 백테스팅 완료 후 current_round 설정: 보유 {len(self.positions)}개 → 다음 매수 {self.current_round}회차")
+        self.logger.debug("🔄 백테스팅 완료 후 current_round 설정: 보유 %s개 → 다음 매수 %s회차", len(self.positions), self.current_round)
 
         final_value = daily_records[-1]["total_assets"] if daily_records else self.initial_capital
         # 마지막 거래일이 10거래일 갱신일이 아니어도, 1회시드·추천은 최종 총자산(입금+수익) 기준으로 맞춤
@@ -4660,7 +5099,7 @@ class SOXLQuantTrader:
             "start_date": start_date,
             "end_date": end_date or datetime.now().strftime("%Y-%m-%d"),
 
-            "trading_days": len(soxl_backtest),
+            "trading_days": trading_days,
             "initial_capital": self.initial_capital,
             "seed_increases_total": seed_total,
             "capital_basis": capital_basis,
@@ -4679,33 +5118,33 @@ class SOXLQuantTrader:
             "compound_reference_seed": getattr(self, "compound_reference_seed", None),
 
             "daily_records": daily_records,
-            "logs": self.backtest_logs if hasattr(self, 'backtest_logs') else []
+            "logs": self.backtest_events
         }
 
-        
-        # MDD 계산 및 출력
-        mdd_info = self.calculate_mdd(daily_records)
-        
-        print("✅ 백테스팅 완료!")
-
-        print(f"\n📊 백테스팅 결과 요약:")
-        print(f"   📅 기간: {start_date} ~ {end_date or datetime.now().strftime('%Y-%m-%d')}")
-        print(f"   💰 초기자본: ${self.initial_capital:,.0f}")
-        if seed_total:
-            print(f"   💰 시드증액(순): ${seed_total:,.0f} → 투입원금 합계: ${capital_basis:,.0f}")
-        print(f"   💰 최종자산: ${final_value:,.0f}")
-        print(f"   📈 총수익률 (초기자본만 기준): {total_return:+.2f}%")
-        if seed_total:
-            print(f"   📈 총수익률 (초기+시드 투입 합계 기준): {total_return_on_capital_basis:+.2f}%")
-        print(f"   📦 최종보유포지션: {len(self.positions)}개")
-        print(f"\n⚠️ 리스크 지표:")
-        print(f"   📉 MDD (최대낙폭): {mdd_info.get('mdd_percent', 0.0):.2f}%")
-        print(f"   📅 MDD 발생일: {mdd_info.get('mdd_date', '')}")
-        print(f"   💰 최저자산: ${mdd_info.get('mdd_value', 0.0):,.0f}")
-        print(f"   📅 MDD 발생 최고자산일: {mdd_info.get('mdd_peak_date', '')}")
-        print(f"   📅 최고자산일: {mdd_info.get('overall_peak_date', '')}")
-        print(f"   💰 최고자산: ${mdd_info.get('overall_peak_value', 0.0):,.0f}")
-        
+
+        # 결과 요약 로그 (info 로그가 꺼져 있으면 MDD 계산과 포맷팅을 생략)
+        if self.logger.isEnabledFor(logging.INFO):
+            mdd_info = self.calculate_mdd(daily_records)
+            log = self.logger.info
+            log('✅ 백테스팅 완료!')
+            log("\n📊 백테스팅 결과 요약:")
+            log("   📅 기간: %s ~ %s", start_date, end_date or datetime.now().strftime('%Y-%m-%d'))
+            log("   💰 초기자본: $%s", f"{self.initial_capital:,.0f}")
+            if seed_total:
+                log("   💰 시드증액(순): $%s → 투입원금 합계: $%s", f"{seed_total:,.0f}", f"{capital_basis:,.0f}")
+            log("   💰 최종자산: $%s", f"{final_value:,.0f}")
+            log("   📈 총수익률 (초기자본만 기준): %+.2f%%", total_return)
+            if seed_total:
+                log("   📈 총수익률 (초기+시드 투입 합계 기준): %+.2f%%", total_return_on_capital_basis)
+            log("   📦 최종보유포지션: %s개", len(self.positions))
+            log("\n⚠️ 리스크 지표:")
+            log("   📉 MDD (최대낙폭): %.2f%%", mdd_info.get('mdd_percent', 0.0))
+            log("   📅 MDD 발생일: %s", mdd_info.get('mdd_date', ''))
+            log("   💰 최저자산: $%s", f"{mdd_info.get('mdd_value', 0.0):,.0f}")
+            log("   📅 MDD 발생 최고자산일: %s", mdd_info.get('mdd_peak_date', ''))
+            log("   📅 최고자산일: %s", mdd_info.get('overall_peak_date', ''))
+            log("   💰 최고자산: $%s", f"{mdd_info.get('overall_peak_value', 0.0):,.0f}")
+
         return summary
     
 
@@ -4718,66 +5157,13 @@ class SOXLQuantTrader:
     
     def calculate_mdd(self, daily_records: List[Dict]) -> Dict:
         """
-        MDD (Maximum Drawdown) 계산
+        MDD (Maximum Drawdown) 계산 (performance_metrics.mdd_info)
         Args:
             daily_records: 일별 백테스팅 기록
         Returns:
-            Dict: MDD 정보
+            Dict: MDD 정보 (mdd_percent, mdd_date, mdd_value, mdd_peak_date, overall_peak_date, overall_peak_value)
         """
-        if not daily_records:
-            return {
-                "mdd_percent": 0.0, 
-                "mdd_date": "", 
-                "mdd_value": 0.0, 
-                "mdd_peak_date": "",  # MDD 계산 시점의 최고자산일
-                "overall_peak_date": "",  # 전체 기간 최고자산일
-                "overall_peak_value": 0.0  # 전체 기간 최고자산
-            }
-        
-        max_assets = 0.0
-        max_drawdown = 0.0
-        mdd_peak_date = ""  # MDD 계산 시점의 최고자산일
-        mdd_date = ""
-        mdd_value = 0.0
-        
-        # 전체 기간 최고자산 추적
-        overall_max_assets = 0.0
-        overall_peak_date = ""
-        
-        # MDD 계산용 변수들
-        current_peak_assets = 0.0
-        current_peak_date = ""
-        
-        for record in daily_records:
-            current_assets = record.get('total_assets', 0.0)
-            
-            # 전체 기간 최고자산 갱신
-            if current_assets > overall_max_assets:
-                overall_max_assets = current_assets
-                overall_peak_date = record.get('date', '')
-            
-            # 새로운 최고자산 갱신 (MDD 계산용)
-            if current_assets > current_peak_assets:
-                current_peak_assets = current_assets
-                current_peak_date = record.get('date', '')
-            
-            # 현재 자산이 현재 최고자산보다 낮으면 낙폭 계산
-            if current_peak_assets > 0:
-                drawdown = (current_peak_assets - current_assets) / current_peak_assets * 100
-                if drawdown > max_drawdown:
-                    max_drawdown = drawdown
-                    mdd_date = record.get('date', '')
-                    mdd_value = current_assets
-                    mdd_peak_date = current_peak_date  # MDD 발생 시점의 기준 최고자산일
-        
-        return {
-            "mdd_percent": max_drawdown,
-            "mdd_date": mdd_date,
-            "mdd_value": mdd_value,
-            "mdd_peak_date": mdd_peak_date,  # MDD 계산 시점의 최고자산일
-            "overall_peak_date": overall_peak_date,  # 전체 기간 최고자산일
-            "overall_peak_value": overall_max_assets  # 전체 기간 최고자산
-        }
+        return mdd_info(daily_records)
     
     def export_backtest_to_excel(self, backtest_result: Dict, filename: str = None):
         """
@@ -4787,7 +5173,7 @@ class SOXLQuantTrader:
             filename: 파일명 (None이면 자동 생성)
         """
         if "error" in backtest_result:
-            print(f"❌ 엑셀 내보내기 실패: {backtest_result['error']}")
+            self.logger.error("❌ 엑셀 내보내기 실패: %s", backtest_result['error'])
             return
         
         if filename is None:
@@ -5090,14 +5476,16 @@ class SOXLQuantTrader:
         # 파일 저장
         try:
             wb.save(filename)
-            print(f"✅ 백테스팅 결과가 엑셀 파일로 저장되었습니다: {filename}")
+            self.logger.info("✅ 백테스팅 결과가 엑셀 파일로 저장되었습니다: %s", filename)
             return filename
         except Exception as e:
-            print(f"❌ 엑셀 파일 저장 실패: {e}")
+            self.logger.error("❌ 엑셀 파일 저장 실패: %s", e)
             return None
 
 def main():
     """메인 실행 함수"""
+    # 시뮬레이션 요약은 info, 일별 진행 로그는 debug (SOXL_LOG_LEVEL=DEBUG로 전체 출력)
+    logging.basicConfig(level=os.environ.get("SOXL_LOG_LEVEL", "INFO").upper(), format="%(message)s")
     print("🚀 SOXL 퀀트투자 시스템")
     print("=" * 50)
     
@@ -0,0 +1,92 @@
+"""
+백테스트 테스트 공용 픽스처
+
+합성 일봉(SOXL/QQQ), 그 QQQ로 계산한 주간 RSI 참조 데이터, 네트워크 없이 만드는 트레이더와
+고정 데이터로 돌리는 백테스트 도우미를 모아둔다. 테스트 모듈은 서로를 import하지 않고 여기서 가져온다.
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from rsi_reference import compute_completed_weeks, weekly_closes
+from soxl_quant_system import SOXLQuantTrader
+
+
+def bars(seed, vol, start="2022-06-01", end="2025-12-31"):
+    """영업일 기준 로그정규 종가 일봉 (Open/High/Low = Close)"""
+    index = pd.bdate_range(start, end, name="Date")
+    rng = np.random.default_rng(seed)
+    close = 20 * np.exp(np.cumsum(rng.normal(0.0005, vol, len(index))))
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0}, index=index)
+
+
+def weekly_reference(qqq, first_day=date(2022, 9, 1), last_day=date(2025, 12, 26)):
+    """QQQ 일봉의 완료 주차로 만든 RSI 참조 데이터 (weekly_rsi_reference.json 형식)"""
+    data = {}
+    for week in compute_completed_weeks(weekly_closes(qqq), first_day, last_day):
+        data.setdefault(week["end"][:4], {"description": "주간 RSI", "weeks": []})["weeks"].append(week)
+    data["metadata"] = {}
+    return data
+
+
+SOXL = bars(1, 0.05)
+QQQ = bars(2, 0.012)
+REFERENCE = weekly_reference(QQQ)
+
+# 전체 이력 비교용 15년 일봉 (SOXL 상장 직후 ~ 2025년, 약 3,900봉)
+FULL_SOXL = bars(11, 0.05, start="2010-03-01")
+FULL_QQQ = bars(12, 0.012, start="2010-03-01")
+
+
+def full_reference():
+    return weekly_reference(FULL_QQQ, first_day=date(2010, 6, 1))
+
+
+def make_trader(cls=SOXLQuantTrader, compounding=False):
+    """RSI 갱신 없이 만든 40,000달러 트레이더 (2024-03-09 시드 10,000달러 증액)"""
+    with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+        trader = cls(initial_capital=40_000)
+    with trader.quiet_logging():
+        if compounding:
+            trader.set_profit_loss_compounding(enabled=True)
+        trader.add_seed_increase("2024-03-09", 10_000)
+    return trader
+
+
+def run_backtest(trader, engine, start="2023-01-03", end="2025-12-26", **kwargs):
+    """SOXL/QQQ/REFERENCE 고정 데이터로 백테스트 (결과의 logs는 제외)"""
+    with patch.object(trader, "get_many", return_value={"SOXL": SOXL, "QQQ": QQQ}), \
+            patch.object(trader, "load_rsi_reference_data", return_value=REFERENCE), \
+            trader.quiet_logging():
+        result = trader.run_backtest(start, end, engine=engine, **kwargs)
+    result.pop("logs", None)
+    return result
+
+
+def run_full_history(engine, reference):
+    """FULL_SOXL/FULL_QQQ로 2011~2025년 백테스트 (복리, 2018-06-01 시드 20,000달러 추가 증액)"""
+    trader = make_trader(compounding=True)
+    trader.add_seed_increase("2018-06-01", 20_000)
+    with patch.object(trader, "get_many", return_value={"SOXL": FULL_SOXL, "QQQ": FULL_QQQ}), \
+            patch.object(trader, "load_rsi_reference_data", return_value=reference), \
+            trader.quiet_logging():
+        result = trader.run_backtest("2011-01-03", "2025-12-26", engine=engine)
+    result.pop("logs", None)
+    return trader, result
+
+
+def trader_state(trader):
+    """엔진 간 비교용 트레이더 포트폴리오·모드·복리 상태"""
+    return (
+        trader.positions,
+        trader.available_cash,
+        trader.current_round,
+        trader.current_investment_capital,
+        trader.processed_seed_dates,
+        trader.current_mode,
+        trader.compound_seed,
+        trader.compound_settlements,
+    )
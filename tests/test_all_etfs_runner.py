@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch
+
+from backtester_all_etfs import run_etf_backtests
+from backtester_any_ticker import AnyTickerQuantTrader
+from soxl_quant_system import SOXLQuantTrader
+from backtest_fixtures import QQQ, REFERENCE, SOXL
+
+SF = {"buy_threshold": 3.5, "sell_threshold": 1.4, "max_hold_days": 35, "split_count": 7,
+      "split_ratios": [0.049, 0.127, 0.230, 0.257, 0.028, 0.169, 0.140]}
+AG = {"buy_threshold": 3.6, "sell_threshold": 3.5, "max_hold_days": 7, "split_count": 8,
+      "split_ratios": [0.062, 0.134, 0.118, 0.148, 0.150, 0.182, 0.186, 0.020]}
+ETFS = [
+    {"ticker": "AAA", "name": "Alpha 3X", "leverage": "3x", "direction": "Bull", "category": "지수"},
+    {"ticker": "BBB", "name": "Beta 3X", "leverage": "3x", "direction": "Bull", "category": "섹터"},
+    {"ticker": "EMPTY", "name": "Empty 2X", "leverage": "2x", "direction": "Bear", "category": "지수"},
+]
+BARS = {"AAA": SOXL, "BBB": SOXL * 1.5, "EMPTY": SOXL.iloc[:0]}
+
+
+def _run(max_workers, mode_timeline=None):
+    seen = []
+    with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+        results = run_etf_backtests(
+            ETFS, "2025-01-02", "2025-12-26", 40_000, SF, AG,
+            bars=BARS, qqq_data=QQQ, rsi_reference=REFERENCE, mode_timeline=mode_timeline,
+            max_workers=max_workers, on_result=lambda etf, ok, row: seen.append((etf["ticker"], ok)),
+        )
+    return results, seen
+
+
+class ETFRunnerTests(unittest.TestCase):
+    def test_sequential_run_uses_injected_bars_and_reference(self):
+        (success, failed), seen = _run(max_workers=1)
+
+        self.assertEqual(seen, [("AAA", True), ("BBB", True), ("EMPTY", False)])
+        self.assertEqual([row["ticker"] for row in failed], ["EMPTY"])
+        self.assertEqual(
+            [row["total_return"] for row in success],
+            sorted((row["total_return"] for row in success), reverse=True),
+        )
+
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            trader = AnyTickerQuantTrader("AAA", initial_capital=40_000, sf_config=SF, ag_config=AG)
+        with patch.object(trader, "get_many", return_value={"SOXL": SOXL, "QQQ": QQQ}), \
+                patch.object(trader, "load_rsi_reference_data", return_value=REFERENCE), \
+                trader.quiet_logging():
+            expected = trader.run_backtest("2025-01-02", "2025-12-26")
+        row = next(row for row in success if row["ticker"] == "AAA")
+        self.assertEqual(row["final_value"], round(expected["final_value"], 2))
+
+    def test_process_pool_matches_sequential_run(self):
+        (expected, expected_failed), _ = _run(max_workers=1)
+        (actual, actual_failed), seen = _run(max_workers=2)
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual_failed, expected_failed)
+        self.assertCountEqual(seen, [("AAA", True), ("BBB", True), ("EMPTY", False)])
+
+    def test_shared_mode_timeline_gives_same_report(self):
+        (expected, _), _ = _run(max_workers=1)
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            timeline = SOXLQuantTrader(initial_capital=40_000).build_mode_timeline(REFERENCE)
+
+        (actual, _), _ = _run(max_workers=2, mode_timeline=timeline)
+
+        self.assertEqual(actual, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
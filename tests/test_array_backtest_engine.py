@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+
+from backtest_engine import ArrayBacktestEngine, PositionBook
+from backtest_fixtures import full_reference, make_trader, run_backtest, run_full_history, trader_state
+from performance_metrics import mdd_info
+from soxl_quant_system import SOXLQuantTrader
+
+
+class _DateVariantTrader(SOXLQuantTrader):
+    def get_mode_config(self, mode, current_date=None, soxl_history=None):
+        return super().get_mode_config(mode, current_date, soxl_history)
+
+
+class ArrayEngineEquivalenceTests(unittest.TestCase):
+    def _assert_same(self, compounding=False, **kwargs):
+        legacy, array = make_trader(compounding=compounding), make_trader(compounding=compounding)
+        expected = run_backtest(legacy, "legacy", **kwargs)
+        actual = run_backtest(array, "array", **kwargs)
+
+        self.assertNotIn("error", expected)
+        self.assertEqual(actual, expected)
+        self.assertEqual(trader_state(array), trader_state(legacy))
+        return actual
+
+    def test_daily_records_match_legacy_loop(self):
+        result = self._assert_same()
+        records = result["daily_records"]
+        self.assertTrue(any(record["sell_date"] for record in records))
+        self.assertTrue(any(record["seed_increase"] for record in records))
+
+    def test_compounding_matches_legacy_loop(self):
+        self._assert_same(compounding=True)
+
+    def test_snapshot_resume_matches_legacy_loop(self):
+        seed = make_trader()
+        run_backtest(seed, "legacy", end="2024-06-28")
+        positions = [dict(position) for position in seed.positions]
+
+        self._assert_same(
+            start="2024-07-01",
+            initial_positions=positions,
+            initial_cash=seed.available_cash,
+            snapshot_max_date="2024-06-28",
+        )
+
+
+class FullHistoryComparisonTests(unittest.TestCase):
+    """기본 엔진(array) 근거: 전체 이력 실행에서 legacy와 같은 결과 (실행 시간은 benchmark_backtest_engine.py)"""
+
+    def test_full_history_matches_legacy(self):
+        reference = full_reference()
+        legacy_trader, expected = run_full_history("legacy", reference)
+        array_trader, actual = run_full_history("array", reference)
+
+        self.assertNotIn("error", expected)
+        self.assertGreater(len(expected["daily_records"]), 3_500)
+        self.assertEqual(actual["final_value"], expected["final_value"])
+        self.assertEqual(
+            [record for record in actual["daily_records"] if record["sell_date"]],
+            [record for record in expected["daily_records"] if record["sell_date"]],
+        )
+        self.assertEqual(mdd_info(actual["daily_records"]), mdd_info(expected["daily_records"]))
+        self.assertEqual(actual, expected)
+        self.assertEqual(trader_state(array_trader), trader_state(legacy_trader))
+
+
+class EngineSelectionTests(unittest.TestCase):
+    def test_overridden_hook_falls_back_to_legacy_loop(self):
+        self.assertTrue(make_trader()._use_array_engine())
+        self.assertFalse(make_trader()._use_array_engine("legacy"))
+        self.assertFalse(make_trader(_DateVariantTrader)._use_array_engine())
+
+        trader = make_trader(_DateVariantTrader)
+        with patch.object(ArrayBacktestEngine, "run") as mock_run:
+            run_backtest(trader, None)
+        mock_run.assert_not_called()
+
+    def test_unknown_engine_is_rejected(self):
+        with self.assertRaises(ValueError):
+            make_trader()._use_array_engine("fast")
+
+
+class PositionBookTests(unittest.TestCase):
+    def test_exits_in_holding_order_and_remove_keeps_columns_aligned(self):
+        positions = [{"round": 1}, {"round": 2}, {"round": 3}]
+        book = PositionBook(positions, capacity=2)
+        for target, stop in ((10.0, 900), (12.0, 800), (13.0, 1000)):
+            book.track(target, stop)
+
+        # 1회차는 목표가 도달, 2회차는 손절예정일 경과, 3회차는 보유 유지
+        exits = book.exits(close=11.0, ordinal=850)
+        self.assertEqual(exits.tolist(), [0, 1])
+
+        book.remove(exits)
+        self.assertEqual(positions, [{"round": 3}])
+        self.assertEqual(book.exits(close=12.0, ordinal=999).tolist(), [])
+        self.assertEqual(book.exits(close=13.0, ordinal=0).tolist(), [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import backtest_kernel
+from backtest_fixtures import bars, make_trader, weekly_reference
+from backtest_kernel import (
+    NUMBA_AVAILABLE,
+    TRADE_COLUMNS,
+    CompoundingParams,
+    mode_codes,
+    mode_params,
+    run_kernel,
+    run_kernel_batch,
+    session_counts,
+)
+from us_market_calendar import is_us_equity_trading_day
+
+
+SOXL = bars(3, 0.05)
+QQQ = bars(4, 0.012)
+REFERENCE = weekly_reference(QQQ)
+
+
+def _engine_run(compounding):
+    trader = make_trader(compounding=compounding)
+    with patch.object(trader, "get_many", return_value={"SOXL": SOXL, "QQQ": QQQ}), \
+            patch.object(trader, "load_rsi_reference_data", return_value=REFERENCE), \
+            trader.quiet_logging():
+        result = trader.run_backtest("2023-01-03", "2025-12-26")
+    return trader, result["daily_records"]
+
+
+def _kernel_run(trader, records, compounding, use_numba=None):
+    days = [date.fromisoformat(record["date"]) for record in records]
+    closes = SOXL["Close"].loc[pd.DatetimeIndex([record["date"] for record in records])].to_numpy()
+    return run_kernel(
+        closes,
+        mode_codes([record["mode"] for record in records]),
+        session_counts(days),
+        mode_params(trader.sf_config, trader.ag_config),
+        initial_cash=40_000,
+        prev_close=float(SOXL["Close"][SOXL.index < pd.Timestamp(days[0])].iloc[-1]),
+        trading=np.array([is_us_equity_trading_day(day) for day in days]),
+        ordinals=np.array([day.toordinal() for day in days]),
+        injections=np.array([record["seed_increase"] for record in records], dtype=float),
+        compounding=CompoundingParams() if compounding else None,
+        use_numba=use_numba,
+    )
+
+
+class KernelEquivalenceTests(unittest.TestCase):
+    def _assert_matches_engine(self, compounding):
+        trader, records = _engine_run(compounding)
+        equity, trades = _kernel_run(trader, records, compounding)
+
+        np.testing.assert_array_equal(equity, [record["total_assets"] for record in records])
+        sold_rows = [record for record in records if record["sell_date"]]
+        self.assertEqual(len(trades), len(sold_rows))
+        self.assertEqual(trades.shape[1], len(TRADE_COLUMNS))
+        pnl = trades[:, TRADE_COLUMNS.index("realized_pnl")]
+        self.assertAlmostEqual(pnl.sum(), sum(record["realized_pnl"] for record in sold_rows), places=6)
+        return trader, records, equity
+
+    def test_equity_matches_array_engine(self):
+        self._assert_matches_engine(compounding=False)
+
+    def test_equity_matches_array_engine_with_compounding(self):
+        self._assert_matches_engine(compounding=True)
+
+    @unittest.skipUnless(NUMBA_AVAILABLE, "numba 미설치")
+    def test_compiled_kernel_matches_python_fallback(self):
+        trader, records = _engine_run(False)
+        compiled, _ = _kernel_run(trader, records, False, use_numba=True)
+        python, _ = _kernel_run(trader, records, False, use_numba=False)
+        np.testing.assert_array_equal(compiled, python)
+
+
+class KernelBatchTests(unittest.TestCase):
+    def test_batch_rows_match_single_path_runs(self):
+        trader, records = _engine_run(True)
+        single, trades = _kernel_run(trader, records, True)
+        days = [date.fromisoformat(record["date"]) for record in records]
+        closes = SOXL["Close"].loc[pd.DatetimeIndex([record["date"] for record in records])].to_numpy()
+        prev_close = float(SOXL["Close"][SOXL.index < pd.Timestamp(days[0])].iloc[-1])
+
+        equity, trade_counts = run_kernel_batch(
+            np.vstack([closes, closes * 1.5]),
+            mode_codes([record["mode"] for record in records]),
+            session_counts(days),
+            mode_params(trader.sf_config, trader.ag_config),
+            initial_cash=40_000,
+            prev_close=[prev_close, prev_close * 1.5],
+            trading=np.array([is_us_equity_trading_day(day) for day in days]),
+            ordinals=np.array([day.toordinal() for day in days]),
+            injections=np.array([record["seed_increase"] for record in records], dtype=float),
+            compounding=CompoundingParams(),
+        )
+
+        self.assertEqual(equity.shape, (2, len(records)))
+        np.testing.assert_array_equal(equity[0], single)
+        self.assertEqual(trade_counts[0], len(trades))
+
+    def test_batch_requires_two_dimensional_closes(self):
+        params = mode_params(*[{"buy_threshold": 1, "sell_threshold": 1, "max_hold_days": 1, "split_count": 1, "split_ratios": [1.0]}] * 2)
+        with self.assertRaises(ValueError):
+            run_kernel_batch(np.ones(3), np.zeros(3), np.arange(3), params, 1000)
+
+
+class KernelInputTests(unittest.TestCase):
+    def test_mode_params_pads_shorter_split_ratios(self):
+        sf = {"buy_threshold": 3.5, "sell_threshold": 1.4, "max_hold_days": 35, "split_count": 2, "split_ratios": [0.5, 0.5]}
+        ag = {"buy_threshold": 3.6, "sell_threshold": 3.5, "max_hold_days": 7, "split_count": 3, "split_ratios": [0.2, 0.3, 0.5]}
+
+        params = mode_params(sf, ag)
+
+        self.assertEqual(params.split_ratios.tolist(), [[0.5, 0.5, 0.0], [0.2, 0.3, 0.5]])
+        self.assertEqual(params.ratio_count.tolist(), [2, 3])
+
+    def test_compounding_requires_bar_dates(self):
+        params = mode_params(*[{"buy_threshold": 1, "sell_threshold": 1, "max_hold_days": 1, "split_count": 1, "split_ratios": [1.0]}] * 2)
+        with self.assertRaises(ValueError):
+            run_kernel(np.ones(3), np.zeros(3), np.arange(3), params, 1000, compounding=CompoundingParams())
+
+    def test_forcing_numba_without_it_raises(self):
+        params = mode_params(*[{"buy_threshold": 1, "sell_threshold": 1, "max_hold_days": 1, "split_count": 1, "split_ratios": [1.0]}] * 2)
+        with patch.object(backtest_kernel, "NUMBA_AVAILABLE", False):
+            with self.assertRaises(RuntimeError):
+                run_kernel(np.ones(3), np.zeros(3), np.arange(3), params, 1000, use_numba=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
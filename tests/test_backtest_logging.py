@@ -0,0 +1,81 @@
+import io
+import logging
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from backtest_fixtures import QQQ, REFERENCE, SOXL, make_trader
+
+LOGGER = "soxl_quant_system"
+
+
+def _run(trader, engine, start="2023-01-03", end="2025-12-26"):
+    with patch.object(trader, "get_many", return_value={"SOXL": SOXL, "QQQ": QQQ}), \
+            patch.object(trader, "load_rsi_reference_data", return_value=REFERENCE):
+        return trader.run_backtest(start, end, engine=engine)
+
+
+class QuietLoggingTests(unittest.TestCase):
+    def test_quiet_simulation_creates_no_log_records(self):
+        for engine in ("legacy", "array"):
+            trader = make_trader()
+            with self.subTest(engine=engine), self.assertNoLogs(LOGGER, level=logging.DEBUG), \
+                    patch.object(trader, "calculate_mdd") as mock_mdd, trader.quiet_logging():
+                result = _run(trader, engine)
+            self.assertTrue(result["daily_records"])
+            # 요약 로그가 꺼져 있으면 표시용 MDD도 계산하지 않음
+            mock_mdd.assert_not_called()
+            self.assertNotIn("logger", trader.__dict__)
+
+    def test_debug_logging_reports_daily_progress(self):
+        trader = make_trader()
+        with self.assertLogs(LOGGER, level=logging.DEBUG) as logs:
+            _run(trader, "legacy", end="2023-03-31")
+        messages = [record.getMessage() for record in logs.records]
+        self.assertTrue(any("매수 조건 확인" in message for message in messages))
+        self.assertTrue(any("백테스팅 결과 요약" in message for message in messages))
+
+    def test_quiet_logging_keeps_warnings(self):
+        trader = make_trader()
+        with self.assertLogs(LOGGER, level=logging.WARNING) as logs, trader.quiet_logging():
+            trader.logger.debug("숨김")
+            trader.logger.warning("표시")
+        self.assertEqual([record.getMessage() for record in logs.records], ["표시"])
+
+    def test_trader_paths_write_nothing_to_stdout(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), self.assertLogs(LOGGER, level=logging.DEBUG) as logs:
+            trader = make_trader()
+            trader.test_today_override = "2025-06-04"
+            trader.calculate_weekly_rsi(QQQ)
+            with patch.object(trader, "load_rsi_reference_data", return_value=REFERENCE):
+                trader.update_mode(QQQ)
+            _run(trader, "array", end="2023-03-31")
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertTrue(any("RSI" in record.getMessage() for record in logs.records))
+
+
+class BacktestEventTests(unittest.TestCase):
+    def test_events_are_off_by_default(self):
+        trader = make_trader()
+        with trader.quiet_logging():
+            result = _run(trader, "array")
+        self.assertEqual(result["logs"], [])
+
+    def test_array_engine_records_same_events_as_legacy_loop(self):
+        results = {}
+        for engine in ("legacy", "array"):
+            trader = make_trader()
+            trader.record_backtest_events = True
+            with trader.quiet_logging():
+                results[engine] = _run(trader, engine)["logs"]
+
+        self.assertEqual(results["array"], results["legacy"])
+        kinds = {event["event"] for event in results["array"]}
+        self.assertEqual(kinds, {"week", "buy", "sell"})
+        buys = [event for event in results["array"] if event["event"] == "buy"]
+        self.assertEqual(buys[0].keys(), {"date", "event", "round", "shares", "price", "amount", "mode"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from market_data import parse_chart_result
+from soxl_quant_system import SOXLQuantTrader
+
+
+def _ts(day: str) -> int:
+    d = datetime.strptime(day, "%Y-%m-%d")
+    return int(datetime(d.year, d.month, d.day, 14, 30, tzinfo=timezone.utc).timestamp())
+
+
+def _result(days, closes, meta=None):
+    return {
+        "meta": meta if meta is not None else {"gmtoffset": -18000},
+        "timestamp": [_ts(d) for d in days],
+        "indicators": {
+            "quote": [
+                {
+                    "open": [1.0] * len(days),
+                    "high": [2.0] * len(days),
+                    "low": [0.5] * len(days),
+                    "close": list(closes),
+                    "volume": [100] * len(days),
+                }
+            ]
+        },
+    }
+
+
+class ParseChartResultTests(unittest.TestCase):
+    def test_builds_typed_normalized_frame(self):
+        df = parse_chart_result(_result(["2025-12-10", "2025-12-11"], [1.5, None]))
+
+        self.assertEqual(list(df.columns), ["Open", "High", "Low", "Close", "Volume"])
+        self.assertEqual(df.index.name, "Date")
+        self.assertEqual(list(df.index), [pd.Timestamp("2025-12-10"), pd.Timestamp("2025-12-11")])
+        self.assertTrue((df.dtypes == np.float64).all())
+        self.assertTrue(np.isnan(df["Close"].iat[1]))
+
+    def test_missing_structure_returns_none(self):
+        self.assertIsNone(parse_chart_result({"meta": {}}))
+
+
+class ChartCorrectionTests(unittest.TestCase):
+    def setUp(self):
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            self.trader = SOXLQuantTrader(initial_capital=100_000)
+        self.trader.test_today_override = "2025-12-16"
+
+    def test_manual_correction_replaces_missing_close(self):
+        result = _result(["2025-12-11", "2025-12-12", "2025-12-15"], [40.0, None, 43.0])
+        df = self.trader._apply_chart_corrections("SOXL", parse_chart_result(result), result)
+
+        row = df.loc["2025-12-12"]
+        self.assertEqual((row["Open"], row["High"], row["Low"], row["Close"]), (46.92, 47.38, 41.06, 41.71))
+        self.assertEqual(row["Volume"], 138088200)
+        self.assertEqual(len(df), 3)
+        self.assertIn("2025-12-12", self.trader._api_missing_close_dates["SOXL"])
+        self.assertIsNone(self.trader._api_original_values["SOXL"]["2025-12-12"])
+        self.assertEqual(self.trader._data_warnings, [])
+
+    def test_uncorrected_missing_close_is_dropped_and_reported(self):
+        result = _result(["2025-12-10", "2025-12-11", "2025-12-15"], [40.0, None, 43.0])
+        df = self.trader._apply_chart_corrections("QQQ", parse_chart_result(result), result)
+
+        self.assertEqual(list(df.index.strftime("%Y-%m-%d")), ["2025-12-10", "2025-12-15"])
+        self.assertEqual(self.trader._data_warnings, ["2025-12-11"])
+
+    def test_latest_prior_bar_close_is_repaired_from_regular_market_price(self):
+        result = _result(["2025-12-12", "2025-12-15"], [40.0, None], meta={"gmtoffset": -18000, "regularMarketPrice": 44.5})
+        df = self.trader._apply_chart_corrections("QQQ", parse_chart_result(result), result)
+
+        self.assertEqual(df["Close"].iat[-1], 44.5)
+        self.assertEqual(self.trader._data_warnings, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,9 +2,19 @@ import unittest
 from datetime import date, datetime
 from unittest.mock import patch
 
+import numpy as np
+import pandas as pd
+
 from soxl_quant_system import SOXLQuantTrader
 from us_market_calendar import (
+    TradingSessionIndex,
+    get_trading_session_index,
+    is_us_equity_market_holiday,
     is_us_equity_trading_day,
+    sessions_after,
+    sessions_between,
+    trading_day_mask,
+    us_equity_business_day,
     us_equity_market_holidays,
 )
 
@@ -102,5 +112,93 @@ class USMarketCalendarTests(unittest.TestCase):
             )
 
 
+class TradingSessionIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = get_trading_session_index()
+
+    def test_sessions_between_counts_half_open_interval(self):
+        self.assertEqual(self.index.sessions_between(date(2026, 7, 1), date(2026, 8, 20)), 35)
+        self.assertEqual(self.index.sessions_between(date(2026, 7, 2), date(2026, 7, 6)), 1)
+        self.assertEqual(self.index.sessions_between(date(2026, 7, 6), date(2026, 7, 1)), 0)
+
+    def test_session_after_and_previous_session_skip_closures(self):
+        self.assertEqual(self.index.session_after(date(2026, 7, 2), 1), date(2026, 7, 6))
+        self.assertEqual(self.index.session_after(date(2026, 7, 4), 0), date(2026, 7, 4))
+        self.assertEqual(self.index.previous_session(date(2026, 7, 6)), date(2026, 7, 2))
+        self.assertEqual(self.index.previous_session(date(2025, 1, 10)), date(2025, 1, 8))
+
+    def test_index_extends_beyond_initial_span(self):
+        index = TradingSessionIndex()
+        far = index.session_after(date(2060, 12, 30), 3)
+
+        self.assertTrue(index.is_session(far))
+        self.assertTrue(is_us_equity_trading_day(far))
+        self.assertEqual(index.sessions_between(date(2060, 12, 30), far), 3)
+
+    def test_extra_holidays_get_their_own_shared_index(self):
+        extra = get_trading_session_index({"2026-08-10"})
+
+        self.assertIs(extra, get_trading_session_index([date(2026, 8, 10)]))
+        self.assertIsNot(extra, self.index)
+        self.assertFalse(extra.is_session(date(2026, 8, 10)))
+        self.assertTrue(self.index.is_session(date(2026, 8, 10)))
+
+    def test_trader_counts_respect_runtime_closures(self):
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            trader = SOXLQuantTrader(initial_capital=100_000)
+        before = trader.count_trading_days(datetime(2026, 8, 7), datetime(2026, 8, 11))
+
+        trader.us_holidays.add("2026-08-10")
+
+        self.assertEqual(before, 2)
+        self.assertEqual(trader.count_trading_days(datetime(2026, 8, 7), datetime(2026, 8, 11)), 1)
+        self.assertEqual(trader.get_trading_date_after("2026-08-07", 1), datetime(2026, 8, 11))
+        self.assertEqual(trader.get_previous_trading_date(datetime(2026, 8, 11)), datetime(2026, 8, 7))
+
+
+class BatchCalendarTests(unittest.TestCase):
+    def test_trading_day_mask_over_range(self):
+        mask = trading_day_mask(date(2026, 7, 1), date(2026, 7, 7))
+
+        self.assertEqual(list(mask.index), list(pd.date_range("2026-07-01", "2026-07-07")))
+        self.assertEqual(mask.tolist(), [True, True, False, False, False, True, True])
+
+    def test_sessions_after_accepts_mixed_dates_and_offsets(self):
+        result = sessions_after([date(2026, 7, 1), "2026-07-02", pd.Timestamp("2026-07-04")], [35, 1, 0])
+
+        self.assertEqual(result.dtype, np.dtype("datetime64[D]"))
+        self.assertEqual(result.tolist(), [date(2026, 8, 20), date(2026, 7, 6), date(2026, 7, 4)])
+
+    def test_sessions_between_broadcasts_end_date(self):
+        starts = pd.DatetimeIndex(["2026-07-01", "2026-08-19", "2026-09-01"])
+
+        self.assertEqual(sessions_between(starts, ["2026-08-20"]).tolist(), [35, 1, 0])
+
+    def test_business_day_offset_skips_closures(self):
+        bday = us_equity_business_day(extra_holidays={"2026-08-10"})
+
+        self.assertEqual(pd.Timestamp("2026-07-02") + bday, pd.Timestamp("2026-07-06"))
+        self.assertEqual(pd.Timestamp("2026-08-07") + bday, pd.Timestamp("2026-08-11"))
+
+    def test_extra_holidays_accept_strings_and_datetimes(self):
+        self.assertTrue(is_us_equity_market_holiday(date(2026, 8, 10), {"2026-08-10"}))
+        self.assertTrue(is_us_equity_market_holiday(date(2026, 8, 10), [datetime(2026, 8, 10, 9, 30)]))
+        self.assertFalse(is_us_equity_market_holiday(date(2026, 8, 11), {"2026-08-10"}))
+
+    def test_trader_batch_helpers_match_scalar_methods(self):
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            trader = SOXLQuantTrader(initial_capital=100_000)
+        buy_dates = [datetime(2026, 7, 1), pd.Timestamp("2026-07-02"), "2026-08-19"]
+
+        self.assertEqual(
+            trader.count_trading_days_many(buy_dates, datetime(2026, 8, 20)).tolist(),
+            [trader.count_trading_days(buy, datetime(2026, 8, 20)) for buy in buy_dates],
+        )
+        self.assertEqual(
+            trader.get_trading_dates_after_many(buy_dates, [35, 7, 1]),
+            [trader.get_trading_date_after(buy, days) for buy, days in zip(buy_dates, [35, 7, 1])],
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,128 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from market_data import MarketDataClient, MarketDataError, run_concurrently
+from soxl_quant_system import SOXLQuantTrader
+
+
+def _response(status_code=200, payload=None):
+    response = MagicMock(status_code=status_code)
+    response.json.return_value = payload if payload is not None else {"chart": {"result": [{"meta": {}}]}}
+    return response
+
+
+class MarketDataClientTests(unittest.TestCase):
+    def setUp(self):
+        self.client = MarketDataClient(max_retries=2, backoff_seconds=0)
+        self.params = {"range": "1mo", "interval": "1d"}
+
+    def test_transient_status_is_retried(self):
+        with patch.object(self.client._session, "get", side_effect=[_response(503), _response(200)]) as mock_get:
+            result = self.client.get_chart_result("QQQ", self.params)
+
+        self.assertEqual(result, {"meta": {}})
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_client_error_is_not_retried(self):
+        with patch.object(self.client._session, "get", return_value=_response(404)) as mock_get:
+            with self.assertRaises(MarketDataError) as ctx:
+                self.client.get_chart("QQQ", self.params)
+
+        self.assertEqual(ctx.exception.status_code, 404)
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_retries_are_bounded(self):
+        with patch.object(self.client._session, "get", return_value=_response(500)) as mock_get:
+            with self.assertRaises(MarketDataError):
+                self.client.get_chart("QQQ", self.params)
+
+        self.assertEqual(mock_get.call_count, 3)
+
+    def test_responses_are_cached_until_max_age(self):
+        with patch.object(self.client._session, "get", return_value=_response()) as mock_get:
+            self.client.get_chart("QQQ", self.params)
+            self.client.get_chart("QQQ", dict(reversed(list(self.params.items()))))
+            self.client.get_chart("QQQ", self.params, max_age=0)
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_cache_is_bounded_and_evicts_least_recently_used(self):
+        client = MarketDataClient(max_retries=0, backoff_seconds=0, cache_size=2)
+        with patch.object(client._session, "get", return_value=_response()) as mock_get:
+            client.get_chart("SOXL", self.params)
+            client.get_chart("QQQ", self.params)
+            client.get_chart("SOXL", self.params)
+            client.get_chart("TQQQ", self.params)
+            client.get_chart("SOXL", self.params)
+            client.get_chart("QQQ", self.params)
+
+        self.assertEqual(mock_get.call_count, 4)
+        self.assertEqual(len(client._cache), 2)
+
+    def test_identical_in_flight_requests_are_coalesced(self):
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(timeout=5)
+            return _response()
+
+        results = []
+        with patch.object(self.client._session, "get", side_effect=slow_get) as mock_get:
+            threads = [
+                threading.Thread(target=lambda: results.append(self.client.get_chart("SOXL", self.params, max_age=0)))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.05)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_get_many_reports_failures_per_symbol(self):
+        def fake_get(url, params=None, timeout=None):
+            return _response(404) if url.endswith("/BAD") else _response()
+
+        with patch.object(self.client._session, "get", side_effect=fake_get):
+            results = self.client.get_many(["QQQ", "BAD"], self.params)
+
+        self.assertEqual(results["QQQ"], {"meta": {}})
+        self.assertIsInstance(results["BAD"], MarketDataError)
+
+
+class RunConcurrentlyTests(unittest.TestCase):
+    def test_preserves_order_and_deduplicates(self):
+        calls = []
+
+        def work(key):
+            calls.append(key)
+            return key.lower()
+
+        self.assertEqual(run_concurrently(work, ["B", "A", "B"]), {"B": "b", "A": "a"})
+        self.assertEqual(sorted(calls), ["A", "B"])
+
+    def test_trader_get_many_runs_symbols_in_parallel(self):
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            trader = SOXLQuantTrader(initial_capital=100_000)
+
+        def slow_fetch(symbol, period):
+            time.sleep(0.2)
+            return f"{symbol}-{period}"
+
+        started = time.perf_counter()
+        with patch.object(trader, "get_stock_data", side_effect=slow_fetch):
+            results = trader.get_many(["SOXL", "QQQ", "TQQQ"], "15y")
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(results, {"SOXL": "SOXL-15y", "QQQ": "QQQ-15y", "TQQQ": "TQQQ-15y"})
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
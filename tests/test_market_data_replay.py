@@ -0,0 +1,131 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from backtester_any_ticker import AnyTickerQuantTrader
+from market_data import RecordingMarketDataClient, ReplayMarketDataClient
+from soxl_quant_system import SOXLQuantTrader
+
+
+def _ts(day: str, hour: int = 13, minute: int = 30) -> int:
+    d = datetime.strptime(day, "%Y-%m-%d")
+    return int(datetime(d.year, d.month, d.day, hour, minute, tzinfo=timezone.utc).timestamp())
+
+
+def _payload(timestamps, closes):
+    return {
+        "chart": {
+            "result": [
+                {
+                    "meta": {"gmtoffset": -14400},
+                    "timestamp": list(timestamps),
+                    "indicators": {
+                        "quote": [
+                            {
+                                "open": list(closes),
+                                "high": list(closes),
+                                "low": list(closes),
+                                "close": list(closes),
+                                "volume": [1] * len(closes),
+                            }
+                        ]
+                    },
+                }
+            ],
+            "error": None,
+        }
+    }
+
+
+def _write_fixture(root: Path, name: str, payload: dict) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / name, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+
+
+class RecordReplayTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_recording_merges_responses_per_symbol_and_interval(self):
+        client = RecordingMarketDataClient(self.root, backoff_seconds=0)
+        first = MagicMock(status_code=200)
+        first.json.return_value = _payload([_ts("2025-06-02"), _ts("2025-06-03")], [1.0, 2.0])
+        second = MagicMock(status_code=200)
+        second.json.return_value = _payload([_ts("2025-06-03"), _ts("2025-06-04")], [2.5, 3.0])
+
+        with patch.object(client._session, "get", side_effect=[first, second]):
+            client.get_chart("KRW=X", {"range": "5d", "interval": "1d"})
+            client.get_chart("KRW=X", {"range": "1d", "interval": "1d"})
+
+        with open(self.root / "KRW%3DX_1d.json", encoding="utf-8") as f:
+            recorded = json.load(f)["chart"]["result"][0]
+        self.assertEqual(len(recorded["timestamp"]), 3)
+        self.assertEqual(recorded["indicators"]["quote"][0]["close"], [1.0, 2.5, 3.0])
+
+    def test_recording_failure_is_logged_as_warning(self):
+        blocked = self.root / "not_a_dir"
+        blocked.write_text("")
+        client = RecordingMarketDataClient(blocked, backoff_seconds=0)
+        response = MagicMock(status_code=200)
+        response.json.return_value = _payload([_ts("2025-06-02")], [1.0])
+
+        with patch.object(client._session, "get", return_value=response), \
+                self.assertLogs("market_data", level="WARNING") as logs:
+            client.get_chart("SOXL", {"range": "5d", "interval": "1d"})
+
+        self.assertIn("픽스처 기록 실패", logs.output[0])
+
+    def test_replay_slices_period_requests(self):
+        _write_fixture(
+            self.root,
+            "QQQ_1d.json",
+            _payload([_ts("2025-06-02"), _ts("2025-06-03"), _ts("2025-06-04")], [1.0, 2.0, 3.0]),
+        )
+        client = ReplayMarketDataClient(self.root)
+        params = {"period1": _ts("2025-06-03", 0, 0), "period2": _ts("2025-06-04", 0, 0), "interval": "1d"}
+
+        result = client.get_chart_result("QQQ", params)
+
+        self.assertEqual(result["indicators"]["quote"][0]["close"], [2.0])
+        self.assertTrue(client.offline)
+
+    def test_trader_runs_network_free_from_fixtures(self):
+        days = ["2025-06-02", "2025-06-03", "2025-06-04", "2025-06-05", "2025-06-06"]
+        _write_fixture(self.root, "SOXL_1d.json", _payload([_ts(d) for d in days], [10, 11, 12, 13, 14]))
+        minute_ts = [_ts("2025-06-06", 19, 58), _ts("2025-06-06", 19, 59)]
+        _write_fixture(self.root, "SOXL_1m.json", _payload(minute_ts, [14.1, None]))
+
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            trader = SOXLQuantTrader(initial_capital=100_000)
+        trader.use_market_data(ReplayMarketDataClient(self.root))
+        trader.test_today_override = "2025-06-07"
+
+        df = trader.get_stock_data("SOXL", "15y")
+        last_time, last_price = trader.get_intraday_last_price("SOXL")
+
+        self.assertEqual(list(df["Close"]), [10, 11, 12, 13, 14])
+        self.assertEqual(last_price, 14.1)
+        self.assertEqual(last_time, datetime(2025, 6, 6, 19, 58))
+        self.assertIsNone(trader.get_stock_data("QQQ", "1mo"))
+
+    def test_any_ticker_trader_reads_redirected_fixture(self):
+        _write_fixture(self.root, "TQQQ_1d.json", _payload([_ts("2025-06-05"), _ts("2025-06-06")], [50.0, 51.0]))
+
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            trader = AnyTickerQuantTrader("TQQQ", initial_capital=100_000)
+        trader.use_market_data(ReplayMarketDataClient(self.root))
+        trader.test_today_override = "2025-06-07"
+
+        self.assertEqual(list(trader.get_stock_data("SOXL", "1mo")["Close"]), [50.0, 51.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import tempfile
+import unittest
+from datetime import date, datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from market_data import MarketDataClient
+from market_data_store import DailyBarStore
+from soxl_quant_system import SOXLQuantTrader
+
+
+def _bars(start: str, periods: int) -> pd.DataFrame:
+    index = pd.bdate_range(start, periods=periods, name="Date")
+    closes = [10.0 + i for i in range(periods)]
+    return pd.DataFrame(
+        {
+            "Open": closes,
+            "High": [c + 1 for c in closes],
+            "Low": [c - 1 for c in closes],
+            "Close": closes,
+            "Volume": [1000.0] * periods,
+        },
+        index=index,
+    )
+
+
+def _chart_response(days, closes):
+    """Yahoo chart API 응답 모양의 가짜 Response (정규장 시작 13:30 UTC 타임스탬프)"""
+    timestamps = [
+        int(datetime(d.year, d.month, d.day, 13, 30, tzinfo=timezone.utc).timestamp()) for d in days
+    ]
+    response = MagicMock(status_code=200)
+    response.json.return_value = {
+        "chart": {
+            "result": [
+                {
+                    "meta": {},
+                    "timestamp": timestamps,
+                    "indicators": {
+                        "quote": [
+                            {
+                                "open": list(closes),
+                                "high": [c + 1 for c in closes],
+                                "low": [c - 1 for c in closes],
+                                "close": list(closes),
+                                "volume": [1000] * len(closes),
+                            }
+                        ]
+                    },
+                }
+            ]
+        }
+    }
+    return response
+
+
+class DailyBarStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = DailyBarStore(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip_keeps_only_closed_sessions(self):
+        df = _bars("2025-06-02", 5)  # 6/2 ~ 6/6
+        self.assertTrue(self.store.save("SOXL", df, date(2025, 6, 5), full_history=True))
+
+        loaded = self.store.load("SOXL")
+        self.assertEqual(loaded.index[-1], pd.Timestamp("2025-06-05"))
+        pd.testing.assert_frame_equal(loaded, df.iloc[:4], check_freq=False, check_index_type=False)
+        meta = self.store.load_meta("SOXL")
+        self.assertEqual(meta["last_session"], "2025-06-05")
+        self.assertTrue(meta["full_history"])
+
+    def test_append_only_adds_sessions_after_last_stored(self):
+        self.store.save("QQQ", _bars("2025-06-02", 3), date(2025, 6, 4))
+        tail = _bars("2025-06-04", 3)
+        tail.loc[pd.Timestamp("2025-06-04"), "Close"] = 999.0  # 저장된 세션은 덮어쓰지 않는다
+
+        self.assertTrue(self.store.save("QQQ", tail, date(2025, 6, 6)))
+        loaded = self.store.load("QQQ")
+        self.assertEqual(len(loaded), 5)
+        self.assertEqual(loaded.loc["2025-06-04", "Close"], 12.0)
+
+    def test_non_contiguous_tail_is_not_stored(self):
+        self.store.save("QQQ", _bars("2025-06-02", 2), date(2025, 6, 3))
+        self.assertFalse(self.store.save("QQQ", _bars("2025-06-10", 2), date(2025, 6, 11)))
+        self.assertEqual(self.store.load_meta("QQQ")["last_session"], "2025-06-03")
+
+
+    def test_write_failure_is_logged_as_warning(self):
+        store = DailyBarStore(self._tmp.name + "/blocked")
+        open(self._tmp.name + "/blocked", "w").close()
+
+        with self.assertLogs("market_data_store", level="WARNING") as logs:
+            self.assertFalse(store.save("SOXL", _bars("2025-06-02", 3), date(2025, 6, 4)))
+
+        self.assertIn("로컬 일봉 저장 실패", logs.output[0])
+
+
+class TraderBarStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            self.trader = SOXLQuantTrader(initial_capital=100_000)
+        self.trader._bar_store = DailyBarStore(self._tmp.name)
+        self.trader._market_data = MarketDataClient(backoff_seconds=0)
+        self.session = self.trader._market_data._session
+        # 2025-06-07(토): 마지막 마감 세션은 2025-06-06(금)
+        self.trader.test_today_override = "2025-06-07"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_last_closed_session_skips_weekend(self):
+        self.assertEqual(self.trader._last_closed_session_date(), date(2025, 6, 6))
+
+    def test_fresh_store_is_served_without_network(self):
+        self.trader._bar_store.save("SOXL", _bars("2025-04-01", 49), date(2025, 6, 6), full_history=True)
+
+        with patch.object(self.session, "get", side_effect=AssertionError("network used")):
+            full = self.trader.get_stock_data("SOXL", "15y")
+            self.trader.clear_cache()
+            recent = self.trader.get_stock_data("SOXL", "1mo")
+
+        self.assertEqual(full.index[-1], pd.Timestamp("2025-06-06"))
+        self.assertEqual(len(full), 49)
+        self.assertGreaterEqual(recent.index[0], pd.Timestamp("2025-05-07"))
+        self.assertEqual(recent.index[-1], pd.Timestamp("2025-06-06"))
+
+    def test_stale_store_is_not_served(self):
+        self.trader._bar_store.save("SOXL", _bars("2025-04-01", 45), date(2025, 6, 6), full_history=True)
+        self.assertIsNone(self.trader._load_stored_bars("SOXL", "15y"))
+
+
+    def test_stale_store_requests_only_the_tail(self):
+        self.trader._bar_store.save("QQQ", _bars("2025-04-01", 47), date(2025, 6, 4), full_history=True)
+        tail = _chart_response([date(2025, 6, 4), date(2025, 6, 5), date(2025, 6, 6)], [56.0, 57.5, 58.5])
+
+        with patch.object(self.session, "get", return_value=tail) as mock_get:
+            df = self.trader.get_stock_data("QQQ", "15y")
+
+        self.assertEqual(mock_get.call_count, 1)
+        params = mock_get.call_args.kwargs["params"]
+        self.assertEqual(params["period1"], int(datetime(2025, 6, 4, tzinfo=timezone.utc).timestamp()))
+        self.assertEqual(len(df), 49)
+        self.assertEqual(df.loc["2025-06-06", "Close"], 58.5)
+        self.assertEqual(self.trader._bar_store.load_meta("QQQ")["last_session"], "2025-06-06")
+
+    def test_tail_price_mismatch_falls_back_to_full_history(self):
+        self.trader._bar_store.save("QQQ", _bars("2025-04-01", 47), date(2025, 6, 4), full_history=True)
+        split_adjusted_tail = _chart_response([date(2025, 6, 4), date(2025, 6, 5)], [28.0, 29.0])
+        full = _chart_response([date(2025, 6, 5), date(2025, 6, 6)], [29.0, 30.0])
+
+        with patch.object(self.session, "get", side_effect=[split_adjusted_tail, full]) as mock_get:
+            df = self.trader.get_stock_data("QQQ", "15y")
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_args.kwargs["params"]["period1"], 0)
+        self.assertEqual(list(df["Close"]), [29.0, 30.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
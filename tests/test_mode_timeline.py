@@ -0,0 +1,148 @@
+import pickle
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from mode_timeline import WeeklyModeTimeline, build_mode_timeline, week_friday
+from rsi_reference import WeeklyRSIIndex
+from backtest_fixtures import FULL_QQQ, QQQ, REFERENCE, SOXL, full_reference, make_trader, trader_state
+
+
+def _run(trader, start="2023-01-03", end="2025-12-26", engine=None):
+    with patch.object(trader, "get_many", return_value={"SOXL": SOXL, "QQQ": QQQ}) as get_many, \
+            patch.object(trader, "load_rsi_reference_data", return_value=REFERENCE), \
+            patch.object(WeeklyRSIIndex, "lookup", autospec=True, side_effect=WeeklyRSIIndex.lookup) as lookup, \
+            trader.quiet_logging():
+        result = trader.run_backtest(start, end, engine=engine)
+    return result, get_many, lookup
+
+
+def _weekly_reference(rsis):
+    reference = {"metadata": {}}
+    for end, rsi in rsis.items():
+        start = (date.fromisoformat(end) - timedelta(days=4)).isoformat()
+        reference.setdefault(end[:4], {"weeks": []})["weeks"].append({"start": start, "end": end, "rsi": rsi})
+    return reference
+
+
+class ModeTimelineTests(unittest.TestCase):
+    def test_timeline_matches_backtest_week_modes(self):
+        trader = make_trader()
+        timeline = trader.build_mode_timeline(REFERENCE)
+        records = _run(trader)[0]["daily_records"]
+
+        days = [date.fromisoformat(record["date"]) for record in records]
+        self.assertEqual(timeline.modes_for(days), [record["mode"] for record in records])
+        self.assertEqual(timeline.get(date(2025, 12, 26))[1], records[-1]["mode"])
+        self.assertIsNone(timeline.get(date(2022, 9, 2)))
+
+    def _assert_injected_run_matches(self, compounding=False, **kwargs):
+        plain, injected = make_trader(compounding=compounding), make_trader(compounding=compounding)
+        injected.use_mode_timeline(plain.build_mode_timeline(REFERENCE))
+
+        expected = _run(plain, **kwargs)[0]
+        actual, get_many, lookup = _run(injected, **kwargs)
+        self.assertNotIn("error", expected)
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(trader_state(injected), trader_state(plain))
+        self.assertEqual(lookup.call_count, 0)
+        get_many.assert_called_once()
+        self.assertEqual(get_many.call_args.args[0], ["SOXL"])
+
+    def test_injected_timeline_skips_rsi_lookups(self):
+        self._assert_injected_run_matches()
+
+    def test_injected_timeline_mid_history_start_with_compounding(self):
+        self._assert_injected_run_matches(compounding=True, start="2024-07-10")
+
+    def test_legacy_loop_uses_injected_timeline(self):
+        self._assert_injected_run_matches(engine="legacy")
+
+    def test_weeks_outside_timeline_fall_back_to_rsi(self):
+        plain, injected = make_trader(), make_trader()
+        full = plain.build_mode_timeline(REFERENCE)
+        injected.use_mode_timeline(WeeklyModeTimeline({
+            friday: full.get(friday) for friday in full.fridays if friday < date(2025, 1, 1)
+        }))
+
+        actual, _, lookup = _run(injected)
+        self.assertEqual(actual, _run(plain)[0])
+        self.assertGreater(lookup.call_count, 0)
+
+    def test_forced_week_keeps_safe_mode_and_pickles(self):
+        reference = _weekly_reference(
+            {"2025-12-05": 50.0, "2025-12-12": 45.0, "2025-12-19": 30.0, "2025-12-26": 40.0, "2026-01-02": 45.0}
+        )
+
+        timeline = build_mode_timeline(reference, make_trader()._is_mode_case_matched)
+
+        # 12/26 주차: 2주전 45 → 1주전 30 (40~50에서 하락) → SF
+        self.assertEqual(timeline.get(date(2025, 12, 26)), (40.0, "SF"))
+        # 1/2 주차: 30 → 40 (35 미만에서 상승)은 AG 조건이지만 강제 안전모드 주차라 SF 유지
+        self.assertEqual(timeline.get(date(2026, 1, 2)), (45.0, "SF"))
+        # 1/9 주차: 조건 없음 → 이전 모드 유지, 진행 중 주차라 RSI는 None
+        self.assertEqual(timeline.get(date(2026, 1, 9)), (None, "SF"))
+        self.assertEqual(week_friday(date(2026, 1, 10)), date(2026, 1, 16))
+        self.assertEqual(pickle.loads(pickle.dumps(timeline)).get(date(2026, 1, 2)), (45.0, "SF"))
+
+    def test_start_mode_uses_recursive_rule(self):
+        # 30 → 40 (35 미만에서 상승) AG 이후 조건 없는 주차가 계속되어 20주 안에 조건 주차가 없음
+        first = date(2024, 1, 5)
+        rsis = {first.isoformat(): 30.0, (first + timedelta(days=7)).isoformat(): 40.0}
+        for week in range(2, 30):
+            rsis[(first + timedelta(days=7 * week)).isoformat()] = 55.0
+        reference = _weekly_reference(rsis)
+        plain, injected = make_trader(), make_trader()
+        timeline = plain.build_mode_timeline(reference)
+        injected.use_mode_timeline(timeline)
+
+        with plain.quiet_logging(), injected.quiet_logging():
+            for week in (4, 10, 24):
+                start = (first + timedelta(days=7 * week - 2)).isoformat()
+                with self.subTest(start=start):
+                    expected = plain.check_backtest_starting_state(start, reference)
+                    self.assertEqual(injected.check_backtest_starting_state(start, reference), expected)
+        # 타임라인 주차 모드는 계속 이어지지만 시작 모드는 재귀 규칙대로 판정 실패
+        self.assertEqual(timeline.get(first + timedelta(days=7 * 24))[1], "AG")
+        self.assertIn("error", expected)
+
+
+class ModeTimelineHistoryTests(unittest.TestCase):
+    """15년 RSI 참조 데이터에서 주차별 타임라인 모드 = update_mode, 시작 모드 = check_backtest_starting_state"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.reference = full_reference()
+        cls.timeline = make_trader().build_mode_timeline(cls.reference)
+        cls.fridays = [friday for friday in cls.timeline.fridays if date(2011, 1, 7) <= friday <= date(2025, 12, 26)]
+
+    def test_every_week_matches_update_mode(self):
+        trader = make_trader()
+        # update_mode는 주간 RSI를 참조 데이터에서 찾으므로 QQQ 일봉은 최소 분량만 전달
+        qqq = FULL_QQQ.iloc[:100]
+        modes = []
+        with patch("soxl_quant_system.load_rsi_reference", return_value=self.reference), trader.quiet_logging():
+            for friday in self.fridays:
+                trader.test_today_override = (friday - timedelta(days=4)).isoformat()
+                trader.current_week_friday = None
+                modes.append(trader.update_mode(qqq))
+
+        self.assertGreater(len(self.fridays), 750)
+        self.assertEqual(modes, [self.timeline.get(friday)[1] for friday in self.fridays])
+        self.assertEqual(set(modes), {"SF", "AG"})
+
+    def test_starting_state_matches_reference_rule(self):
+        plain, injected = make_trader(), make_trader()
+        injected.use_mode_timeline(self.timeline)
+        with plain.quiet_logging(), injected.quiet_logging(), \
+                patch.object(injected, "get_rsi_from_reference") as lookup:
+            for friday in self.fridays[::3]:
+                start = (friday - timedelta(days=2)).isoformat()
+                expected = plain.check_backtest_starting_state(start, self.reference)
+                self.assertEqual(injected.check_backtest_starting_state(start, self.reference), expected, start)
+        lookup.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
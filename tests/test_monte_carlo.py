@@ -0,0 +1,78 @@
+import unittest
+from itertools import product
+from unittest.mock import patch
+
+import numpy as np
+
+from backtest_kernel import MODE_AG, MODE_SF
+from monte_carlo import (
+    generate_paths,
+    matched_mode_codes,
+    prepare_bootstrap_source,
+    run_monte_carlo,
+    summarize_distribution,
+)
+from parameter_sweep import prepare_sweep_data
+from backtest_fixtures import QQQ, REFERENCE, SOXL, make_trader
+
+
+class _FirstWeekRng:
+    """모든 블록을 첫 주차부터 뽑는 난수 생성기 (과거 경로 그대로 재현)"""
+
+    def integers(self, low, high, size):
+        return np.zeros(size, dtype=np.int64)
+
+
+def _load(trader, loader, *args):
+    with patch.object(trader, "get_many", return_value={"SOXL": SOXL, "QQQ": QQQ}), \
+            patch.object(trader, "load_rsi_reference_data", return_value=REFERENCE), \
+            trader.quiet_logging():
+        return loader(trader, "2023-01-03", "2025-12-26", *args)
+
+
+class MonteCarloTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.trader = make_trader()
+        cls.source = _load(cls.trader, prepare_bootstrap_source)
+
+    def test_vectorized_case_matcher_matches_trader(self):
+        values = [20.0, 34.0, 40.0, 45.0, 49.0, 50.0, 55.0, 61.0, 66.0, 80.0]
+        pairs = list(product(values, values))
+        codes = matched_mode_codes(np.array([p[0] for p in pairs]), np.array([p[1] for p in pairs]))
+        for (current, prev), code in zip(pairs, codes):
+            matched, mode = self.trader._is_mode_case_matched(current, prev)
+            self.assertEqual(code, {"SF": MODE_SF, "AG": MODE_AG}[mode] if matched else -1, (current, prev))
+
+    def test_unshuffled_path_reproduces_history_and_week_modes(self):
+        data = _load(self.trader, prepare_sweep_data)
+        block_weeks = self.source.n_weeks
+
+        closes, modes, ordinals = generate_paths(self.source, 1, block_weeks, _FirstWeekRng())
+
+        np.testing.assert_allclose(closes[0], data.closes, rtol=1e-12)
+        np.testing.assert_array_equal(modes[0], data.modes)
+        np.testing.assert_array_equal(ordinals[0], data.ordinals)
+
+    def test_distribution_is_reproducible_across_workers(self):
+        sf, ag = self.trader.sf_config, self.trader.ag_config
+        expected = run_monte_carlo(self.source, sf, ag, n_paths=6, seed=11, batch_size=2, max_workers=1)
+        actual = run_monte_carlo(self.source, sf, ag, n_paths=6, seed=11, batch_size=2, max_workers=3)
+
+        self.assertEqual(len(actual), 6)
+        self.assertEqual(actual.to_dict("records"), expected.to_dict("records"))
+        self.assertGreater(actual["total_return"].nunique(), 1)
+        self.assertTrue((actual["mdd"] >= 0).all())
+
+        summary = summarize_distribution(actual)
+        self.assertEqual(list(summary.index), ["total_return", "cagr", "mdd"])
+        self.assertAlmostEqual(summary.loc["mdd", "p50"], float(np.percentile(actual["mdd"], 50)))
+
+    def test_historical_metrics_use_trader_config(self):
+        data = _load(self.trader, prepare_sweep_data)
+        self.assertEqual(self.source.n_bars, len(data.closes))
+        self.assertIn("mdd", self.source.historical_metrics)
+
+
+if __name__ == "__main__":
+    unittest.main()
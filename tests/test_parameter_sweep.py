@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from parameter_sweep import equity_metrics, grid_configs, prepare_sweep_data, random_configs, run_sweep
+from backtest_fixtures import QQQ, REFERENCE, SOXL, make_trader
+
+
+def _data(trader, start="2023-01-03", end="2025-12-26"):
+    with patch.object(trader, "get_many", return_value={"SOXL": SOXL, "QQQ": QQQ}), \
+            patch.object(trader, "load_rsi_reference_data", return_value=REFERENCE), \
+            trader.quiet_logging():
+        return prepare_sweep_data(trader, start, end)
+
+
+def _backtest(trader, start="2023-01-03", end="2025-12-26"):
+    with patch.object(trader, "get_many", return_value={"SOXL": SOXL, "QQQ": QQQ}), \
+            patch.object(trader, "load_rsi_reference_data", return_value=REFERENCE), \
+            trader.quiet_logging():
+        return trader.run_backtest(start, end)
+
+
+class ParameterSweepTests(unittest.TestCase):
+    def _assert_base_config_matches_backtest(self, compounding):
+        trader = make_trader(compounding=compounding)
+        data = _data(trader)
+        table = run_sweep(data, grid_configs(trader.sf_config, trader.ag_config, {}), max_workers=1)
+        expected = _backtest(trader)
+
+        self.assertEqual(len(table), 1)
+        self.assertAlmostEqual(table.loc[0, "final_value"], expected["final_value"], places=6)
+        self.assertAlmostEqual(table.loc[0, "total_return"], expected["total_return"], places=6)
+        self.assertAlmostEqual(table.loc[0, "mdd"], trader.calculate_mdd(expected["daily_records"])["mdd_percent"], places=6)
+
+    def test_base_config_matches_run_backtest(self):
+        self._assert_base_config_matches_backtest(compounding=False)
+
+    def test_base_config_matches_run_backtest_with_compounding(self):
+        self._assert_base_config_matches_backtest(compounding=True)
+
+    def test_process_pool_ranks_same_results(self):
+        trader = make_trader()
+        data = _data(trader)
+        configs = grid_configs(trader.sf_config, trader.ag_config, {
+            "sf.sell_threshold": [1.0, 1.4, 2.0],
+            "ag.max_hold_days": [5, 7],
+        })
+
+        expected = run_sweep(data, configs, max_workers=1)
+        actual = run_sweep(data, configs, max_workers=2, chunk_size=2)
+
+        self.assertEqual(len(actual), 6)
+        self.assertEqual(actual.to_dict("records"), expected.to_dict("records"))
+        self.assertTrue(actual["total_return"].is_monotonic_decreasing)
+        self.assertEqual(set(actual["ag.max_hold_days"]), {5, 7})
+
+    def test_random_configs_are_reproducible_and_in_range(self):
+        trader = make_trader()
+        space = {"sf.buy_threshold": (2.0, 4.0), "ag.max_hold_days": (5, 9), "ag.split_count": [6, 8]}
+
+        configs = random_configs(trader.sf_config, trader.ag_config, space, 50, seed=3)
+
+        self.assertEqual([c["params"] for c in configs], [c["params"] for c in random_configs(trader.sf_config, trader.ag_config, space, 50, seed=3)])
+        for config in configs:
+            self.assertTrue(2.0 <= config["sf_config"]["buy_threshold"] <= 4.0)
+            self.assertIn(config["ag_config"]["max_hold_days"], range(5, 10))
+            self.assertIn(config["ag_config"]["split_count"], (6, 8))
+            self.assertEqual(config["sf_config"]["split_ratios"], trader.sf_config["split_ratios"])
+        self.assertIsNot(configs[0]["sf_config"]["split_ratios"], trader.sf_config["split_ratios"])
+        with self.assertRaises(ValueError):
+            grid_configs(trader.sf_config, trader.ag_config, {"sf.split_ratio": [[1.0]]})
+        with self.assertRaises(ValueError):
+            random_configs(trader.sf_config, trader.ag_config, {"sf.split_ratios": (0.1, 0.5)}, 1)
+
+    def test_split_ratio_candidates_are_swept_as_lists(self):
+        trader = make_trader()
+        candidates = [[0.5, 0.5], [0.2, 0.3, 0.5]]
+
+        configs = grid_configs(trader.sf_config, trader.ag_config, {"sf.split_ratios": candidates})
+
+        self.assertEqual([c["sf_config"]["split_ratios"] for c in configs], candidates)
+        self.assertEqual(configs[0]["sf_config"]["split_count"], trader.sf_config["split_count"])
+
+    def test_equity_metrics(self):
+        metrics = equity_metrics(np.array([100.0, 120.0, 90.0, 150.0]), 100.0, 252)
+
+        self.assertAlmostEqual(metrics["total_return"], 50.0)
+        self.assertAlmostEqual(metrics["cagr"], 50.0)
+        self.assertAlmostEqual(metrics["mdd"], 25.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+
+import numpy as np
+
+from performance_metrics import DrawdownTracker, annualized_return, compute_metrics, drawdown_series, mdd_info
+from backtest_fixtures import make_trader, run_backtest
+
+
+def _loop_mdd(records):
+    """기존 SOXLQuantTrader.calculate_mdd 루프 (비교 기준)"""
+    peak = overall = 0.0
+    peak_date = overall_date = mdd_date = mdd_peak_date = ""
+    mdd = mdd_value = 0.0
+    for record in records:
+        assets = record["total_assets"]
+        if assets > overall:
+            overall, overall_date = assets, record["date"]
+        if assets > peak:
+            peak, peak_date = assets, record["date"]
+        if peak > 0:
+            drawdown = (peak - assets) / peak * 100
+            if drawdown > mdd:
+                mdd, mdd_date, mdd_value, mdd_peak_date = drawdown, record["date"], assets, peak_date
+    return {
+        "mdd_percent": mdd,
+        "mdd_date": mdd_date,
+        "mdd_value": mdd_value,
+        "mdd_peak_date": mdd_peak_date,
+        "overall_peak_date": overall_date,
+        "overall_peak_value": overall,
+    }
+
+
+def _records(values):
+    return [{"date": f"d{i:03d}", "total_assets": float(value)} for i, value in enumerate(values)]
+
+
+class PerformanceMetricsTests(unittest.TestCase):
+    def test_mdd_info_matches_previous_loop_on_backtest(self):
+        records = run_backtest(make_trader(compounding=True), "array")["daily_records"]
+        self.assertEqual(mdd_info(records), _loop_mdd(records))
+        self.assertEqual(mdd_info([]), _loop_mdd([]))
+
+    def test_mdd_info_matches_previous_loop_with_ties_and_flat_curves(self):
+        curves = [
+            [100, 120, 120, 90, 120, 90, 130],
+            [100, 100, 100],
+            [0, 50, 40, 60],
+            np.round(np.random.default_rng(5).uniform(50, 150, 300)),
+        ]
+        for values in curves:
+            self.assertEqual(mdd_info(_records(values)), _loop_mdd(_records(values)), values)
+
+    def test_two_dimensional_input_matches_each_curve(self):
+        curves = np.cumprod(1 + np.random.default_rng(2).normal(0.001, 0.03, (4, 500)), axis=1) * 1000
+        dates = [f"d{i:03d}" for i in range(500)]
+
+        batch = compute_metrics(curves, dates, initial_capital=1000)
+
+        for k, curve in enumerate(curves):
+            single = compute_metrics(curve, dates, initial_capital=1000)
+            for key, value in single.items():
+                if isinstance(value, str):
+                    self.assertEqual(batch[key][k], value, key)
+                else:
+                    self.assertAlmostEqual(float(batch[key][k]), value, places=9, msg=key)
+        np.testing.assert_array_equal(batch["mdd_percent"], drawdown_series(curves).max(axis=1))
+
+    def test_returns_under_water_and_exposure(self):
+        metrics = compute_metrics(
+            np.array([100.0, 110.0, 99.0, 105.0, 121.0, 120.0]),
+            initial_capital=100.0,
+            trading_days=252,
+            holdings=np.array([0, 1, 1, 0, 2, 2]),
+        )
+
+        self.assertAlmostEqual(metrics["total_return"], 20.0)
+        self.assertAlmostEqual(metrics["cagr"], 20.0)
+        self.assertAlmostEqual(metrics["mdd_percent"], 10.0)
+        self.assertEqual(metrics["mdd_index"], 2)
+        self.assertEqual(metrics["mdd_peak_index"], 1)
+        self.assertEqual(metrics["max_time_under_water"], 2)
+        self.assertAlmostEqual(metrics["time_under_water"], 3 / 6)
+        self.assertAlmostEqual(metrics["exposure"], 4 / 6)
+        self.assertGreater(metrics["sharpe"], 0)
+        self.assertGreater(metrics["sortino"], metrics["sharpe"])
+
+    def test_annualized_return_edge_cases(self):
+        self.assertEqual(annualized_return(0.0, 100.0, 252), 0.0)
+        self.assertEqual(annualized_return(150.0, 100.0, 0), 0.0)
+        np.testing.assert_allclose(annualized_return(np.array([121.0, 81.0]), 100.0, 504), [10.0, -10.0])
+
+    def test_drawdown_tracker_resumes_from_saved_state(self):
+        records = run_backtest(make_trader(compounding=True), "array")["daily_records"]
+        tracker = DrawdownTracker()
+        for start in range(0, len(records), 97):
+            tracker = DrawdownTracker.from_dict(tracker.to_dict())
+            self.assertEqual(tracker.update_records(records[: start + 97]), len(records[start:start + 97]))
+
+        self.assertEqual(tracker.mdd_info(), mdd_info(records))
+        self.assertEqual(tracker.last_date, records[-1]["date"])
+        self.assertEqual(tracker.update_records(records), 0)
+
+    def test_drawdown_tracker_matches_mdd_info_with_ties(self):
+        values = [0, 100, 120, 120, 90, 120, 90, 130, 65]
+        tracker = DrawdownTracker()
+        tracker.update_records(_records(values))
+
+        self.assertEqual(tracker.mdd_info(), mdd_info(_records(values)))
+        self.assertEqual(DrawdownTracker().mdd_info(), mdd_info([]))
+        with self.assertRaises(ValueError):
+            DrawdownTracker.from_dict({"peakValue": 1.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
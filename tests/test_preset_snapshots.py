@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from preset_snapshots import MAX_MDD_KEY, MDD_TRACKER_KEY, simulate_preset_snapshot, simulate_presets
+from simulation_cache import SimulationCache
+from soxl_quant_system import SOXLQuantTrader
+from backtest_fixtures import QQQ, REFERENCE, SOXL
+
+BARS = {"SOXL": SOXL, "QQQ": QQQ}
+SETTINGS = {"sf_config": None, "ag_config": None, "test_today_override": "2025-12-27"}
+PRESETS = {
+    "기본": {"initial_capital": 40_000, "session_start_date": "2023-01-03", "seed_increases": []},
+    "증액": {
+        "initial_capital": 25_000,
+        "session_start_date": "2024-03-04",
+        "seed_increases": [{"date": "2024-09-09", "amount": 10_000}],
+    },
+    "후발": {"initial_capital": 60_000, "session_start_date": "2024-09-03", "seed_increases": []},
+}
+
+
+def _stored_bars(trader, symbol, period):
+    return trader._slice_to_period(BARS[symbol.upper()], period)
+
+
+def _comparable(snapshot):
+    # 저장 시각(updatedAt 등)은 실행마다 달라지므로 비교에서 제외
+    result = {key: value for key, value in snapshot.items() if key not in (MAX_MDD_KEY, MDD_TRACKER_KEY)}
+    result[MAX_MDD_KEY] = snapshot[MAX_MDD_KEY]["percent"]
+    result[MDD_TRACKER_KEY] = snapshot[MDD_TRACKER_KEY]
+    return result
+
+
+class PresetSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        # 시세·RSI 참조 데이터는 고정 데이터로, 프로세스 공용 캐시·체크포인트는 트레이더마다 분리
+        patches = [
+            patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True),
+            patch.object(SOXLQuantTrader, "load_rsi_reference_data", return_value=REFERENCE),
+            patch.object(SOXLQuantTrader, "get_latest_trading_day", return_value=datetime(2025, 12, 26)),
+            patch.object(SOXLQuantTrader, "_load_stored_bars", autospec=True, side_effect=_stored_bars),
+            patch("soxl_quant_system.get_simulation_cache", side_effect=SimulationCache),
+            patch("soxl_quant_system.get_checkpoint_store", return_value=None),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_concurrent_run_matches_sequential_snapshots(self):
+        sequential = {
+            name: simulate_preset_snapshot(name, preset, {}, SETTINGS) for name, preset in PRESETS.items()
+        }
+        concurrent = simulate_presets(PRESETS, {}, SETTINGS)
+
+        self.assertEqual(list(concurrent), list(PRESETS))
+        for name in PRESETS:
+            expected, error = sequential[name]
+            self.assertIsNone(error, name)
+            actual, error = concurrent[name]
+            self.assertIsNone(error, name)
+            self.assertEqual(_comparable(actual), _comparable(expected), name)
+            positions = [value for key, value in expected.items() if key[:1].isdigit()]
+            self.assertTrue(positions or expected["available_cash"] > 0, name)
+
+    def test_preloaded_bars_are_sliced_copies(self):
+        trader = SOXLQuantTrader()
+        trader.set_test_today(SETTINGS["test_today_override"])
+        trader.preload_stock_data({"SOXL": SOXL})
+
+        month = trader.get_stock_data("SOXL", "1mo")
+        self.assertLess(len(month), 30)
+        self.assertEqual(month.index[-1], SOXL.index[-1])
+        self.assertEqual(len(trader.get_stock_data("SOXL", "max")), len(SOXL))
+
+        last_close = SOXL["Close"].iloc[-1]
+        month.loc[month.index[-1], "Close"] = -1.0
+        self.assertEqual(SOXL["Close"].iloc[-1], last_close)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import rsi_reference
+from rsi_reference import load_rsi_reference
+from soxl_quant_system import SOXLQuantTrader
+
+
+def _reference(weeks):
+    return {
+        "2026": {"description": "2026년 주간 RSI", "weeks": weeks},
+        "metadata": {"last_updated": weeks[-1]["end"], "total_weeks": len(weeks)},
+    }
+
+
+WEEK_1 = {"start": "2026-01-05", "end": "2026-01-09", "week": 2, "rsi": 61.2}
+WEEK_2 = {"start": "2026-01-12", "end": "2026-01-16", "week": 3, "rsi": 64.0}
+
+
+class BackgroundRSIRefreshTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "weekly_rsi_reference.json"
+        self._write([WEEK_1])
+        self.release = threading.Event()
+        self.update_calls = 0
+
+        patchers = [
+            patch.object(SOXLQuantTrader, "_rsi_refresh_checked_on", None),
+            patch.object(SOXLQuantTrader, "_rsi_refresh_thread", None),
+            patch.object(SOXLQuantTrader, "_run_rsi_reference_update", self._slow_update),
+            patch.object(SOXLQuantTrader, "_resolve_data_path", return_value=self.path),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.release.set()
+        SOXLQuantTrader.wait_for_rsi_refresh(timeout=5)
+        rsi_reference.clear_rsi_reference_cache()
+        self._tmp.cleanup()
+
+    def _write(self, weeks):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(_reference(weeks), f)
+
+    def _slow_update(self):
+        self.update_calls += 1
+        self.release.wait(timeout=5)
+        self._write([WEEK_1, WEEK_2])
+        return True
+
+    def _make_trader(self, check):
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", check):
+            return SOXLQuantTrader(initial_capital=100_000)
+
+    def test_constructor_returns_while_refresh_runs_once(self):
+        check = MagicMock(return_value=False)
+
+        started = time.perf_counter()
+        self._make_trader(check)
+        self._make_trader(check)
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(check.call_count, 1)
+        self.assertTrue(SOXLQuantTrader.rsi_refresh_in_progress())
+
+        self.release.set()
+        self.assertTrue(SOXLQuantTrader.wait_for_rsi_refresh(timeout=5))
+        self.assertEqual(self.update_calls, 1)
+
+    def test_only_lookups_past_the_file_wait_for_refresh(self):
+        trader = self._make_trader(MagicMock(return_value=False))
+        rsi_data = load_rsi_reference(self.path)
+
+        self.assertEqual(trader.get_rsi_from_reference(datetime(2026, 1, 9), rsi_data), 61.2)
+        self.assertTrue(SOXLQuantTrader.rsi_refresh_in_progress())
+
+        threading.Timer(0.1, self.release.set).start()
+        self.assertEqual(trader.get_rsi_from_reference(datetime(2026, 1, 16), rsi_data), 64.0)
+
+    def test_fresh_reference_starts_no_worker(self):
+        self._make_trader(MagicMock(return_value=True))
+
+        self.assertIsNone(SOXLQuantTrader._rsi_refresh_thread)
+        self.assertFalse(SOXLQuantTrader.wait_for_rsi_refresh(timeout=0))
+        self.assertEqual(self.update_calls, 0)
+
+    def test_marked_check_skips_refresh_for_the_day(self):
+        SOXLQuantTrader.mark_rsi_refresh_checked()
+        check = MagicMock(return_value=False)
+
+        self._make_trader(check)
+
+        check.assert_not_called()
+        self.assertIsNone(SOXLQuantTrader._rsi_refresh_thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+
+import update_rsi_data
+from rsi_reference import (
+    append_completed_weeks,
+    compute_completed_weeks,
+    last_completed_friday,
+    weekly_closes,
+)
+from soxl_quant_system import SOXLQuantTrader
+from update_rsi_data import RSIDataUpdater
+
+
+def _daily(start="2025-01-01", end="2026-02-27", seed=0):
+    index = pd.bdate_range(start, end, name="Date")
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0}, index=index)
+
+
+def _rolling_rsi(daily, window=14):
+    closes = daily["Close"].resample("W-FRI").last().dropna()
+    delta = closes.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    return (100 - (100 / (1 + gain / loss))).round(2)
+
+
+def _reference(*weeks):
+    data = {}
+    for week in weeks:
+        data.setdefault(week["end"][:4], {"description": "주간 RSI", "weeks": []})["weeks"].append(dict(week))
+    data["metadata"] = {"last_updated": "2026-01-10"}
+    return data
+
+
+OLD_2021 = {"start": "2021-03-01", "end": "2021-03-05", "week": 9, "rsi": 12.34}
+LAST_WEEK = {"start": "2026-01-26", "end": "2026-01-30", "week": 5, "rsi": 50.0}
+
+
+class IncrementalRSITests(unittest.TestCase):
+    def test_per_week_rsi_matches_rolling_mean_formula(self):
+        daily = _daily()
+        expected = _rolling_rsi(daily)
+
+        weeks = compute_completed_weeks(weekly_closes(daily), date(2025, 6, 1), date(2026, 2, 27))
+
+        self.assertTrue(weeks)
+        for week in weeks:
+            self.assertEqual(week["rsi"], expected[pd.Timestamp(week["end"])])
+        self.assertEqual(weeks[-1]["start"], "2026-02-23")
+
+    def test_only_weeks_after_last_record_are_appended(self):
+        data = _reference(OLD_2021, LAST_WEEK)
+        fetch = MagicMock(return_value=_daily())
+
+        added = append_completed_weeks(data, fetch, date(2026, 2, 20))
+
+        fetch.assert_called_once_with("6mo")
+        self.assertEqual([week["end"] for week in added], ["2026-02-06", "2026-02-13", "2026-02-20"])
+        self.assertEqual(data["2026"]["weeks"][0], LAST_WEEK)
+        self.assertEqual(data["2021"]["weeks"], [OLD_2021])
+
+    def test_up_to_date_reference_skips_fetch(self):
+        fetch = MagicMock()
+
+        self.assertEqual(append_completed_weeks(_reference(LAST_WEEK), fetch, date(2026, 1, 30)), [])
+        fetch.assert_not_called()
+
+    def test_friday_completes_after_regular_session_close(self):
+        self.assertEqual(last_completed_friday(datetime(2026, 2, 20, 15, 59)), date(2026, 2, 13))
+        self.assertEqual(last_completed_friday(datetime(2026, 2, 20, 16, 0)), date(2026, 2, 20))
+        self.assertEqual(last_completed_friday(datetime(2026, 2, 23, 9, 0)), date(2026, 2, 20))
+
+
+class ReferenceFileUpdateTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "weekly_rsi_reference.json"
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(_reference(OLD_2021, LAST_WEEK), f)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_updater_appends_without_wiping_2021(self):
+        updater = RSIDataUpdater(str(self.path))
+        with patch.object(update_rsi_data, "us_eastern_now", return_value=datetime(2026, 2, 14, 10, 0)), \
+                patch.object(updater, "get_stock_data", return_value=_daily()) as mock_fetch:
+            self.assertTrue(updater.update_rsi_data())
+
+        mock_fetch.assert_called_once_with("QQQ", "6mo")
+        data = self._load()
+        self.assertEqual(data["2021"]["weeks"], [OLD_2021])
+        self.assertEqual([week["end"] for week in data["2026"]["weeks"]], ["2026-01-30", "2026-02-06", "2026-02-13"])
+        self.assertEqual(data["metadata"]["total_weeks"], 4)
+        self.assertEqual(data["metadata"]["updated_by"], "update_rsi_data.py")
+        self.assertEqual(os.listdir(self._tmp.name), ["weekly_rsi_reference.json"])
+
+    def test_trader_update_appends_completed_weeks(self):
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            trader = SOXLQuantTrader(initial_capital=100_000)
+        trader.test_today_override = "2026-02-20"
+
+        with patch.object(SOXLQuantTrader, "_resolve_data_path", return_value=self.path), \
+                patch.object(trader, "get_stock_data", return_value=_daily()) as mock_fetch:
+            self.assertTrue(trader.update_rsi_reference_file())
+
+        mock_fetch.assert_called_once_with("QQQ", "6mo")
+        data = self._load()
+        # 2026-02-20(금) 정오 기준이므로 장 마감 전인 그 주는 제외
+        self.assertEqual(data["2026"]["weeks"][-1]["end"], "2026-02-13")
+        self.assertEqual(data["2026"]["weeks"][0], LAST_WEEK)
+
+
+if __name__ == "__main__":
+    unittest.main()
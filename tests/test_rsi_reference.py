@@ -0,0 +1,133 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import rsi_reference
+from rsi_reference import RSIReferenceData, WeeklyRSIIndex, get_weekly_rsi_index, load_rsi_reference
+from soxl_quant_system import SOXLQuantTrader
+
+
+def _reference():
+    return {
+        "2025": {
+            "description": "2025년 주간 RSI",
+            "weeks": [
+                {"start": "2025-12-15", "end": "2025-12-19", "week": 51, "rsi": 59.14},
+                {"start": "2025-12-22", "end": "2025-12-26", "week": 52, "rsi": 57.65},
+                {"start": "2025-12-29", "end": "2026-01-02", "week": 1, "rsi": 50.0},
+            ],
+        },
+        "2026": {
+            "description": "2026년 주간 RSI",
+            "weeks": [
+                {"start": "2025-12-29", "end": "2026-01-02", "week": 1, "rsi": 55.5},
+                {"start": "2026-01-05", "end": "2026-01-09", "week": 2, "rsi": 61.2},
+            ],
+        },
+        "metadata": {"last_updated": "2026-01-09", "total_weeks": 5},
+    }
+
+
+class WeeklyRSIIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = WeeklyRSIIndex(_reference())
+
+    def test_day_inside_week(self):
+        self.assertEqual(self.index.lookup("2025-12-17"), 59.14)
+        self.assertEqual(self.index.lookup("2026-01-09"), 61.2)
+
+    def test_duplicate_week_prefers_latest_year(self):
+        self.assertEqual(self.index.lookup("2025-12-31"), 55.5)
+
+    def test_weekend_falls_back_to_previous_week(self):
+        self.assertEqual(self.index.lookup("2025-12-21"), 59.14)
+
+    def test_fallback_gap_is_limited_to_seven_days(self):
+        self.assertEqual(self.index.lookup("2026-01-15"), 61.2)
+        self.assertIsNone(self.index.lookup("2026-01-16"))
+        self.assertIsNone(self.index.lookup("2025-12-01"))
+
+    def test_index_is_reused_until_reference_changes(self):
+        data = _reference()
+        first = get_weekly_rsi_index(data)
+        self.assertIs(get_weekly_rsi_index(data), first)
+
+        data["2026"]["weeks"].append({"start": "2026-01-12", "end": "2026-01-16", "week": 3, "rsi": 64.0})
+        updated = get_weekly_rsi_index(data)
+        self.assertIsNot(updated, first)
+        self.assertEqual(updated.lookup("2026-01-16"), 64.0)
+
+
+class MemoizedReferenceLoaderTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "weekly_rsi_reference.json"
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(_reference(), f)
+
+    def tearDown(self):
+        rsi_reference.clear_rsi_reference_cache()
+        self._tmp.cleanup()
+
+    def test_file_is_parsed_once_until_it_changes(self):
+        with patch.object(rsi_reference.json, "load", wraps=json.load) as mock_load:
+            first = load_rsi_reference(self.path)
+            second = load_rsi_reference(str(self.path))
+            self.assertIs(first, second)
+            self.assertEqual(mock_load.call_count, 1)
+
+            data = _reference()
+            data["2026"]["weeks"][-1]["rsi"] = 70.0
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            stat = os.stat(self.path)
+            os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+            third = load_rsi_reference(self.path)
+            self.assertIsNot(third, first)
+            self.assertEqual(mock_load.call_count, 2)
+        self.assertEqual(third.index.lookup("2026-01-09"), 70.0)
+
+    def test_view_is_read_only_and_indexed(self):
+        reference = load_rsi_reference(self.path)
+
+        self.assertIsInstance(reference, RSIReferenceData)
+        self.assertIs(get_weekly_rsi_index(reference), reference.index)
+        self.assertEqual(len(reference["2025"]["weeks"]), 3)
+        with self.assertRaises(TypeError):
+            reference["2025"]["weeks"][0]["rsi"] = 1.0
+        with self.assertRaises(TypeError):
+            reference["2026"] = {}
+        self.assertEqual(reference.to_dict(), _reference())
+
+    def test_missing_file_returns_none(self):
+        self.assertIsNone(load_rsi_reference(Path(self._tmp.name) / "missing.json"))
+
+    def test_traders_share_one_parsed_reference(self):
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            traders = [SOXLQuantTrader(initial_capital=100_000) for _ in range(2)]
+
+        with patch.object(SOXLQuantTrader, "_resolve_data_path", return_value=self.path):
+            loaded = [trader.load_rsi_reference_data() for trader in traders]
+
+        self.assertIs(loaded[0], loaded[1])
+        self.assertEqual(traders[0].get_rsi_from_reference(datetime(2025, 12, 17), loaded[0]), 59.14)
+
+
+class TraderReferenceLookupTests(unittest.TestCase):
+    def test_get_rsi_from_reference_uses_index(self):
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            trader = SOXLQuantTrader(initial_capital=100_000)
+        data = _reference()
+
+        self.assertEqual(trader.get_rsi_from_reference(datetime(2026, 1, 2), data), 55.5)
+        self.assertEqual(trader.get_rsi_from_reference(datetime(2026, 1, 10), data), 61.2)
+        self.assertIsNone(trader.get_rsi_from_reference(datetime(2026, 1, 2), {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
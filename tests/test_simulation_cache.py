@@ -0,0 +1,93 @@
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import simulation_cache
+from simulation_cache import SimulationCache, simulation_key
+from soxl_quant_system import SOXLQuantTrader
+from backtest_fixtures import QQQ, REFERENCE, SOXL
+
+LAST_SESSION = datetime(2025, 12, 26)
+
+
+class SimulationCacheTests(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SimulationCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+
+    def test_entries_expire_after_their_ttl(self):
+        cache = SimulationCache(ttl_seconds=100)
+        with patch.object(simulation_cache.time, "monotonic", return_value=0.0):
+            cache.put("default", 1)
+            cache.put("short", 2, ttl_seconds=10)
+        with patch.object(simulation_cache.time, "monotonic", return_value=50.0):
+            self.assertEqual(cache.get("default"), 1)
+            self.assertIsNone(cache.get("short"))
+        with patch.object(simulation_cache.time, "monotonic", return_value=100.0):
+            self.assertIsNone(cache.get("default"))
+        self.assertEqual(len(cache), 0)
+
+    def test_key_ignores_dict_order_but_not_values(self):
+        key = simulation_key({"a": 1, "b": {"x": [1, 2], "y": {"2025-01-02"}}})
+        self.assertEqual(key, simulation_key({"b": {"y": {"2025-01-02"}, "x": [1, 2]}, "a": 1}))
+        self.assertNotEqual(key, simulation_key({"a": 1, "b": {"x": [2, 1], "y": {"2025-01-02"}}}))
+
+
+class TraderSimulationCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = SimulationCache()
+
+    def _trader(self, seed_amount=10_000):
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            trader = SOXLQuantTrader(initial_capital=40_000)
+        trader._simulation_cache = self.cache
+        trader._checkpoint_store = None
+        trader.set_seed_increases([{"date": "2024-03-09", "amount": seed_amount}])
+        return trader
+
+    def _simulate(self, trader, last_session=LAST_SESSION, soxl=SOXL):
+        with patch.object(trader, "get_many", return_value={"SOXL": soxl, "QQQ": QQQ}), \
+                patch.object(trader, "load_rsi_reference_data", return_value=REFERENCE), \
+                patch.object(trader, "get_latest_trading_day", return_value=last_session), \
+                patch.object(trader, "run_backtest", wraps=trader.run_backtest) as run:
+            result = trader.simulate_from_start_to_today("2023-01-03")
+        return result, run.call_count
+
+    def test_new_trader_with_same_config_reuses_result_and_state(self):
+        first = self._trader()
+        expected, runs = self._simulate(first)
+        self.assertEqual(runs, 1)
+
+        second = self._trader()
+        result, runs = self._simulate(second)
+
+        self.assertEqual(runs, 0)
+        self.assertIs(result, expected)
+        self.assertEqual(second.positions, first.positions)
+        self.assertIsNot(second.positions, first.positions)
+        self.assertEqual(second.available_cash, first.available_cash)
+        self.assertEqual(second.processed_seed_dates, first.processed_seed_dates)
+
+    def test_config_or_session_change_misses(self):
+        self._simulate(self._trader())
+
+        self.assertEqual(self._simulate(self._trader(seed_amount=5_000))[1], 1)
+        self.assertEqual(self._simulate(self._trader(), last_session=datetime(2025, 12, 24))[1], 1)
+        self.assertEqual(len(self.cache), 3)
+
+    def test_result_missing_last_session_is_kept_briefly(self):
+        trader = self._trader()
+        with patch.object(self.cache, "put", wraps=self.cache.put) as put:
+            # 마지막 완료 세션(12/26) 일봉이 아직 들어오지 않은 상태
+            self._simulate(trader, soxl=SOXL[SOXL.index <= "2025-12-24"])
+        self.assertEqual(put.call_args.args[2], SOXLQuantTrader.INCOMPLETE_SIMULATION_CACHE_SECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
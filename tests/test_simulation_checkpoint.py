@@ -0,0 +1,155 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+
+from simulation_cache import SimulationCache
+from simulation_checkpoint import CheckpointStore, decode_value, encode_value
+from soxl_quant_system import SOXLQuantTrader
+from backtest_fixtures import QQQ, REFERENCE, SOXL, trader_state
+
+CHECKPOINT_SESSION = datetime(2024, 2, 29)
+MIDDLE_SESSION = datetime(2024, 11, 29)
+LAST_SESSION = datetime(2025, 12, 26)
+
+
+class CheckpointEncodingTests(unittest.TestCase):
+    def test_dates_and_sets_round_trip(self):
+        value = {
+            "positions": [{"buy_date": pd.Timestamp("2024-02-28"), "shares": 3}],
+            "settlements": [{"trade_date": datetime(2024, 2, 28), "pnl": -1.5}],
+            "processed": {"2024-03-09", "2023-05-01"},
+            "friday": None,
+        }
+        self.assertEqual(decode_value(encode_value(value)), value)
+
+
+class CheckpointStoreTests(unittest.TestCase):
+    def test_oldest_checkpoints_are_pruned(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = CheckpointStore(root, max_files=2)
+            for index, key in enumerate("abc"):
+                store.save(key, {"session": key})
+                os.utime(store._path(key), ns=(index, index))
+            store.save("c", {"session": "c2"})
+
+            self.assertIsNone(store.load("a"))
+            self.assertEqual(store.load("c"), {"session": "c2"})
+            self.assertEqual(sorted(os.listdir(root)), ["b.json", "c.json"])
+
+    def test_records_log_keeps_only_committed_rows(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = CheckpointStore(root)
+            size = store.append_records("k", enumerate([{"day": 1}, {"day": 2}]))
+            # 확정되지 않은 덧붙임(체크포인트 JSON 저장 전 중단)은 읽지 않음
+            store.append_records("k", [(0, {"day": 99})], size)
+            self.assertEqual(store.load_records("k", size, 2), [{"day": 1}, {"day": 2}])
+
+            # 다음 저장은 미확정 행을 잘라내고 이어 씀, 같은 위치의 나중 행이 이전 행을 대체
+            size = store.append_records("k", [(1, {"day": 2, "sold": True}), (2, {"day": 3})], size)
+            self.assertEqual(
+                store.load_records("k", size, 3), [{"day": 1}, {"day": 2, "sold": True}, {"day": 3}]
+            )
+            self.assertIsNone(store.load_records("k", size, 4))
+            self.assertIsNone(store.load_records("missing", size, 3))
+
+
+class IncrementalSimulationTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = CheckpointStore(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _trader(self, store, compounding=False):
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            trader = SOXLQuantTrader(initial_capital=40_000)
+        trader._simulation_cache = SimulationCache()
+        trader._checkpoint_store = store
+        if compounding:
+            trader.set_profit_loss_compounding(enabled=True)
+        trader.set_seed_increases([{"date": "2024-03-09", "amount": 10_000}])
+        return trader
+
+    def _files(self):
+        return sorted(os.listdir(self._tmp.name))
+
+    def _simulate(self, trader, last_session=LAST_SESSION, soxl=SOXL):
+        with patch.object(trader, "get_many", return_value={"SOXL": soxl, "QQQ": QQQ}), \
+                patch.object(trader, "load_rsi_reference_data", return_value=REFERENCE), \
+                patch.object(trader, "get_latest_trading_day", return_value=last_session), \
+                patch.object(trader, "run_backtest", wraps=trader.run_backtest) as run:
+            result = trader.simulate_from_start_to_today("2023-01-03")
+        return result, run.call_count
+
+    def _assert_resume_matches_full_run(self, compounding):
+        self._simulate(
+            self._trader(self.store, compounding), CHECKPOINT_SESSION, SOXL[SOXL.index <= CHECKPOINT_SESSION]
+        )
+        self.assertEqual([name.split(".", 1)[1] for name in self._files()], ["json", "records.jsonl"])
+
+        resumed = self._trader(self.store, compounding)
+        actual, runs = self._simulate(resumed)
+        full = self._trader(None, compounding)
+        expected, _ = self._simulate(full)
+
+        self.assertEqual(runs, 0)
+        self.assertEqual(actual, expected)
+        self.assertEqual(trader_state(resumed), trader_state(full))
+        self.assertEqual(resumed.compound_reference_seed, full.compound_reference_seed)
+        self.assertEqual(resumed.trading_days_count, full.trading_days_count)
+        return actual
+
+    def test_resume_matches_full_run(self):
+        result = self._assert_resume_matches_full_run(compounding=False)
+        # 체크포인트 이후 체결된 매도가 체크포인트 이전 매수 행에도 반영됨
+        self.assertTrue(any(r["sell_date"] for r in result["daily_records"] if r["date"] <= "2024-02-29"))
+        self.assertEqual(self.store.load(next(iter(self.store.root.glob("*.json"))).stem)["session"], "2025-12-26")
+
+    def test_resume_with_compounding_matches_full_run(self):
+        self._assert_resume_matches_full_run(compounding=True)
+
+    def test_repeated_resume_appends_only_new_rows(self):
+        self._simulate(self._trader(self.store), CHECKPOINT_SESSION, SOXL[SOXL.index <= CHECKPOINT_SESSION])
+        key = next(self.store.root.glob("*.json")).stem
+        first = self.store.load(key)["records"]
+
+        middle = self._simulate(self._trader(self.store), MIDDLE_SESSION, SOXL[SOXL.index <= MIDDLE_SESSION])
+        self.assertEqual(middle[1], 0)
+        second = self.store.load(key)["records"]
+        log = self.store._records_path(key).read_bytes()
+        # 기존 기록은 다시 쓰지 않고, 새 봉 행과 다시 기록된 미청산 매수 행만 덧붙임
+        appended = log[first["size"]:second["size"]].splitlines()
+        self.assertGreater(second["count"], first["count"])
+        self.assertLess(len(appended), second["count"] - first["count"] + 10)
+
+        resumed = self._trader(self.store)
+        actual, runs = self._simulate(resumed)
+        full = self._trader(None)
+        expected, _ = self._simulate(full)
+        self.assertEqual(runs, 0)
+        self.assertEqual(actual, expected)
+        self.assertEqual(trader_state(resumed), trader_state(full))
+
+    def test_revised_checkpoint_close_replays_from_start(self):
+        self._simulate(self._trader(self.store), CHECKPOINT_SESSION, SOXL[SOXL.index <= CHECKPOINT_SESSION])
+        revised = SOXL.copy()
+        revised.loc[pd.Timestamp(CHECKPOINT_SESSION), "Close"] *= 1.01
+
+        self.assertEqual(self._simulate(self._trader(self.store), soxl=revised)[1], 1)
+
+    def test_config_change_does_not_reuse_checkpoint(self):
+        self._simulate(self._trader(self.store), CHECKPOINT_SESSION, SOXL[SOXL.index <= CHECKPOINT_SESSION])
+        trader = self._trader(self.store)
+        trader.sf_config = dict(trader.sf_config, buy_threshold=trader.sf_config["buy_threshold"] + 0.5)
+
+        self.assertEqual(self._simulate(trader)[1], 1)
+        self.assertEqual(len(self._files()), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import patch
+
+from parameter_sweep import grid_configs, prepare_sweep_data
+from soxl_quant_system import SOXLQuantTrader
+from backtest_fixtures import QQQ, REFERENCE, SOXL, make_trader
+from walk_forward import run_walk_forward, summarize_walk_forward, walk_forward_windows
+
+GRID = {"sf.sell_threshold": [1.0, 1.4, 2.0], "ag.max_hold_days": [5, 7]}
+
+
+def _patched(trader):
+    return patch.object(trader, "get_many", return_value={"SOXL": SOXL, "QQQ": QQQ}), \
+        patch.object(trader, "load_rsi_reference_data", return_value=REFERENCE)
+
+
+def _data(trader):
+    bars, reference = _patched(trader)
+    with bars, reference, trader.quiet_logging():
+        return prepare_sweep_data(trader, "2023-01-03", "2025-12-26")
+
+
+class WalkForwardTests(unittest.TestCase):
+    def test_rolling_and_anchored_windows(self):
+        self.assertEqual(walk_forward_windows(10, 4, 2), [(0, 4, 4, 6), (2, 6, 6, 8), (4, 8, 8, 10)])
+        self.assertEqual(walk_forward_windows(10, 4, 2, anchored=True), [(0, 4, 4, 6), (0, 6, 6, 8), (0, 8, 8, 10)])
+        self.assertEqual(walk_forward_windows(10, 4, 3, step_bars=1), [(0, 4, 4, 7), (1, 5, 5, 8), (2, 6, 6, 9), (3, 7, 7, 10)])
+        self.assertEqual(walk_forward_windows(5, 4, 2), [])
+
+    def test_test_window_score_matches_run_backtest_from_test_start(self):
+        trader = make_trader()
+        trader.set_seed_increases(None)
+        data = _data(trader)
+        table = run_walk_forward(data, grid_configs(trader.sf_config, trader.ag_config, GRID),
+                                 train_bars=250, test_bars=125, max_workers=1)
+
+        row = table.iloc[-1]
+        with patch.object(SOXLQuantTrader, "check_and_update_rsi_data", return_value=True):
+            chosen = SOXLQuantTrader(initial_capital=40_000, sf_config=row["sf_config"], ag_config=row["ag_config"])
+        bars, reference = _patched(chosen)
+        with bars, reference, chosen.quiet_logging():
+            expected = chosen.run_backtest(row["test_start"], row["test_end"])
+
+        self.assertEqual(expected["daily_records"][0]["date"], row["test_start"])
+        self.assertAlmostEqual(row["test_final_value"], expected["final_value"], places=6)
+        self.assertAlmostEqual(row["test_total_return"], expected["total_return"], places=6)
+
+    def test_parallel_folds_match_sequential_run(self):
+        trader = make_trader()
+        data = _data(trader)
+        configs = grid_configs(trader.sf_config, trader.ag_config, GRID)
+
+        expected = run_walk_forward(data, configs, train_bars=250, test_bars=125, objective="return_over_mdd", max_workers=1)
+        actual = run_walk_forward(data, configs, train_bars=250, test_bars=125, objective="return_over_mdd", max_workers=3)
+
+        self.assertEqual(actual.to_dict("records"), expected.to_dict("records"))
+        self.assertEqual(list(actual["fold"]), list(range(1, len(actual) + 1)))
+        self.assertTrue((actual["test_start"] > actual["train_end"]).all())
+        summary = summarize_walk_forward(actual)
+        self.assertEqual(summary["folds"], len(actual))
+        self.assertAlmostEqual(
+            summary["chained_test_return"],
+            ((1 + actual["test_total_return"] / 100).prod() - 1) * 100,
+        )
+
+    def test_rejects_unknown_objective_and_short_history(self):
+        trader = make_trader()
+        data = _data(trader)
+        configs = grid_configs(trader.sf_config, trader.ag_config, {})
+        with self.assertRaises(ValueError):
+            run_walk_forward(data, configs, objective="sharpe")
+        with self.assertRaises(ValueError):
+            run_walk_forward(data, configs, train_bars=len(data.closes), test_bars=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,16 +2,35 @@
 # -*- coding: utf-8 -*-
 """
 RSI 데이터 업데이트 스크립트
-오늘 날짜까지의 주간 RSI 데이터를 자동으로 계산하여 JSON 파일에 업데이트
+마지막 기록 주차 이후 완료된 주간 RSI만 계산하여 JSON 파일에 추가 (--full: 전체 재계산)
 """
 
-import requests
 import json
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import os
 import sys
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from market_data import MarketDataError, get_market_data_client, parse_chart_result
+from rsi_reference import (
+    append_completed_weeks,
+    last_completed_friday,
+    latest_reference_end,
+    refresh_metadata,
+    write_rsi_reference,
+)
+
+
+def us_eastern_now() -> datetime:
+    """미국 동부시간(ET) 현재시각 (tz 정보 없는 datetime)"""
+    try:
+        return datetime.now(ZoneInfo("America/New_York")).replace(tzinfo=None)
+    except ZoneInfoNotFoundError:
+        # tzdata가 없는 환경: 서머타임(3~10월) 대략 판별
+        now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
+        return now_utc - timedelta(hours=4 if 3 <= now_utc.month <= 10 else 5)
 
 class CompactJSONEncoder(json.JSONEncoder):
     """각 주차 객체를 한 줄로 저장하는 커스텀 JSON 인코더"""
@@ -67,55 +86,26 @@ class RSIDataUpdater:
             DataFrame: 주식 데이터 (Date, Open, High, Low, Close, Volume)
         """
         try:
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
             # 충분한 기간 확보 (기본 max, 환경변수 RSI_PERIOD로 조정 가능)
             params = {'range': period, 'interval': '1d'}
             
             print(f"📊 {symbol} 데이터 가져오는 중... (기간: {period})")
             
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            result = get_market_data_client().get_chart_result(symbol, params, timeout=15)
+            df = parse_chart_result(result)
+            if df is None:
+                print(f"   ❌ 차트 데이터 구조 오류")
+                return None
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
-                    result = data['chart']['result'][0]
-                    
-                    if 'timestamp' in result and 'indicators' in result:
-                        timestamps = result['timestamp']
-                        quote_data = result['indicators']['quote'][0]
-                        
-                        # DataFrame 생성
-                        df_data = {
-                            'Date': [datetime.fromtimestamp(ts) for ts in timestamps],
-                            'Open': quote_data.get('open', [None] * len(timestamps)),
-                            'High': quote_data.get('high', [None] * len(timestamps)),
-                            'Low': quote_data.get('low', [None] * len(timestamps)),
-                            'Close': quote_data.get('close', [None] * len(timestamps)),
-                            'Volume': quote_data.get('volume', [None] * len(timestamps))
-                        }
-                        
-                        df = pd.DataFrame(df_data)
-                        df = df.dropna()  # NaN 값 제거
-                        df.set_index('Date', inplace=True)
-                        
-                        print(f"✅ {symbol} 데이터 가져오기 성공! ({len(df)}일치 데이터)")
-                        print(f"   기간: {df.index[0].strftime('%Y-%m-%d')} ~ {df.index[-1].strftime('%Y-%m-%d')}")
-                        return df
-                    else:
-                        print(f"   ❌ 차트 데이터 구조 오류")
-                else:
-                    print(f"   ❌ 차트 결과 없음")
-            else:
-                print(f"   ❌ HTTP 오류: {response.status_code}")
+            df = df.dropna()  # NaN 값 제거
             
-            return None
+            print(f"✅ {symbol} 데이터 가져오기 성공! ({len(df)}일치 데이터)")
+            print(f"   기간: {df.index[0].strftime('%Y-%m-%d')} ~ {df.index[-1].strftime('%Y-%m-%d')}")
+            return df
                 
+        except MarketDataError as e:
+            print(f"   ❌ {e}")
+            return None
         except Exception as e:
             print(f"❌ {symbol} 데이터 가져오기 오류: {e}")
             return None
@@ -204,9 +194,43 @@ class RSIDataUpdater:
             print(f"❌ RSI 데이터 로드 오류: {e}")
             return {}
     
-    def update_rsi_data(self) -> bool:
+    @staticmethod
+    def format_reference(data: dict) -> str:
+        """참조 데이터를 파일 형식 문자열로 변환 (각 주차 객체를 한 줄로, 연도순 정렬)"""
+        sorted_years = sorted([k for k in data.keys() if k != 'metadata'])
+        
+        year_lines = []
+        for year in sorted_years:
+            year_data = data[year]
+            desc = json.dumps(year_data['description'], ensure_ascii=False)
+            week_lines = []
+            for week in year_data['weeks']:
+                week_str = json.dumps(week, ensure_ascii=False, separators=(',', ':'))
+                week_lines.append(f'      {week_str}')
+            weeks_str = '[\n' + ',\n'.join(week_lines) + '\n    ]'
+            year_str = f'  "{year}": {{\n    "description": {desc},\n    "weeks": {weeks_str}\n  }}'
+            year_lines.append(year_str)
+        
+        # metadata 추가
+        metadata = data['metadata']
+        metadata_items = []
+        for key, value in metadata.items():
+            if isinstance(value, str):
+                metadata_items.append(f'    "{key}": {json.dumps(value, ensure_ascii=False)}')
+            else:
+                metadata_items.append(f'    "{key}": {value}')
+        metadata_str = '{\n' + ',\n'.join(metadata_items) + '\n  }'
+        year_lines.append(f'  "metadata": {metadata_str}')
+        
+        return '{\n' + ',\n'.join(year_lines) + '\n}'
+    
+    def update_rsi_data(self, full: bool = False) -> bool:
         """
-        RSI 데이터 업데이트 (오늘 날짜까지)
+        RSI 데이터 업데이트 (마지막 기록 주차 이후 완료된 금요일만 추가)
+        RSI는 14주 이동평균이므로 새 주차 계산에는 직전 15주 종가만 필요하다.
+        기존 주차는 다시 계산하지 않으며, 파일이 비어 있거나 full=True면 2010년부터 전체 생성.
+        Args:
+            full: 기존 데이터를 버리고 전체 주차를 다시 계산할지 여부
         Returns:
             bool: 업데이트 성공 여부
         """
@@ -215,7 +239,7 @@ class RSIDataUpdater:
             print("=" * 60)
             
             # 1. 기존 데이터 로드
-            existing_data = self.load_existing_data()
+            existing_data = {} if full else self.load_existing_data()
 
             # 1-1. 2010년 이전 데이터 제거
             years_to_remove = [str(year) for year in range(2000, 2010)]
@@ -226,183 +250,45 @@ class RSIDataUpdater:
                     del existing_data[year]
             if removed_years:
                 print(f"\n🧹 2010년 이전 데이터 제거: {', '.join(removed_years)}")
-
-            # 1-2. 2021년 RSI를 다시 계산하기 위해 기존 2021년 주차 데이터 초기화
-            target_year = "2021"
-            if target_year in existing_data:
-                old_count = len(existing_data[target_year].get("weeks", []))
-                print(f"\n🧹 {target_year}년 기존 주차 {old_count}개를 비우고 다시 계산합니다.")
-                existing_data[target_year]["weeks"] = []
             
-            # 2. QQQ 데이터 가져오기 (2010년부터 현재까지)
-            print("\n📊 QQQ 데이터 수집 중...")
-            # 2010년부터 현재까지의 데이터만 가져오기 위해 기간 계산
-            start_date = datetime(2010, 1, 1)
-            today = datetime.now()
-            days_diff = (today - start_date).days
-            
-            # 기간에 따라 적절한 period 선택
-            if days_diff <= 365:
-                period = "1y"
-            elif days_diff <= 730:
-                period = "2y"
-            elif days_diff <= 1825:  # 5년
-                period = "15y"  # 15년으로 통일 (정확한 RSI)
-            elif days_diff <= 3650:  # 10년
-                period = "15y"  # 15년으로 통일
+            # 2. 추가할 주차 범위 (마지막 기록 주차 다음 ~ 정규장이 마감된 가장 최근 금요일)
+            through = last_completed_friday(us_eastern_now())
+            last_end = latest_reference_end(existing_data)
+            if last_end is not None:
+                print(f"\n📅 마지막 기록 주차: {last_end} → 완료된 금요일: {through}")
             else:
-                period = "15y"  # 15년 (2010년부터 현재까지 약 15년)
-            
-            print(f"   기간: 2010-01-01 ~ {today.strftime('%Y-%m-%d')} ({period})")
+                print(f"\n📅 기존 주차 없음 → 2010년부터 {through}까지 전체 계산")
             
-            qqq_data = self.get_stock_data("QQQ", period)
-            if qqq_data is None:
+            # 3. 필요한 기간만 QQQ 데이터 조회 후 새 주차 RSI 계산
+            new_weeks = append_completed_weeks(existing_data, lambda period: self.get_stock_data("QQQ", period), through)
+            if new_weeks is None:
                 print("❌ QQQ 데이터를 가져올 수 없습니다.")
                 return False
             
-            # 2010년 1월 1일 이전 데이터 필터링
-            qqq_data = qqq_data[qqq_data.index >= start_date]
-            print(f"   필터링 후 데이터: {len(qqq_data)}일치 ({qqq_data.index[0].strftime('%Y-%m-%d')} ~ {qqq_data.index[-1].strftime('%Y-%m-%d')})")
+            for week_data in new_weeks:
+                print(f"   ➕ {week_data['end'][:4]}년 {week_data['week']}주차 추가: RSI {week_data['rsi']:.2f}")
             
-            # 3. 주간 RSI 계산
-            print("\n📈 주간 RSI 계산 중...")
-            weekly_rsi = self.calculate_weekly_rsi(qqq_data)
-            if weekly_rsi is None:
-                print("❌ 주간 RSI 계산 실패")
-                return False
-            
-            # 4. 주간 데이터로 변환 (금요일 기준)
-            weekly_data = qqq_data.resample('W-FRI').agg({
-                'Open': 'first',
-                'High': 'max',
-                'Low': 'min',
-                'Close': 'last',
-                'Volume': 'sum'
-            }).dropna()
-            
-            # 5. 각 연도별로 데이터 업데이트 (2010년부터)
-            print("\n📝 연도별 RSI 데이터 업데이트 중...")
-            
-            # 연도별로 그룹화 (2010년부터만)
-            yearly_data = {}
-            for date, rsi_value in weekly_rsi.items():
-                if not np.isnan(rsi_value) and date.year >= 2010:
-                    year = date.year
-                    if year not in yearly_data:
-                        yearly_data[year] = []
-                    
-                    # 해당 주의 시작일 계산 (월요일)
-                    week_start = date - timedelta(days=4)  # 금요일에서 4일 전 = 월요일
-                    
-                    # 주차 번호 계산
-                    week_num = week_start.isocalendar()[1]
-                    
-                    yearly_data[year].append({
-                        "start": week_start.strftime('%Y-%m-%d'),
-                        "end": date.strftime('%Y-%m-%d'),
-                        "week": week_num,
-                        "rsi": round(float(rsi_value), 2)
-                    })
+            # 4. 메타데이터 업데이트
+            today_str = datetime.now().strftime('%Y-%m-%d')
+            total_weeks = refresh_metadata(existing_data, today_str, updated_by="update_rsi_data.py")
             
-            # 6. 기존 데이터에 새로운 데이터 추가/업데이트
-            updated_count = 0
-            for year, weeks_data in yearly_data.items():
-                year_str = str(year)
-                
-                # 해당 연도 데이터 초기화
-                if year_str not in existing_data:
-                    existing_data[year_str] = {
-                        "description": f"{year}년 주간 RSI 데이터",
-                        "weeks": []
-                    }
-                
-                # 주차별로 정렬
-                weeks_data.sort(key=lambda x: x['week'])
-                
-                # 기존 주차와 비교하여 업데이트 또는 추가
-                for week_data in weeks_data:
-                    week_num = week_data['week']
-                    
-                    # 기존 주차 찾기
-                    week_exists = False
-                    for i, existing_week in enumerate(existing_data[year_str]['weeks']):
-                        if existing_week['week'] == week_num:
-                            # 기존 데이터 업데이트
-                            old_rsi = existing_week.get('rsi', 0)
-                            existing_data[year_str]['weeks'][i] = week_data
-                            if old_rsi != week_data['rsi']:
-                                updated_count += 1
-                                print(f"   📝 {year}년 {week_num}주차 업데이트: {old_rsi} → {week_data['rsi']:.2f}")
-                            week_exists = True
-                            break
-                    
-                    if not week_exists:
-                        # 새로운 주차 추가
-                        existing_data[year_str]['weeks'].append(week_data)
-                        updated_count += 1
-                        print(f"   ➕ {year}년 {week_num}주차 추가: RSI {week_data['rsi']:.2f}")
-                
-                # 주차별로 정렬
-                existing_data[year_str]['weeks'].sort(key=lambda x: x['week'])
-            
-            # 7. 메타데이터 업데이트
-            total_weeks = sum(len(year_data['weeks']) for year, year_data in existing_data.items() if year != 'metadata')
-            existing_data['metadata'] = {
-                "last_updated": datetime.now().strftime('%Y-%m-%d'),
-                "total_years": len([k for k in existing_data.keys() if k != 'metadata']),
-                "total_weeks": total_weeks,
-                "description": "QQQ 주간 RSI 참조 데이터 (14주 Wilder's RSI)",
-                "updated_by": "update_rsi_data.py"
-            }
-            
-            # 8. JSON 파일 저장 (각 주차 객체를 한 줄로)
+            # 5. JSON 파일 저장 (각 주차 객체를 한 줄로, 임시 파일 교체 방식)
             print(f"\n💾 JSON 파일 저장 중...")
-            with open(self.json_file_path, 'w', encoding='utf-8') as f:
-                # 연도별로 정렬
-                sorted_years = sorted([k for k in existing_data.keys() if k != 'metadata'])
-                
-                f.write('{\n')
-                year_lines = []
-                for year in sorted_years:
-                    year_data = existing_data[year]
-                    desc = json.dumps(year_data['description'], ensure_ascii=False)
-                    week_lines = []
-                    for week in year_data['weeks']:
-                        week_str = json.dumps(week, ensure_ascii=False, separators=(',', ':'))
-                        week_lines.append(f'      {week_str}')
-                    weeks_str = '[\n' + ',\n'.join(week_lines) + '\n    ]'
-                    year_str = f'  "{year}": {{\n    "description": {desc},\n    "weeks": {weeks_str}\n  }}'
-                    year_lines.append(year_str)
-                
-                # metadata 추가
-                metadata = existing_data['metadata']
-                metadata_items = []
-                for key, value in metadata.items():
-                    if isinstance(value, str):
-                        metadata_items.append(f'    "{key}": {json.dumps(value, ensure_ascii=False)}')
-                    else:
-                        metadata_items.append(f'    "{key}": {value}')
-                metadata_str = '{\n' + ',\n'.join(metadata_items) + '\n  }'
-                year_lines.append(f'  "metadata": {metadata_str}')
-                
-                f.write(',\n'.join(year_lines))
-                f.write('\n}')
+            write_rsi_reference(self.json_file_path, self.format_reference(existing_data))
             
             print("✅ RSI 데이터 업데이트 완료!")
             print("=" * 60)
             print(f"📊 업데이트 결과:")
             print(f"   - 총 {total_weeks}개 주차 데이터")
-            print(f"   - 업데이트된 주차: {updated_count}개")
-            print(f"   - 마지막 업데이트: {datetime.now().strftime('%Y-%m-%d')}")
+            print(f"   - 추가된 주차: {len(new_weeks)}개")
+            print(f"   - 마지막 업데이트: {today_str}")
             print(f"   - 파일 경로: {os.path.abspath(self.json_file_path)}")
             
-            # 9. 최신 5주차 RSI 정보 출력
-            print(f"\n📈 최신 5주차 RSI:")
-            for year in sorted(yearly_data.keys(), reverse=True)[:2]:  # 최근 2년
-                year_weeks = existing_data[str(year)]['weeks']
-                recent_weeks = year_weeks[-3:] if len(year_weeks) >= 3 else year_weeks
-                for week in recent_weeks:
-                    print(f"   - {year}년 {week['week']}주차 ({week['end']}): RSI {week['rsi']:.2f}")
+            # 6. 최근 추가 주차 RSI 정보 출력
+            if new_weeks:
+                print(f"\n📈 최근 추가 주차 RSI:")
+                for week in new_weeks[-3:]:
+                    print(f"   - {week['end'][:4]}년 {week['week']}주차 ({week['end']}): RSI {week['rsi']:.2f}")
             
             return True
             
@@ -416,15 +302,17 @@ def main():
     """메인 실행 함수"""
     print("🚀 RSI 데이터 업데이트 스크립트")
     print("=" * 60)
-    print("📝 오늘 날짜까지의 QQQ 주간 RSI 데이터를 자동으로 계산하여 업데이트합니다.")
+    print("📝 마지막 기록 이후 완료된 QQQ 주간 RSI만 계산하여 추가합니다. (--full: 전체 재계산)")
     print()
     
     # JSON 파일 경로 확인
     json_file = "data/weekly_rsi_reference.json"
     
-    # 명령행 인수로 파일 경로 지정 가능
-    if len(sys.argv) > 1:
-        json_file = sys.argv[1]
+    # 명령행 인수로 파일 경로 지정 가능 (--full: 전체 주차 다시 계산)
+    args = [arg for arg in sys.argv[1:] if arg != "--full"]
+    full = "--full" in sys.argv[1:]
+    if args:
+        json_file = args[0]
     
     print(f"📁 대상 파일: {json_file}")
     
@@ -432,7 +320,7 @@ def main():
     updater = RSIDataUpdater(json_file)
     
     # 업데이트 실행
-    success = updater.update_rsi_data()
+    success = updater.update_rsi_data(full=full)
     
     if success:
         print("\n🎉 RSI 데이터 업데이트가 성공적으로 완료되었습니다!")
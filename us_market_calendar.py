@@ -3,15 +3,28 @@
 The recurring full-day closures follow the NYSE/Nasdaq holiday calendar.  A
 small explicit set covers unscheduled full-market closures that cannot be
 derived from a recurring rule.  Early-close sessions remain trading days.
+
+``TradingSessionIndex`` precomputes the sessions as a sorted ordinal array so
+that session counting and stepping are array lookups instead of day walks.
+The batch helpers (``trading_day_mask``, ``sessions_after``,
+``sessions_between``, ``us_equity_business_day``) answer whole date ranges or
+position lists in one call and return NumPy/pandas objects.
 """
 
+import threading
 from datetime import date, datetime, timedelta
 from functools import lru_cache
-from typing import Iterable, Union
+from typing import Dict, FrozenSet, Iterable, Tuple, Union
+
+import numpy as np
+import pandas as pd
 
 
 DateLike = Union[date, datetime]
 
+# date(1970, 1, 1).toordinal(); converts between datetime64[D] and date ordinals.
+_EPOCH_ORDINAL = 719163
+
 
 # Unscheduled US equity-market closures relevant to the available price
 # history.  Keep these explicit because no calendar rule can predict them.
@@ -129,15 +142,7 @@ def is_us_equity_market_holiday(
     day = _as_date(value)
     if day in us_equity_market_holidays(day.year):
         return True
-
-    day_text = day.isoformat()
-    for extra in extra_holidays:
-        if isinstance(extra, str):
-            if extra == day_text:
-                return True
-        elif _as_date(extra) == day:
-            return True
-    return False
+    return bool(extra_holidays) and day in _normalize_extra_holidays(extra_holidays)
 
 
 def is_us_equity_trading_day(
@@ -146,3 +151,232 @@ def is_us_equity_trading_day(
 ) -> bool:
     day = _as_date(value)
     return day.weekday() < 5 and not is_us_equity_market_holiday(day, extra_holidays)
+
+
+@lru_cache(maxsize=64)
+def _extra_holiday_set(extra_holidays: FrozenSet[Union[DateLike, str]]) -> FrozenSet[date]:
+    days = set()
+    for extra in extra_holidays:
+        if isinstance(extra, str):
+            days.add(datetime.strptime(extra, "%Y-%m-%d").date())
+        else:
+            days.add(_as_date(extra))
+    return frozenset(days)
+
+
+def _normalize_extra_holidays(extra_holidays: Iterable[Union[DateLike, str]]) -> FrozenSet[date]:
+    """Index extra closures (``date``/``datetime``/``YYYY-MM-DD``) as a set of dates.
+
+    The conversion is cached per distinct set of closures, so repeated calls with
+    the same runtime holiday set cost one hash lookup instead of a linear scan.
+    """
+    return _extra_holiday_set(frozenset(extra_holidays))
+
+
+def _to_ordinals(values) -> np.ndarray:
+    """Convert a scalar or array of date-likes to proleptic Gregorian ordinals."""
+    if isinstance(values, (date, str)):
+        values = [values]
+    if isinstance(values, (list, tuple)) and all(isinstance(value, date) for value in values):
+        # date/datetime/Timestamp objects: skip the pandas parsing round-trip
+        return np.fromiter((value.toordinal() for value in values), dtype=np.int64, count=len(values))
+    days = pd.DatetimeIndex(pd.to_datetime(values))
+    return days.values.astype("datetime64[D]").astype(np.int64) + _EPOCH_ORDINAL
+
+
+def _from_ordinals(ordinals: np.ndarray) -> np.ndarray:
+    return (np.asarray(ordinals, dtype=np.int64) - _EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+class TradingSessionIndex:
+    """Sorted US equity sessions for constant/logarithmic-time calendar math.
+
+    Sessions are stored as ``date.toordinal()`` values in a sorted NumPy array
+    together with an ordinal-to-position map.  The covered year span grows on
+    demand, so queries outside the initial span still resolve correctly.
+    """
+
+    #: Years covered by a freshly built index (extended on demand).
+    DEFAULT_FIRST_YEAR = 1990
+    DEFAULT_YEARS_AHEAD = 2
+
+    def __init__(self, extra_holidays: Iterable[Union[DateLike, str]] = ()):
+        self.extra_holidays = _normalize_extra_holidays(extra_holidays)
+        self._lock = threading.Lock()
+        # (first_year, last_year, ordinals, positions); replaced as a whole so
+        # readers always see a consistent snapshot without taking the lock.
+        self._state: Tuple[int, int, np.ndarray, Dict[int, int]] = self._build(
+            self.DEFAULT_FIRST_YEAR, date.today().year + self.DEFAULT_YEARS_AHEAD
+        )
+
+    def _build(self, first_year: int, last_year: int) -> Tuple[int, int, np.ndarray, Dict[int, int]]:
+        days = np.arange(date(first_year, 1, 1).toordinal(), date(last_year, 12, 31).toordinal() + 1, dtype=np.int64)
+        closed = {
+            day.toordinal()
+            for year in range(first_year, last_year + 1)
+            for day in us_equity_market_holidays(year)
+        }
+        closed.update(day.toordinal() for day in self.extra_holidays)
+        # date.fromordinal(1) is a Monday, so (ordinal - 1) % 7 is the weekday.
+        mask = ((days - 1) % 7 < 5) & ~np.isin(days, np.fromiter(closed, dtype=np.int64, count=len(closed)))
+        ordinals = days[mask]
+        positions = dict(zip(ordinals.tolist(), range(len(ordinals))))
+        return first_year, last_year, ordinals, positions
+
+    def _covering(self, first_ordinal: int, last_ordinal: int) -> Tuple[int, int, np.ndarray, Dict[int, int]]:
+        state = self._state
+        first_year = date.fromordinal(first_ordinal).year
+        last_year = date.fromordinal(last_ordinal).year
+        if state[0] <= first_year and last_year <= state[1]:
+            return state
+        with self._lock:
+            state = self._state
+            if not (state[0] <= first_year and last_year <= state[1]):
+                state = self._build(min(state[0], first_year), max(state[1], last_year))
+                self._state = state
+            return state
+
+    @property
+    def sessions(self) -> np.ndarray:
+        """Sorted session ordinals currently covered by the index."""
+        return self._state[2]
+
+    def is_session(self, value: DateLike) -> bool:
+        ordinal = _as_date(value).toordinal()
+        return ordinal in self._covering(ordinal, ordinal)[3]
+
+    def sessions_between(self, start: DateLike, end: DateLike) -> int:
+        """Number of sessions in ``(start, end]`` (0 when ``end <= start``)."""
+        start_ordinal = _as_date(start).toordinal()
+        end_ordinal = _as_date(end).toordinal()
+        if end_ordinal <= start_ordinal:
+            return 0
+        ordinals = self._covering(start_ordinal, end_ordinal)[2]
+        return int(
+            np.searchsorted(ordinals, end_ordinal, side="right")
+            - np.searchsorted(ordinals, start_ordinal, side="right")
+        )
+
+    def session_after(self, start: DateLike, sessions: int) -> date:
+        """Date of the ``sessions``-th session strictly after ``start``.
+
+        ``sessions == 0`` returns ``start`` itself, matching a zero-day offset.
+        """
+        sessions = int(sessions)
+        if sessions < 0:
+            raise ValueError("sessions must be non-negative")
+        start_day = _as_date(start)
+        if sessions == 0:
+            return start_day
+
+        # About 252 sessions per year; over-provision and extend until covered.
+        horizon = start_day.toordinal() + sessions * 2 + 14
+        while True:
+            ordinals = self._covering(start_day.toordinal(), horizon)[2]
+            target = int(np.searchsorted(ordinals, start_day.toordinal(), side="right")) + sessions - 1
+            if target < len(ordinals):
+                return date.fromordinal(int(ordinals[target]))
+            horizon += 366
+
+    def sessions_between_many(self, starts, ends) -> np.ndarray:
+        """Vectorized ``sessions_between`` for broadcastable date arrays."""
+        start_ordinals = _to_ordinals(starts)
+        end_ordinals = _to_ordinals(ends)
+        lowest = int(min(start_ordinals.min(), end_ordinals.min()))
+        highest = int(max(start_ordinals.max(), end_ordinals.max()))
+        ordinals = self._covering(lowest, highest)[2]
+        counts = np.searchsorted(ordinals, end_ordinals, side="right") - np.searchsorted(
+            ordinals, start_ordinals, side="right"
+        )
+        return np.where(end_ordinals > start_ordinals, counts, 0).astype(np.int64)
+
+    def session_after_many(self, starts, sessions) -> np.ndarray:
+        """Vectorized ``session_after``; returns a ``datetime64[D]`` array."""
+        start_ordinals = _to_ordinals(starts)
+        offsets = np.broadcast_to(np.asarray(sessions, dtype=np.int64), start_ordinals.shape)
+        if (offsets < 0).any():
+            raise ValueError("sessions must be non-negative")
+
+        horizon = int(start_ordinals.max()) + int(offsets.max()) * 2 + 14
+        while True:
+            ordinals = self._covering(int(start_ordinals.min()), horizon)[2]
+            targets = np.searchsorted(ordinals, start_ordinals, side="right") + offsets - 1
+            if (targets < len(ordinals)).all():
+                break
+            horizon += 366
+        result = np.where(offsets == 0, start_ordinals, ordinals[np.clip(targets, 0, None)])
+        return _from_ordinals(result)
+
+    def mask(self, start: DateLike, end: DateLike) -> pd.Series:
+        """Boolean trading-day mask over every calendar day in ``[start, end]``."""
+        days = pd.date_range(_as_date(start), _as_date(end), freq="D", name="Date")
+        if len(days) == 0:
+            return pd.Series([], index=days, dtype=bool)
+        day_ordinals = _to_ordinals(days)
+        ordinals = self._covering(int(day_ordinals[0]), int(day_ordinals[-1]))[2]
+        return pd.Series(np.isin(day_ordinals, ordinals), index=days)
+
+    def previous_session(self, start: DateLike) -> date:
+        """Closest session strictly before ``start``."""
+        start_ordinal = _as_date(start).toordinal()
+        ordinals = self._covering(start_ordinal - 14, start_ordinal)[2]
+        position = int(np.searchsorted(ordinals, start_ordinal, side="left")) - 1
+        return date.fromordinal(int(ordinals[position]))
+
+
+@lru_cache(maxsize=32)
+def _session_index_for(extra_holidays: FrozenSet[date]) -> TradingSessionIndex:
+    return TradingSessionIndex(extra_holidays)
+
+
+def get_trading_session_index(
+    extra_holidays: Iterable[Union[DateLike, str]] = (),
+) -> TradingSessionIndex:
+    """Return the shared session index for a given set of extra closures."""
+    return _session_index_for(_normalize_extra_holidays(extra_holidays))
+
+
+def trading_day_mask(
+    start: DateLike,
+    end: DateLike,
+    extra_holidays: Iterable[Union[DateLike, str]] = (),
+) -> pd.Series:
+    """Boolean Series (daily DatetimeIndex) marking trading days in ``[start, end]``."""
+    return get_trading_session_index(extra_holidays).mask(start, end)
+
+
+def sessions_after(
+    starts,
+    sessions,
+    extra_holidays: Iterable[Union[DateLike, str]] = (),
+) -> np.ndarray:
+    """``datetime64[D]`` array of the N-th session strictly after each start date."""
+    return get_trading_session_index(extra_holidays).session_after_many(starts, sessions)
+
+
+def sessions_between(
+    starts,
+    ends,
+    extra_holidays: Iterable[Union[DateLike, str]] = (),
+) -> np.ndarray:
+    """Sessions in ``(start, end]`` for each start/end pair (0 when end <= start)."""
+    return get_trading_session_index(extra_holidays).sessions_between_many(starts, ends)
+
+
+def us_equity_business_day(
+    extra_holidays: Iterable[Union[DateLike, str]] = (),
+    first_year: int = TradingSessionIndex.DEFAULT_FIRST_YEAR,
+    last_year: int = None,
+) -> pd.offsets.CustomBusinessDay:
+    """pandas business-day offset following the US equity calendar.
+
+    Usable as ``freq=`` in ``pd.date_range`` or for ``Timestamp`` arithmetic.
+    Holidays are materialised for ``[first_year, last_year]``.
+    """
+    if last_year is None:
+        last_year = date.today().year + TradingSessionIndex.DEFAULT_YEARS_AHEAD
+    holidays = sorted(
+        {day for year in range(first_year, last_year + 1) for day in us_equity_market_holidays(year)}
+        | _normalize_extra_holidays(extra_holidays)
+    )
+    return pd.offsets.CustomBusinessDay(holidays=holidays)
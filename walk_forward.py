@@ -0,0 +1,251 @@
+"""
+SF/AG 파라미터 워크포워드 검증 (롤링 학습/검증 구간, 구간별 병렬)
+
+한 백테스트 구간에서 고른 파라미터는 그 구간에 과최적화되기 쉽다. 전체 기간을 학습 구간과
+바로 뒤의 검증 구간으로 굴려 가며, 학습 구간에서 조합 탐색으로 고른 최적 설정을 다음 검증
+구간(표본 외)에서 평가한다.
+
+- 가격·모드·시드증액 배열은 parameter_sweep.prepare_sweep_data로 전체 기간에 대해 한 번만 만들고,
+  각 구간은 window_data로 잘라 쓴다 (워커마다 한 번만 전달)
+- 구간 점수는 구간 시작일에 초기자본으로 새로 시작한 run_backtest와 같은 커널 결과이며,
+  구간 이전 시드증액은 반영하지 않는다
+- 구간(fold)은 프로세스 풀에서 병렬 실행
+
+사용법:
+  python walk_forward.py --start 2011-01-01 --train-years 3 --test-years 1 --grid sf.sell_threshold=1,1.4,2 --grid ag.max_hold_days=5,7,9
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from parameter_sweep import (
+    SweepData,
+    add_search_arguments,
+    configs_from_args,
+    evaluate_config,
+    prepare_sweep_data,
+    save_table,
+    trader_from_args,
+    window_data,
+)
+from performance_metrics import TRADING_DAYS_PER_YEAR
+
+# 학습 구간 최적 조합 선택 기준: 이름 → (지표 → 점수, 클수록 좋은지)
+OBJECTIVES = {
+    "total_return": (lambda m: m["total_return"], True),
+    "cagr": (lambda m: m["cagr"], True),
+    "mdd": (lambda m: m["mdd"], False),
+    "return_over_mdd": (lambda m: m["cagr"] / m["mdd"] if m["mdd"] > 0 else float("inf"), True),
+}
+
+
+def walk_forward_windows(
+    n_bars: int, train_bars: int, test_bars: int, step_bars: Optional[int] = None, anchored: bool = False
+) -> List[Tuple[int, int, int, int]]:
+    """
+    롤링 학습/검증 구간 봉 인덱스
+    Args:
+        n_bars: 전체 봉 수
+        train_bars: 학습 구간 봉 수 (anchored면 첫 학습 구간 길이)
+        test_bars: 검증 구간 봉 수
+        step_bars: 구간 이동 봉 수 (None이면 test_bars, 검증 구간이 겹치지 않음)
+        anchored: True면 학습 구간 시작을 처음 봉에 고정 (확장 구간)
+    Returns:
+        List[Tuple]: (학습 시작, 학습 끝, 검증 시작, 검증 끝) 반열린 구간 목록 (검증 구간이 다 차는 것만)
+    """
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError("학습/검증 구간 길이는 1봉 이상이어야 합니다.")
+    step_bars = step_bars or test_bars
+    windows = []
+    train_start = 0
+    while True:
+        train_stop = (train_bars + len(windows) * step_bars) if anchored else train_start + train_bars
+        test_stop = train_stop + test_bars
+        if test_stop > n_bars:
+            break
+        windows.append((0 if anchored else train_start, train_stop, train_stop, test_stop))
+        train_start += step_bars
+    return windows
+
+
+def _best_config(data: SweepData, configs: Sequence[Dict], objective: str, use_numba: Optional[bool]):
+    score_of, maximize = OBJECTIVES[objective]
+    best_index, best_metrics, best_score = None, None, None
+    for index, config in enumerate(configs):
+        metrics = evaluate_config(data, config["sf_config"], config["ag_config"], use_numba)
+        score = score_of(metrics)
+        if best_score is None or (score > best_score if maximize else score < best_score):
+            best_index, best_metrics, best_score = index, metrics, score
+    return best_index, best_metrics
+
+
+def run_fold(
+    data: SweepData,
+    configs: Sequence[Dict],
+    window: Tuple[int, int, int, int],
+    objective: str = "total_return",
+    use_numba: Optional[bool] = None,
+) -> Dict:
+    """
+    구간 하나: 학습 구간에서 최적 조합 선택 후 검증 구간 평가
+    Returns:
+        Dict: 구간 날짜, 선택된 조합 값, train_*/test_* 지표, 선택된 sf_config/ag_config
+    """
+    train_start, train_stop, test_start, test_stop = window
+    train = window_data(data, train_start, train_stop)
+    test = window_data(data, test_start, test_stop)
+    best_index, train_metrics = _best_config(train, configs, objective, use_numba)
+    best = configs[best_index]
+    test_metrics = evaluate_config(test, best["sf_config"], best["ag_config"], use_numba)
+    return {
+        "train_start": train.days[0].isoformat(),
+        "train_end": train.days[-1].isoformat(),
+        "test_start": test.days[0].isoformat(),
+        "test_end": test.days[-1].isoformat(),
+        **best["params"],
+        **{f"train_{key}": value for key, value in train_metrics.items()},
+        **{f"test_{key}": value for key, value in test_metrics.items()},
+        "sf_config": best["sf_config"],
+        "ag_config": best["ag_config"],
+    }
+
+
+_WORKER_SHARED = {}
+
+
+def _init_worker(data: SweepData, configs: List[Dict], objective: str, use_numba: Optional[bool]):
+    """프로세스 풀 워커 초기화: 전체 기간 배열과 조합 목록을 프로세스당 한 번만 받아 둔다"""
+    _WORKER_SHARED.update(data=data, configs=configs, objective=objective, use_numba=use_numba)
+
+
+def _run_fold_in_worker(window):
+    shared = _WORKER_SHARED
+    return run_fold(shared["data"], shared["configs"], window, shared["objective"], shared["use_numba"])
+
+
+def run_walk_forward(
+    data: SweepData,
+    configs: Sequence[Dict],
+    train_bars: int = 3 * TRADING_DAYS_PER_YEAR,
+    test_bars: int = TRADING_DAYS_PER_YEAR,
+    step_bars: Optional[int] = None,
+    anchored: bool = False,
+    objective: str = "total_return",
+    max_workers: Optional[int] = None,
+    use_numba: Optional[bool] = None,
+) -> pd.DataFrame:
+    """
+    워크포워드 검증 실행
+    Args:
+        data: 전체 기간 prepare_sweep_data 결과
+        configs: 학습 구간마다 탐색할 조합 (grid_configs/random_configs)
+        train_bars/test_bars/step_bars/anchored: walk_forward_windows 참고
+        objective: 학습 구간 선택 기준 (OBJECTIVES 키)
+        max_workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 순서대로 실행)
+    Returns:
+        pd.DataFrame: 구간(fold)별 한 행, 검증 구간 시작일 순
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"지원하지 않는 선택 기준입니다: {objective} ({', '.join(OBJECTIVES)})")
+    configs = list(configs)
+    if not configs:
+        raise ValueError("탐색할 조합이 없습니다.")
+    windows = walk_forward_windows(len(data.closes), train_bars, test_bars, step_bars, anchored)
+    if not windows:
+        raise ValueError(f"기간이 짧아 구간을 만들 수 없습니다. (전체 {len(data.closes)}봉, 학습 {train_bars}봉 + 검증 {test_bars}봉 필요)")
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(windows)))
+
+    if max_workers == 1:
+        rows = [run_fold(data, configs, window, objective, use_numba) for window in windows]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(data, configs, objective, use_numba)
+        ) as pool:
+            rows = list(pool.map(_run_fold_in_worker, windows))
+
+    table = pd.DataFrame(rows)
+    table.insert(0, "fold", range(1, len(table) + 1))
+    return table
+
+
+def summarize_walk_forward(table: pd.DataFrame) -> Dict:
+    """
+    검증 구간 성과 요약
+    Returns:
+        Dict: 구간 수, 검증 수익률 평균/중앙값, 이익 구간 비율, 검증 구간 수익률을 이어 붙인 누적 수익률, 최악 검증 MDD (%)
+    """
+    if table.empty:
+        return {"folds": 0}
+    returns = table["test_total_return"]
+    chained = float((1 + returns / 100).prod() - 1) * 100
+    return {
+        "folds": int(len(table)),
+        "mean_test_return": float(returns.mean()),
+        "median_test_return": float(returns.median()),
+        "positive_folds": float((returns > 0).mean()),
+        "chained_test_return": chained,
+        "worst_test_mdd": float(table["test_mdd"].max()),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """CLI: 파라미터.xlsx(없으면 기본 설정)를 기준으로 탐색 공간을 만들어 워크포워드 검증"""
+    import argparse
+
+    if sys.stdout.encoding != "utf-8":
+        try:
+            sys.stdout.reconfigure(encoding="utf-8")
+        except Exception:
+            pass
+
+    parser = argparse.ArgumentParser(description="SF/AG 파라미터 워크포워드 검증")
+    add_search_arguments(parser)
+    parser.add_argument("--train-years", type=float, default=3, help="학습 구간 (년, 252거래일 기준)")
+    parser.add_argument("--test-years", type=float, default=1, help="검증 구간 (년)")
+    parser.add_argument("--step-years", type=float, default=None, help="구간 이동 (년, 기본: 검증 구간)")
+    parser.add_argument("--anchored", action="store_true", help="학습 구간 시작을 처음 날짜에 고정")
+    parser.add_argument("--objective", default="total_return", choices=list(OBJECTIVES), help="학습 구간 선택 기준")
+    args = parser.parse_args(argv)
+
+    def bars(years):
+        return None if years is None else max(1, int(round(years * TRADING_DAYS_PER_YEAR)))
+
+    trader = trader_from_args(args)
+    try:
+        configs = configs_from_args(args, trader)
+        with trader.quiet_logging():
+            data = prepare_sweep_data(trader, args.start, args.end or None)
+        print(f"📅 기간: {data.days[0]} ~ {data.days[-1]} ({len(data.days)}봉), 조합 {len(configs):,}개")
+        started = datetime.now()
+        table = run_walk_forward(
+            data, configs,
+            train_bars=bars(args.train_years), test_bars=bars(args.test_years), step_bars=bars(args.step_years),
+            anchored=args.anchored, objective=args.objective, max_workers=args.workers,
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    print(f"✅ {len(table)}개 구간 완료: {(datetime.now() - started).total_seconds():.1f}초")
+
+    columns = [column for column in table.columns if column not in ("sf_config", "ag_config")]
+    with pd.option_context("display.max_columns", None, "display.width", 200, "display.float_format", "{:,.2f}".format):
+        print(table[columns].to_string(index=False))
+
+    summary = summarize_walk_forward(table)
+    print("\n📊 검증 구간 요약")
+    print(f"   평균 수익률: {summary['mean_test_return']:+.2f}% (중앙값 {summary['median_test_return']:+.2f}%)")
+    print(f"   이익 구간 비율: {summary['positive_folds'] * 100:.0f}%")
+    print(f"   검증 구간 누적 수익률: {summary['chained_test_return']:+.2f}%")
+    print(f"   최악 검증 MDD: {summary['worst_test_mdd']:.2f}%")
+
+    if args.output:
+        save_table(table, args.output)
+
+
+if __name__ == "__main__":
+    main()